@@ -12,6 +12,7 @@ class AtomicOp:
     def execute(self):
         """
         执行指令 必要时上抛状态事件
+        在指令执行器的线程中直接执行 需要等待时应使用可被 stop 中断的方式 例如 CancelToken
         """
         pass
 
@@ -24,6 +25,6 @@ class AtomicOp:
 
     def stop(self) -> None:
         """
-        停止运行
+        停止运行 正在 execute 中等待的应尽快返回
         """
         pass
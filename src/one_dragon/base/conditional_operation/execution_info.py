@@ -16,6 +16,7 @@ class ExecutionInfo:
         """
         self.trigger: str | None = None  # 触发器
         self.interrupt_cal_tree: StateCalNode | None = interrupt_cal_tree  # 打断状态判断树
+        self.interrupt_checked: bool = False  # 是否已经判断过打断条件 判断为真时会直接打断 所以判断过即为假
         self.priority: int | None = None  # 优先级 只能被高等级的打断；为None时可以被随意打断
 
         self.op_list: list[AtomicOp] = op_list  # 需要执行的指令列表
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from concurrent.futures import Future, ThreadPoolExecutor
 from threading import Lock
 
 from one_dragon.base.conditional_operation.atomic_op import AtomicOp
 from one_dragon.utils import thread_utils
 from one_dragon.utils.log_utils import log
 
-# 当前执行1个 新的打断1个 即理论最多2个同时运行
+# 每个执行器占用1个 当前执行1个 新的打断1个 即理论最多2个同时运行
 _od_op_task_executor = ThreadPoolExecutor(thread_name_prefix='_od_op_task_executor', max_workers=4)
 
 
@@ -42,6 +42,8 @@ class OperationExecutor:
     def _run(self) -> bool:
         """
         执行
+        指令直接在当前线程中执行 不再额外提交到线程池 减少指令之间的延迟
+        stop 时会调用当前指令的 stop 可中断的指令应尽快返回
         :return: 是否完成所有指令了
         """
         for idx in range(len(self.op_list)):
@@ -52,20 +54,12 @@ class OperationExecutor:
                 self._current_op = self.op_list[idx]
                 if self._current_op.async_op:
                     self._async_ops.append(self._current_op)
-                future: Future = _od_op_task_executor.submit(self._current_op.execute)
-                future.add_done_callback(thread_utils.handle_future_result)
+                current_op = self._current_op
 
-            # 使用短超时循环等待，以便能响应 stop()
-            while not future.done():
-                if not self.running:
-                    break
-                try:
-                    future.result(timeout=0.05)
-                except TimeoutError:
-                    continue
-                except Exception:
-                    log.error('指令执行出错', exc_info=True)
-                    break
+            try:
+                current_op.execute()
+            except Exception:
+                log.error('指令执行出错', exc_info=True)
 
             with self._op_lock:
                 if not self.running:
@@ -2,7 +2,7 @@ import time
 from abc import abstractmethod
 from concurrent.futures import Future, ThreadPoolExecutor
 from functools import cached_property
-from threading import Lock
+from threading import Condition, RLock
 from typing import Optional
 
 from one_dragon.base.conditional_operation.atomic_op import AtomicOp
@@ -17,11 +17,15 @@ from one_dragon.base.conditional_operation.state_record_service import StateReco
 from one_dragon.base.conditional_operation.state_recorder import StateRecord
 from one_dragon.thread.atomic_int import AtomicInt
 from one_dragon.utils import thread_utils
+from one_dragon.utils.latency_stats import LatencyStats
 from one_dragon.utils.log_utils import log
 
 # 当前运行的场景一个 打断的新场景一个 处理事件更新状态一个
 _od_conditional_op_executor = ThreadPoolExecutor(thread_name_prefix='od_conditional_op', max_workers=4)
 
+# 主循环等待到状态判断随时间变化时 最短的等待时间 避免变化的时间点刚好是当前时间时空转
+_NORMAL_SCENE_MIN_WAIT_SECONDS = 0.001
+
 
 class ConditionalOperator(ConditionalOperatorLoader):
 
@@ -52,9 +56,16 @@ class ConditionalOperator(ConditionalOperatorLoader):
         self.current_execution_info: ExecutionInfo | None = None  # 当前的执行信息
         self.running_executor: OperationExecutor | None = None  # 正在运行的任务
         self.running_executor_cnt: AtomicInt = AtomicInt()  # 统计有
-        
+        self.reaction_latency: LatencyStats = LatencyStats()  # 从状态更新到开始执行指令的延迟
+
         self._inited: bool = False
-        self._task_lock: Lock = Lock()
+        # 可重入 指令完成得很快时 add_done_callback 会在持有锁的线程里直接调用 _on_task_done
+        self._task_lock: RLock = RLock()
+        # 主循环等待的条件 使用的状态更新、指令完成、停止运行时唤醒
+        self._normal_scene_condition: Condition = Condition(self._task_lock)
+        self._normal_scene_states: frozenset[str] = frozenset()  # 主循环场景使用的状态
+        self._state_2_changed_states: dict[str, frozenset[str]] = {}  # 更新一个状态后 会发生变化的状态 包括被清除的互斥状态
+        self._normal_scene_update_time: float | None = None  # 主循环上次判断后 最早的一次状态更新时间
 
     def init(self) -> None:
         """
@@ -78,6 +89,8 @@ class ConditionalOperator(ConditionalOperatorLoader):
         self.trigger_2_scene = {}
         self.normal_scene = None
         self.last_trigger_time = {}
+        self._normal_scene_states = frozenset()
+        self._state_2_changed_states = {}
 
         for scene in self.scenes:
             scene.build(
@@ -89,6 +102,7 @@ class ConditionalOperator(ConditionalOperatorLoader):
                     self.trigger_2_scene[trigger] = scene
             else:
                 self.normal_scene = scene
+                self._normal_scene_states = frozenset(scene.usage_states)
 
     def dispose(self) -> None:
         """
@@ -117,6 +131,8 @@ class ConditionalOperator(ConditionalOperatorLoader):
 
         self.is_running = True
         self.running_executor_cnt.set(0)  # 每次重置计数器 防止有bug导致无法正常运行
+        self.reaction_latency.clear()
+        self._normal_scene_update_time = None
 
         if self.normal_scene is not None:
             future: Future = _od_conditional_op_executor.submit(self._normal_scene_loop)
@@ -127,61 +143,71 @@ class ConditionalOperator(ConditionalOperatorLoader):
     def _normal_scene_loop(self) -> None:
         """
         主循环
+        不轮询 在以下情况被唤醒后判断
+        - 使用的状态有更新
+        - 运行中的指令完成或被停止
+        - 场景的触发间隔到期
+        - 状态记录不变 但判断结果因为时间流逝而可能变化 例如 [状态, a, b] 的时间窗口开启 或者状态过期
         :return:
         """
         normal_scene_id = id(self.normal_scene)
-        while self.is_running:
-            if self.running_executor_cnt.get() > 0:
-                # 有其它场景在运行 等待
-                time.sleep(0.02)
-                continue
-
-            # log.debug('开始等待新的主循环')
-            to_sleep: Optional[float] = None
-
-            # 上锁后确保运行状态不会被篡改
-            with self._task_lock:
-                if not self.is_running:
-                    # 已经被stop_running中断了 不继续
-                    break
+        # 等待时会释放锁 判断时持有锁 确保运行状态不会被篡改
+        with self._normal_scene_condition:
+            while self.is_running:
+                if self.running_executor_cnt.get() > 0:
+                    # 有其它场景在运行 等待其完成 完成或停止时 _on_task_done 和 _stop_running_task 会唤醒
+                    self._normal_scene_condition.wait()
+                    continue
 
                 trigger_time = time.time()
                 last_trigger_time = self.last_trigger_time.get(normal_scene_id, 0)
                 past_time = trigger_time - last_trigger_time
                 if past_time < self.normal_scene.interval_seconds:
-                    to_sleep = self.normal_scene.interval_seconds - past_time
+                    # 间隔内的状态更新不需要处理 等到间隔到期
+                    self._normal_scene_update_time = None
+                    self._normal_scene_condition.wait(self.normal_scene.interval_seconds - past_time)
+                    continue
+
+                update_time = self._normal_scene_update_time
+                self._normal_scene_update_time = None
+                new_execution_info = self.normal_scene.match_execution(trigger_time)
+                if new_execution_info is not None:
+                    log.debug(f'当前场景 主循环 当前条件 {new_execution_info.expr_display}')
+                    new_execution_info.priority = self.normal_scene.priority
+                    self._emit_overlay_decision(
+                        trigger="主循环",
+                        expression=new_execution_info.expr_display,
+                        status="MATCHED",
+                        execution_info=new_execution_info,
+                    )
+
+                    self.current_execution_info = new_execution_info
+                    self.running_executor = OperationExecutor(
+                        op_list=new_execution_info.op_list,
+                        trigger_time=trigger_time,
+                    )
+                    self.last_trigger_time[normal_scene_id] = trigger_time
+                    self.running_executor_cnt.inc()
+                    # 在开始执行前记录 避免指令执行完了统计还没有样本
+                    if update_time is not None:
+                        self.reaction_latency.record('主循环', time.perf_counter() - update_time)
+                    future = self.running_executor.run_async()
+                    future.add_done_callback(self._on_task_done)
                 else:
-                    new_execution_info = self.normal_scene.match_execution(trigger_time)
-                    if new_execution_info is not None:
-                        log.debug(f'当前场景 主循环 当前条件 {new_execution_info.expr_display}')
-                        new_execution_info.priority = self.normal_scene.priority
-                        self._emit_overlay_decision(
-                            trigger="主循环",
-                            expression=new_execution_info.expr_display,
-                            status="MATCHED",
-                            execution_info=new_execution_info,
+                    # 没有命中的状态 等待状态更新 或者等到判断结果随时间变化
+                    next_change_time = self.normal_scene.get_next_change_time(trigger_time)
+                    if next_change_time is None:
+                        self._normal_scene_condition.wait()
+                    else:
+                        self._normal_scene_condition.wait(
+                            max(next_change_time - time.time(), _NORMAL_SCENE_MIN_WAIT_SECONDS)
                         )
 
-                        self.current_execution_info = new_execution_info
-                        self.running_executor = OperationExecutor(
-                            op_list=new_execution_info.op_list,
-                            trigger_time=trigger_time,
-                        )
-                        self.last_trigger_time[normal_scene_id] = trigger_time
-                        self.running_executor_cnt.inc()
-                        future = self.running_executor.run_async()
-                        future.add_done_callback(self._on_task_done)
-
-            if to_sleep is not None:
-                # 等待时间不能写在锁里 要尽快释放锁
-                time.sleep(to_sleep)
-            else:  # 没有命中的状态 或者 提交执行了 那就自旋等待
-                time.sleep(0.02)
-
-    def _trigger_scene(self, state_name: str) -> None:
+    def _trigger_scene(self, state_name: str, update_time: float | None = None) -> None:
         """
         触发对应的场景
         :param state_name: 触发的状态
+        :param update_time: 状态更新的时间 time.perf_counter() 用于统计反应延迟
         :return:
         """
         if state_name not in self.trigger_2_scene:
@@ -237,6 +263,8 @@ class ConditionalOperator(ConditionalOperatorLoader):
             self.current_execution_info = new_execution_info
             self.running_executor = OperationExecutor(new_execution_info.op_list, trigger_time)
             self.last_trigger_time[trigger_scene_id] = trigger_time
+            if update_time is not None:
+                self.reaction_latency.record('触发', time.perf_counter() - update_time)
             future = self.running_executor.run_async()
             future.add_done_callback(self._on_task_done)
 
@@ -247,8 +275,15 @@ class ConditionalOperator(ConditionalOperatorLoader):
         """
         # 上锁后停止 上锁后确保运行状态不会被篡改
         with self._task_lock:
+            was_running = self.is_running
             self.is_running = False
             self._stop_running_task()
+            self._normal_scene_condition.notify_all()
+
+        if was_running:
+            latency_text = self.reaction_latency.get_display_text()
+            if latency_text:
+                log.info(f'反应延迟 {latency_text}')
 
     def _stop_running_task(self) -> None:
         """
@@ -262,6 +297,7 @@ class ConditionalOperator(ConditionalOperatorLoader):
                 # 如果 finish=True 则计数器已经在 _on_task_done 减少了 这里就不减了
                 # 如果 finish=False 则代表还有操作在继续。在这里要减少计数器而不是等_on_task_done 让无触发器场景尽早运行
                 self.running_executor_cnt.dec()
+                self._normal_scene_condition.notify_all()
             self.running_executor = None
 
     def _on_task_done(self, future: Future) -> None:
@@ -275,6 +311,7 @@ class ConditionalOperator(ConditionalOperatorLoader):
                     self.running_executor_cnt.dec()
             except Exception:  # run_async里有callback打印日志
                 pass
+            self._normal_scene_condition.notify_all()
 
     @cached_property
     def usage_states(self) -> set[str]:
@@ -305,6 +342,15 @@ class ConditionalOperator(ConditionalOperatorLoader):
         if not self.is_running:
             return
 
+        update_time = time.perf_counter()
+        changed_states = self._get_changed_states(state_records)
+        if not changed_states.isdisjoint(self._normal_scene_states):
+            # 主循环使用的状态有变化 唤醒主循环重新判断
+            with self._normal_scene_condition:
+                if self._normal_scene_update_time is None:
+                    self._normal_scene_update_time = update_time
+                self._normal_scene_condition.notify_all()
+
         top_priority_scene: Optional[Scene] = None
         top_priority_state: Optional[str] = None
 
@@ -337,14 +383,16 @@ class ConditionalOperator(ConditionalOperatorLoader):
 
         # 触发具体的场景 由自己的线程处理
         if top_priority_state is not None:
-            future: Future = _od_conditional_op_executor.submit(self._trigger_scene, top_priority_state)
+            future: Future = _od_conditional_op_executor.submit(self._trigger_scene, top_priority_state, update_time)
             future.add_done_callback(thread_utils.handle_future_result)
         else:
             # 没有场景需要触发 看是否需要打断当前操作
             with self._task_lock:
                 interrupt: bool = False
                 if (self.running_executor is not None and self.running_executor.running
-                        and self.current_execution_info.interrupt_cal_tree is not None):
+                        and self.current_execution_info.interrupt_cal_tree is not None
+                        and self._need_check_interrupt(self.current_execution_info, changed_states)):
+                    self.current_execution_info.interrupt_checked = True
                     now = time.time()
                     if self.current_execution_info.interrupt_cal_tree.in_time_range(now):
                         interrupt = True
@@ -359,6 +407,49 @@ class ConditionalOperator(ConditionalOperatorLoader):
                         ttl_seconds=30.0,
                     )
 
+    def _get_changed_states(self, state_records: list[StateRecord]) -> set[str]:
+        """
+        获取一批状态更新后 会发生变化的状态
+        包括更新的状态本身 以及因互斥被清除的状态
+
+        Args:
+            state_records: 状态记录列表
+
+        Returns:
+            set[str]: 会发生变化的状态
+        """
+        changed_states: set[str] = set()
+        for state_record in state_records:
+            state_name = state_record.state_name
+            states = self._state_2_changed_states.get(state_name)
+            if states is None:
+                states = {state_name}
+                recorder = self.state_record_service.get_state_recorder(state_name)
+                if recorder is not None and recorder.mutex_list is not None:
+                    states.update(recorder.mutex_list)
+                states = frozenset(states)
+                self._state_2_changed_states[state_name] = states
+            changed_states.update(states)
+        return changed_states
+
+    @staticmethod
+    def _need_check_interrupt(execution_info: ExecutionInfo, changed_states: set[str]) -> bool:
+        """
+        是否需要重新判断打断条件
+        打断条件判断过且为假时 如果判断结果只可能随时间由真变假 那只有相关状态变化才需要重新判断
+
+        Args:
+            execution_info: 当前的执行信息
+            changed_states: 会发生变化的状态
+
+        Returns:
+            bool: 是否需要判断
+        """
+        tree = execution_info.interrupt_cal_tree
+        if not execution_info.interrupt_checked or not tree.time_monotone:
+            return True
+        return not changed_states.isdisjoint(tree.usage_states)
+
     def _emit_overlay_decision(
         self,
         trigger: str,
@@ -66,6 +66,23 @@ class Scene:
 
         return states
 
+    def get_next_change_time(self, now: float) -> float | None:
+        """
+        状态记录不变时 各个状态处理器的判断结果下一次可能因为时间流逝而变化的时间
+
+        Args:
+            now: 当前时间
+
+        Returns:
+            下一次可能变化的时间 不会再随时间变化时返回None
+        """
+        time_list: list[float] = []
+        for handler in self.handlers:
+            next_time = handler.get_next_change_time(now)
+            if next_time is not None:
+                time_list.append(next_time)
+        return min(time_list) if len(time_list) > 0 else None
+
     def match_execution(self, trigger_time: float) -> ExecutionInfo | None:
         """
         根据触发时间和优先级 获取符合条件的场景下的执行信息
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from enum import IntEnum
 from functools import cached_property
-from typing import Callable, Optional
+from typing import Any, Callable, Optional
 
 from one_dragon.base.conditional_operation.state_recorder import StateRecorder
 from one_dragon.utils.log_utils import log
@@ -64,43 +64,62 @@ class StateCalNode:
     def in_time_range(self, now: float) -> bool:
         """
         根据当前时间 判断是否在状态的生效时间范围内
+        使用编译后的判断函数 结果与逐个节点递归判断一致
         :param now: 当前时间
         :return:
         """
+        return self.evaluator(now)
+
+    @cached_property
+    def evaluator(self) -> Callable[[float], bool]:
+        """
+        将判断树编译成一个扁平的判断函数 避免每次判断都递归遍历节点
+        需要在树构建完成后使用 构建后不应再修改节点
+        """
+        return compile_state_cal_tree(self)
+
+    @cached_property
+    def time_monotone(self) -> bool:
+        """
+        状态记录不变时 判断结果是否只可能随时间由真变假
+        即不包含 NOT 并且所有状态的时间区间都从0开始
+        为True时 判断为假后 只有相关状态更新才可能变为真
+        """
         if self.node_type == StateCalNodeType.OP:
-            if self.op_type == StateCalOpType.AND:
-                return self.left_child.in_time_range(now) and self.right_child.in_time_range(now)
-            elif self.op_type == StateCalOpType.OR:
-                return self.left_child.in_time_range(now) or self.right_child.in_time_range(now)
-            elif self.op_type == StateCalOpType.NOT:
-                return not self.left_child.in_time_range(now)
+            if self.op_type == StateCalOpType.NOT:
+                return False
+            return self.left_child.time_monotone and self.right_child.time_monotone
         elif self.node_type == StateCalNodeType.STATE:
-            diff = now - self.state_recorder.last_record_time
-            # log.debug('状态 [ %s ] 距离上次 %.2f, 要求区间 [%.2f, %.2f]' % (
-            #     self.state_recorder.state_name,
-            #     999 if diff > 999 else diff,
-            #     self.state_time_range_min,
-            #     self.state_time_range_max
-            # ))
-            time_valid = self.state_time_range_min <= diff <= self.state_time_range_max
-            value_valid = True
-            if self.state_value_range_min is not None and self.state_value_range_max is not None:
-                # log.debug('状态 [ %s ] 当前值 %s, 值要求区间 [%d, %d]' % (
-                #     self.state_recorder.state_name,
-                #     self.state_recorder.last_value,
-                #     self.state_value_range_min,
-                #     self.state_value_range_max
-                # ))
-                if self.state_recorder.last_value is None:
-                    value_valid = False
-                else:
-                    value_valid = self.state_value_range_min <= self.state_recorder.last_value <= self.state_value_range_max
-
-            return time_valid and value_valid
-        elif self.node_type == StateCalNodeType.TRUE:
-            return True
-
-        return False
+            return self.state_time_range_min <= 0
+        return True
+
+    def get_next_change_time(self, now: float) -> float | None:
+        """
+        状态记录不变时 判断结果下一次可能因为时间流逝而变化的时间
+        即各个状态时间区间的开始 或者结束 中在当前时间之后最早的一个
+        :param now: 当前时间
+        :return: 下一次可能变化的时间 不会再随时间变化时返回None
+        """
+        next_time: float | None = None
+        node_stack: list[StateCalNode] = [self]  # 连续的运算符可能很长 不使用递归
+        while len(node_stack) > 0:
+            node = node_stack.pop()
+            if node.node_type == StateCalNodeType.OP:
+                node_stack.append(node.left_child)
+                if node.right_child is not None:
+                    node_stack.append(node.right_child)
+                continue
+            elif node.node_type != StateCalNodeType.STATE:
+                continue
+
+            last_record_time = node.state_recorder.last_record_time
+            start_time = last_record_time + node.state_time_range_min  # 到这个时间开始生效
+            end_time = last_record_time + node.state_time_range_max  # 超过这个时间后失效
+            if start_time > now and (next_time is None or start_time < next_time):
+                next_time = start_time
+            if end_time >= now and (next_time is None or end_time < next_time):
+                next_time = end_time
+        return next_time
 
     @cached_property
     def usage_states(self) -> set[str]:
@@ -278,3 +297,97 @@ def construct_state_cal_tree(
         raise ValueError('有多段表达式 未使用运算符连接')
     else:
         return node_stack[0]
+
+
+
+def _in_time_range_by_walk(node: StateCalNode, now: float) -> bool:
+    """
+    逐个节点递归判断 编译失败时使用
+    :param node: 判断树节点
+    :param now: 当前时间
+    :return:
+    """
+    if node.node_type == StateCalNodeType.OP:
+        if node.op_type == StateCalOpType.AND:
+            return _in_time_range_by_walk(node.left_child, now) and _in_time_range_by_walk(node.right_child, now)
+        elif node.op_type == StateCalOpType.OR:
+            return _in_time_range_by_walk(node.left_child, now) or _in_time_range_by_walk(node.right_child, now)
+        elif node.op_type == StateCalOpType.NOT:
+            return not _in_time_range_by_walk(node.left_child, now)
+    elif node.node_type == StateCalNodeType.STATE:
+        diff = now - node.state_recorder.last_record_time
+        time_valid = node.state_time_range_min <= diff <= node.state_time_range_max
+        value_valid = True
+        if node.state_value_range_min is not None and node.state_value_range_max is not None:
+            if node.state_recorder.last_value is None:
+                value_valid = False
+            else:
+                value_valid = node.state_value_range_min <= node.state_recorder.last_value <= node.state_value_range_max
+
+        return time_valid and value_valid
+    elif node.node_type == StateCalNodeType.TRUE:
+        return True
+
+    return False
+
+
+def _to_expr_source(node: StateCalNode, namespace: dict[str, Any]) -> str:
+    """
+    将判断树转换成一个python表达式
+    连续的相同运算符会展开成一层 减少括号嵌套
+    状态记录器和区间值都放在命名空间里 表达式只引用变量名
+    :param node: 判断树节点
+    :param namespace: 表达式使用的变量
+    :return: 表达式
+    """
+    if node.node_type == StateCalNodeType.OP:
+        if node.op_type == StateCalOpType.NOT:
+            return f'(not {_to_expr_source(node.left_child, namespace)})'
+
+        # 展开连续的相同运算符 a & (b & c) -> a and b and c
+        operand_list: list[StateCalNode] = []
+        to_visit: list[StateCalNode] = [node]
+        while len(to_visit) > 0:
+            current = to_visit.pop()
+            if current.node_type == StateCalNodeType.OP and current.op_type == node.op_type:
+                to_visit.append(current.right_child)
+                to_visit.append(current.left_child)
+            else:
+                operand_list.append(current)
+
+        joiner = ' and ' if node.op_type == StateCalOpType.AND else ' or '
+        return '(' + joiner.join(_to_expr_source(i, namespace) for i in operand_list) + ')'
+    elif node.node_type == StateCalNodeType.STATE:
+        idx = len(namespace)
+        recorder = f'r{idx}'
+        namespace[recorder] = node.state_recorder
+        namespace[f'tmin{idx}'] = node.state_time_range_min
+        namespace[f'tmax{idx}'] = node.state_time_range_max
+        expr = f'(tmin{idx} <= now - {recorder}.last_record_time <= tmax{idx})'
+        if node.state_value_range_min is not None and node.state_value_range_max is not None:
+            namespace[f'vmin{idx}'] = node.state_value_range_min
+            namespace[f'vmax{idx}'] = node.state_value_range_max
+            expr = (f'({expr[1:-1]} and {recorder}.last_value is not None'
+                    f' and vmin{idx} <= {recorder}.last_value <= vmax{idx})')
+        return expr
+    elif node.node_type == StateCalNodeType.TRUE:
+        return 'True'
+
+    return 'False'
+
+
+def compile_state_cal_tree(node: StateCalNode) -> Callable[[float], bool]:
+    """
+    将判断树编译成一个判断函数
+    整棵树生成一个表达式 判断时只有一次函数调用 并保留 and/or 的短路
+    表达式嵌套过深无法编译时 使用逐个节点递归判断
+    :param node: 判断树根节点
+    :return: 入参为当前时间的判断函数
+    """
+    namespace: dict[str, Any] = {}
+    try:
+        source = _to_expr_source(node, namespace)
+        return eval(f'lambda now: {source}', namespace)
+    except (SyntaxError, RecursionError, MemoryError):
+        log.debug('状态判断树嵌套过深 使用递归判断', exc_info=True)
+        return lambda now: _in_time_range_by_walk(node, now)
@@ -1,7 +1,9 @@
 import time
+from collections import deque
 
 from cv2.typing import MatLike
 
+from one_dragon.base.controller.screen_capture_service import ScreenCaptureService
 from one_dragon.base.geometry.point import Point
 
 
@@ -20,9 +22,27 @@ class ControllerBase:
         """
         基础控制器的定义
         """
-        self.screenshot_history: list[ScreenshotWithTime] = []
+        self.screenshot_history: deque[ScreenshotWithTime] = deque(maxlen=max(max_screenshot_cnt, 0))  # 有上限的环形队列
         self.screenshot_alive_seconds: float = screenshot_alive_seconds  # 截图在内存的存活时间
-        self.max_screenshot_cnt: int = max_screenshot_cnt  # 内存中最多保持的截图数量
+        self._last_raw_screen: MatLike | None = None  # 上一次拿到的原始截图 后台截图没有新的一帧时会再次返回同一张
+
+        self.capture_service: ScreenCaptureService | None = None  # 后台截图服务 开启后截图直接获取最新的一帧
+        self.capture_max_age_seconds: float = 0.5  # 后台截图的最新一帧超过这个时间时 等待新的一帧
+
+    @property
+    def max_screenshot_cnt(self) -> int:
+        """
+        内存中最多保持的截图数量 0 时不保存
+        """
+        return self.screenshot_history.maxlen
+
+    @max_screenshot_cnt.setter
+    def max_screenshot_cnt(self, value: int) -> None:
+        value = max(value, 0)
+        if value == self.screenshot_history.maxlen:
+            return
+        # 只在修改数量时重新创建 截图时不需要分配
+        self.screenshot_history = deque(self.screenshot_history, maxlen=value)
 
     def init_before_context_run(self) -> bool:
         """
@@ -61,22 +81,28 @@ class ControllerBase:
         截图并保存在内存中
         """
         self.before_screenshot()
-        screenshot_time = time.time()
-        screen = self.get_screenshot(independent)
+        if not independent and self.capture_service is not None and self.capture_service.is_running:
+            screenshot_time, screen = self.capture_service.get_latest(self.capture_max_age_seconds)
+        else:
+            screenshot_time = time.time()
+            screen = self.get_screenshot(independent)
         if screen is None:
             return screenshot_time, None
-        fix_screen = self.fill_uid_black(screen)
-
-        if self.max_screenshot_cnt > 0:
-            self.screenshot_history.append(ScreenshotWithTime(fix_screen, screenshot_time))
-            while len(self.screenshot_history) > self.max_screenshot_cnt:
-                self.screenshot_history.pop(0)
-
-            while (len(self.screenshot_history) > 0
-                and screenshot_time - self.screenshot_history[0].create_time > self.screenshot_alive_seconds):
-                self.screenshot_history.pop(0)
-
-        return screenshot_time, fix_screen
+        if screen is self._last_raw_screen:
+            # 后台截图还没有新的一帧 原始截图已经给了之前的调用方 复制一份 避免互相修改
+            screen = screen.copy()
+        else:
+            # 新的一帧归调用方所有 直接在截图上遮挡UID 不需要复制
+            self._last_raw_screen = screen
+            screen = self.fill_uid_black(screen)
+
+        history = self.screenshot_history
+        if history.maxlen > 0:
+            history.append(ScreenshotWithTime(screen, screenshot_time))  # 超过数量时 自动移除最旧的
+            while len(history) > 0 and screenshot_time - history[0].create_time > self.screenshot_alive_seconds:
+                history.popleft()
+
+        return screenshot_time, screen
 
     def before_screenshot(self) -> None:
         """
@@ -84,17 +110,53 @@ class ControllerBase:
         """
         pass
 
-    def get_screenshot(self, independent: bool = False) -> MatLike:
+    def get_screenshot(self, independent: bool = False, dst: MatLike | None = None) -> MatLike:
         """
         截图 如果分辨率和默认不一样则进行缩放
         由子类实现 做具体的截图
+        :param independent: 是否独立截图
+        :param dst: 缩放时可以写入的图片 避免每次分配新的图片
         :return: 缩放到默认分辨率的截图
         """
         pass
 
+    def start_capture_service(self, fps: float, idle_seconds: float = 1) -> None:
+        """
+        开启后台截图 之后的截图直接获取后台最新的一帧
+        已经开启时只更新帧率
+        :param fps: 每秒最多截图的次数
+        :param idle_seconds: 超过这个时间没有截图时暂停后台截图
+        """
+        if self.capture_service is None:
+            self.capture_service = ScreenCaptureService(
+                capture_fn=self._capture_for_service,
+                fps=fps,
+                idle_seconds=idle_seconds,
+            )
+        self.capture_service.fps = fps
+        self.capture_service.idle_seconds = idle_seconds
+        self.capture_service.start()
+
+    def stop_capture_service(self) -> None:
+        """
+        关闭后台截图 之后的截图在调用线程中进行
+        """
+        if self.capture_service is not None:
+            self.capture_service.stop()
+            self.capture_service = None
+
+    def _capture_for_service(self, dst: MatLike | None) -> MatLike | None:
+        """
+        后台截图使用的截图方法
+        :param dst: 可以写入的图片
+        :return: 截图
+        """
+        return self.get_screenshot(dst=dst)
+
     def fill_uid_black(self, screen: MatLike) -> MatLike:
         """
         遮挡UID 由子类实现
+        直接修改传入的截图 需要保留原图时由调用方先复制
         """
         return screen
 
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+import time
+
+from cv2.typing import MatLike
+
+from one_dragon.utils import cv2_utils
+
+
+class FileScreencapper:
+
+    def __init__(
+        self,
+        image_list: list[MatLike],
+        standard_width: int = 1920,
+        standard_height: int = 1080,
+        delay_seconds: float = 0,
+    ):
+        """
+        使用图片代替游戏窗口的截图器 不依赖 Windows 用于在其它系统上运行和测试截图的流程
+        按顺序循环返回图片 尺寸与标准分辨率不一致时缩放 和游戏窗口缩放时的截图一样
+
+        Args:
+            image_list: RGB图片列表
+            standard_width: 标准分辨率宽度
+            standard_height: 标准分辨率高度
+            delay_seconds: 每次截图的额外耗时 用于模拟真实截图的耗时
+        """
+        if len(image_list) == 0:
+            raise ValueError('image_list is empty')
+        self.image_list: list[MatLike] = image_list
+        self.standard_width: int = standard_width
+        self.standard_height: int = standard_height
+        self.delay_seconds: float = delay_seconds
+        self.capture_idx: int = 0  # 下一次截图使用的图片下标
+
+    @classmethod
+    def from_dir(
+        cls,
+        dir_path: str,
+        standard_width: int = 1920,
+        standard_height: int = 1080,
+        delay_seconds: float = 0,
+    ) -> FileScreencapper:
+        """
+        读取文件夹中的图片 按文件名排序
+
+        Args:
+            dir_path: 文件夹路径
+            standard_width: 标准分辨率宽度
+            standard_height: 标准分辨率高度
+            delay_seconds: 每次截图的额外耗时
+
+        Returns:
+            FileScreencapper: 截图器
+        """
+        image_list: list[MatLike] = []
+        for file_name in sorted(os.listdir(dir_path)):
+            if not file_name.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp')):
+                continue
+            image = cv2_utils.read_image(os.path.join(dir_path, file_name))
+            if image is not None:
+                image_list.append(image)
+        return cls(image_list, standard_width, standard_height, delay_seconds)
+
+    def capture(self, dst: MatLike | None = None) -> MatLike:
+        """
+        截图
+
+        Args:
+            dst: 可以写入的图片 尺寸一致时直接写入 避免分配新的图片
+
+        Returns:
+            MatLike: 截图
+        """
+        if self.delay_seconds > 0:
+            time.sleep(self.delay_seconds)
+
+        image = self.image_list[self.capture_idx]
+        self.capture_idx = (self.capture_idx + 1) % len(self.image_list)
+
+        if image.shape[0] == self.standard_height and image.shape[1] == self.standard_width:
+            # 图片列表会重复使用 需要复制
+            if dst is not None and dst.shape == image.shape and dst.dtype == image.dtype:
+                dst[:] = image
+                return dst
+            return image.copy()
+
+        return cv2_utils.resize_to(image, self.standard_width, self.standard_height, dst)
+
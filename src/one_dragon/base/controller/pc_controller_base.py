@@ -83,6 +83,7 @@ class PcControllerBase(ControllerBase):
         清理资源
         """
         self.btn_controller.reset()
+        self.stop_capture_service()
         self.screenshot_controller.cleanup()
 
     def active_window(self) -> None:
@@ -151,12 +152,12 @@ class PcControllerBase(ControllerBase):
         except Exception:
             log.error('关闭游戏失败', exc_info=True)
 
-    def get_screenshot(self, independent: bool = False) -> MatLike | None:
+    def get_screenshot(self, independent: bool = False, dst: MatLike | None = None) -> MatLike | None:
         if self.is_game_window_ready:
             # 确保截图器已初始化
             if not independent and self.screenshot_controller.active_strategy_name is None:
                 self.screenshot_controller.init_screenshot(self.screenshot_method)
-            return self.screenshot_controller.get_screenshot(independent)
+            return self.screenshot_controller.get_screenshot(independent, dst=dst)
         else:
             raise RuntimeError('游戏窗口未就绪')
 
@@ -1,4 +1,3 @@
-import cv2
 from cv2.typing import MatLike
 
 from one_dragon.base.controller.pc_game_window import PcGameWindow
@@ -13,6 +12,7 @@ from one_dragon.base.controller.pc_screenshot.print_window_screencapper import (
 from one_dragon.base.controller.pc_screenshot.screencapper_base import ScreencapperBase
 from one_dragon.base.geometry.rectangle import Rect
 from one_dragon.envs.env_config import ScreenshotMethodEnum
+from one_dragon.utils import cv2_utils
 from one_dragon.utils.log_utils import log
 
 
@@ -37,12 +37,14 @@ class PcScreenshotController:
         }
         self.active_strategy_name: str | None = None
 
-    def get_screenshot(self, independent: bool = False, resize: bool = True) -> MatLike | None:
+    def get_screenshot(self, independent: bool = False, resize: bool = True,
+                       dst: MatLike | None = None) -> MatLike | None:
         """根据初始化的方法获取截图
 
         Args:
             independent: 是否独立截图（不进行初始化，使用临时的截图器）
             resize: 是否缩放到标准分辨率
+            dst: 缩放时可以写入的图片 尺寸一致时直接写入 避免每次分配新的图片
 
         Returns:
             截图数组，失败返回 None
@@ -76,7 +78,7 @@ class PcScreenshotController:
                     self.active_strategy_name = method_name
 
                 if resize and self.game_win.is_win_scale:
-                    result = cv2.resize(result, (self.standard_width, self.standard_height))
+                    result = cv2_utils.resize_to(result, self.standard_width, self.standard_height, dst)
 
                 return result
 
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from types import ModuleType
+
+
+class ReplayClock:
+
+    def __init__(self, start_time: float = 0):
+        """
+        回放使用的时钟 只有调用 sleep 或 advance 时才会前进
+        提供和 time 模块相同的 time sleep perf_counter monotonic 方法
+        可以替换模块中的 time 让指令的等待和超时都使用回放时间 每次运行的结果一致 替换的限制见 patch
+
+        Args:
+            start_time: 开始时间
+        """
+        self._lock = threading.Lock()
+        self._now: float = start_time
+
+    def time(self) -> float:
+        """
+        Returns:
+            float: 当前的回放时间
+        """
+        with self._lock:
+            return self._now
+
+    def perf_counter(self) -> float:
+        return self.time()
+
+    def monotonic(self) -> float:
+        return self.time()
+
+    def sleep(self, seconds: float) -> None:
+        """
+        等待 不会真的等待 只让回放时间前进
+
+        Args:
+            seconds: 等待的秒数
+        """
+        if seconds > 0:
+            self.advance(seconds)
+
+    def advance(self, seconds: float) -> None:
+        """
+        回放时间前进
+
+        Args:
+            seconds: 前进的秒数
+        """
+        with self._lock:
+            self._now += seconds
+
+    def set_time(self, now: float) -> None:
+        """
+        设置回放时间 只能往后设置
+
+        Args:
+            now: 新的回放时间
+        """
+        with self._lock:
+            self._now = max(self._now, now)
+
+    @contextmanager
+    def patch(self, *module_list: ModuleType) -> Iterator[ReplayClock]:
+        """
+        在范围内 把模块中导入的 time 替换成这个时钟
+        替换的是模块的全局变量 所有线程中运行这些模块的代码都会使用回放时间 例如后台截图、自动战斗、条件操作的线程
+        只能在没有其它代码正在运行这些模块时使用 例如离线回放时只运行一个指令 没有运行的模块不受影响
+
+        Args:
+            module_list: 需要替换的模块 模块中需要是 import time 的用法
+
+        Yields:
+            ReplayClock: 时钟本身
+        """
+        patched_list: list[tuple[ModuleType, ModuleType]] = []
+        try:
+            for module in module_list:
+                origin = getattr(module, 'time', None)
+                if not isinstance(origin, ModuleType) or origin.__name__ != 'time':
+                    raise ValueError(f'模块中没有导入 time: {module.__name__}')
+                module.time = self
+                patched_list.append((module, origin))
+            yield self
+        finally:
+            for module, origin in patched_list:
+                module.time = origin
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import os
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from cv2.typing import MatLike
+
+from one_dragon.base.controller.controller_base import ControllerBase
+from one_dragon.base.controller.replay_clock import ReplayClock
+from one_dragon.base.geometry.point import Point
+from one_dragon.utils import cv2_utils
+from one_dragon.utils.latency_stats import LatencyStats
+
+# 调试截图的文件名 {前缀}_{毫秒时间戳}.png
+_FRAME_TIME_PATTERN = re.compile(r'(\d{10,})$')
+
+
+@dataclass(slots=True)
+class ReplayFrame:
+    """录制的一帧截图"""
+
+    screenshot_time: float  # 截图时间 秒
+    image: MatLike  # RGB截图 已经是标准分辨率
+
+
+@dataclass(slots=True)
+class ReplayAction:
+    """回放中发出的一个操作"""
+
+    action_time: float  # 回放时间
+    name: str  # 操作名称
+    args: dict[str, Any] = field(default_factory=dict)  # 操作参数
+
+
+class ReplayController(ControllerBase):
+
+    def __init__(
+        self,
+        frame_list: list[ReplayFrame],
+        clock: ReplayClock | None = None,
+        screenshot_seconds: float = 0.02,
+        on_finished: Callable[[], None] | None = None,
+    ):
+        """
+        离线回放的控制器 不依赖游戏窗口 可以在其它系统上运行
+        - 截图 按回放时间返回录制的截图 即录制中这个时间点游戏画面上的那一帧
+        - 操作 不会真的按键和点击 只记录操作和回放时间
+        - 时间 使用注入的时钟 配合 ReplayClock.patch 每次运行的截图和操作都一致
+
+        Args:
+            frame_list: 录制的截图 按时间排序
+            clock: 回放时钟 不传入时从第一帧的时间开始
+            screenshot_seconds: 每次截图让回放时间前进的秒数 模拟截图的耗时
+            on_finished: 回放时间超过最后一帧后 第一次截图时的回调 可以用于停止运行
+        """
+        ControllerBase.__init__(self)
+        if len(frame_list) == 0:
+            raise ValueError('frame_list is empty')
+        self.frame_list: list[ReplayFrame] = sorted(frame_list, key=lambda i: i.screenshot_time)
+        self.clock: ReplayClock = clock if clock is not None else ReplayClock(self.frame_list[0].screenshot_time)
+        self.screenshot_seconds: float = screenshot_seconds
+        self.on_finished: Callable[[], None] | None = on_finished
+
+        self.frame_idx: int = 0  # 当前回放时间对应的截图下标
+        self.screenshot_cnt: int = 0  # 截图次数
+        self.action_list: list[ReplayAction] = []  # 回放中发出的操作
+
+        # 相邻两次截图之间的真实耗时 即一轮识别和判断的耗时 用于性能对比
+        self.round_latency: LatencyStats = LatencyStats()
+        self._last_screenshot_perf: float | None = None
+        self._finished_notified: bool = False
+
+    @classmethod
+    def from_dir(
+        cls,
+        dir_path: str,
+        frame_interval: float = 0.1,
+        standard_width: int = 1920,
+        standard_height: int = 1080,
+        **kwargs,
+    ) -> ReplayController:
+        """
+        读取文件夹中录制的截图 例如截图助手保存的调试截图
+        文件名以毫秒时间戳结尾时使用文件名的时间 否则按文件名排序 按固定间隔排列
+
+        Args:
+            dir_path: 文件夹路径
+            frame_interval: 文件名没有时间时 每帧的间隔秒数
+            standard_width: 标准分辨率宽度 尺寸不一致时缩放
+            standard_height: 标准分辨率高度
+            kwargs: 其它构造参数
+
+        Returns:
+            ReplayController: 回放控制器
+        """
+        frame_list: list[ReplayFrame] = []
+        for file_name in sorted(os.listdir(dir_path)):
+            name, ext = os.path.splitext(file_name)
+            if ext.lower() not in ('.png', '.jpg', '.jpeg', '.bmp'):
+                continue
+            image = cv2_utils.read_image(os.path.join(dir_path, file_name))
+            if image is None:
+                continue
+            if image.shape[0] != standard_height or image.shape[1] != standard_width:
+                image = cv2_utils.resize_to(image, standard_width, standard_height)
+            match = _FRAME_TIME_PATTERN.search(name)
+            if match is not None:
+                screenshot_time = int(match.group(1)) / 1000
+            else:
+                screenshot_time = len(frame_list) * frame_interval
+            frame_list.append(ReplayFrame(screenshot_time, image))
+        return cls(frame_list, **kwargs)
+
+    @property
+    def is_game_window_ready(self) -> bool:
+        return True
+
+    @property
+    def is_finished(self) -> bool:
+        """
+        回放时间是否已经超过最后一帧
+        """
+        return self.clock.time() > self.frame_list[-1].screenshot_time
+
+    def screenshot(self, independent: bool = False) -> tuple[float, MatLike | None]:
+        """
+        获取回放时间对应的截图 录制的截图已经遮挡了UID
+        每次返回新的副本 调用方可以直接修改
+        """
+        now_perf = time.perf_counter()
+        if self._last_screenshot_perf is not None:
+            self.round_latency.record('轮次', now_perf - self._last_screenshot_perf)
+        self._last_screenshot_perf = now_perf
+
+        self.clock.advance(self.screenshot_seconds)
+        screenshot_time = self.clock.time()
+        while (self.frame_idx + 1 < len(self.frame_list)
+               and self.frame_list[self.frame_idx + 1].screenshot_time <= screenshot_time):
+            self.frame_idx += 1
+        self.screenshot_cnt += 1
+
+        if self.is_finished and not self._finished_notified:
+            self._finished_notified = True
+            if self.on_finished is not None:
+                self.on_finished()
+
+        return screenshot_time, self.frame_list[self.frame_idx].image.copy()
+
+    def get_screenshot(self, independent: bool = False, dst: MatLike | None = None) -> MatLike:
+        return self.screenshot(independent)[1]
+
+    def record_action(self, name: str, **kwargs) -> None:
+        """
+        记录一个操作
+
+        Args:
+            name: 操作名称
+            kwargs: 操作参数
+        """
+        self.action_list.append(ReplayAction(self.clock.time(), name, kwargs))
+
+    def get_action_name_list(self) -> list[str]:
+        """
+        Returns:
+            list[str]: 按顺序的操作名称
+        """
+        return [i.name for i in self.action_list]
+
+    def click(self, pos: Point = None, press_time: float = 0, pc_alt: bool = False, gamepad_key: str | None = None) -> bool:
+        self.record_action('click', pos=pos, press_time=press_time)
+        self.clock.sleep(press_time)
+        return True
+
+    def scroll(self, down: int, pos: Point | None = None):
+        self.record_action('scroll', down=down, pos=pos)
+
+    def drag_to(self, end: Point, start: Point | None = None, duration: float = 0.5):
+        self.record_action('drag_to', end=end, start=start, duration=duration)
+        self.clock.sleep(duration)
+
+    def input_str(self, to_input: str, interval: float = 0.1):
+        self.record_action('input_str', to_input=to_input)
+        self.clock.sleep(interval * len(to_input))
+
+    def delete_all_input(self):
+        self.record_action('delete_all_input')
+
+    def close_game(self):
+        self.record_action('close_game')
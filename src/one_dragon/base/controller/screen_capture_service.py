@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+
+from cv2.typing import MatLike
+
+from one_dragon.thread.cancel_token import CancelToken
+from one_dragon.utils.log_utils import log
+
+
+class ScreenCaptureService:
+
+    def __init__(
+        self,
+        capture_fn: Callable[[MatLike | None], MatLike | None],
+        fps: float = 30,
+        idle_seconds: float = 1,
+        thread_name: str = 'od_screen_capture',
+    ):
+        """
+        后台截图服务 在后台线程中按帧率持续截图 调用方直接获取最新的一帧 不需要等待截图
+
+        截图结果使用双缓冲 最新的一帧和下一帧的写入区域轮流使用
+        - 最新的一帧被取走后 归调用方所有 之后不会再被写入
+        - 没有被取走的帧 会作为之后的写入区域 不需要每次分配新的图片
+
+        超过 idle_seconds 没有调用方获取截图时暂停 下次获取时恢复
+
+        Args:
+            capture_fn: 截图方法 参数为可以写入的图片 可能为None 返回截图 失败时返回None
+            fps: 每秒最多截图的次数
+            idle_seconds: 超过这个时间没有获取截图时暂停
+            thread_name: 线程名称
+        """
+        self.capture_fn: Callable[[MatLike | None], MatLike | None] = capture_fn
+        self.fps: float = fps
+        self.idle_seconds: float = idle_seconds
+        self.thread_name: str = thread_name
+
+        self._condition = threading.Condition()
+        self._front: MatLike | None = None  # 最新的一帧
+        self._front_time: float = 0  # 最新一帧的截图时间 time.time()
+        self._front_taken: bool = False  # 最新的一帧是否已经被取走
+        self._back: MatLike | None = None  # 下一帧可以写入的图片
+        self._frame_seq: int = 0  # 截图的次数 用于等待新的一帧
+
+        self._last_get_time: float = 0  # 上一次获取截图的时间 time.perf_counter()
+        self._last_capture_failed: bool = False  # 上一次截图是否失败
+        self._cancel_token: CancelToken = CancelToken()
+        self._thread: threading.Thread | None = None
+
+        self.capture_cnt: int = 0  # 截图次数
+        self.capture_seconds: float = 0  # 截图累计耗时
+        self.get_cnt: int = 0  # 获取截图的次数
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def is_paused(self) -> bool:
+        """
+        是否因为没有调用方获取截图而暂停
+        """
+        return time.perf_counter() - self._last_get_time > self.idle_seconds
+
+    def start(self) -> None:
+        """
+        开始后台截图
+        """
+        with self._condition:
+            if self.is_running:
+                return
+            self._cancel_token.reset()
+            self._last_get_time = time.perf_counter()
+            self._thread = threading.Thread(target=self._capture_loop, name=self.thread_name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 1) -> None:
+        """
+        停止后台截图 并清空截图
+
+        Args:
+            timeout: 等待线程结束的时间
+        """
+        with self._condition:
+            thread = self._thread
+            self._thread = None
+            self._cancel_token.cancel()
+            self._condition.notify_all()
+
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+        with self._condition:
+            self._front = None
+            self._front_time = 0
+            self._back = None
+
+    def _capture_loop(self) -> None:
+        next_capture_time = time.perf_counter()
+        while not self._cancel_token.cancelled:
+            with self._condition:
+                # 没有调用方时暂停 获取截图时会唤醒
+                while self.is_paused and not self._cancel_token.cancelled:
+                    self._condition.wait()
+                if self._cancel_token.cancelled:
+                    break
+                back = self._back
+                self._back = None
+
+            capture_time = time.time()
+            start = time.perf_counter()
+            try:
+                frame = self.capture_fn(back)
+            except Exception:
+                if not self._last_capture_failed:  # 连续失败时只记录第一次
+                    log.debug('后台截图失败', exc_info=True)
+                frame = None
+            self._last_capture_failed = frame is None
+            self.capture_seconds += time.perf_counter() - start
+            self.capture_cnt += 1
+
+            with self._condition:
+                if frame is None:
+                    self._back = back
+                else:
+                    # 旧的一帧没有被取走 可以作为下一帧的写入区域
+                    if self._front is not None and not self._front_taken and self._front is not frame:
+                        self._back = self._front
+                    elif back is not frame:
+                        self._back = back
+                    self._front = frame
+                    self._front_time = capture_time
+                    self._front_taken = False
+                    self._frame_seq += 1
+                    self._condition.notify_all()
+
+            next_capture_time = max(next_capture_time + 1.0 / self.fps, time.perf_counter())
+            self._cancel_token.sleep_until(next_capture_time)
+
+    def get_latest(self, max_age_seconds: float | None = None, timeout: float = 1) -> tuple[float, MatLike | None]:
+        """
+        获取最新的一帧 取走后这一帧归调用方所有 可以直接修改
+
+        Args:
+            max_age_seconds: 最新一帧超过这个时间时 等待新的一帧 None 时不等待
+            timeout: 等待新的一帧的最长时间
+
+        Returns:
+            tuple[float, MatLike | None]: 截图时间 time.time() 和截图 还没有截图时为None
+        """
+        with self._condition:
+            self.get_cnt += 1
+            was_paused = self.is_paused
+            self._last_get_time = time.perf_counter()
+            if was_paused:
+                self._condition.notify_all()
+
+            need_wait = self._front is None or was_paused
+            if max_age_seconds is not None and time.time() - self._front_time > max_age_seconds:
+                need_wait = True
+            if need_wait and self.is_running:
+                frame_seq = self._frame_seq
+                self._condition.wait_for(lambda: self._frame_seq != frame_seq or not self.is_running, timeout)
+
+            self._front_taken = True
+            return self._front_time, self._front
+
+    def get_avg_capture_ms(self) -> float:
+        """
+        Returns:
+            float: 平均每次截图的耗时 单位毫秒
+        """
+        if self.capture_cnt == 0:
+            return 0
+        return self.capture_seconds * 1000 / self.capture_cnt
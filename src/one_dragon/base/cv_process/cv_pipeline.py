@@ -36,11 +36,15 @@ class CvPipeline:
                 context.success = False
                 break  # 超时则中断后续步骤
 
+            display_before = context.display_image
+            mask_before = context.mask_image
             step_start_time = time.time()
             step.execute(context)
             step_end_time = time.time()
             execution_time_ms = (step_end_time - step_start_time) * 1000
-            context.step_execution_times.append((step.name, execution_time_ms))
+            allocated_bytes = context.get_new_image_bytes(display_before, mask_before)
+            context.total_allocated_bytes += allocated_bytes
+            context.step_execution_times.append((step.name, execution_time_ms, allocated_bytes))
 
         pipeline_end_time = time.time()
         context.total_execution_time = (pipeline_end_time - pipeline_start_time) * 1000
@@ -1,6 +1,7 @@
 # coding: utf-8
 import os
-from typing import List, Dict, Type
+import threading
+from typing import TYPE_CHECKING, List, Dict, Type
 
 import cv2
 import numpy as np
@@ -15,8 +16,11 @@ from one_dragon.base.cv_process.steps import (
     CvStepFilterByCentroidDistance, CvStepOcr, CvStepGrayscale, CvStepHistogramEqualization, CvStepThreshold,
     CvStepCropByArea, CvStepCropToAnnulus, CvTemplateMatchingStep
 )
-from one_dragon.base.operation.one_dragon_context import OneDragonContext
 from one_dragon.utils import os_utils, yaml_utils
+from one_dragon.utils.log_utils import log
+
+if TYPE_CHECKING:
+    from one_dragon.base.operation.one_dragon_context import OneDragonContext
 
 
 class CvService:
@@ -27,12 +31,12 @@ class CvService:
     PIPELINE_DIR: str = os_utils.get_path_under_work_dir('assets', 'image_analysis_pipelines')
     TEMPLATE_DIR: str = os_utils.get_path_under_work_dir('assets', 'image_analysis_templates')
 
-    def __init__(self, od_ctx: OneDragonContext):
+    def __init__(self, od_ctx: 'OneDragonContext'):
         """
         服务初始化
         :param od_ctx: 总上下文
         """
-        self.od_ctx: OneDragonContext = od_ctx
+        self.od_ctx: 'OneDragonContext' = od_ctx
         self.ocr = od_ctx.ocr
         self.template_loader = od_ctx.template_loader
 
@@ -61,6 +65,10 @@ class CvService:
             'OCR识别': CvStepOcr,
         }
 
+        # 已编译的流水线缓存 key=流水线名称 value=(文件修改时间, 流水线)
+        self._pipeline_cache: dict[str, tuple[int, CvPipeline | None]] = {}
+        self._pipeline_cache_lock = threading.Lock()
+
         if not os.path.exists(self.PIPELINE_DIR):
             os.makedirs(self.PIPELINE_DIR)
         if not os.path.exists(self.TEMPLATE_DIR):
@@ -76,7 +84,7 @@ class CvService:
         :param timeout: 允许的执行时间（秒），None表示无限制
         :return: 包含所有结果的上下文
         """
-        pipeline = self.load_pipeline(pipeline_name)
+        pipeline = self.get_pipeline(pipeline_name)
         if pipeline is None:
             ctx = CvPipelineContext(image, service=self, debug_mode=debug_mode, start_time=start_time, timeout=timeout)
             ctx.error_str = f"流水线 {pipeline_name} 加载失败"
@@ -206,6 +214,8 @@ class CvService:
         with open(file_path, 'w', encoding='utf-8') as f:
             yaml.dump(data_to_save, f, allow_unicode=True, sort_keys=False)
 
+        # 同一秒内的多次保存 mtime 可能不变 因此主动失效
+        self.invalidate_pipeline(name)
         return True
 
     def load_pipeline(self, name: str) -> CvPipeline | None:
@@ -237,6 +247,63 @@ class CvService:
         pipeline.steps = new_steps
         return pipeline
 
+    def get_pipeline(self, name: str) -> CvPipeline | None:
+        """
+        获取已编译的流水线 供运行使用
+
+        按 名称+文件修改时间 缓存，文件变化后自动重新加载。
+        返回的实例会被多个调用方共享，不可修改其步骤或参数；需要编辑时使用 load_pipeline。
+
+        Args:
+            name: 流水线名称
+
+        Returns:
+            CvPipeline | None: 流水线 加载失败时返回 None
+        """
+        file_path = os.path.join(self.PIPELINE_DIR, f"{name}.yml")
+        try:
+            mtime = os.stat(file_path).st_mtime_ns
+        except OSError:
+            self.invalidate_pipeline(name)
+            return self.load_pipeline(name)
+
+        cached = self._pipeline_cache.get(name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with self._pipeline_cache_lock:
+            cached = self._pipeline_cache.get(name)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+
+            pipeline = self.load_pipeline(name)
+            self._pipeline_cache[name] = (mtime, pipeline)
+            return pipeline
+
+    def prewarm_pipelines(self, names: list[str]) -> None:
+        """
+        预先加载流水线到缓存 避免第一次运行时才读取文件
+
+        Args:
+            names: 流水线名称列表
+        """
+        for name in names:
+            if self.get_pipeline(name) is None:
+                log.warning(f'预加载流水线失败 {name}')
+
+    def invalidate_pipeline(self, name: str | None = None) -> None:
+        """
+        使流水线缓存失效
+
+        Args:
+            name: 流水线名称 为 None 时清空全部缓存
+        """
+        with self._pipeline_cache_lock:
+            if name is None:
+                self._pipeline_cache.clear()
+            else:
+                self._pipeline_cache.pop(name, None)
+
     def delete_pipeline(self, name: str):
         """
         删除一个流水线文件
@@ -245,6 +312,7 @@ class CvService:
         file_path = os.path.join(self.PIPELINE_DIR, f"{name}.yml")
         if os.path.exists(file_path):
             os.remove(file_path)
+        self.invalidate_pipeline(name)
 
     def rename_pipeline(self, old_name: str, new_name: str):
         """
@@ -260,6 +328,8 @@ class CvService:
 
         if os.path.exists(old_file_path) and not os.path.exists(new_file_path):
             os.rename(old_file_path, new_file_path)
+            self.invalidate_pipeline(old_name)
+            self.invalidate_pipeline(new_name)
 
     def get_template_names(self) -> List[str]:
         """
@@ -18,15 +18,19 @@ class CvPipelineContext:
         self.source_image: np.ndarray = source_image  # 原始输入图像 (只读)
         self.service: 'CvService' = service
         self.debug_mode: bool = debug_mode  # 是否为调试模式
-        self.display_image: np.ndarray = source_image.copy()  # 用于UI显示的主图像，可被修改
+        # 用于UI显示的主图像
+        # 调试模式下复制一份 可随意绘制；非调试模式下直接引用原图 需要修改像素时通过 get_writable_display_image 获取
+        self._display_image: np.ndarray = source_image.copy() if debug_mode else source_image
+        self._display_image_shared: bool = not debug_mode  # display_image 是否与原图共享内存
         self.crop_offset: tuple[int, int] = (0, 0)  # display_image 左上角相对于 source_image 的坐标偏移
         self.mask_image: np.ndarray = None  # 二值掩码图像
         self.contours: List[np.ndarray] = []  # 检测到的轮廓列表
         self.analysis_results: List[str] = []  # 存储分析结果的字符串列表
         self.match_result: MatchResult = None
         self.ocr_result = None  # OcrResult from ocr step
-        self.step_execution_times: list[tuple[str, float]] = []
+        self.step_execution_times: list[tuple[str, float, int]] = []  # (步骤名称, 耗时毫秒, 新分配的图像字节数)
         self.total_execution_time: float = 0.0
+        self.total_allocated_bytes: int = 0  # 所有步骤新分配的图像字节数
         self.error_str: str = None  # 致命错误信息
         self.success: bool = True  # 流水线逻辑是否成功
 
@@ -34,6 +38,56 @@ class CvPipelineContext:
         self.start_time: float = start_time if start_time is not None else time.time()
         self.timeout: float = timeout  # 允许的执行时间（秒），None表示无限制
 
+    @property
+    def display_image(self) -> np.ndarray:
+        """
+        当前用于处理和显示的图像
+        非调试模式下可能是原图的视图 不能直接修改像素
+        """
+        return self._display_image
+
+    @display_image.setter
+    def display_image(self, image: np.ndarray) -> None:
+        """
+        步骤产生了新的图像 之后的修改不会影响原图
+        """
+        self._display_image = image
+        self._display_image_shared = False
+
+    def set_display_image_view(self, image: np.ndarray) -> None:
+        """
+        设置为当前 display_image 的视图 (例如裁剪)
+        不分配内存 是否与原图共享内存的标记保持不变
+        :param image: 当前 display_image 的视图
+        """
+        self._display_image = image
+
+    def get_writable_display_image(self) -> np.ndarray:
+        """
+        获取可以修改像素的 display_image
+        如果当前图像与原图共享内存，才复制一份
+        :return:
+        """
+        if self._display_image_shared:
+            self._display_image = self._display_image.copy()
+            self._display_image_shared = False
+        return self._display_image
+
+    def get_new_image_bytes(self, display_before: np.ndarray | None, mask_before: np.ndarray | None) -> int:
+        """
+        统计步骤执行后新分配的图像字节数 视图不计算在内
+        :param display_before: 步骤执行前的 display_image
+        :param mask_before: 步骤执行前的 mask_image
+        :return:
+        """
+        total = 0
+        for before, after in ((display_before, self._display_image), (mask_before, self.mask_image)):
+            if after is None or after is before:
+                continue
+            if isinstance(after, np.ndarray) and after.base is None:
+                total += after.nbytes
+        return total
+
     @property
     def is_success(self) -> bool:
         """
@@ -226,7 +280,7 @@ class CvStep:
             context.success = False
             return
 
-        context.display_image = cv2_utils.crop_image_only(context.display_image, rect)
+        context.set_display_image_view(cv2_utils.crop_image_only(context.display_image, rect))
 
         # 累加偏移量
         context.crop_offset = (context.crop_offset[0] + rect.x1, context.crop_offset[1] + rect.y1)
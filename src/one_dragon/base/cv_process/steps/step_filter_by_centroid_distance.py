@@ -2,7 +2,6 @@
 from typing import Dict, Any
 import cv2
 import numpy as np
-from scipy.spatial import KDTree
 from one_dragon.base.cv_process.cv_step import CvStep, CvPipelineContext
 
 
@@ -52,7 +51,8 @@ class CvStepFilterByCentroidDistance(CvStep):
             context.analysis_results.append(f"有效轮廓数量不足2，无法过滤")
             return
 
-        # 构建K-D树
+        # 构建K-D树 scipy 导入较慢 用到时再导入
+        from scipy.spatial import KDTree
         kdtree = KDTree(centroids)
 
         # 查找每个点的邻居
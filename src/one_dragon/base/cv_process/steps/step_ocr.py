@@ -78,11 +78,13 @@ class CvStepOcr(CvStep):
             context.success = False
         context.analysis_results.append(f"OCR 识别到 {len(ocr_results)} 个文本项:")
 
-        # 绘制结果
-        display_with_ocr = context.display_image.copy()
+        # 绘制结果 只有调试模式需要复制图像
+        draw = context.debug_mode and draw_text_box
+        display_with_ocr = context.display_image.copy() if draw else None
         for text, match_list in ocr_results.items():
             for match in match_list:
                 context.analysis_results.append(f"  - '{match.data}' (置信度: {match.confidence:.2f}) at {match.rect}")
-                if context.debug_mode and draw_text_box:
+                if draw:
                     cv2.rectangle(display_with_ocr, (match.rect.x1, match.rect.y1), (match.rect.x2, match.rect.y2), (255, 0, 255), 2)
-        context.display_image = display_with_ocr
\ No newline at end of file
+        if draw:
+            context.display_image = display_with_ocr
\ No newline at end of file
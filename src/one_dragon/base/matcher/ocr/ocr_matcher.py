@@ -2,8 +2,10 @@ from collections.abc import Callable
 
 from cv2.typing import MatLike
 
+from one_dragon.base.geometry.point import Point
 from one_dragon.base.geometry.rectangle import Rect
 from one_dragon.base.matcher.match_result import MatchResultList
+from one_dragon.base.matcher.ocr import ocr_utils
 from one_dragon.base.matcher.ocr.ocr_match_result import OcrMatchResult
 
 
@@ -81,6 +83,101 @@ class OcrMatcher:
         """
         raise NotImplementedError('由具体的OCR实现提供')
 
+    def get_batch_canvas_size(self) -> int:
+        """
+        批量识别时 拼接画布的最大边长
+        不超过检测模型的输入边长限制 防止缩放影响识别效果
+
+        Returns:
+            画布最大边长
+        """
+        return 1920
+
+    def _ocr_canvas(
+            self,
+            image: MatLike,
+            threshold: float = 0,
+            merge_line_distance: float = -1,
+    ) -> list[OcrMatchResult]:
+        """
+        对批量识别的拼接画布进行OCR
+        画布上的坐标没有意义 子类可以在这里跳过调试绘制
+
+        Args:
+            image: 拼接画布
+            threshold: 匹配阈值
+            merge_line_distance: 多少行距内合并结果 -1为不合并
+
+        Returns:
+            ocr_result_list: 识别结果列表
+        """
+        return self.ocr(image, threshold, merge_line_distance)
+
+    def ocr_batch(
+            self,
+            image_list: list[MatLike],
+            threshold: float = 0,
+            merge_line_distance: float = -1,
+    ) -> list[list[OcrMatchResult]]:
+        """
+        对多张图片进行OCR
+        将图片拼接到同一张画布上 只需要一次检测 识别的文本框也会在同一批次中处理
+
+        Args:
+            image_list: 图片列表
+            threshold: 匹配阈值
+            merge_line_distance: 多少行距内合并结果 -1为不合并
+
+        Returns:
+            每张图片的识别结果列表 坐标相对于各自的图片
+        """
+        result_list: list[list[OcrMatchResult]] = [[] for _ in image_list]
+        canvas_size = self.get_batch_canvas_size()
+        for canvas, layout in ocr_utils.pack_images_to_canvas(image_list, canvas_size, canvas_size):
+            for ocr_result in self._ocr_canvas(canvas, threshold, merge_line_distance):
+                center = ocr_result.center
+                for idx, rect in layout:
+                    if rect.x1 <= center.x < rect.x2 and rect.y1 <= center.y < rect.y2:
+                        ocr_result.add_offset(Point(-rect.x1, -rect.y1))
+                        result_list[idx].append(ocr_result)
+                        break
+        return result_list
+
+    def recognize_batch(
+            self,
+            image_list: list[MatLike],
+            threshold: float = 0,
+    ) -> list[tuple[str, float]]:
+        """
+        对多张单行文本图片 跳过文本检测直接识别
+        调用方需要保证图片中只有一行文本 且文本基本占满图片
+
+        Args:
+            image_list: 图片列表
+            threshold: 匹配阈值 低于阈值时返回空文本
+
+        Returns:
+            每张图片的 (文本, 置信度)
+        """
+        result_list: list[tuple[str, float]] = []
+        for image in image_list:
+            ocr_result_list = self.ocr(image, threshold)
+            ocr_result_list.sort(key=lambda i: i.x)
+            text = ''.join(i.data for i in ocr_result_list)
+            score = min((i.confidence for i in ocr_result_list), default=0)
+            result_list.append((text, score))
+        return result_list
+
+    def emit_overlay_results(self, ocr_result_list: list[OcrMatchResult]) -> None:
+        """
+        将识别结果绘制到调试浮层 坐标需要是游戏画面的坐标
+        用于批量识别后 按区域补充绘制
+
+        Args:
+            ocr_result_list: 识别结果列表
+        """
+        pass
+
     def crop_and_run_ocr(
             self,
             image: MatLike,
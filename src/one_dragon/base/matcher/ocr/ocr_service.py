@@ -1,4 +1,7 @@
+import hashlib
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 
 import cv2
@@ -14,22 +17,31 @@ from one_dragon.utils.i18_utils import gt
 from one_dragon.utils.log_utils import log
 
 
+@dataclass(frozen=True)
+class OcrCacheKey:
+    """OCR缓存键 相同的识别图像和参数 识别结果一定相同"""
+    image_hash: bytes  # 实际送入OCR的图像内容哈希 (裁剪和颜色过滤后)
+    image_shape: tuple[int, ...]  # 实际送入OCR的图像尺寸
+    offset: tuple[int, int]  # 识别结果的坐标偏移 即裁剪区域的左上角
+    color_range: tuple[tuple[int, ...], ...] | None  # 颜色范围
+    threshold: float  # OCR阈值
+    merge_line_distance: float  # 行合并距离
+    rec_only: bool = False  # 是否跳过文本检测直接识别
+
+
 @dataclass(frozen=True)
 class OcrCacheEntry:
     """OCR缓存条目"""
-    image_id: int  # 图片在内存中的ID
-    image: MatLike  # 将图片也缓存起来 防止旧图片没引用被回收 导致出现新图片ID与旧图片重复
+    key: OcrCacheKey  # 缓存键
     ocr_result_list: list[OcrMatchResult]  # OCR识别结果
     create_time: float  # 创建时间
-    color_range: list[list[int]] | None  # 颜色范围
-    rect: Rect | None = None  # 识别区域
-    crop_first: bool = True  # 先裁剪再识别 用于从连续文本中只提取特定区域的文本
+    size_bytes: int  # 估算的占用内存
 
 
 class OcrService:
     """
     OCR服务
-    - 提供缓存
+    - 提供缓存 按识别区域的图像内容哈希缓存 画面不变时不需要重复识别
     - 提供并发识别 (未实现)
 
     缺点：
@@ -40,7 +52,8 @@ class OcrService:
     def __init__(
         self,
         ocr_matcher: OcrMatcher,
-        max_cache_size: int = 5,
+        max_cache_size: int = 256,
+        max_cache_bytes: int = 1024 * 1024,
     ):
         """
         初始化OCR服务
@@ -48,34 +61,44 @@ class OcrService:
         Args:
             ocr_matcher: OCR匹配器实例
             max_cache_size: 最大缓存条目数
+            max_cache_bytes: 缓存最多占用的内存 (估算)
         """
         self.ocr_matcher = ocr_matcher
-        self.max_cache_size = max_cache_size
+        self.max_cache_size: int = max_cache_size
+        self.max_cache_bytes: int = max_cache_bytes
 
-        # 缓存存储：key=图片ID，value为缓存条目
-        self._cache: dict[int, list[OcrCacheEntry]] = {}
-        self._cache_list: list[OcrCacheEntry] = []
+        # LRU缓存 最近使用的在末尾
+        self._cache: OrderedDict[OcrCacheKey, OcrCacheEntry] = OrderedDict()
+        self._cache_bytes: int = 0
+        self._cache_lock = threading.Lock()
 
-    def _clean_expired_cache(self) -> None:
+        # 缓存统计
+        self.cache_hit_count: int = 0
+        self.cache_miss_count: int = 0
+
+    @staticmethod
+    def _estimate_entry_bytes(ocr_result_list: list[OcrMatchResult]) -> int:
         """
-        清除过期缓存
+        估算一个缓存条目占用的内存
+
+        Args:
+            ocr_result_list: OCR识别结果
+
         Returns:
+            估算的字节数
+        """
+        return 256 + sum(256 + len(i.data or '') * 4 for i in ocr_result_list)
 
+    def _clean_expired_cache(self) -> None:
         """
-        while len(self._cache_list) > self.max_cache_size:
-            oldest_entry = self._cache_list.pop(0)
-            image_id = oldest_entry.image_id
-
-            if image_id in self._cache:
-                # 从与 image_id 关联的列表中移除特定的条目
-                try:
-                    self._cache[image_id].remove(oldest_entry)
-                    # 如果这个 image_id 的列表现在为空，则从字典中移除该键
-                    if not self._cache[image_id]:
-                        self._cache.pop(image_id)
-                except ValueError:
-                    # 在罕见的并发场景下，如果条目已经被移除，可能会发生这种情况，但可以安全地忽略。
-                    pass
+        按LRU淘汰超出数量或内存限制的缓存 调用方需持有锁
+        """
+        while self._cache and (
+            len(self._cache) > self.max_cache_size
+            or self._cache_bytes > self.max_cache_bytes
+        ):
+            _, oldest_entry = self._cache.popitem(last=False)
+            self._cache_bytes -= oldest_entry.size_bytes
 
     def _apply_color_filter(self, image: MatLike, color_range: list[list[int]]) -> MatLike:
         """
@@ -96,40 +119,127 @@ class OcrService:
         mask = cv2.inRange(image, np.array(color_range[0]), np.array(color_range[1]))
         return cv2.cvtColor(mask, cv2.COLOR_GRAY2RGB)
 
-    def _get_ocr_result_list_from_cache(
+    @staticmethod
+    def _hash_image(image: MatLike) -> bytes:
+        """
+        计算图像内容的哈希
+
+        Args:
+            image: 图像
+
+        Returns:
+            哈希值
+        """
+        data = np.ascontiguousarray(image)
+        return hashlib.sha1(memoryview(data).cast('B'), usedforsecurity=False).digest()
+
+    def _get_ocr_result_list_from_cache(self, key: OcrCacheKey) -> OcrCacheEntry | None:
+        """
+        从缓存中获取OCR结果
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存条目
+        """
+        with self._cache_lock:
+            cache_entry = self._cache.get(key)
+            if cache_entry is None:
+                self.cache_miss_count += 1
+                return None
+
+            self._cache.move_to_end(key)
+            self.cache_hit_count += 1
+            return cache_entry
+
+    def _put_ocr_result_list_to_cache(self, key: OcrCacheKey, ocr_result_list: list[OcrMatchResult]) -> None:
+        """
+        存储OCR结果到缓存
+
+        Args:
+            key: 缓存键
+            ocr_result_list: OCR识别结果
+        """
+        cache_entry = OcrCacheEntry(
+            key=key,
+            ocr_result_list=ocr_result_list,
+            create_time=time.time(),
+            size_bytes=self._estimate_entry_bytes(ocr_result_list),
+        )
+        with self._cache_lock:
+            old_entry = self._cache.pop(key, None)
+            if old_entry is not None:
+                self._cache_bytes -= old_entry.size_bytes
+            self._cache[key] = cache_entry
+            self._cache_bytes += cache_entry.size_bytes
+            self._clean_expired_cache()
+
+    def _prepare_ocr_input(
         self,
         image: MatLike,
-        color_range: list[list[int]] | None = None,
-        rect: Rect | None = None,
-        crop_first: bool = True,
-    ) -> OcrCacheEntry | None:
+        color_range: list[list[int]] | None,
+        rect: Rect | None,
+        crop_first: bool,
+        threshold: float,
+        merge_line_distance: float,
+        rec_only: bool = False,
+    ) -> tuple[MatLike, Rect | None, OcrCacheKey]:
         """
-        从缓存中获取OCR结果
+        生成实际送入OCR的图片和缓存键
+
         Args:
             image: 输入图片
             color_range: 颜色范围过滤 [[lower], [upper]]
-            rect: 指定区域。识别结果后，筛选在指定区域中出现的结果，即文本所在的矩形有70%以上在指定区域内
-            crop_first: 先裁剪再识别 用于从连续文本中只提取特定区域的文本
+            rect: 指定区域
+            crop_first: 先裁剪再识别
+            threshold: OCR阈值
+            merge_line_distance: 行合并距离
+            rec_only: 是否跳过文本检测直接识别
 
         Returns:
-            缓存条目
+            送入OCR的图片, 实际裁剪区域 (不裁剪时为None), 缓存键
         """
-        image_id = id(image)
-        cache_list = self._cache.get(image_id)
-        if cache_list is None:
-            return None
-
-        for cache_entry in cache_list:
-            # Python 的列表 == 操作符会自动处理嵌套结构和值的比较 包括None
-            if cache_entry.color_range != color_range:
-                continue
-            if cache_entry.crop_first != crop_first:
-                continue
-            if crop_first and cache_entry.rect != rect:
-                continue
-            return cache_entry
+        # 先裁剪再颜色过滤 只需要处理区域内的像素
+        crop_rect: Rect | None = None
+        if crop_first and rect is not None:
+            to_ocr, crop_rect = cv2_utils.crop_image(image, rect)
+        else:
+            to_ocr = image
+        to_ocr = self._apply_color_filter(to_ocr, color_range)
+
+        key = OcrCacheKey(
+            image_hash=self._hash_image(to_ocr),
+            image_shape=tuple(to_ocr.shape),
+            offset=(0, 0) if crop_rect is None else (crop_rect.x1, crop_rect.y1),
+            color_range=None if color_range is None else tuple(tuple(i) for i in color_range),
+            threshold=threshold,
+            merge_line_distance=merge_line_distance,
+            rec_only=rec_only,
+        )
+        return to_ocr, crop_rect, key
 
-        return None
+    @staticmethod
+    def _filter_by_rect(ocr_result_list: list[OcrMatchResult], rect: Rect | None) -> list[OcrMatchResult]:
+        """
+        过滤出指定区域内的结果 即文本所在的矩形有70%以上在指定区域内
+
+        Args:
+            ocr_result_list: OCR识别结果列表
+            rect: 指定区域 为None时不过滤
+
+        Returns:
+            区域内的识别结果列表
+        """
+        if rect is None:
+            return ocr_result_list
+
+        area_result_list: list[OcrMatchResult] = []
+        for ocr_result in ocr_result_list:
+            # 检查匹配结果是否和指定区域重叠
+            if cal_utils.cal_overlap_percent(ocr_result.rect, rect, base=ocr_result.rect) > 0.7:
+                area_result_list.append(ocr_result)
+
+        return area_result_list
 
     def get_ocr_result_list(
         self,
@@ -154,31 +264,22 @@ class OcrService:
         Returns:
             ocr_result_list: OCR识别结果列表
         """
-        # 生成缓存键
-        image_id = id(image)
-
-        cache_entity = self._get_ocr_result_list_from_cache(
-            image=image,
-            color_range=color_range,
-            rect=rect,
-            crop_first=crop_first,
+        to_ocr, crop_rect, key = self._prepare_ocr_input(
+            image, color_range, rect, crop_first, threshold, merge_line_distance
         )
 
         # 检查缓存
+        cache_entity = self._get_ocr_result_list_from_cache(key)
         if cache_entity is not None:
             ocr_result_list = cache_entity.ocr_result_list
         else:
-            # 应用颜色过滤
-            processed_image = self._apply_color_filter(image, color_range)
-
             # 执行OCR
-            if crop_first and rect is not None:
-                crop_image, crop_rect = cv2_utils.crop_image(processed_image, rect)
+            if crop_rect is not None:
                 bus = getattr(self.ocr_matcher, 'overlay_debug_bus', None)
                 if bus is not None:
                     bus.set_crop_offset(crop_rect.x1, crop_rect.y1)
                 ocr_result_list = self.ocr_matcher.ocr(
-                    crop_image,
+                    to_ocr,
                     threshold,
                     merge_line_distance,
                 )
@@ -187,36 +288,110 @@ class OcrService:
                 for ocr_result in ocr_result_list:
                     ocr_result.add_offset(crop_rect.left_top)
             else:
-                ocr_result_list = self.ocr_matcher.ocr(processed_image, threshold, merge_line_distance)
+                ocr_result_list = self.ocr_matcher.ocr(to_ocr, threshold, merge_line_distance)
 
             # 存储到缓存
-            cache_entry = OcrCacheEntry(
-                ocr_result_list=ocr_result_list,
-                create_time=time.time(),
-                color_range=color_range,
-                image_id=image_id,
-                image=image,
-                rect=rect,
-                crop_first=crop_first,
+            self._put_ocr_result_list_to_cache(key, ocr_result_list)
+
+        return self._filter_by_rect(ocr_result_list, rect)
+
+    def get_ocr_result_batch(
+        self,
+        image: MatLike,
+        region_list: list[tuple[Rect | None, list[list[int]] | None]],
+        threshold: float = 0,
+        merge_line_distance: float = -1,
+    ) -> list[list[OcrMatchResult]]:
+        """
+        同一张截图中 批量识别多个区域
+        每个区域都先裁剪再识别 等同于 crop_first=True 的 get_ocr_result_list
+        未命中缓存的区域会拼接在一起 只进行一次检测
+
+        Args:
+            image: 输入图片
+            region_list: 区域列表 每个元素为 (区域, 颜色范围过滤)
+            threshold: OCR阈值
+            merge_line_distance: 行合并距离
+
+        Returns:
+            每个区域的OCR识别结果列表 顺序与 region_list 一致
+        """
+        result_list: list[list[OcrMatchResult] | None] = [None] * len(region_list)
+
+        to_ocr_list: list[MatLike] = []
+        to_ocr_info_list: list[tuple[int, Rect | None, OcrCacheKey]] = []
+        for idx, (rect, color_range) in enumerate(region_list):
+            to_ocr, crop_rect, key = self._prepare_ocr_input(
+                image, color_range, rect, True, threshold, merge_line_distance
             )
-            if image_id not in self._cache:
-                self._cache[image_id] = []
-            self._cache[image_id].append(cache_entry)
-            self._cache_list.append(cache_entry)
-            self._clean_expired_cache()
+            cache_entity = self._get_ocr_result_list_from_cache(key)
+            if cache_entity is not None:
+                result_list[idx] = cache_entity.ocr_result_list
+            else:
+                to_ocr_list.append(to_ocr)
+                to_ocr_info_list.append((idx, crop_rect, key))
+
+        if len(to_ocr_list) > 0:
+            batch_result_list = self.ocr_matcher.ocr_batch(to_ocr_list, threshold, merge_line_distance)
+            for (idx, crop_rect, key), ocr_result_list in zip(to_ocr_info_list, batch_result_list, strict=True):
+                if crop_rect is not None:
+                    for ocr_result in ocr_result_list:
+                        ocr_result.add_offset(crop_rect.left_top)
+                self.ocr_matcher.emit_overlay_results(ocr_result_list)
+                self._put_ocr_result_list_to_cache(key, ocr_result_list)
+                result_list[idx] = ocr_result_list
+
+        return [
+            self._filter_by_rect(ocr_result_list, rect)
+            for ocr_result_list, (rect, _) in zip(result_list, region_list, strict=True)
+        ]
+
+    def get_rec_result_batch(
+        self,
+        image: MatLike,
+        region_list: list[tuple[Rect, list[list[int]] | None]],
+        threshold: float = 0,
+    ) -> list[list[OcrMatchResult]]:
+        """
+        同一张截图中 批量识别多个固定位置的单行文本区域
+        跳过文本检测 裁剪后直接送入识别模型 所有未命中缓存的区域在同一批次中识别
 
-        if rect is not None:
-            # 过滤出指定区域内的结果
-            area_result_list: list[OcrMatchResult] = []
+        Args:
+            image: 输入图片
+            region_list: 区域列表 每个元素为 (区域, 颜色范围过滤)
+            threshold: OCR阈值
 
-            for ocr_result in ocr_result_list:
-                # 检查匹配结果是否和指定区域重叠
-                if cal_utils.cal_overlap_percent(ocr_result.rect, rect, base=ocr_result.rect) > 0.7:
-                    area_result_list.append(ocr_result)
+        Returns:
+            每个区域的OCR识别结果列表 识别到文本时只有一个覆盖整个区域的结果 顺序与 region_list 一致
+        """
+        result_list: list[list[OcrMatchResult] | None] = [None] * len(region_list)
 
-            return area_result_list
-        else:
-            return ocr_result_list
+        to_ocr_list: list[MatLike] = []
+        to_ocr_info_list: list[tuple[int, Rect, OcrCacheKey]] = []
+        for idx, (rect, color_range) in enumerate(region_list):
+            to_ocr, crop_rect, key = self._prepare_ocr_input(
+                image, color_range, rect, True, threshold, -1, rec_only=True
+            )
+            cache_entity = self._get_ocr_result_list_from_cache(key)
+            if cache_entity is not None:
+                result_list[idx] = cache_entity.ocr_result_list
+            else:
+                to_ocr_list.append(to_ocr)
+                to_ocr_info_list.append((idx, crop_rect, key))
+
+        if len(to_ocr_list) > 0:
+            rec_result_list = self.ocr_matcher.recognize_batch(to_ocr_list, threshold)
+            for (idx, crop_rect, key), (text, score) in zip(to_ocr_info_list, rec_result_list, strict=True):
+                ocr_result_list: list[OcrMatchResult] = []
+                if len(text) > 0:
+                    ocr_result_list.append(OcrMatchResult(
+                        score, crop_rect.x1, crop_rect.y1, crop_rect.width, crop_rect.height, data=text
+                    ))
+                self.ocr_matcher.emit_overlay_results(ocr_result_list)
+                self._put_ocr_result_list_to_cache(key, ocr_result_list)
+                result_list[idx] = ocr_result_list
+
+        return result_list
 
     def get_ocr_result_map(
         self,
@@ -305,5 +480,22 @@ class OcrService:
 
     def clear_cache(self) -> None:
         """清空所有缓存"""
-        self._cache.clear()
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_bytes = 0
         log.debug("OCR缓存已清空")
+
+    def get_cache_stats(self) -> dict[str, int]:
+        """
+        获取缓存统计
+
+        Returns:
+            hit=命中次数 miss=未命中次数 size=条目数 bytes=估算占用内存
+        """
+        with self._cache_lock:
+            return {
+                'hit': self.cache_hit_count,
+                'miss': self.cache_miss_count,
+                'size': len(self._cache),
+                'bytes': self._cache_bytes,
+            }
@@ -1,5 +1,10 @@
 from typing import List, Optional
 
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+from one_dragon.base.geometry.rectangle import Rect
 from one_dragon.base.matcher.match_result import MatchResult, MatchResultList
 from one_dragon.utils import str_utils
 from one_dragon.utils.i18_utils import gt
@@ -128,3 +133,65 @@ def match_word_list_by_priority(
             return word, result
 
     return None, None
+
+
+def pack_images_to_canvas(
+        image_list: list[MatLike],
+        max_width: int,
+        max_height: int,
+        gap: int = 16,
+) -> list[tuple[MatLike, list[tuple[int, Rect]]]]:
+    """
+    将多张小图按行依次拼接到画布上 用于一次检测多个区域
+    单张图片超过画布大小时 单独作为一张画布 不复制
+    :param image_list: 图片列表 RGB或灰度
+    :param max_width: 画布最大宽度
+    :param max_height: 画布最大高度
+    :param gap: 图片之间的间隔 防止相邻区域的文本被检测成同一个文本框
+    :return: 画布列表 每个元素为 (画布, [(图片下标, 图片在画布上的区域)])
+    """
+    canvas_list: list[tuple[MatLike, list[tuple[int, Rect]]]] = []
+
+    # 先计算每张画布上的摆放位置
+    layout_list: list[list[tuple[int, Rect]]] = []
+    current_layout: list[tuple[int, Rect]] = []
+    x, y, row_height = gap, gap, 0
+    for idx, image in enumerate(image_list):
+        h, w = image.shape[:2]
+        if w + gap * 2 > max_width or h + gap * 2 > max_height:
+            canvas_list.append((image, [(idx, Rect(0, 0, w, h))]))
+            continue
+
+        if x + w + gap > max_width:  # 换行
+            x = gap
+            y += row_height + gap
+            row_height = 0
+        if y + h + gap > max_height:  # 换画布
+            layout_list.append(current_layout)
+            current_layout = []
+            x, y, row_height = gap, gap, 0
+
+        current_layout.append((idx, Rect(x, y, x + w, y + h)))
+        x += w + gap
+        row_height = max(row_height, h)
+    if len(current_layout) > 0:
+        layout_list.append(current_layout)
+
+    for layout in layout_list:
+        if len(layout) == 1:  # 只有一张图 不需要拼接
+            idx, rect = layout[0]
+            image = image_list[idx]
+            canvas_list.append((image, [(idx, Rect(0, 0, rect.width, rect.height))]))
+            continue
+
+        canvas_width = max(rect.x2 for _, rect in layout) + gap
+        canvas_height = max(rect.y2 for _, rect in layout) + gap
+        canvas = np.zeros((canvas_height, canvas_width, 3), dtype=np.uint8)
+        for idx, rect in layout:
+            image = image_list[idx]
+            if image.ndim == 2:
+                image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+            canvas[rect.y1:rect.y2, rect.x1:rect.x2] = image
+        canvas_list.append((canvas, layout))
+
+    return canvas_list
@@ -372,6 +372,42 @@ class OnnxOcrMatcher(OcrMatcher, ZipDownloader):
             log.debug('OCR结果 %s 耗时 %.2f', scan_result, time.time() - start_time)
         return img_result[0][0]
 
+    def recognize_batch(
+            self,
+            image_list: list[MatLike],
+            threshold: float = 0,
+    ) -> list[tuple[str, float]]:
+        """
+        对多张单行文本图片 跳过文本检测直接识别 所有图片在同一批次中识别
+
+        Args:
+            image_list: 图片列表
+            threshold: 匹配阈值 低于阈值时返回空文本
+
+        Returns:
+            每张图片的 (文本, 置信度)
+        """
+        if len(image_list) == 0:
+            return []
+        if self._model is None and not self.init_model():
+            return [('', 0) for _ in image_list]
+        start_time = time.time()
+        scan_result: list = self._model.ocr(
+            image_list,
+            det=False,
+            rec=True,
+            cls=self._ocr_param.use_angle_cls
+        )
+        result_list: list[tuple[str, float]] = []
+        for text, score in scan_result[0]:
+            if score < threshold:
+                result_list.append(('', score))
+            else:
+                result_list.append((text, score))
+        if log.isEnabledFor(DEBUG):
+            log.debug('OCR仅识别结果 %s 耗时 %.2f', result_list, time.time() - start_time)
+        return result_list
+
     def match_words(
             self,
             image: MatLike, words: list[str],
@@ -429,6 +465,52 @@ class OnnxOcrMatcher(OcrMatcher, ZipDownloader):
             threshold: 匹配阈值
             merge_line_distance: 多少行距内合并结果 -1为不合并 理论中文情况不会出现过长分行的 这里只是为了兼容英语的情况
 
+        Returns:
+            ocr_result_list: 识别结果列表
+        """
+        return self._ocr(image, threshold, merge_line_distance, emit_vision=True)
+
+    def _ocr_canvas(
+            self,
+            image: MatLike,
+            threshold: float = 0,
+            merge_line_distance: float = -1,
+    ) -> list[OcrMatchResult]:
+        """
+        对批量识别的拼接画布进行OCR 画布坐标不绘制到调试浮层
+
+        Args:
+            image: 拼接画布
+            threshold: 匹配阈值
+            merge_line_distance: 多少行距内合并结果 -1为不合并
+
+        Returns:
+            ocr_result_list: 识别结果列表
+        """
+        return self._ocr(image, threshold, merge_line_distance, emit_vision=False)
+
+    def get_batch_canvas_size(self) -> int:
+        return int(self._ocr_param.det_limit_side_len)
+
+    def emit_overlay_results(self, ocr_result_list: list[OcrMatchResult]) -> None:
+        self._emit_overlay_vision_from_ocr_results(ocr_result_list)
+
+    def _ocr(
+            self,
+            image: MatLike,
+            threshold: float,
+            merge_line_distance: float,
+            emit_vision: bool,
+    ) -> list[OcrMatchResult]:
+        """
+        对图片进行OCR 返回所有识别结果
+
+        Args:
+            image: 图片
+            threshold: 匹配阈值
+            merge_line_distance: 多少行距内合并结果 -1为不合并
+            emit_vision: 是否将识别结果绘制到调试浮层
+
         Returns:
             ocr_result_list: 识别结果列表
         """
@@ -465,7 +547,8 @@ class OnnxOcrMatcher(OcrMatcher, ZipDownloader):
             pass  # TODO
 
         elapsed_ms = (time.time() - start_time) * 1000.0
-        self._emit_overlay_vision_from_ocr_results(ocr_result_list)
+        if emit_vision:
+            self._emit_overlay_vision_from_ocr_results(ocr_result_list)
         self._emit_overlay_perf_and_timeline(elapsed_ms, len(ocr_result_list))
 
         if log.isEnabledFor(DEBUG):
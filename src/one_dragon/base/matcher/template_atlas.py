@@ -0,0 +1,277 @@
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+from numpy.lib.stride_tricks import sliding_window_view
+
+from one_dragon.base.matcher.match_result import MatchResult
+from one_dragon.base.screen.template_info import TemplateInfo
+
+_MIN_VARIANCE_PER_PIXEL: float = 1e-2  # 原图在掩码内每个像素的最小方差 低于这个值视为纯色
+
+
+class _AtlasTemplate:
+
+    def __init__(self, template: TemplateInfo):
+        """
+        原尺寸的模板 预先计算好精确匹配需要的部分
+        """
+        self.template_id: str = template.template_id
+        raw = _to_hwc_float(template.raw)
+        self.height: int = raw.shape[0]
+        self.width: int = raw.shape[1]
+        self.channel: int = raw.shape[2]
+
+        mask = _to_binary_mask(template.mask, raw.shape[:2])
+        self.mask: np.ndarray = mask  # (h, w) 0/1
+        self.mask_multi: np.ndarray = np.repeat(mask[:, :, np.newaxis], self.channel, axis=2)
+        self.mask_cnt: float = float(mask.sum())
+
+        # 掩码内减去均值 与 cv2.TM_CCOEFF_NORMED 使用掩码时的定义一致
+        mean = (raw * self.mask_multi).reshape(-1, self.channel).sum(axis=0) / max(self.mask_cnt, 1)
+        self.centered: np.ndarray = np.ascontiguousarray((raw - mean) * self.mask_multi)
+        self.norm2: float = float((self.centered * self.centered).sum())
+
+
+class _AtlasGroup:
+
+    def __init__(self, small_height: int, small_width: int, template_list: list[tuple[TemplateInfo, np.ndarray, np.ndarray]]):
+        """
+        缩小后尺寸相同的一组模板 拼成矩阵 一次矩阵乘法计算所有模板在所有位置的相关系数
+        """
+        self.small_height: int = small_height
+        self.small_width: int = small_width
+        self.template_id_list: list[str] = [i[0].template_id for i in template_list]
+
+        raw = np.stack([i[1] for i in template_list])  # (k, h, w, c)
+        mask = np.stack([i[2] for i in template_list])  # (k, h, w)
+        k, h, w, c = raw.shape
+        self.channel: int = c
+
+        mask_multi = np.repeat(mask[:, :, :, np.newaxis], c, axis=3)
+        self.mask_cnt: np.ndarray = mask.reshape(k, -1).sum(axis=1)
+        mean = (raw * mask_multi).reshape(k, -1, c).sum(axis=1) / np.maximum(self.mask_cnt, 1)[:, np.newaxis]
+        centered = (raw - mean[:, np.newaxis, np.newaxis, :]) * mask_multi
+
+        self.centered_flat: np.ndarray = centered.reshape(k, -1)  # (k, h*w*c)
+        self.mask_flat: np.ndarray = mask.reshape(k, -1)  # (k, h*w)
+        self.norm2: np.ndarray = (self.centered_flat * self.centered_flat).sum(axis=1)
+
+    def match(self, source_small: np.ndarray, idx_list: list[int]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        计算部分模板在缩小后的原图中的最佳位置
+
+        Args:
+            source_small: 缩小并减去均值后的原图 (h, w, c)
+            idx_list: 需要计算的模板下标
+
+        Returns:
+            每个模板的 最高相关系数, 最佳位置x, 最佳位置y
+        """
+        window = sliding_window_view(source_small, (self.small_height, self.small_width, self.channel))
+        ny, nx = window.shape[0], window.shape[1]
+        window = window.reshape(ny * nx, self.small_height * self.small_width * self.channel)  # 复制成连续内存 (p, h*w*c)
+        # 按通道分开 (c, p, h*w) 每个通道都是连续内存 矩阵乘法才能用上BLAS
+        window_by_channel = np.ascontiguousarray(
+            window.reshape(ny * nx, -1, self.channel).transpose(2, 0, 1)
+        )
+
+        centered = self.centered_flat[idx_list]
+        mask_t = np.ascontiguousarray(self.mask_flat[idx_list].T)
+        mask_cnt = np.maximum(self.mask_cnt[idx_list], 1)
+
+        num = window @ centered.T  # (p, k)
+        sum_i = window_by_channel @ mask_t  # (c, p, k)
+        sum_i2 = (window_by_channel * window_by_channel).sum(axis=0) @ mask_t
+        variance = sum_i2 - (sum_i * sum_i).sum(axis=0) / mask_cnt
+
+        score = _normalize_score(num, variance, mask_cnt, self.norm2[idx_list])
+        best_pos = np.argmax(score, axis=0)
+        best_score = score[best_pos, np.arange(len(idx_list))]
+        return best_score, best_pos % nx, best_pos // nx
+
+
+class TemplateAtlas:
+
+    def __init__(self, template_list: list[TemplateInfo], scale: int = 4):
+        """
+        模板图集 用于在一个小区域中 从大量模板里找到匹配度最高的一个
+        先把所有模板缩小 按尺寸分组拼成矩阵 一次计算出所有模板的粗略匹配度
+        再只对粗略匹配度最高的几个模板 在粗略位置附近按原尺寸计算精确的匹配度
+        匹配度的定义与 cv2.TM_CCOEFF_NORMED 使用掩码时一致
+
+        Args:
+            template_list: 模板列表 需要有原图 掩码可选
+            scale: 粗略匹配时缩小的倍数
+        """
+        self.scale: int = scale
+        self._template_map: dict[str, _AtlasTemplate] = {}
+        self._template_2_group: dict[str, tuple[_AtlasGroup, int]] = {}
+
+        shape_2_list: dict[tuple[int, int], list[tuple[TemplateInfo, np.ndarray, np.ndarray]]] = {}
+        for template in template_list:
+            if template is None or template.raw is None:
+                continue
+            atlas_template = _AtlasTemplate(template)
+            if atlas_template.mask_cnt == 0:
+                continue
+            self._template_map[template.template_id] = atlas_template
+
+            small_size = (max(atlas_template.width // scale, 1), max(atlas_template.height // scale, 1))
+            small_raw = _to_hwc_float(cv2.resize(template.raw, small_size, interpolation=cv2.INTER_AREA))
+            small_mask = (cv2.resize(atlas_template.mask, small_size, interpolation=cv2.INTER_AREA) > 0.5).astype(np.float32)
+            if small_mask.sum() == 0:
+                small_mask[:] = 1
+            shape_2_list.setdefault((small_size[1], small_size[0]), []).append((template, small_raw, small_mask))
+
+        for (small_height, small_width), group_list in shape_2_list.items():
+            group = _AtlasGroup(small_height, small_width, group_list)
+            for idx, template_id in enumerate(group.template_id_list):
+                self._template_2_group[template_id] = (group, idx)
+
+    @property
+    def template_id_list(self) -> list[str]:
+        return list(self._template_map.keys())
+
+    def match_best(
+            self,
+            source: MatLike,
+            template_id_list: list[str] | None = None,
+            threshold: float = 0.8,
+            top_k: int = 3,
+            coarse_margin: float = 0.2,
+    ) -> MatchResult | None:
+        """
+        找到匹配度最高的模板
+
+        Args:
+            source: 原图 通道数需要和模板一致
+            template_id_list: 只在这些模板中匹配 为空时使用全部模板
+            threshold: 匹配阈值
+            top_k: 粗略匹配后 最多对多少个模板进行精确匹配
+            coarse_margin: 粗略匹配度低于 threshold - coarse_margin 的模板不再进行精确匹配
+
+        Returns:
+            MatchResult | None: 匹配结果 data 为模板ID 没有达到阈值的模板时返回None
+        """
+        if template_id_list is None:
+            template_id_list = self.template_id_list
+        template_id_list = [i for i in template_id_list if i in self._template_map]
+        if len(template_id_list) == 0:
+            return None
+
+        source_float = _to_hwc_float(source)
+        source_float -= source_float.reshape(-1, source_float.shape[2]).mean(axis=0)
+
+        candidate_list = self._coarse_match(source, template_id_list)
+        candidate_list.sort(key=lambda i: i[1], reverse=True)
+
+        best: MatchResult | None = None
+        for template_id, coarse_score, small_x, small_y in candidate_list[:top_k]:
+            if coarse_score < threshold - coarse_margin:
+                break
+            result = self._exact_match(source_float, self._template_map[template_id], small_x, small_y)
+            if result is None or result.confidence < threshold:
+                continue
+            if best is None or result.confidence > best.confidence:
+                best = result
+
+        return best
+
+    def _coarse_match(self, source: MatLike, template_id_list: list[str]) -> list[tuple[str, float, int, int]]:
+        """
+        在缩小后的原图中 计算模板的粗略匹配度
+
+        Returns:
+            list[tuple[str, float, int, int]]: 模板ID, 粗略匹配度, 缩小后的位置x, 缩小后的位置y
+        """
+        small_size = (max(source.shape[1] // self.scale, 1), max(source.shape[0] // self.scale, 1))
+        source_small = _to_hwc_float(cv2.resize(source, small_size, interpolation=cv2.INTER_AREA))
+        source_small -= source_small.reshape(-1, source_small.shape[2]).mean(axis=0)
+
+        group_2_idx: dict[int, tuple[_AtlasGroup, list[int]]] = {}
+        for template_id in template_id_list:
+            group, idx = self._template_2_group[template_id]
+            group_2_idx.setdefault(id(group), (group, []))[1].append(idx)
+
+        result_list: list[tuple[str, float, int, int]] = []
+        for group, idx_list in group_2_idx.values():
+            if group.small_height > source_small.shape[0] or group.small_width > source_small.shape[1]:
+                continue
+            score, pos_x, pos_y = group.match(source_small, idx_list)
+            for i, idx in enumerate(idx_list):
+                result_list.append((group.template_id_list[idx], float(score[i]), int(pos_x[i]), int(pos_y[i])))
+
+        return result_list
+
+    def _exact_match(self, source: np.ndarray, template: _AtlasTemplate, small_x: int, small_y: int) -> MatchResult | None:
+        """
+        在粗略位置附近 按原尺寸计算精确的匹配度
+
+        Args:
+            source: 减去均值后的原图 float32
+            template: 模板
+            small_x: 缩小后的位置x
+            small_y: 缩小后的位置y
+
+        Returns:
+            MatchResult | None: 附近最好的匹配结果
+        """
+        source_height, source_width = source.shape[:2]
+        if template.height > source_height or template.width > source_width:
+            return None
+
+        margin = self.scale + 1
+        x1 = min(max(small_x * self.scale - margin, 0), source_width - template.width)
+        y1 = min(max(small_y * self.scale - margin, 0), source_height - template.height)
+        x2 = min(small_x * self.scale + margin, source_width - template.width)
+        y2 = min(small_y * self.scale + margin, source_height - template.height)
+        window = np.ascontiguousarray(source[y1:y2 + template.height, x1:x2 + template.width])
+
+        # 拆成几次不带掩码的相关计算 模板部分都已预先计算
+        num = cv2.matchTemplate(window, template.centered, cv2.TM_CCORR)
+        sum_i2 = cv2.matchTemplate(window * window, template.mask_multi, cv2.TM_CCORR)
+        sum_sq = np.zeros_like(num)
+        for c in range(template.channel):
+            s = cv2.matchTemplate(np.ascontiguousarray(window[:, :, c]), template.mask, cv2.TM_CCORR)
+            sum_sq += s * s
+        variance = sum_i2 - sum_sq / template.mask_cnt
+
+        score = _normalize_score(num, variance, template.mask_cnt, template.norm2)
+        _, max_val, _, max_loc = cv2.minMaxLoc(score)
+        if not np.isfinite(max_val):
+            return None
+
+        return MatchResult(max_val, x1 + max_loc[0], y1 + max_loc[1], template.width, template.height,
+                           data=template.template_id)
+
+
+def _to_hwc_float(image: MatLike) -> np.ndarray:
+    """
+    转化成 (h, w, c) 的 float32
+    """
+    image = image.astype(np.float32)
+    if image.ndim == 2:
+        image = image[:, :, np.newaxis]
+    return image
+
+
+def _to_binary_mask(mask: MatLike | None, shape: tuple[int, int]) -> np.ndarray:
+    """
+    转化成 0/1 的 float32 掩码 没有掩码时全部为1
+    """
+    if mask is None:
+        return np.ones(shape, dtype=np.float32)
+    if mask.ndim == 3:
+        mask = mask[:, :, 0]
+    return (mask > 0).astype(np.float32)
+
+
+def _normalize_score(num: np.ndarray, variance: np.ndarray, mask_cnt, norm2) -> np.ndarray:
+    """
+    相关系数 = 协方差 / 标准差的乘积
+    原图在掩码内几乎是纯色时 浮点误差会让结果失真 这些位置为 -inf
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        score = num / np.sqrt(variance * norm2)
+    score[~np.isfinite(score) | (variance <= _MIN_VARIANCE_PER_PIXEL * mask_cnt)] = -np.inf
+    return score.astype(np.float32, copy=False)
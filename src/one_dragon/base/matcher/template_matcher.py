@@ -3,6 +3,7 @@ from cv2.typing import MatLike
 
 from one_dragon.base.geometry.rectangle import Rect
 from one_dragon.base.matcher.match_result import MatchResult, MatchResultList
+from one_dragon.base.matcher.vision_frame_memo import VisionFrameMemo
 from one_dragon.base.screen.template_info import TemplateInfo
 from one_dragon.base.screen.template_loader import TemplateLoader
 from one_dragon.utils import cv2_utils
@@ -14,6 +15,7 @@ class TemplateMatcher:
     def __init__(self, template_loader: TemplateLoader):
         self.template_loader: TemplateLoader = template_loader
         self.overlay_debug_bus = None
+        self.frame_memo: VisionFrameMemo | None = None  # 同一帧截图内的识别结果记录
 
     def match_template(self, source: MatLike,
                        template_sub_dir: str,
@@ -108,9 +110,9 @@ class TemplateMatcher:
             log.error(f'未加载模板 {template_id}')
             return MatchResultList()
 
-        # 对原图和模板都进行二值化处理
+        # 对原图进行二值化处理 模板的二值化图会缓存
         source_binary = cv2_utils.to_binary(source, threshold=binary_threshold)
-        template_binary = cv2_utils.to_binary(template.raw, threshold=binary_threshold)
+        template_binary = template.get_binary(binary_threshold)
 
         # 处理掩码
         mask_usage: MatLike | None = None
@@ -147,6 +149,12 @@ class TemplateMatcher:
         :param template_id: 模板id
         :param kwargs: 传递给 match_template 的额外参数
         """
+        memo_key = self._get_frame_memo_key('raw', rect, template_sub_dir, template_id, kwargs)
+        if memo_key is not None:
+            result = self.frame_memo.get_template_result(source, memo_key)
+            if result is not None:
+                return result
+
         part = cv2_utils.crop_image_only(source, rect)
         bus = getattr(self, 'overlay_debug_bus', None)
         if bus is not None:
@@ -156,6 +164,9 @@ class TemplateMatcher:
         finally:
             if bus is not None:
                 bus.reset_crop_offset()
+
+        if memo_key is not None:
+            self.frame_memo.put_template_result(source, memo_key, result)
         return result
 
     def crop_and_match_template_binary(
@@ -174,6 +185,12 @@ class TemplateMatcher:
         :param template_id: 模板id
         :param kwargs: 传递给 match_template_binary 的额外参数
         """
+        memo_key = self._get_frame_memo_key('binary', rect, template_sub_dir, template_id, kwargs)
+        if memo_key is not None:
+            result = self.frame_memo.get_template_result(source, memo_key)
+            if result is not None:
+                return result
+
         part = cv2_utils.crop_image_only(source, rect)
         bus = getattr(self, 'overlay_debug_bus', None)
         if bus is not None:
@@ -183,8 +200,37 @@ class TemplateMatcher:
         finally:
             if bus is not None:
                 bus.reset_crop_offset()
+
+        if memo_key is not None:
+            self.frame_memo.put_template_result(source, memo_key, result)
         return result
 
+    def _get_frame_memo_key(
+            self,
+            match_type: str,
+            rect: Rect,
+            template_sub_dir: str,
+            template_id: str,
+            kwargs: dict,
+    ) -> tuple | None:
+        """
+        同一帧截图内 模板匹配结果的记录键
+        :param match_type: 匹配方式
+        :param rect: 裁剪区域
+        :param template_sub_dir: 模板的子文件夹
+        :param template_id: 模板id
+        :param kwargs: 匹配的额外参数 包含掩码等不可哈希的参数时不记录
+        :return: 记录键 不需要记录时返回None
+        """
+        if self.frame_memo is None or rect is None:
+            return None
+        try:
+            kwargs_key = tuple(sorted(kwargs.items()))
+            hash(kwargs_key)
+        except TypeError:
+            return None
+        return match_type, template_sub_dir, template_id, rect.x1, rect.y1, rect.x2, rect.y2, kwargs_key
+
     def _emit_overlay_vision(
         self,
         template_sub_dir: str,
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Hashable
+from typing import Any
+
+from cv2.typing import MatLike
+
+from one_dragon.base.matcher.match_result import MatchResult, MatchResultList
+from one_dragon.utils import cv2_utils
+
+
+def copy_match_result_list(mrl: MatchResultList) -> MatchResultList:
+    """
+    复制匹配结果列表 调用方可能会修改结果的坐标 缓存中需要保留原始结果
+
+    Args:
+        mrl: 匹配结果列表
+
+    Returns:
+        MatchResultList: 复制后的列表
+    """
+    copied = MatchResultList(only_best=mrl.only_best)
+    for mr in mrl.arr:
+        new_mr = MatchResult(mr.confidence, mr.x, mr.y, mr.w, mr.h, template_scale=mr.template_scale, data=mr.data)
+        copied.arr.append(new_mr)
+        if mr is mrl.max:
+            copied.max = new_mr
+    return copied
+
+
+class VisionFrameMemo:
+
+    def __init__(self):
+        """
+        同一帧截图内的识别结果记录
+        一个指令的同一轮中 经常会对同一张截图多次判断相同的区域 这里记录结果避免重复识别
+        只有传入的截图就是当前帧的截图对象时 才会使用记录
+        """
+        self._lock = threading.Lock()
+        self._screen: MatLike | None = None  # 当前帧的截图 持有引用 防止对象id被复用
+        self._area_result: dict[Hashable, Any] = {}  # 区域判断结果
+        self._template_result: dict[Hashable, MatchResultList] = {}  # 模板匹配结果
+        self._frame_signature: MatLike | None = None  # 当前帧的画面特征
+
+        self.area_hit: int = 0  # 区域判断 命中次数
+        self.area_miss: int = 0  # 区域判断 未命中次数
+        self.template_hit: int = 0  # 模板匹配 命中次数
+        self.template_miss: int = 0  # 模板匹配 未命中次数
+        self.round_run: int = 0  # 指令轮次 实际运行次数
+        self.round_skip: int = 0  # 指令轮次 画面没有变化而跳过的次数
+
+    def new_frame(self, screen: MatLike | None) -> None:
+        """
+        开始新的一帧 清除之前的记录
+        截图对象可能被复用 所以每次截图后都需要调用
+
+        Args:
+            screen: 新的截图
+        """
+        with self._lock:
+            self._screen = screen
+            self._area_result.clear()
+            self._template_result.clear()
+            self._frame_signature = None
+
+    def clear(self) -> None:
+        """
+        清除记录
+        """
+        self.new_frame(None)
+
+    def is_current_frame(self, screen: MatLike | None) -> bool:
+        """
+        是否当前帧的截图
+
+        Args:
+            screen: 截图
+
+        Returns:
+            bool: 是否当前帧
+        """
+        return screen is not None and screen is self._screen
+
+    def get_area_result(self, screen: MatLike, key: Hashable) -> Any | None:
+        """
+        获取区域判断结果
+
+        Args:
+            screen: 截图
+            key: 区域的识别内容
+
+        Returns:
+            Any | None: 判断结果 没有记录时返回None
+        """
+        with self._lock:
+            if not self.is_current_frame(screen):
+                return None
+            result = self._area_result.get(key)
+            if result is None:
+                self.area_miss += 1
+            else:
+                self.area_hit += 1
+            return result
+
+    def put_area_result(self, screen: MatLike, key: Hashable, result: Any) -> None:
+        """
+        记录区域判断结果
+
+        Args:
+            screen: 截图
+            key: 区域的识别内容
+            result: 判断结果
+        """
+        with self._lock:
+            if self.is_current_frame(screen):
+                self._area_result[key] = result
+
+    def get_template_result(self, screen: MatLike, key: Hashable) -> MatchResultList | None:
+        """
+        获取模板匹配结果
+
+        Args:
+            screen: 截图
+            key: 模板和区域
+
+        Returns:
+            MatchResultList | None: 匹配结果的副本 没有记录时返回None
+        """
+        with self._lock:
+            if not self.is_current_frame(screen):
+                return None
+            result = self._template_result.get(key)
+            if result is None:
+                self.template_miss += 1
+                return None
+            self.template_hit += 1
+        return copy_match_result_list(result)
+
+    def put_template_result(self, screen: MatLike, key: Hashable, result: MatchResultList) -> None:
+        """
+        记录模板匹配结果
+
+        Args:
+            screen: 截图
+            key: 模板和区域
+            result: 匹配结果
+        """
+        if not self.is_current_frame(screen):
+            return
+        copied = copy_match_result_list(result)
+        with self._lock:
+            if self.is_current_frame(screen):
+                self._template_result[key] = copied
+
+    def get_frame_signature(self, screen: MatLike) -> MatLike:
+        """
+        获取画面特征 当前帧只计算一次
+
+        Args:
+            screen: 截图
+
+        Returns:
+            MatLike: 画面特征
+        """
+        with self._lock:
+            if self.is_current_frame(screen) and self._frame_signature is not None:
+                return self._frame_signature
+        signature = cv2_utils.calc_frame_signature(screen)
+        with self._lock:
+            if self.is_current_frame(screen):
+                self._frame_signature = signature
+        return signature
+
+    def record_round(self, skipped: bool) -> None:
+        """
+        记录指令的一轮运行
+
+        Args:
+            skipped: 是否因为画面没有变化而跳过
+        """
+        with self._lock:
+            if skipped:
+                self.round_skip += 1
+            else:
+                self.round_run += 1
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        获取统计信息
+
+        Returns:
+            dict[str, int]: 命中和未命中次数 命中次数即避免的重复识别次数 以及跳过的指令轮次
+        """
+        with self._lock:
+            return {
+                'area_hit': self.area_hit,
+                'area_miss': self.area_miss,
+                'template_hit': self.template_hit,
+                'template_miss': self.template_miss,
+                'round_run': self.round_run,
+                'round_skip': self.round_skip,
+            }
+
+    def reset_stats(self) -> None:
+        """
+        重置统计信息
+        """
+        with self._lock:
+            self.area_hit = 0
+            self.area_miss = 0
+            self.template_hit = 0
+            self.template_miss = 0
+            self.round_run = 0
+            self.round_skip = 0
@@ -11,6 +11,7 @@ from one_dragon.base.operation.application_run_record import AppRunRecord
 from one_dragon.base.operation.operation import Operation
 from one_dragon.base.operation.operation_base import OperationResult
 from one_dragon.base.operation.operation_notify import send_application_notify
+from one_dragon.utils.log_utils import log
 
 if TYPE_CHECKING:
     from one_dragon.base.operation.one_dragon_context import OneDragonContext
@@ -64,6 +65,7 @@ class Application(Operation):
         运行前初始化
         """
         Operation.handle_init(self)
+        self.ctx.vision_frame_memo.reset_stats()
 
         if self.run_record is not None:
             self.run_record.check_and_update_status()  # 先判断是否重置记录
@@ -96,6 +98,12 @@ class Application(Operation):
         """
         Operation.after_operation_done(self, result)
 
+        memo_stats = self.ctx.vision_frame_memo.get_stats()
+        log.info('%s 同帧识别复用 区域 %d/%d 模板 %d/%d 画面未变化跳过轮次 %d/%d', self.display_name,
+                 memo_stats['area_hit'], memo_stats['area_hit'] + memo_stats['area_miss'],
+                 memo_stats['template_hit'], memo_stats['template_hit'] + memo_stats['template_miss'],
+                 memo_stats['round_skip'], memo_stats['round_skip'] + memo_stats['round_run'])
+
         self._update_record_after_stop(result)
 
         if self.ctx.run_context.is_app_need_notify(self.app_id):
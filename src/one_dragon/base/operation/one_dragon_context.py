@@ -16,6 +16,7 @@ from one_dragon.base.matcher.ocr.ocr_matcher import OcrMatcher
 from one_dragon.base.matcher.ocr.ocr_service import OcrService
 from one_dragon.base.matcher.ocr.onnx_ocr_matcher import OnnxOcrMatcher, OnnxOcrParam
 from one_dragon.base.matcher.template_matcher import TemplateMatcher
+from one_dragon.base.matcher.vision_frame_memo import VisionFrameMemo
 from one_dragon.base.operation.application.application_factory_manager import (
     ApplicationFactoryManager,
 )
@@ -67,6 +68,8 @@ class OneDragonContext(ContextEventBus, OneDragonEnvContext):
         self.template_loader: TemplateLoader = TemplateLoader()
         self.tm: TemplateMatcher = TemplateMatcher(self.template_loader)
         self.tm.overlay_debug_bus = self.overlay_debug_bus
+        self.vision_frame_memo: VisionFrameMemo = VisionFrameMemo()  # 同一帧截图内的识别结果记录
+        self.tm.frame_memo = self.vision_frame_memo
 
         self.ocr: OcrMatcher = OnnxOcrMatcher(
             OnnxOcrParam(
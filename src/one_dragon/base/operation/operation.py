@@ -27,7 +27,7 @@ from one_dragon.base.operation.operation_round_result import (
 from one_dragon.base.screen import screen_utils
 from one_dragon.base.screen.screen_area import ScreenArea
 from one_dragon.base.screen.screen_utils import FindAreaResultEnum, OcrClickResultEnum
-from one_dragon.utils import debug_utils, str_utils
+from one_dragon.utils import cv2_utils, debug_utils, str_utils
 from one_dragon.utils.i18_utils import coalesce_gt, gt
 from one_dragon.utils.log_utils import log
 
@@ -84,6 +84,9 @@ class Operation(OperationBase):
 
     STATUS_TIMEOUT: ClassVar[str] = '执行超时'
     STATUS_SCREEN_UNKNOWN: ClassVar[str] = '未能识别当前画面'
+    FRAME_UNCHANGED_MAX_DIFF: ClassVar[int] = 3  # 画面特征差异不超过这个值时 认为画面没有变化
+    SCREEN_POLL_SECONDS: ClassVar[float] = 0.1  # 等待画面时 截图判断的间隔
+    SCREEN_STABLE_POLL_CNT: ClassVar[int] = 3  # 等待画面时 连续多少次截图没有变化 认为画面已经稳定
 
     def __init__(
             self,
@@ -183,6 +186,18 @@ class Operation(OperationBase):
         self.node_status: dict[str, NodeStateProxy] = {}
         """已保存节点状态的字典"""
 
+        self._round_wait: dict[str, Any] = {}
+        """本轮结束时的等待参数"""
+
+        self._reusable_round_result: OperationRoundResult | None = None
+        """当前节点可以沿用的上一轮结果 只有画面没有变化时才沿用"""
+
+        self._reusable_round_signature: MatLike | None = None
+        """可以沿用的结果对应的画面特征"""
+
+        self._reusable_round_wait: dict[str, Any] = {}
+        """可以沿用的结果对应的等待参数 沿用时同样等待 保持原来的轮次节奏"""
+
     def _init_before_execute(self):
         """在操作开始前初始化执行状态。
 
@@ -207,6 +222,7 @@ class Operation(OperationBase):
         self._current_node_start_time = now
         self._previous_round_result = None
         self.node_status.clear()
+        self._clear_reusable_round()
 
         # 监听事件
         self.ctx.run_context.event_bus.unlisten_all_event(self)
@@ -509,7 +525,28 @@ class Operation(OperationBase):
         if self._current_node.op_method is not None:
             if self._current_node.screenshot_before_round:
                 self.screenshot()
+            signature: MatLike | None = None
+            if (self._current_node.skip_if_screen_unchanged
+                    and self._current_node.screenshot_before_round
+                    and self.last_screenshot is not None):
+                signature = self.ctx.vision_frame_memo.get_frame_signature(self.last_screenshot)
+                reused_round_result = self._reuse_round_result(signature)
+                if reused_round_result is not None:
+                    self.ctx.vision_frame_memo.record_round(skipped=True)
+                    return reused_round_result
+
+            self.ctx.vision_frame_memo.record_round(skipped=False)
+            self._round_wait = {}
+            node_clicked = self.node_clicked
             current_round_result: OperationRoundResult = self._current_node.op_method(self)
+            if signature is not None:
+                if (current_round_result.result in (OperationRoundResultEnum.WAIT, OperationRoundResultEnum.RETRY)
+                        and self.node_clicked == node_clicked):  # 本轮有点击时 画面可能还没来得及变化 不沿用
+                    self._reusable_round_result = current_round_result
+                    self._reusable_round_signature = signature
+                    self._reusable_round_wait = self._round_wait
+                else:
+                    self._clear_reusable_round()
         elif self._current_node.op is not None:
             op_result = self._current_node.op.execute()
             current_round_result = self.round_by_op_result(op_result,
@@ -526,6 +563,34 @@ class Operation(OperationBase):
 
         return current_round_result
 
+    def _reuse_round_result(self, signature: MatLike) -> OperationRoundResult | None:
+        """画面和上次运行节点时相比没有变化时 沿用上次的结果。
+
+        与上次实际运行时的画面比较 而不是与上一帧比较 避免缓慢的变化被逐帧忽略。
+
+        Args:
+            signature: 当前截图的画面特征。
+
+        Returns:
+            OperationRoundResult | None: 沿用的结果 画面有变化时返回None。
+        """
+        if self._reusable_round_result is None or self._reusable_round_signature is None:
+            return None
+        diff = cv2_utils.frame_signature_diff(signature, self._reusable_round_signature)
+        if diff > Operation.FRAME_UNCHANGED_MAX_DIFF:
+            return None
+
+        self._after_round_wait(**self._reusable_round_wait)
+        previous = self._reusable_round_result
+        # 返回新的对象 重试超过次数时主循环会修改结果
+        return OperationRoundResult(result=previous.result, status=previous.status, data=previous.data)
+
+    def _clear_reusable_round(self) -> None:
+        """清除可以沿用的轮次结果。"""
+        self._reusable_round_result = None
+        self._reusable_round_signature = None
+        self._reusable_round_wait = {}
+
     def _get_next_node(self, current_round_result: OperationRoundResult):
         """根据当前轮结果找到下一个节点。
 
@@ -574,6 +639,7 @@ class Operation(OperationBase):
         self.node_retry_times = 0  # 每个节点都可以重试
         self._current_node_start_time = time.time()  # 每个节点单独计算耗时
         self.node_clicked = False  # 重置节点点击
+        self._clear_reusable_round()  # 上一个节点的结果不能沿用
 
     def _on_pause(self, e=None):
         """操作暂停时触发的回调。
@@ -638,6 +704,7 @@ class Operation(OperationBase):
             np.ndarray: 截图图像。
         """
         self.last_screenshot_time, self.last_screenshot = self.ctx.controller.screenshot()
+        self.ctx.vision_frame_memo.new_frame(self.last_screenshot)
         return self.last_screenshot
 
     def save_screenshot(self, prefix: str | None = None) -> str:
@@ -775,7 +842,9 @@ class Operation(OperationBase):
         )
 
     def round_success(self, status: str | None = None, data: Any = None,
-                      wait: float | None = None, wait_round_time: float | None = None) -> OperationRoundResult:
+                      wait: float | None = None, wait_round_time: float | None = None,
+                      wait_until_stable: bool = False,
+                      wait_until_area: tuple[str, str] | None = None) -> OperationRoundResult:
         """创建成功的轮次结果。
 
         Args:
@@ -783,15 +852,20 @@ class Operation(OperationBase):
             data: 可选返回数据。默认为None。
             wait: 等待时间（秒）。默认为None。
             wait_round_time: 等待直到轮次时间达到此值，如果设置了wait则忽略。默认为None。
+            wait_until_stable: 等待时画面变化后稳定下来就提前结束 等待时间变为最长等待时间。默认为False。
+            wait_until_area: 等待时出现此区域 (画面名称, 区域名称) 就提前结束。默认为None。
 
         Returns:
             OperationRoundResult: 具有指定参数的成功结果。
         """
-        self._after_round_wait(wait=wait, wait_round_time=wait_round_time)
+        self._after_round_wait(wait=wait, wait_round_time=wait_round_time,
+                               wait_until_stable=wait_until_stable, wait_until_area=wait_until_area)
         return OperationRoundResult(result=OperationRoundResultEnum.SUCCESS, status=status, data=data)
 
     def round_wait(self, status: str | None = None, data: Any = None,
-                   wait: float | None = None, wait_round_time: float | None = None) -> OperationRoundResult:
+                   wait: float | None = None, wait_round_time: float | None = None,
+                   wait_until_stable: bool = False,
+                   wait_until_area: tuple[str, str] | None = None) -> OperationRoundResult:
         """创建等待的轮次结果。
 
         Args:
@@ -799,15 +873,20 @@ class Operation(OperationBase):
             data: 可选返回数据。默认为None。
             wait: 等待时间（秒）。默认为None。
             wait_round_time: 等待直到轮次时间达到此值，如果设置了wait则忽略。默认为None。
+            wait_until_stable: 等待时画面变化后稳定下来就提前结束 等待时间变为最长等待时间。默认为False。
+            wait_until_area: 等待时出现此区域 (画面名称, 区域名称) 就提前结束。默认为None。
 
         Returns:
             OperationRoundResult: 具有指定参数的等待结果。
         """
-        self._after_round_wait(wait=wait, wait_round_time=wait_round_time)
+        self._after_round_wait(wait=wait, wait_round_time=wait_round_time,
+                               wait_until_stable=wait_until_stable, wait_until_area=wait_until_area)
         return OperationRoundResult(result=OperationRoundResultEnum.WAIT, status=status, data=data)
 
     def round_retry(self, status: str | None = None, data: Any = None,
-                    wait: float | None = None, wait_round_time: float | None = None) -> OperationRoundResult:
+                    wait: float | None = None, wait_round_time: float | None = None,
+                    wait_until_stable: bool = False,
+                    wait_until_area: tuple[str, str] | None = None) -> OperationRoundResult:
         """创建重试的轮次结果。
 
         Args:
@@ -815,15 +894,20 @@ class Operation(OperationBase):
             data: 可选返回数据。默认为None。
             wait: 等待时间（秒）。默认为None。
             wait_round_time: 等待直到轮次时间达到此值，如果设置了wait则忽略。默认为None。
+            wait_until_stable: 等待时画面变化后稳定下来就提前结束 等待时间变为最长等待时间。默认为False。
+            wait_until_area: 等待时出现此区域 (画面名称, 区域名称) 就提前结束。默认为None。
 
         Returns:
             OperationRoundResult: 具有指定参数的重试结果。
         """
-        self._after_round_wait(wait=wait, wait_round_time=wait_round_time)
+        self._after_round_wait(wait=wait, wait_round_time=wait_round_time,
+                               wait_until_stable=wait_until_stable, wait_until_area=wait_until_area)
         return OperationRoundResult(result=OperationRoundResultEnum.RETRY, status=status, data=data)
 
     def round_fail(self, status: str | None = None, data: Any = None,
-                   wait: float | None = None, wait_round_time: float | None = None) -> OperationRoundResult:
+                   wait: float | None = None, wait_round_time: float | None = None,
+                   wait_until_stable: bool = False,
+                   wait_until_area: tuple[str, str] | None = None) -> OperationRoundResult:
         """创建失败的轮次结果。
 
         Args:
@@ -831,26 +915,100 @@ class Operation(OperationBase):
             data: 可选返回数据。默认为None。
             wait: 等待时间（秒）。默认为None。
             wait_round_time: 等待直到轮次时间达到此值，如果设置了wait则忽略。默认为None。
+            wait_until_stable: 等待时画面变化后稳定下来就提前结束 等待时间变为最长等待时间。默认为False。
+            wait_until_area: 等待时出现此区域 (画面名称, 区域名称) 就提前结束。默认为None。
 
         Returns:
             OperationRoundResult: 具有指定参数的失败结果。
         """
-        self._after_round_wait(wait=wait, wait_round_time=wait_round_time)
+        self._after_round_wait(wait=wait, wait_round_time=wait_round_time,
+                               wait_until_stable=wait_until_stable, wait_until_area=wait_until_area)
         return OperationRoundResult(result=OperationRoundResultEnum.FAIL, status=status, data=data)
 
-    def _after_round_wait(self, wait: float | None = None, wait_round_time: float | None = None):
+    def _after_round_wait(self, wait: float | None = None, wait_round_time: float | None = None,
+                          wait_until_stable: bool = False, wait_until_area: tuple[str, str] | None = None):
         """每轮操作后的等待。
 
         Args:
             wait: 等待时间（秒）。默认为None。
             wait_round_time: 等待直到轮次时间达到此值，如果设置了wait则忽略。默认为None。
+            wait_until_stable: 画面变化后稳定下来就提前结束等待。默认为False。
+            wait_until_area: 出现此区域 (画面名称, 区域名称) 就提前结束等待。默认为None。
         """
+        self._round_wait = {
+            'wait': wait,
+            'wait_round_time': wait_round_time,
+            'wait_until_stable': wait_until_stable,
+            'wait_until_area': wait_until_area,
+        }
+        to_wait: float = 0
         if wait is not None and wait > 0:
-            time.sleep(wait)
+            to_wait = wait
         elif wait_round_time is not None and wait_round_time > 0:
             to_wait = wait_round_time - (time.time() - self.round_start_time)
-            if to_wait > 0:
-                time.sleep(to_wait)
+        if to_wait <= 0:
+            return
+
+        if wait_until_stable or wait_until_area is not None:
+            self.wait_for_screen(to_wait, until_stable=wait_until_stable, until_area=wait_until_area)
+        else:
+            time.sleep(to_wait)
+
+    def wait_for_screen(self, max_wait: float, until_stable: bool = False,
+                        until_area: tuple[str, str] | None = None, require_change: bool = True) -> bool:
+        """等待画面 最多等待 max_wait 秒 画面稳定或者出现指定区域时提前结束。
+
+        用于代替等待动画或画面切换的固定等待 每隔一段时间截图 只计算画面特征 开销很小。
+        固定等待需要按最慢的机器设置 较快的机器可以提前进入下一轮。
+
+        Args:
+            max_wait: 最长等待时间（秒）。
+            until_stable: 画面连续多次截图没有变化时 认为已经稳定 提前结束。
+            until_area: 出现此区域 (画面名称, 区域名称) 时提前结束。
+            require_change: 画面需要先和等待前的截图不同 才判断是否稳定。
+                点击之后的等待需要 避免画面还没开始变化就结束等待。
+
+        Returns:
+            bool: 是否提前结束 等待到最长时间时返回False。
+        """
+        memo = self.ctx.vision_frame_memo
+        deadline = time.time() + max_wait
+        base_signature: MatLike | None = None
+        if require_change and self.last_screenshot is not None:
+            base_signature = memo.get_frame_signature(self.last_screenshot)
+        changed: bool = not require_change
+        last_signature: MatLike | None = None
+        stable_cnt: int = 0
+
+        while True:
+            to_wait = deadline - time.time()
+            if to_wait <= 0:
+                return False
+            time.sleep(min(to_wait, Operation.SCREEN_POLL_SECONDS))
+
+            screen = self.screenshot()
+            if screen is None:
+                continue
+            if until_area is not None:
+                if screen_utils.find_area(self.ctx, screen, until_area[0], until_area[1]) == FindAreaResultEnum.TRUE:
+                    return True
+            if not until_stable:
+                continue
+
+            signature = memo.get_frame_signature(screen)
+            if base_signature is None:
+                base_signature = signature
+            elif not changed and cv2_utils.frame_signature_diff(signature, base_signature) > Operation.FRAME_UNCHANGED_MAX_DIFF:
+                changed = True
+
+            if last_signature is not None and cv2_utils.frame_signature_diff(signature, last_signature) <= Operation.FRAME_UNCHANGED_MAX_DIFF:
+                stable_cnt += 1
+            else:
+                stable_cnt = 0
+            last_signature = signature
+
+            if changed and stable_cnt >= Operation.SCREEN_STABLE_POLL_CNT:
+                return True
 
     def round_by_op_result(self, op_result: OperationResult, status: str | None = None, retry_on_fail: bool = False,
                            wait: float | None = None, wait_round_time: float | None = None) -> OperationRoundResult:
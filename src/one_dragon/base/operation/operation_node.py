@@ -19,6 +19,7 @@ class OperationNode:
             mute: bool = False,
             screenshot_before_round: bool = True,
             save_status: bool = False,
+            skip_if_screen_unchanged: bool = False,
     ):
         """
 
@@ -34,6 +35,7 @@ class OperationNode:
             mute: 是否不显示当前节点的结果日志
             screenshot_before_round: 当前节点每次运行前是否自动截图
             save_status: 是否保存当前状态到列表中
+            skip_if_screen_unchanged: 画面没有变化时是否跳过运行 直接沿用上一轮的等待或重试结果
         """
 
         self.cn: str = cn
@@ -69,6 +71,9 @@ class OperationNode:
         self.save_status: bool = save_status
         """是否保存当前状态到列表中"""
 
+        self.skip_if_screen_unchanged: bool = skip_if_screen_unchanged
+        """画面没有变化时是否跳过运行 只适用于结果完全由截图决定的节点 需要运行前自动截图"""
+
 def operation_node(
         name: str,
         retry_on_op_fail: bool = False,
@@ -79,6 +84,7 @@ def operation_node(
         mute: bool = False,
         screenshot_before_round: bool = True,
         save_status: bool = False,
+        skip_if_screen_unchanged: bool = False,
 ):
     def decorator(func):
         # 直接将 node 对象作为函数的一个属性附加到函数上
@@ -93,6 +99,7 @@ def operation_node(
             mute=mute,
             screenshot_before_round=screenshot_before_round,
             save_status=save_status,
+            skip_if_screen_unchanged=skip_if_screen_unchanged,
         )
         setattr(func, 'operation_node_annotation', node)
         return func
@@ -4,6 +4,7 @@ import yaml
 
 from one_dragon.base.screen.screen_area import ScreenArea
 from one_dragon.base.screen.screen_info import ScreenInfo
+from one_dragon.base.screen.screen_match_index import ScreenMatchIndex
 from one_dragon.utils import os_utils, yaml_utils
 from one_dragon.utils.log_utils import log
 
@@ -52,6 +53,7 @@ class ScreenContext:
         self._extra_screen_ids: set[str] = set()
         self._extra_screen_file_path_map: dict[str, Path] = {}
         self.screen_route_map: dict[str, dict[str, ScreenRoute]] = {}
+        self._screen_match_index: ScreenMatchIndex | None = None  # 画面识别索引 使用时再构建
 
         self.last_screen_name: str | None = None  # 上一个画面名字
         self.current_screen_name: str | None = None  # 当前的画面名字
@@ -83,6 +85,7 @@ class ScreenContext:
         self.screen_info_list.clear()
         self.screen_info_map.clear()
         self._screen_area_map.clear()
+        self._screen_match_index = None
         if not from_memory:
             self._extra_screen_ids.clear()
             self._extra_screen_file_path_map.clear()
@@ -208,6 +211,7 @@ class ScreenContext:
             added = True
 
         if added:
+            self._screen_match_index = None
             self.init_screen_route()
             self._global_screen_names = {
                 s.screen_name for s in self.screen_info_list if not s.app_id
@@ -233,6 +237,17 @@ class ScreenContext:
         else:
             return screen
 
+    @property
+    def screen_match_index(self) -> ScreenMatchIndex:
+        """
+        画面识别索引 画面配置变化后重新构建
+        """
+        index = self._screen_match_index
+        if index is None:
+            index = ScreenMatchIndex(self.screen_info_list)
+            self._screen_match_index = index
+        return index
+
     def get_area(self, screen_name: str, area_name: str) -> ScreenArea:
         """
         获取某个区域的信息
@@ -340,73 +355,61 @@ class ScreenContext:
 
     def init_screen_route(self) -> None:
         """
-        初始化画面间的跳转路径
+        重置画面间的跳转路径 路径在使用时再按出发画面计算
         :return:
         """
-        self.screen_route_map.clear()
-
-        # 先对任意两个画面之间做初始化
-        for screen_1 in self.screen_info_list:
-            self.screen_route_map[screen_1.screen_name] = {}
-            for screen_2 in self.screen_info_list:
-                self.screen_route_map[screen_1.screen_name][screen_2.screen_name] = ScreenRoute(
-                    from_screen=screen_1.screen_name,
-                    to_screen=screen_2.screen_name
-                )
-
-        # 根据画面的goto_list来初始化边
-        for screen_info in self.screen_info_list:
+        self.screen_route_map = {}
+
+    def _cal_screen_route_from(self, from_screen: str) -> dict[str, ScreenRoute]:
+        """
+        从出发画面开始广度优先搜索 计算到其它所有画面的最短跳转路径
+        :param from_screen: 出发画面
+        :return: 目标画面 -> 跳转路径 无法到达的画面路径为空
+        """
+        route_map: dict[str, ScreenRoute] = {
+            screen_info.screen_name: ScreenRoute(from_screen=from_screen, to_screen=screen_info.screen_name)
+            for screen_info in self.screen_info_list
+        }
+
+        # 记录到达每个画面的最后一步
+        prev_node_map: dict[str, ScreenRouteNode] = {}
+        bfs_list: list[str] = [from_screen]
+        bfs_idx = 0
+        while bfs_idx < len(bfs_list):
+            current_screen_name = bfs_list[bfs_idx]
+            bfs_idx += 1
+
+            screen_info = self.screen_info_map.get(current_screen_name)
+            if screen_info is None:
+                continue
             for area in screen_info.area_list:
                 if area.goto_list is None or len(area.goto_list) == 0:
                     continue
-                from_screen_route = self.screen_route_map[screen_info.screen_name]
-                if from_screen_route is None:
-                    log.error('画面路径没有初始化 %s', screen_info.screen_name)
-                    continue
                 for goto_screen_name in area.goto_list:
-                    if goto_screen_name not in from_screen_route:
-                        log.error('画面路径 %s -> %s 无法找到目标画面', screen_info.screen_name, goto_screen_name)
+                    if goto_screen_name not in route_map:
+                        log.error('画面路径 %s -> %s 无法找到目标画面', current_screen_name, goto_screen_name)
                         continue
-                    from_screen_route[goto_screen_name].node_list.append(
-                        ScreenRouteNode(
-                            from_screen=screen_info.screen_name,
-                            from_area=area.area_name,
-                            to_screen=goto_screen_name
-                        )
-                    )
-
-        # Floyd算出任意两个画面之间的路径
-        screen_len = len(self.screen_info_list)
-        for k in range(screen_len):
-            screen_k = self.screen_info_list[k]
-            for i in range(screen_len):
-                if i == k:
-                    continue
-                screen_i = self.screen_info_list[i]
-
-                route_ik: ScreenRoute = self.screen_route_map[screen_i.screen_name][screen_k.screen_name]
-                if not route_ik.can_go:  # 无法从 i 到 k
-                    continue
-
-                for j in range(screen_len):
-                    if k == j or i == j:
-                        continue
-                    screen_j = self.screen_info_list[j]
-
-                    route_kj: ScreenRoute = self.screen_route_map[screen_k.screen_name][screen_j.screen_name]
-                    if not route_kj.can_go:  # 无法从 k 到 j
+                    if goto_screen_name == from_screen or goto_screen_name in prev_node_map:
                         continue
+                    prev_node_map[goto_screen_name] = ScreenRouteNode(
+                        from_screen=current_screen_name,
+                        from_area=area.area_name,
+                        to_screen=goto_screen_name
+                    )
+                    bfs_list.append(goto_screen_name)
 
-                    route_ij: ScreenRoute = self.screen_route_map[screen_i.screen_name][screen_j.screen_name]
+        # 从目标画面往回 还原路径
+        for to_screen_name, route in route_map.items():
+            node_list: list[ScreenRouteNode] = []
+            current_screen_name = to_screen_name
+            while current_screen_name in prev_node_map:
+                node = prev_node_map[current_screen_name]
+                node_list.append(node)
+                current_screen_name = node.from_screen
+            node_list.reverse()
+            route.node_list = node_list
 
-                    if (not route_ij.can_go  # 当前无法从 i 到 j
-                        or len(route_ik.node_list) + len(route_kj.node_list) < len(route_ij.node_list)  # 新的更短
-                    ):
-                        route_ij.node_list = []
-                        for node_ik in route_ik.node_list:
-                            route_ij.node_list.append(node_ik)
-                        for node_kj in route_kj.node_list:
-                            route_ij.node_list.append(node_kj)
+        return route_map
 
     def get_screen_route(self, from_screen: str, to_screen: str) -> ScreenRoute | None:
         """
@@ -417,7 +420,10 @@ class ScreenContext:
         """
         from_route = self.screen_route_map.get(from_screen, None)
         if from_route is None:
-            return None
+            if from_screen not in self.screen_info_map:
+                return None
+            from_route = self._cal_screen_route_from(from_screen)
+            self.screen_route_map[from_screen] = from_route
         return from_route.get(to_screen, None)
 
     def update_current_screen_name(self, screen_name: str) -> None:
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from one_dragon.base.screen.screen_area import ScreenArea
+from one_dragon.base.screen.screen_info import ScreenInfo
+
+# 标识区域的识别内容 相同内容的区域在同一帧中结果一定相同
+ScreenAreaKey = tuple
+
+
+def get_area_key(area: ScreenArea) -> ScreenAreaKey:
+    """
+    标识区域的识别内容 不包含区域名称和跳转等信息
+
+    Args:
+        area: 区域
+
+    Returns:
+        ScreenAreaKey: 可哈希的识别内容
+    """
+    return (
+        area.pc_rect.x1, area.pc_rect.y1, area.pc_rect.x2, area.pc_rect.y2,
+        area.text, area.lcs_percent,
+        area.template_sub_dir, area.template_id, area.template_match_threshold,
+        None if area.color_range is None else tuple(tuple(i) for i in area.color_range),
+        area.rec_only,
+    )
+
+
+class ScreenMatchIndex:
+
+    def __init__(self, screen_info_list: list[ScreenInfo]):
+        """
+        画面识别索引
+        - 内容相同的标识区域只识别一次 结果记录在 VisionFrameMemo 中 同一帧内共用
+        - 每个画面的标识区域按 模板优先 被共用次数多的优先 排序 尽早排除不符合的画面
+        """
+        self.key_2_area: dict[ScreenAreaKey, ScreenArea] = {}  # 每种识别内容的代表区域
+        self.key_2_screen_names: dict[ScreenAreaKey, list[str]] = {}  # 使用这种识别内容作为标识的画面
+        self.screen_key_map: dict[str, list[ScreenAreaKey]] = {}  # 画面的标识区域 按判断顺序排列
+
+        for screen_info in screen_info_list:
+            key_list: list[ScreenAreaKey] = []
+            for area in screen_info.area_list:
+                if not area.id_mark:
+                    continue
+                key = get_area_key(area)
+                if key in key_list:
+                    continue
+                key_list.append(key)
+                if key not in self.key_2_area:
+                    self.key_2_area[key] = area
+                    self.key_2_screen_names[key] = []
+                self.key_2_screen_names[key].append(screen_info.screen_name)
+            self.screen_key_map[screen_info.screen_name] = key_list
+
+        for key_list in self.screen_key_map.values():
+            key_list.sort(key=lambda k: (self.key_2_area[k].is_text_area, -len(self.key_2_screen_names[k])))
+
+    def get_screen_key_list(self, screen_name: str) -> list[ScreenAreaKey]:
+        """
+        获取画面的标识区域
+
+        Args:
+            screen_name: 画面名称
+
+        Returns:
+            list[ScreenAreaKey]: 标识区域 按判断顺序排列 画面不存在或没有标识区域时为空
+        """
+        return self.screen_key_map.get(screen_name, [])
@@ -7,8 +7,14 @@ from cv2.typing import MatLike
 
 from one_dragon.base.geometry.point import Point
 from one_dragon.base.matcher.match_result import MatchResult
+from one_dragon.base.matcher.ocr.ocr_match_result import OcrMatchResult
 from one_dragon.base.screen.screen_area import ScreenArea
 from one_dragon.base.screen.screen_info import ScreenInfo
+from one_dragon.base.screen.screen_match_index import (
+    ScreenAreaKey,
+    ScreenMatchIndex,
+    get_area_key,
+)
 from one_dragon.utils import cv2_utils, str_utils
 from one_dragon.utils.i18_utils import gt
 
@@ -101,17 +107,27 @@ def find_area_in_screen_binary(
     if area is None:
         return FindAreaResultEnum.AREA_NO_CONFIG
 
-    # 对屏幕进行二值化处理
-    binary_screen = cv2_utils.to_binary(screen, threshold=binary_threshold)
+    memo_key = ('binary', binary_threshold, get_area_key(area), crop_first)
+    memo_result = _get_area_result_from_frame_memo(ctx, screen, memo_key)
+    if memo_result is not None:
+        return memo_result
 
     find: bool = False
     if area.is_text_area:
-        ocr_result_list = ctx.ocr_service.get_ocr_result_list(
-            image=binary_screen,
-            rect=area.rect,
-            color_range=area.color_range,
-            crop_first=crop_first,
-        )
+        if crop_first:
+            # 只对区域进行二值化 识别结果只用于文本匹配 不需要换算坐标
+            part = cv2_utils.crop_image_only(screen, area.rect)
+            ocr_result_list = ctx.ocr_service.get_ocr_result_list(
+                image=cv2_utils.to_binary(part, threshold=binary_threshold),
+                color_range=area.color_range,
+            )
+        else:
+            ocr_result_list = ctx.ocr_service.get_ocr_result_list(
+                image=cv2_utils.to_binary(screen, threshold=binary_threshold),
+                rect=area.rect,
+                color_range=area.color_range,
+                crop_first=crop_first,
+            )
 
         for ocr_result in ocr_result_list:
             if str_utils.find_by_lcs(gt(area.text, 'game'), ocr_result.data, percent=area.lcs_percent):
@@ -121,9 +137,9 @@ def find_area_in_screen_binary(
         # 裁剪区域
         rect = area.rect
 
-        # 使用二值化模板匹配
+        # 裁剪后再二值化 进行模板匹配
         mrl = ctx.tm.crop_and_match_template_binary(
-            binary_screen,
+            screen,
             rect,
             area.template_sub_dir,
             area.template_id,
@@ -132,7 +148,9 @@ def find_area_in_screen_binary(
         )
         find = mrl.max is not None
 
-    return FindAreaResultEnum.TRUE if find else FindAreaResultEnum.FALSE
+    result = FindAreaResultEnum.TRUE if find else FindAreaResultEnum.FALSE
+    _put_area_result_to_frame_memo(ctx, screen, memo_key, result)
+    return result
 
 
 def find_area_in_screen(
@@ -156,14 +174,25 @@ def find_area_in_screen(
     if area is None:
         return FindAreaResultEnum.AREA_NO_CONFIG
 
+    memo_key = ('raw', get_area_key(area), crop_first)
+    memo_result = _get_area_result_from_frame_memo(ctx, screen, memo_key)
+    if memo_result is not None:
+        return memo_result
+
     find: bool = False
     if area.is_text_area:
-        ocr_result_list = ctx.ocr_service.get_ocr_result_list(
-            image=screen,
-            rect=area.rect,
-            color_range=area.color_range,
-            crop_first=crop_first,
-        )
+        if area.rec_only and crop_first:
+            ocr_result_list = ctx.ocr_service.get_rec_result_batch(
+                image=screen,
+                region_list=[(area.rect, area.color_range)],
+            )[0]
+        else:
+            ocr_result_list = ctx.ocr_service.get_ocr_result_list(
+                image=screen,
+                rect=area.rect,
+                color_range=area.color_range,
+                crop_first=crop_first,
+            )
 
         for ocr_result in ocr_result_list:
             if str_utils.find_by_lcs(gt(area.text, 'game'), ocr_result.data, percent=area.lcs_percent):
@@ -176,7 +205,52 @@ def find_area_in_screen(
                                              threshold=area.template_match_threshold)
         find = mrl.max is not None
 
-    return FindAreaResultEnum.TRUE if find else FindAreaResultEnum.FALSE
+    result = FindAreaResultEnum.TRUE if find else FindAreaResultEnum.FALSE
+    _put_area_result_to_frame_memo(ctx, screen, memo_key, result)
+    return result
+
+
+def _get_area_result_from_frame_memo(
+    ctx: OneDragonContext,
+    screen: MatLike,
+    memo_key: tuple,
+) -> FindAreaResultEnum | bool | None:
+    """
+    从同一帧截图的识别结果记录中 获取区域判断结果
+
+    Args:
+        ctx: 上下文
+        screen: 游戏截图
+        memo_key: 记录键
+
+    Returns:
+        FindAreaResultEnum | bool | None: 判断结果 没有记录时返回None
+    """
+    memo = getattr(ctx, 'vision_frame_memo', None)
+    if memo is None:
+        return None
+    return memo.get_area_result(screen, memo_key)
+
+
+def _put_area_result_to_frame_memo(
+    ctx: OneDragonContext,
+    screen: MatLike,
+    memo_key: tuple,
+    result: FindAreaResultEnum | bool,
+) -> None:
+    """
+    记录区域判断结果到同一帧截图的识别结果记录中
+
+    Args:
+        ctx: 上下文
+        screen: 游戏截图
+        memo_key: 记录键
+        result: 判断结果
+    """
+    memo = getattr(ctx, 'vision_frame_memo', None)
+    if memo is None:
+        return
+    memo.put_area_result(screen, memo_key, result)
 
 
 def find_template_coord_in_area(
@@ -351,19 +425,17 @@ def get_match_screen_name(
         str | None: 画面名称
     """
     if screen_name_list is not None:
-        for screen_info in ctx.screen_loader.screen_info_list:
-            if screen_info.screen_name not in screen_name_list:
-                continue
-            if is_target_screen(ctx, screen, screen_info=screen_info, crop_first=crop_first):
-                return screen_info.screen_name
+        to_check_list = [
+            screen_info.screen_name
+            for screen_info in ctx.screen_loader.screen_info_list
+            if screen_info.screen_name in screen_name_list
+        ]
     elif ctx.screen_loader.current_screen_name is not None or ctx.screen_loader.last_screen_name is not None:
         return get_match_screen_name_from_last(ctx, screen, crop_first=crop_first)
     else:
-        for screen_info in ctx.screen_loader.active_screen_info_list:
-            if is_target_screen(ctx, screen, screen_info=screen_info, crop_first=crop_first):
-                return screen_info.screen_name
+        to_check_list = [screen_info.screen_name for screen_info in ctx.screen_loader.active_screen_info_list]
 
-    return None
+    return match_screen_by_index(ctx, screen, to_check_list, crop_first=crop_first)
 
 
 def get_match_screen_name_from_last(
@@ -393,27 +465,18 @@ def get_match_screen_name_from_last(
     if len(bfs_list) == 0:
         return None
 
+    # 按跳转关系 从上次的画面开始排列需要判断的画面
+    to_check_list: list[str] = []
     bfs_idx = 0
     while bfs_idx < len(bfs_list):
         current_screen_name = bfs_list[bfs_idx]
         bfs_idx += 1
 
         # 在 scope 模式下 跳过非活跃 screen 的匹配（但仍展开其邻居以保持图连通性）
-        if active_names is not None and current_screen_name not in active_names:
-            screen_info = ctx.screen_loader.screen_info_map.get(current_screen_name)
-            if screen_info is not None:
-                for area in screen_info.area_list:
-                    if area.goto_list is None or len(area.goto_list) == 0:
-                        continue
-                    for goto_screen in area.goto_list:
-                        if goto_screen not in bfs_list:
-                            bfs_list.append(goto_screen)
-            continue
+        if active_names is None or current_screen_name in active_names:
+            to_check_list.append(current_screen_name)
 
-        if is_target_screen(ctx, screen, screen_name=current_screen_name, crop_first=crop_first):
-            return current_screen_name
-
-        screen_info = ctx.screen_loader.get_screen(current_screen_name)
+        screen_info = ctx.screen_loader.screen_info_map.get(current_screen_name)
         if screen_info is None:
             continue
         for area in screen_info.area_list:
@@ -427,11 +490,180 @@ def get_match_screen_name_from_last(
     for screen_info in ctx.screen_loader.active_screen_info_list:
         if screen_info.screen_name in bfs_list:
             continue
-        if is_target_screen(ctx, screen, screen_info=screen_info, crop_first=crop_first):
-            return screen_info.screen_name
+        to_check_list.append(screen_info.screen_name)
+
+    return match_screen_by_index(ctx, screen, to_check_list, crop_first=crop_first)
+
+
+def match_screen_by_index(
+    ctx: OneDragonContext,
+    screen: MatLike,
+    screen_name_list: list[str],
+    crop_first: bool = True,
+) -> str | None:
+    """
+    使用画面识别索引 按顺序找出第一个符合的画面
+    - 先单独判断第一个画面 大部分时候仍停留在原来的画面
+    - 其余画面先判断所有模板标识区域 排除不符合的画面
+    - 剩下画面的文本标识区域合并成一次识别
+    同一帧内 内容相同的标识区域只识别一次
+
+    Args:
+        ctx: 上下文
+        screen: 游戏截图
+        screen_name_list: 需要判断的画面 按优先级排列
+        crop_first: 在传入区域时 是否先裁剪再进行文本识别
+
+    Returns:
+        str | None: 画面名称
+    """
+    index = ctx.screen_loader.screen_match_index
+    area_result = _IdMarkResult(ctx, screen, crop_first)
+
+    candidate_list = [i for i in screen_name_list if len(index.get_screen_key_list(i)) > 0]
+    if len(candidate_list) == 0:
+        return None
+
+    if _is_target_screen_by_index(ctx, screen, index, area_result, candidate_list[0]):
+        return candidate_list[0]
+
+    rest_list = candidate_list[1:]
+    for screen_name in rest_list:
+        for key in index.get_screen_key_list(screen_name):
+            if index.key_2_area[key].is_text_area or area_result.get(key) is not None:
+                continue
+            area = index.key_2_area[key]
+            area_result.put(key, find_area_in_screen(ctx, screen, area, crop_first) == FindAreaResultEnum.TRUE)
+
+    survivor_list = [
+        screen_name
+        for screen_name in rest_list
+        if all(area_result.get(key) is not False for key in index.get_screen_key_list(screen_name))
+    ]
+
+    text_key_list: list[ScreenAreaKey] = []
+    for screen_name in survivor_list:
+        for key in index.get_screen_key_list(screen_name):
+            if area_result.get(key) is None and key not in text_key_list:
+                text_key_list.append(key)
+    _update_text_area_result(ctx, screen, index, area_result, text_key_list)
+
+    for screen_name in survivor_list:
+        if all(area_result.get(key) for key in index.get_screen_key_list(screen_name)):
+            return screen_name
 
     return None
 
+
+class _IdMarkResult:
+
+    def __init__(self, ctx: OneDragonContext, screen: MatLike, crop_first: bool):
+        """
+        一次画面匹配中 每个标识区域的识别结果
+        结果同时记录到 ctx.vision_frame_memo 同一帧的后续匹配可以直接使用
+        """
+        self.ctx: OneDragonContext = ctx
+        self.screen: MatLike = screen
+        self.crop_first: bool = crop_first
+        self._result: dict[ScreenAreaKey, bool] = {}
+
+    def get(self, key: ScreenAreaKey) -> bool | None:
+        """
+        获取标识区域的识别结果
+
+        Args:
+            key: 标识区域的识别内容
+
+        Returns:
+            bool | None: 是否找到 还没有识别时返回None
+        """
+        result = self._result.get(key)
+        if result is None:
+            result = _get_area_result_from_frame_memo(self.ctx, self.screen, ('id_mark', key, self.crop_first))
+            if result is not None:
+                self._result[key] = result
+        return result
+
+    def put(self, key: ScreenAreaKey, result: bool) -> None:
+        """
+        记录标识区域的识别结果
+
+        Args:
+            key: 标识区域的识别内容
+            result: 是否找到
+        """
+        self._result[key] = result
+        _put_area_result_to_frame_memo(self.ctx, self.screen, ('id_mark', key, self.crop_first), result)
+
+
+def _is_target_screen_by_index(
+    ctx: OneDragonContext,
+    screen: MatLike,
+    index: ScreenMatchIndex,
+    area_result: _IdMarkResult,
+    screen_name: str,
+) -> bool:
+    """
+    使用画面识别索引 判断是否目标画面 模板标识区域逐个判断 文本标识区域合并识别
+
+    Args:
+        ctx: 上下文
+        screen: 游戏截图
+        index: 画面识别索引
+        area_result: 标识区域的识别结果
+        screen_name: 画面名称
+
+    Returns:
+        bool: 是否目标画面
+    """
+    key_list = index.get_screen_key_list(screen_name)
+    if len(key_list) == 0:
+        return False
+
+    for key in key_list:
+        area = index.key_2_area[key]
+        if area.is_text_area:
+            continue
+        result = area_result.get(key)
+        if result is None:
+            result = find_area_in_screen(ctx, screen, area, area_result.crop_first) == FindAreaResultEnum.TRUE
+            area_result.put(key, result)
+        if not result:
+            return False
+
+    for key in key_list:
+        if area_result.get(key) is False:
+            return False
+
+    _update_text_area_result(ctx, screen, index, area_result, [key for key in key_list if area_result.get(key) is None])
+    return all(area_result.get(key) for key in key_list)
+
+
+def _update_text_area_result(
+    ctx: OneDragonContext,
+    screen: MatLike,
+    index: ScreenMatchIndex,
+    area_result: _IdMarkResult,
+    key_list: list[ScreenAreaKey],
+) -> None:
+    """
+    合并识别多个文本标识区域 并记录识别结果
+
+    Args:
+        ctx: 上下文
+        screen: 游戏截图
+        index: 画面识别索引
+        area_result: 标识区域的识别结果
+        key_list: 需要识别的文本标识区域
+    """
+    if len(key_list) == 0:
+        return
+    area_list = [index.key_2_area[key] for key in key_list]
+    result_list = find_text_areas_in_screen(ctx, screen, area_list, area_result.crop_first)
+    for key, result in zip(key_list, result_list, strict=True):
+        area_result.put(key, result)
+
+
 def is_target_screen(
     ctx: OneDragonContext,
     screen: MatLike,
@@ -459,18 +691,135 @@ def is_target_screen(
         if screen_info is None:
             return False
 
-    existed_id_mark: bool = False
-    fit_id_mark: bool = True
-    for screen_area in screen_info.area_list:
-        if not screen_area.id_mark:
-            continue
-        existed_id_mark = True
+    id_mark_list: list[ScreenArea] = [i for i in screen_info.area_list if i.id_mark]
+    if len(id_mark_list) == 0:
+        return False
 
-        if find_area_in_screen(ctx, screen, screen_area, crop_first) != FindAreaResultEnum.TRUE:
-            fit_id_mark = False
-            break
+    # 模板匹配较快 先判断模板区域 不符合时可以省去文本识别
+    text_area_list: list[ScreenArea] = []
+    for screen_area in id_mark_list:
+        if screen_area.is_text_area:
+            text_area_list.append(screen_area)
+        elif find_area_in_screen(ctx, screen, screen_area, crop_first) != FindAreaResultEnum.TRUE:
+            return False
+
+    if len(text_area_list) == 0:
+        return True
 
-    return existed_id_mark and fit_id_mark
+    return all(find_text_areas_in_screen(ctx, screen, text_area_list, crop_first))
+
+
+def find_text_areas_in_screen(
+    ctx: OneDragonContext,
+    screen: MatLike,
+    area_list: list[ScreenArea],
+    crop_first: bool = True,
+) -> list[bool]:
+    """
+    游戏截图中 批量判断多个文本区域是否能找到
+    固定单行文本直接识别 其余区域合并成一次检测
+
+    Args:
+        ctx: 上下文
+        screen: 游戏截图
+        area_list: 文本区域列表
+        crop_first: 在传入区域时 是否先裁剪再进行文本识别
+
+    Returns:
+        list[bool]: 每个区域是否能找到
+    """
+    if not crop_first:
+        return [
+            find_area_in_screen(ctx, screen, area, crop_first) == FindAreaResultEnum.TRUE
+            for area in area_list
+        ]
+
+    result_list: list[bool] = [False] * len(area_list)
+    rec_idx_list: list[int] = [idx for idx, area in enumerate(area_list) if area.rec_only]
+    det_idx_list: list[int] = [idx for idx, area in enumerate(area_list) if not area.rec_only]
+
+    if len(rec_idx_list) > 0:
+        rec_result_batch = ctx.ocr_service.get_rec_result_batch(
+            image=screen,
+            region_list=[(area_list[idx].rect, area_list[idx].color_range) for idx in rec_idx_list],
+        )
+        for idx, ocr_result_list in zip(rec_idx_list, rec_result_batch, strict=True):
+            result_list[idx] = _is_text_area_matched(area_list[idx], ocr_result_list)
+
+    if len(det_idx_list) == 1:
+        idx = det_idx_list[0]
+        result_list[idx] = find_area_in_screen(ctx, screen, area_list[idx], crop_first) == FindAreaResultEnum.TRUE
+    elif len(det_idx_list) > 1:
+        ocr_result_batch = ctx.ocr_service.get_ocr_result_batch(
+            image=screen,
+            region_list=[(area_list[idx].rect, area_list[idx].color_range) for idx in det_idx_list],
+        )
+        for idx, ocr_result_list in zip(det_idx_list, ocr_result_batch, strict=True):
+            result_list[idx] = _is_text_area_matched(area_list[idx], ocr_result_list)
+
+    return result_list
+
+
+def _is_text_area_matched(area: ScreenArea, ocr_result_list: list[OcrMatchResult]) -> bool:
+    """
+    判断文本区域的识别结果中 是否包含目标文本
+
+    Args:
+        area: 文本区域
+        ocr_result_list: 区域的识别结果列表
+
+    Returns:
+        bool: 是否包含目标文本
+    """
+    return any(
+        str_utils.find_by_lcs(gt(area.text, 'game'), ocr_result.data, percent=area.lcs_percent)
+        for ocr_result in ocr_result_list
+    )
+
+
+def is_rec_only_suitable(
+    ctx: OneDragonContext,
+    screen: MatLike,
+    area: ScreenArea,
+) -> bool:
+    """
+    分析文本区域是否适合跳过文本检测直接识别
+    要求区域内只检测到一行文本 且检测和直接识别的结果都能匹配目标文本
+
+    Args:
+        ctx: 上下文
+        screen: 包含该区域的游戏截图
+        area: 文本区域
+
+    Returns:
+        bool: 是否适合开启 rec_only
+    """
+    if area is None or not area.is_text_area:
+        return False
+
+    target = gt(area.text, 'game')
+    det_result_list = ctx.ocr_service.get_ocr_result_list(
+        image=screen,
+        color_range=area.color_range,
+        rect=area.rect,
+        crop_first=True,
+    )
+    if len(det_result_list) != 1:
+        return False
+    det_rect = det_result_list[0].rect
+    if det_rect.y1 > area.center.y or det_rect.y2 < area.center.y:  # 文本需要在区域的中线上
+        return False
+    if not str_utils.find_by_lcs(target, det_result_list[0].data, percent=area.lcs_percent):
+        return False
+
+    rec_result_list = ctx.ocr_service.get_rec_result_batch(
+        image=screen,
+        region_list=[(area.rect, area.color_range)],
+    )[0]
+    return any(
+        str_utils.find_by_lcs(target, ocr_result.data, percent=area.lcs_percent)
+        for ocr_result in rec_result_list
+    )
 
 
 def find_by_ocr(
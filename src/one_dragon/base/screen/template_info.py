@@ -57,6 +57,8 @@ class TemplateInfo(YamlOperator):
 
         # 运算后保存在内存的
         self._gray: MatLike = None  # 灰度图
+        self._hsv: MatLike = None  # HSV图
+        self._binary_map: dict[int, MatLike] = {}  # 二值化图 key=二值化阈值
         self._kps: List[cv2.KeyPoint] = None  # 关键点
         self._desc: MatLike = None  # 描述
 
@@ -116,6 +118,10 @@ class TemplateInfo(YamlOperator):
             return self.gray
         if t == 'mask':
             return self.mask
+        if t == 'hsv':
+            return self.hsv
+        if t == 'binary':
+            return self.get_binary()
 
     @property
     def gray(self) -> MatLike:
@@ -126,6 +132,30 @@ class TemplateInfo(YamlOperator):
         self._gray = cv2.cvtColor(self.raw, cv2.COLOR_RGB2GRAY)
         return self._gray
 
+    @property
+    def hsv(self) -> MatLike:
+        if self._hsv is not None:
+            return self._hsv
+        if self.raw is None:
+            return None
+        self._hsv = cv2.cvtColor(self.raw, cv2.COLOR_RGB2HSV)
+        return self._hsv
+
+    def get_binary(self, threshold: int = 127) -> MatLike:
+        """
+        获取二值化后的模板 按阈值缓存
+        :param threshold: 二值化阈值
+        :return: 二值化图像
+        """
+        binary = self._binary_map.get(threshold)
+        if binary is not None:
+            return binary
+        if self.raw is None:
+            return None
+        _, binary = cv2.threshold(self.gray, threshold, 255, cv2.THRESH_BINARY)
+        self._binary_map[threshold] = binary
+        return binary
+
     @property
     def features(self) -> Tuple[List[cv2.KeyPoint], MatLike]:
         if self._kps is not None:
@@ -388,6 +388,17 @@ class EnvConfig(YamlConfig):
     def screenshot_method(self, new_value: str) -> None:
         self.update('screenshot_method', new_value)
 
+    @property
+    def capture_service_fps(self) -> int:
+        """
+        后台截图的帧率 0 为不开启 在调用截图时才截图
+        """
+        return self.get('capture_service_fps', 0)
+
+    @capture_service_fps.setter
+    def capture_service_fps(self, new_value: int) -> None:
+        self.update('capture_service_fps', new_value)
+
     @property
     def key_start_running(self) -> str:
         """
@@ -0,0 +1,63 @@
+import threading
+import time
+
+# 每次 time.sleep 的最长秒数 之间检查是否被取消 即取消后最多再等待这么久
+# 不使用 Event.wait 等待 Windows 上它按系统定时器(约15.6毫秒)取整 而 time.sleep 使用高精度定时器
+_SLICE_SECONDS: float = 0.005
+
+
+class CancelToken:
+
+    def __init__(self):
+        """
+        可取消的等待
+        等待按 time.perf_counter() 的截止时间计算 取消后在几毫秒内返回
+        """
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """
+        取消 正在等待的会马上返回
+        """
+        self._event.set()
+
+    def reset(self) -> None:
+        """
+        重置为未取消 开始新的一次执行前调用
+        """
+        self._event.clear()
+
+    def sleep(self, seconds: float) -> bool:
+        """
+        等待一段时间
+
+        Args:
+            seconds: 等待秒数
+
+        Returns:
+            bool: 是否等待完成 被取消时返回False
+        """
+        return self.sleep_until(time.perf_counter() + seconds)
+
+    def sleep_until(self, deadline: float) -> bool:
+        """
+        等待到截止时间
+        分成多次短的 time.sleep 每次之间检查是否被取消 最后一次只等待到截止时间
+
+        Args:
+            deadline: 截止时间 time.perf_counter()
+
+        Returns:
+            bool: 是否等待完成 被取消时返回False
+        """
+        while True:
+            if self._event.is_set():
+                return False
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return True
+            time.sleep(min(remaining, _SLICE_SECONDS))
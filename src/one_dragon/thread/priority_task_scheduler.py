@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
+
+from one_dragon.utils.latency_stats import LatencyStats
+
+
+def get_default_worker_cnt(max_worker_cnt: int = 8) -> int:
+    """
+    按CPU核数计算默认的线程数 留一半给游戏和主循环
+
+    Args:
+        max_worker_cnt: 最多的线程数
+
+    Returns:
+        int: 线程数 最少2个
+    """
+    cpu_cnt = os.cpu_count() or 4
+    return max(2, min(max_worker_cnt, cpu_cnt // 2))
+
+
+class _ScheduledTask:
+
+    def __init__(self, name: str, fn: Callable[..., Any], args: tuple, kwargs: dict,
+                 priority: int, deadline: float | None):
+        self.name: str = name
+        self.fn: Callable[..., Any] = fn
+        self.args: tuple = args
+        self.kwargs: dict = kwargs
+        self.priority: int = priority
+        self.deadline: float | None = deadline
+        self.submit_time: float = time.perf_counter()
+        self.future: Future = Future()
+        self.removed: bool = False  # 被同名的新任务替换 仍在堆中 出队时忽略
+
+
+class _TaskCounter:
+
+    def __init__(self):
+        self.submit_cnt: int = 0  # 提交次数
+        self.run_cnt: int = 0  # 执行次数
+        self.replaced_cnt: int = 0  # 未开始就被同名新任务替换的次数
+        self.expired_cnt: int = 0  # 开始前已超过截止时间被丢弃的次数
+
+
+class PriorityTaskScheduler:
+
+    def __init__(self, thread_name_prefix: str, max_workers: int | None = None):
+        """
+        按优先级执行的线程池 用于每帧提交的识别任务
+        - 优先级数值越小越先执行
+        - 同名任务还在排队时 只保留最新提交的 旧的直接返回None
+        - 到了截止时间还没开始的任务会被丢弃 返回None
+        被丢弃的任务不会报错 需要结果的调用方应该处理None
+
+        Args:
+            thread_name_prefix: 线程名称前缀
+            max_workers: 最大线程数 默认按CPU核数计算
+        """
+        self.thread_name_prefix: str = thread_name_prefix
+        self.max_workers: int = max_workers if max_workers is not None else get_default_worker_cnt()
+
+        self._condition = threading.Condition()
+        self._heap: list[tuple[int, int, _ScheduledTask]] = []
+        self._seq = itertools.count()
+        self._queued_map: dict[str, _ScheduledTask] = {}  # 排队中的任务 key=任务名称
+        self._thread_list: list[threading.Thread] = []
+        self._idle_cnt: int = 0
+        self._shutdown: bool = False
+
+        self._counter_map: dict[str, _TaskCounter] = {}
+        self.wait_latency: LatencyStats = LatencyStats()  # 从提交到开始执行的耗时
+        self.run_latency: LatencyStats = LatencyStats()  # 执行耗时
+
+    def submit(self, name: str, fn: Callable[..., Any], /, *args,
+               priority: int = 0, deadline: float | None = None, **kwargs) -> Future:
+        """
+        提交任务
+
+        Args:
+            name: 任务名称 同名任务排队时只保留最新的一个 也用于统计
+            fn: 执行的方法
+            priority: 优先级 数值越小越先执行
+            deadline: 截止时间 time.perf_counter() 到时仍未开始则丢弃 None 为不丢弃
+
+        Returns:
+            Future: 任务结果 被替换或丢弃时结果为None
+        """
+        task = _ScheduledTask(name, fn, args, kwargs, priority, deadline)
+        replaced: _ScheduledTask | None = None
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError('cannot schedule new futures after shutdown')
+
+            counter = self._get_counter(name)
+            counter.submit_cnt += 1
+
+            replaced = self._queued_map.get(name)
+            if replaced is not None:
+                replaced.removed = True
+                counter.replaced_cnt += 1
+
+            self._queued_map[name] = task
+            heapq.heappush(self._heap, (priority, next(self._seq), task))
+
+            if self._idle_cnt > 0:
+                self._condition.notify()
+            elif len(self._thread_list) < self.max_workers:
+                self._start_thread()
+
+        if replaced is not None:
+            replaced.future.set_result(None)
+
+        return task.future
+
+    def _get_counter(self, name: str) -> _TaskCounter:
+        counter = self._counter_map.get(name)
+        if counter is None:
+            counter = _TaskCounter()
+            self._counter_map[name] = counter
+        return counter
+
+    def _start_thread(self) -> None:
+        t = threading.Thread(
+            target=self._worker_loop,
+            name=f'{self.thread_name_prefix}_{len(self._thread_list)}',
+            daemon=True,
+        )
+        self._thread_list.append(t)
+        t.start()
+
+    def _next_task(self) -> _ScheduledTask | None:
+        """
+        取出下一个需要执行的任务 没有任务时等待
+
+        Returns:
+            _ScheduledTask | None: 需要执行的任务 关闭后返回None
+        """
+        expired_list: list[_ScheduledTask] = []
+        try:
+            with self._condition:
+                while True:
+                    if self._shutdown:
+                        return None
+                    if len(self._heap) == 0:
+                        self._idle_cnt += 1
+                        self._condition.wait()
+                        self._idle_cnt -= 1
+                        continue
+
+                    _, _, task = heapq.heappop(self._heap)
+                    if task.removed:
+                        continue
+
+                    self._queued_map.pop(task.name, None)
+                    if task.deadline is not None and time.perf_counter() > task.deadline:
+                        self._get_counter(task.name).expired_cnt += 1
+                        expired_list.append(task)
+                        continue
+
+                    self._get_counter(task.name).run_cnt += 1
+                    return task
+        finally:
+            for task in expired_list:
+                task.future.set_result(None)
+
+    def _worker_loop(self) -> None:
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+
+            if not task.future.set_running_or_notify_cancel():
+                continue
+
+            start_time = time.perf_counter()
+            self.wait_latency.record(task.name, start_time - task.submit_time)
+            try:
+                result = task.fn(*task.args, **task.kwargs)
+            except BaseException as e:
+                self.run_latency.record(task.name, time.perf_counter() - start_time)
+                task.future.set_exception(e)
+            else:
+                self.run_latency.record(task.name, time.perf_counter() - start_time)
+                task.future.set_result(result)
+            del task
+
+    def get_stats(self) -> dict[str, dict[str, float]]:
+        """
+        获取各个任务的统计
+
+        Returns:
+            dict[str, dict[str, float]]: key=任务名称 value=提交/执行/替换/超时次数 及排队和执行耗时的 p50 p99 单位毫秒
+        """
+        with self._condition:
+            counter_map = {
+                name: (c.submit_cnt, c.run_cnt, c.replaced_cnt, c.expired_cnt)
+                for name, c in self._counter_map.items()
+            }
+        wait_stats = self.wait_latency.get_stats()
+        run_stats = self.run_latency.get_stats()
+
+        result: dict[str, dict[str, float]] = {}
+        for name, (submit_cnt, run_cnt, replaced_cnt, expired_cnt) in counter_map.items():
+            item: dict[str, float] = {
+                'submit': submit_cnt,
+                'run': run_cnt,
+                'replaced': replaced_cnt,
+                'expired': expired_cnt,
+            }
+            if name in wait_stats:
+                item['wait_p50'] = wait_stats[name]['p50']
+                item['wait_p99'] = wait_stats[name]['p99']
+            if name in run_stats:
+                item['run_p50'] = run_stats[name]['p50']
+                item['run_p99'] = run_stats[name]['p99']
+            result[name] = item
+        return result
+
+    def get_display_text(self) -> str:
+        """
+        Returns:
+            str: 用于日志的统计文本 没有提交过任务时为空字符串
+        """
+        text_list: list[str] = []
+        for name, s in self.get_stats().items():
+            text = f"{name}[提交{s['submit']}次 执行{s['run']}次 替换{s['replaced']}次 超时{s['expired']}次"
+            if 'wait_p50' in s:
+                text += f" 排队p50={s['wait_p50']:.1f}ms p99={s['wait_p99']:.1f}ms"
+            if 'run_p50' in s:
+                text += f" 执行p50={s['run_p50']:.1f}ms p99={s['run_p99']:.1f}ms"
+            text_list.append(text + ']')
+        return ' '.join(text_list)
+
+    def clear_stats(self) -> None:
+        """
+        清除统计
+        """
+        with self._condition:
+            self._counter_map.clear()
+        self.wait_latency.clear()
+        self.run_latency.clear()
+
+    def shutdown(self) -> None:
+        """
+        关闭 取消排队中的任务 不等待正在执行的任务
+        """
+        with self._condition:
+            self._shutdown = True
+            pending_list = [task for _, _, task in self._heap if not task.removed]
+            self._heap.clear()
+            self._queued_map.clear()
+            self._condition.notify_all()
+
+        for task in pending_list:
+            task.future.cancel()
@@ -178,7 +178,8 @@ def mark_area_as_color(image: MatLike, pos: List, color, new_image: bool = False
 
 def match_template(source: MatLike, template: MatLike, threshold,
                    mask: np.ndarray | None = None, only_best: bool = True,
-                   ignore_inf: bool = False) -> MatchResultList:
+                   ignore_inf: bool = False, max_result_cnt: int | None = None,
+                   merge_distance: float = 10) -> MatchResultList:
     """
     在原图中匹配模板 注意无法从负偏移量开始匹配 即需要保证目标模板不会在原图边缘位置导致匹配不到
     :param source: 原图
@@ -187,29 +188,86 @@ def match_template(source: MatLike, template: MatLike, threshold,
     :param mask: 掩码
     :param only_best: 只返回最好的结果
     :param ignore_inf: 是否忽略无限大的结果
+    :param max_result_cnt: only_best=False 时 最多返回多少个结果 按置信度从高到低保留 None为不限制
+    :param merge_distance: only_best=False 时 多少距离内的结果只保留置信度最高的一个
     :return: 所有匹配结果
     """
     tx, ty = template.shape[1], template.shape[0]
     # 进行模板匹配
-    # show_image(source, win_name='source')
-    # show_image(template, win_name='template')
-    # show_image(mask, win_name='mask', wait=1)
     result = cv2.matchTemplate(source, template, cv2.TM_CCOEFF_NORMED, mask=mask)
 
+    # 使用掩码时可能出现 nan 和 inf nan 不会超过阈值 ignore_inf 时 inf 也不会
+    finite = np.isfinite(result)
+    if not finite.all():
+        result[~finite if ignore_inf else np.isnan(result)] = -np.inf
+
     match_result_list = MatchResultList(only_best=only_best)
-    filtered_locations = np.where(np.logical_and(
-        result >= threshold,
-        np.isfinite(result) if ignore_inf else np.ones_like(result))
-    )  # 过滤低置信度的匹配结果
+    if only_best:
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        if max_val >= threshold:
+            match_result_list.append(MatchResult(max_val, max_loc[0], max_loc[1], tx, ty))
+        return match_result_list
 
-    # 遍历所有匹配结果，并输出位置和置信度
-    for pt in zip(*filtered_locations[::-1]):
-        confidence = result[pt[1], pt[0]]  # 获取置信度
-        match_result_list.append(MatchResult(confidence, pt[0], pt[1], tx, ty))
+    for x, y, confidence in _find_template_peaks(result, threshold, merge_distance, max_result_cnt):
+        match_result_list.append(MatchResult(confidence, x, y, tx, ty), auto_merge=False)
 
     return match_result_list
 
 
+def _find_template_peaks(
+        result: np.ndarray,
+        threshold: float,
+        merge_distance: float,
+        max_result_cnt: int | None,
+) -> list[tuple[int, int, float]]:
+    """
+    从模板匹配的结果矩阵中 找出不低于阈值的局部最大值 并进行非极大值抑制
+    先用膨胀找出邻域内的最大值 只对这些候选点排序 避免对每个超过阈值的像素都创建结果
+    :param result: cv2.matchTemplate 的结果矩阵
+    :param threshold: 阈值
+    :param merge_distance: 多少距离内只保留置信度最高的一个
+    :param max_result_cnt: 最多返回多少个结果 None为不限制
+    :return: [(x, y, 置信度)] 按从上到下 从左到右排序
+    """
+    radius = max(int(merge_distance), 0)
+    # 使用圆内接正方形做膨胀 方形核可以分离计算 比圆形核快很多
+    # 被去掉的点在合并距离内一定有更高的点 不影响抑制结果
+    half = int(merge_distance / np.sqrt(2))
+    if half > 0:
+        kernel = np.ones((half * 2 + 1, half * 2 + 1), dtype=np.uint8)
+        local_max = cv2.dilate(result, kernel)
+        candidate = (result >= threshold) & (result >= local_max)
+    else:
+        candidate = result >= threshold
+
+    ys, xs = np.nonzero(candidate)
+    if len(ys) == 0:
+        return []
+    confidences = result[ys, xs]
+
+    # 按置信度从高到低 置信度相同时按原图扫描顺序
+    order = np.lexsort((xs, ys, -confidences))
+    ys, xs, confidences = ys[order], xs[order], confidences[order]
+
+    keep_idx: list[int] = []
+    if radius > 0:
+        suppressed = np.zeros(len(ys), dtype=bool)
+        dist_square = merge_distance ** 2
+        for i in range(len(ys)):
+            if suppressed[i]:
+                continue
+            keep_idx.append(i)
+            if max_result_cnt is not None and len(keep_idx) >= max_result_cnt:
+                break
+            suppressed[i + 1:] |= (ys[i + 1:] - ys[i]) ** 2 + (xs[i + 1:] - xs[i]) ** 2 <= dist_square
+    else:
+        keep_idx = list(range(len(ys) if max_result_cnt is None else min(len(ys), max_result_cnt)))
+
+    peaks = [(int(xs[i]), int(ys[i]), float(confidences[i])) for i in keep_idx]
+    peaks.sort(key=lambda i: (i[1], i[0]))
+    return peaks
+
+
 def concat_vertically(img: MatLike, next_img: MatLike, decision_height: int = 150):
     """
     垂直拼接图片。
@@ -809,6 +867,47 @@ def scale_image(img: Optional[MatLike] = None, scale: Optional[float] = None, co
     return cv2.resize(img, target_size)
 
 
+def resize_to(img: MatLike, width: int, height: int, dst: Optional[MatLike] = None) -> MatLike:
+    """
+    缩放到指定尺寸 dst 的尺寸和类型一致时直接写入 避免每次分配新的图片
+    :param img: 原图
+    :param width: 目标宽度
+    :param height: 目标高度
+    :param dst: 可以写入的图片
+    :return: 缩放后图片
+    """
+    if dst is not None and (dst.shape[:2] != (height, width) or dst.shape[2:] != img.shape[2:] or dst.dtype != img.dtype):
+        dst = None
+    return cv2.resize(img, (width, height), dst=dst)
+
+
+def calc_frame_signature(img: MatLike, width: int = 64, height: int = 36, sample_step: int = 4) -> MatLike:
+    """
+    计算画面特征 用于低成本判断两帧画面是否变化
+    先间隔采样 再按区域求均值缩小 1080p 的截图耗时约 1ms
+    :param img: 截图
+    :param width: 特征宽度 每个像素对应原图的一个区域
+    :param height: 特征高度
+    :param sample_step: 采样间隔
+    :return: 画面特征 各个区域的颜色均值
+    """
+    if sample_step > 1:
+        img = np.ascontiguousarray(img[::sample_step, ::sample_step])
+    return cv2.resize(img, (width, height), interpolation=cv2.INTER_AREA)
+
+
+def frame_signature_diff(signature_1: MatLike, signature_2: MatLike) -> int:
+    """
+    两个画面特征的差异 取所有区域中颜色差值的最大值 局部的变化也不会被平均掉
+    :param signature_1: 画面特征
+    :param signature_2: 画面特征
+    :return: 差异 0~255 尺寸不一致时返回 255
+    """
+    if signature_1.shape != signature_2.shape:
+        return 255
+    return int(cv2.absdiff(signature_1, signature_2).max())
+
+
 def to_base64(img: MatLike) -> str:
     """
     将图片转化成base64编码展示
@@ -5,8 +5,6 @@ from functools import lru_cache
 from typing import Optional
 
 import cv2
-import win32clipboard
-import win32con
 from cv2.typing import MatLike
 from PIL import Image
 
@@ -35,6 +33,10 @@ def get_debug_image(filename, suffix: str = '.png') -> MatLike:
 def copy_image_to_clipboard(image) -> bool:
     """将图片复制到剪贴板"""
     try:
+        # 剪贴板只在 Windows 上可用 在使用时才导入 其它系统也能导入这个模块
+        import win32clipboard
+        import win32con
+
         pil_image = Image.fromarray(image)
         with io.BytesIO() as output:
             pil_image.save(output, "BMP")
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+
+import numpy as np
+
+
+class LatencyStats:
+
+    def __init__(self, max_sample_cnt: int = 2000):
+        """
+        耗时统计 例如反应延迟 任务排队和执行耗时
+        按来源分别保存最近的样本 用于计算分位数
+
+        Args:
+            max_sample_cnt: 每种来源最多保存的样本数量
+        """
+        self.max_sample_cnt: int = max_sample_cnt
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, source: str, latency_seconds: float) -> None:
+        """
+        记录一次耗时
+
+        Args:
+            source: 来源 例如 主循环 或 触发的状态
+            latency_seconds: 耗时 单位秒
+        """
+        if latency_seconds < 0:
+            return
+        with self._lock:
+            samples = self._samples.get(source)
+            if samples is None:
+                samples = deque(maxlen=self.max_sample_cnt)
+                self._samples[source] = samples
+            samples.append(latency_seconds)
+
+    def clear(self) -> None:
+        """
+        清除所有样本
+        """
+        with self._lock:
+            self._samples.clear()
+
+    def get_stats(self) -> dict[str, dict[str, float]]:
+        """
+        获取各个来源的耗时分位数 单位毫秒
+
+        Returns:
+            dict[str, dict[str, float]]: key=来源 value=样本数量 cnt 和 p50 p90 p99 max
+        """
+        with self._lock:
+            sample_map = {k: list(v) for k, v in self._samples.items() if len(v) > 0}
+
+        result: dict[str, dict[str, float]] = {}
+        for source, samples in sample_map.items():
+            arr = np.asarray(samples, dtype=np.float64) * 1000
+            p50, p90, p99 = np.percentile(arr, [50, 90, 99])
+            result[source] = {
+                'cnt': len(samples),
+                'p50': float(p50),
+                'p90': float(p90),
+                'p99': float(p99),
+                'max': float(arr.max()),
+            }
+        return result
+
+    def get_display_text(self) -> str:
+        """
+        Returns:
+            str: 用于日志的统计文本 没有样本时为空字符串
+        """
+        return ' '.join(
+            f"{source}[{s['cnt']}次 p50={s['p50']:.1f}ms p90={s['p90']:.1f}ms p99={s['p99']:.1f}ms max={s['max']:.1f}ms]"
+            for source, s in self.get_stats().items()
+        )
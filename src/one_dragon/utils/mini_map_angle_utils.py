@@ -3,7 +3,6 @@ from functools import lru_cache
 import cv2
 import numpy as np
 from cv2.typing import MatLike
-from scipy import signal
 
 
 @lru_cache
@@ -82,6 +81,8 @@ def create_angular_histogram_from_peaks(
     Returns:
         np.ndarray: 一个一维数组，其索引代表角度，值代表该角度上检测到的峰值数量。
     """
+    from scipy import signal  # scipy 导入较慢 用到时再导入
+
     # 1. 找到所有峰值在一维数组中的索引
     #    `signal.find_peaks` 返回一个元组，第一个元素是峰值的索引数组
     peak_indices = signal.find_peaks(
@@ -111,6 +112,8 @@ def peak_confidence(arr: np.ndarray) -> float:
     Returns:
         float: 置信度值，范围0-1，越接近1表示检测越可靠
     """
+    from scipy import signal  # scipy 导入较慢 用到时再导入
+
     length = len(arr)  # 原始数组长度
 
     # 将数组重复3次连接，这样可以处理周期性数据（角度是周期性的）
@@ -159,6 +162,8 @@ def convolve(arr: np.ndarray, kernel: int = 3) -> np.ndarray:
     Returns:
         np.ndarray: 卷积后的平滑数组。
     """
+    from scipy import signal  # scipy 导入较慢 用到时再导入
+
     # 1. 生成三角核 (Triangular Kernel)
     #    核的范围从 -kernel+1 到 kernel-1，总长度为 2*kernel - 1
     kernel_range = np.arange(-kernel + 1, kernel)
@@ -145,19 +145,37 @@ def nms(boxes, scores, iou_threshold):
 
 
 def multiclass_nms(boxes, scores, class_ids, iou_threshold):
-
-    unique_class_ids = np.unique(class_ids)
-
-    keep_boxes = []
-    for class_id in unique_class_ids:
-        class_indices = np.where(class_ids == class_id)[0]
-        class_boxes = boxes[class_indices,:]
-        class_scores = scores[class_indices]
-
-        class_keep_boxes = nms(class_boxes, class_scores, iou_threshold)
-        keep_boxes.extend(class_indices[class_keep_boxes])
-
-    return keep_boxes
+    """
+    多类别的NMS 所有类别一次处理
+    使用 opencv 的 NMSBoxesBatched 按类别给框加上偏移 不同类别的框不会重叠 也就不会互相抑制
+    结果顺序与逐个类别进行NMS一致 按类别升序 同类别内按得分降序
+
+    Args:
+        boxes: 目标框 xyxy (n, 4)
+        scores: 得分 (n,)
+        class_ids: 类别 (n,)
+        iou_threshold: IOU阈值
+
+    Returns:
+        保留的下标
+    """
+    if len(scores) == 0:
+        return []
+
+    boxes = np.asarray(boxes)
+    scores = np.asarray(scores, dtype=np.float32)
+    class_ids = np.asarray(class_ids, dtype=np.int32)
+
+    xywh = np.empty((len(boxes), 4), dtype=np.float64)
+    xywh[:, :2] = boxes[:, :2]
+    xywh[:, 2:] = boxes[:, 2:] - boxes[:, :2]
+    keep_indices = np.asarray(cv2.dnn.NMSBoxesBatched(xywh, scores, class_ids, -np.inf, iou_threshold),
+                              dtype=np.int64).reshape(-1)
+
+    # 先按得分降序 再按类别稳定排序
+    keep_indices = keep_indices[np.argsort(-scores[keep_indices], kind='stable')]
+    keep_indices = keep_indices[np.argsort(class_ids[keep_indices], kind='stable')]
+    return keep_indices.tolist()
 
 
 def compute_iou(box, boxes):
@@ -3,10 +3,12 @@ import time
 import urllib.request
 import zipfile
 
+import numpy as np
 import onnxruntime as ort
 
 from one_dragon.utils import gpu_executor
 from one_dragon.yolo.log_utils import log
+from one_dragon.yolo.onnx_utils import LetterboxPreprocessor
 
 _GH_PROXY_URL = 'https://ghfast.top'
 
@@ -39,6 +41,8 @@ class OnnxModelLoader:
         self.onnx_input_width: int = 0
         self.onnx_input_height: int = 0
         self.output_names: list[str] = []
+        self.preprocessor: LetterboxPreprocessor | None = None  # 按模型输入尺寸复用缓冲区的预处理
+        self.use_io_binding: bool = True  # 是否使用IO绑定推理 失败后不再使用
 
         if not self.check_and_download_model():  # 新模型不ok
             log.error(f'模型 {self.model_name} 未下载成功 请尝试更换代理下载')
@@ -163,6 +167,36 @@ class OnnxModelLoader:
     def run_session(self, output_names: list[str], input_feed: dict):
         return gpu_executor.run_session(self.session, output_names, input_feed=input_feed)
 
+    def run_session_io_binding(self, input_tensor: np.ndarray) -> list[np.ndarray]:
+        """
+        使用IO绑定进行推理 直接使用输入张量的内存 不需要再复制一份输入
+        IO绑定不可用时 回退到普通的推理
+
+        Args:
+            input_tensor: 第一个输入的张量 需要是连续内存
+
+        Returns:
+            list[np.ndarray]: 全部输出
+        """
+        if self.use_io_binding:
+            try:
+                if gpu_executor.should_serialize_session(self.session):
+                    return gpu_executor.run_sync(self._run_io_binding, input_tensor)
+                return self._run_io_binding(input_tensor)
+            except Exception:
+                log.warning('模型 %s 使用IO绑定推理失败 改用普通推理', self.model_name, exc_info=True)
+                self.use_io_binding = False
+
+        return self.run_session(self.output_names, {self.input_names[0]: input_tensor})
+
+    def _run_io_binding(self, input_tensor: np.ndarray) -> list[np.ndarray]:
+        binding = self.session.io_binding()
+        binding.bind_cpu_input(self.input_names[0], input_tensor)
+        for name in self.output_names:
+            binding.bind_output(name, 'cpu')
+        self.session.run_with_iobinding(binding)
+        return binding.copy_outputs_to_cpu()
+
     def get_input_details(self):
         model_inputs = self.session.get_inputs()
         self.input_names = [model_inputs[i].name for i in range(len(model_inputs))]
@@ -170,6 +204,7 @@ class OnnxModelLoader:
         shape = model_inputs[0].shape
         self.onnx_input_height = shape[2]
         self.onnx_input_width = shape[3]
+        self.preprocessor = LetterboxPreprocessor(self.onnx_input_width, self.onnx_input_height)
 
     def get_output_details(self):
         model_outputs = self.session.get_outputs()
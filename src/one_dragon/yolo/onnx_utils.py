@@ -1,3 +1,4 @@
+import threading
 from typing import Tuple
 
 import cv2
@@ -38,3 +39,72 @@ def scale_input_image_u(image: MatLike, onnx_input_width: int, onnx_input_height
     input_tensor = input_img[np.newaxis, :, :, :].astype(np.float32)
 
     return input_tensor, scale_height, scale_width
+
+
+class LetterboxPreprocessor:
+
+    def __init__(self, onnx_input_width: int, onnx_input_height: int):
+        """
+        按照 ultralytics 的方式缩放图片 结果与 scale_input_image_u 一致
+        每个模型持有一个 复用缩放后的图片和输入张量 缩放、归一化、转置过程中不产生完整尺寸的临时数组
+        缓冲区按线程区分 返回的张量在同一线程下次调用时会被覆盖 需要在推理完成后再调用
+
+        Args:
+            onnx_input_width: 模型需要的图片宽度
+            onnx_input_height: 模型需要的图片高度
+        """
+        self.onnx_input_width: int = onnx_input_width
+        self.onnx_input_height: int = onnx_input_height
+        self._local = threading.local()
+
+    def _get_buffers(self) -> tuple[np.ndarray, dict[tuple[int, int], np.ndarray]]:
+        """
+        获取当前线程的缓冲区
+
+        Returns:
+            tuple[np.ndarray, dict]: 输入张量 和 按缩放后尺寸区分的图片缓冲区
+        """
+        tensor = getattr(self._local, 'tensor', None)
+        if tensor is None:
+            tensor = np.empty((1, 3, self.onnx_input_height, self.onnx_input_width), dtype=np.float32)
+            self._local.tensor = tensor
+            self._local.scale_map = {}
+            self._local.padding_shape = None
+        return tensor, self._local.scale_map
+
+    def __call__(self, image: MatLike) -> Tuple[np.ndarray, int, int]:
+        """
+        缩放图片并转化成模型的输入
+
+        Args:
+            image: 输入的图片 RGB通道
+
+        Returns:
+            Tuple[np.ndarray, int, int]: 输入张量 (1, 3, h, w) float32, 未padding前的高度, 未padding前的宽度
+        """
+        img_height, img_width = image.shape[:2]
+        min_scale = min(self.onnx_input_height / img_height, self.onnx_input_width / img_width)
+        scale_height = int(round(img_height * min_scale))
+        scale_width = int(round(img_width * min_scale))
+
+        tensor, scale_map = self._get_buffers()
+
+        if self.onnx_input_height != img_height or self.onnx_input_width != img_width:
+            scale_img = scale_map.get((scale_height, scale_width))
+            if scale_img is None:
+                scale_img = np.empty((scale_height, scale_width, 3), dtype=np.uint8)
+                scale_map[(scale_height, scale_width)] = scale_img
+            cv2.resize(image, (scale_width, scale_height), dst=scale_img, interpolation=cv2.INTER_LINEAR)
+        else:
+            scale_img = image
+
+        # padding区域只有缩放尺寸变化时才需要重新填充
+        if self._local.padding_shape != (scale_height, scale_width):
+            tensor.fill(np.float32(114 / 255.0))
+            self._local.padding_shape = (scale_height, scale_width)
+
+        # 归一化和HWC转CHW一步完成 直接写入张量
+        np.divide(scale_img.transpose(2, 0, 1), np.float32(255.0),
+                  out=tensor[0, :, :scale_height, :scale_width], dtype=np.float32)
+
+        return tensor, scale_height, scale_width
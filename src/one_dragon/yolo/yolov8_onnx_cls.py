@@ -4,7 +4,6 @@ import numpy as np
 from cv2.typing import MatLike
 from typing import Optional, List
 
-from one_dragon.yolo import onnx_utils
 from one_dragon.yolo.onnx_model_loader import OnnxModelLoader
 
 
@@ -111,7 +110,7 @@ class Yolov8Classifier(OnnxModelLoader):
         """
         推理前的预处理
         """
-        input_tensor, scale_height, scale_width = onnx_utils.scale_input_image_u(context.img, self.onnx_input_width, self.onnx_input_height)
+        input_tensor, scale_height, scale_width = self.preprocessor(context.img)
         context.scale_height = scale_height
         context.scale_width = scale_width
         return input_tensor
@@ -122,7 +121,7 @@ class Yolov8Classifier(OnnxModelLoader):
         :param input_tensor: 输入模型的图片 RGB通道
         :return: onnx模型推理得到的结果
         """
-        outputs = self.run_session(self.output_names, {self.input_names[0]: input_tensor})
+        outputs = self.run_session_io_binding(input_tensor)
         return outputs
 
     def process_output(self, output, context: RunContext) -> ClassificationResult:
@@ -6,7 +6,6 @@ import os
 from cv2.typing import MatLike
 from typing import Optional, List
 
-from one_dragon.yolo import onnx_utils
 from one_dragon.yolo.detect_utils import DetectFrameResult, DetectClass, DetectContext, DetectObjectResult, xywh2xyxy, \
     multiclass_nms
 from one_dragon.yolo.onnx_model_loader import OnnxModelLoader
@@ -78,7 +77,7 @@ class Yolov8Detector(OnnxModelLoader):
         Returns:
             DetectFrameResult: 识别结果
         """
-        t1 = time.time()
+        t1 = time.perf_counter()
         context = DetectContext(image, run_time)
         context.conf = conf
         context.iou = iou
@@ -86,13 +85,13 @@ class Yolov8Detector(OnnxModelLoader):
         context.category_list = category_list
 
         input_tensor = self.prepare_input(context)
-        t2 = time.time()
+        t2 = time.perf_counter()
 
         outputs = self.inference(input_tensor)
-        t3 = time.time()
+        t3 = time.perf_counter()
 
         results = self.process_output(outputs, context)
-        t4 = time.time()
+        t4 = time.perf_counter()
 
         # log.info(f'识别完毕 得到结果 {len(results)}个。预处理耗时 {t2 - t1:.3f}s, 推理耗时 {t3 - t2:.3f}s, 后处理耗时 {t4 - t3:.3f}s')
 
@@ -110,7 +109,7 @@ class Yolov8Detector(OnnxModelLoader):
         """
         推理前的预处理
         """
-        input_tensor, scale_height, scale_width = onnx_utils.scale_input_image_u(context.img, self.onnx_input_width, self.onnx_input_height)
+        input_tensor, scale_height, scale_width = self.preprocessor(context.img)
         context.scale_height = scale_height
         context.scale_width = scale_width
         return input_tensor
@@ -121,7 +120,7 @@ class Yolov8Detector(OnnxModelLoader):
         :param input_tensor: 输入模型的图片 RGB通道
         :return: onnx模型推理得到的结果
         """
-        outputs = self.run_session(self.output_names, {self.input_names[0]: input_tensor})
+        outputs = self.run_session_io_binding(input_tensor)
         return outputs
 
     def process_output(self, output, context: DetectContext) -> List[DetectObjectResult]:
@@ -132,34 +131,33 @@ class Yolov8Detector(OnnxModelLoader):
         """
         predictions = np.squeeze(output[0]).T
 
-        keep = np.ones(shape=(predictions.shape[1]), dtype=bool)
-
-        if context.label_list is not None or context.category_list is not None:
-            keep[4:] = False  # 前4位是坐标 先把所有标签都设置为False
-            if context.label_list is not None:
-                for label in context.label_list:
-                    idx = self.class_2_idx.get(label)
-                    if idx is not None:
-                        keep[idx + 4] = True
-
-            if context.category_list is not None:
-                for category in context.category_list:
-                    for idx in self.category_2_idx.get(category, []):
-                        keep[idx + 4] = True
-
-        predictions[:, keep == False] = 0
-
-        # 按置信度阈值进行基本的过滤
-        scores = np.max(predictions[:, 4:], axis=1)
-        predictions = predictions[scores > context.conf, :]
-        scores = scores[scores > context.conf]
+        # 先用全部类别的最高置信度过滤 限定标签时得分只会更低 所以不会漏掉结果
+        class_scores = predictions[:, 4:]
+        predictions = predictions[np.max(class_scores, axis=1) > context.conf, :]
 
         results: List[DetectObjectResult] = []
-        if len(scores) == 0:
+        if len(predictions) == 0:
             return results
 
+        class_scores = predictions[:, 4:]
+        allowed_class_ids = self._get_allowed_class_ids(context)
+        if allowed_class_ids is not None:
+            if len(allowed_class_ids) == 0:
+                return results
+            # 只取限定类别的列 再按置信度阈值过滤一次
+            class_scores = class_scores[:, allowed_class_ids]
+            valid = np.max(class_scores, axis=1) > context.conf
+            predictions = predictions[valid, :]
+            class_scores = class_scores[valid, :]
+            if len(predictions) == 0:
+                return results
+
+        scores = np.max(class_scores, axis=1)
+
         # 选择置信度最高的类别
-        class_ids = np.argmax(predictions[:, 4:], axis=1)
+        class_ids = np.argmax(class_scores, axis=1)
+        if allowed_class_ids is not None:
+            class_ids = allowed_class_ids[class_ids]
 
         # 提取Bounding box
         boxes = predictions[:, :4]  # 原始推理结果 xywh
@@ -180,6 +178,32 @@ class Yolov8Detector(OnnxModelLoader):
 
         return results
 
+    def _get_allowed_class_ids(self, context: DetectContext) -> Optional[np.ndarray]:
+        """
+        获取限定识别的类别
+
+        Args:
+            context: 上下文
+
+        Returns:
+            Optional[np.ndarray]: 升序的类别下标 不限定时返回None
+        """
+        if context.label_list is None and context.category_list is None:
+            return None
+
+        class_ids: set[int] = set()
+        if context.label_list is not None:
+            for label in context.label_list:
+                idx = self.class_2_idx.get(label)
+                if idx is not None:
+                    class_ids.add(idx)
+
+        if context.category_list is not None:
+            for category in context.category_list:
+                class_ids.update(self.category_2_idx.get(category, []))
+
+        return np.array(sorted(class_ids), dtype=np.int64)
+
     def record_result(self, context: DetectContext, results: List[DetectObjectResult]) -> DetectFrameResult:
         """
         记录本帧识别结果
@@ -255,14 +279,30 @@ class Yolov8Detector(OnnxModelLoader):
                 value=total_ms,
                 unit="ms",
                 ttl_seconds=20.0,
-                meta={"result_count": result_count},
+                meta={
+                    "result_count": result_count,
+                    "preprocess_ms": preprocess_ms,
+                    "infer_ms": infer_ms,
+                    "postprocess_ms": postprocess_ms,
+                },
+            )
+        )
+        bus.add_performance(
+            PerfMetricSample(
+                metric="yolo_preprocess_ms",
+                value=preprocess_ms,
+                unit="ms",
+                ttl_seconds=20.0,
             )
         )
         bus.add_timeline(
             TimelineItem(
                 category="vision",
                 title="yolo",
-                detail=f"{result_count} objects / {total_ms:.1f}ms",
+                detail=(
+                    f"{result_count} objects / {total_ms:.1f}ms"
+                    f" (pre {preprocess_ms:.1f} / infer {infer_ms:.1f} / post {postprocess_ms:.1f})"
+                ),
                 level="DEBUG",
                 ttl_seconds=15.0,
             )
@@ -34,6 +34,7 @@ _DEFAULT_PANEL_FREE_MODE_MAP: dict[str, bool] = {
 _DEFAULT_PERFORMANCE_METRIC_ENABLED: dict[str, bool] = {
     "ocr_ms": True,
     "yolo_ms": True,
+    "yolo_preprocess_ms": False,
     "cv_pipeline_ms": True,
     "operation_round_ms": True,
     "overlay_refresh_ms": True,
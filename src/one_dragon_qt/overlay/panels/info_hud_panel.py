@@ -23,6 +23,7 @@ _LEVEL_COLOR = {
 _CORE_METRIC_ORDER = [
     "ocr_ms",
     "yolo_ms",
+    "yolo_preprocess_ms",
     "cv_pipeline_ms",
     "operation_round_ms",
     "overlay_refresh_ms",
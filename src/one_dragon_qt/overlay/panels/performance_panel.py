@@ -10,6 +10,7 @@ from one_dragon_qt.widgets.overlay_text_widget import OverlayTextWidget
 _CORE_METRIC_ORDER = [
     "ocr_ms",
     "yolo_ms",
+    "yolo_preprocess_ms",
     "cv_pipeline_ms",
     "operation_round_ms",
     "overlay_refresh_ms",
@@ -647,10 +647,11 @@ class DevtoolsImageAnalysisInterface(VerticalScrollInterface):
 
         if self.logic.context.step_execution_times:
             result_lines.append(f"--- {gt('性能分析')} ---")
-            for step_name, t in self.logic.context.step_execution_times:
-                result_lines.append(f"[{step_name}] - {t:.2f} ms")
+            for step_name, t, allocated_bytes in self.logic.context.step_execution_times:
+                result_lines.append(f"[{step_name}] - {t:.2f} ms, {allocated_bytes / 1024:.1f} KB")
             result_lines.append("-" * 20)
             result_lines.append(f"{gt('总耗时')}: {self.logic.context.total_execution_time:.2f} ms")
+            result_lines.append(f"{gt('总分配')}: {self.logic.context.total_allocated_bytes / 1024:.1f} KB")
 
         self.result_text.setPlainText('\n'.join(result_lines))
         self._update_toggle_button_text()
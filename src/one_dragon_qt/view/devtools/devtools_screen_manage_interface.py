@@ -30,6 +30,7 @@ from qfluentwidgets import (
 from one_dragon.base.config.config_item import ConfigItem
 from one_dragon.base.geometry.rectangle import Rect
 from one_dragon.base.operation.one_dragon_context import OneDragonContext
+from one_dragon.base.screen import screen_utils
 from one_dragon.base.screen.screen_area import ScreenArea
 from one_dragon.base.screen.screen_info import ScreenInfo
 from one_dragon.base.screen.template_info import (
@@ -109,6 +110,7 @@ class DevtoolsScreenManageInterface(VerticalScrollInterface, HistoryMixin):
                    formatter=lambda v: ','.join(v) if v else ''),
         ColumnMeta('手柄键', 'gamepad_key', lambda x: x.strip() or None, 120,
                    formatter=lambda v: '' if v is None else str(v)),
+        ColumnMeta('仅识别', 'rec_only', lambda x: x.strip().lower() in ('true', '1'), 70),
     ]
 
     AREA_FIELD_2_COLUMN: dict[str, int] = {col.display_name: idx for idx, col in enumerate(AREA_COLUMNS)}
@@ -219,6 +221,11 @@ class DevtoolsScreenManageInterface(VerticalScrollInterface, HistoryMixin):
         self.choose_template_btn.clicked.connect(self.choose_existed_template)
         img_btn_row.add_widget(self.choose_template_btn)
 
+        self.analyse_rec_only_btn = PushButton(text=gt('分析仅识别'))
+        self.analyse_rec_only_btn.setToolTip(gt('根据当前图片 找出可以跳过文本检测的固定单行文本区域'))
+        self.analyse_rec_only_btn.clicked.connect(self._on_analyse_rec_only_clicked)
+        img_btn_row.add_widget(self.analyse_rec_only_btn)
+
         self.screen_id_label = BodyLabel(text=gt('ID'))
         self.screen_id_edit = LineEdit()
         self.screen_id_edit.setMinimumWidth(200)
@@ -403,6 +410,7 @@ class DevtoolsScreenManageInterface(VerticalScrollInterface, HistoryMixin):
         self.cancel_btn.setDisabled(not chosen)
 
         self.choose_image_btn.setDisabled(not chosen)
+        self.analyse_rec_only_btn.setDisabled(not chosen)
         self.screen_id_edit.setDisabled(not chosen)
         self.screen_name_edit.setDisabled(not chosen)
         self.pc_alt_opt.setDisabled(not chosen)
@@ -575,6 +583,29 @@ class DevtoolsScreenManageInterface(VerticalScrollInterface, HistoryMixin):
         self.chosen_screen.screen_image = screen
         self._image_update.signal.emit()
 
+    def _on_analyse_rec_only_clicked(self) -> None:
+        """
+        分析当前图片中的文本区域 是否适合跳过文本检测直接识别
+        """
+        if self.chosen_screen is None or self.chosen_screen.screen_image is None:
+            return
+
+        suitable_list: list[str] = []
+        for area_item in self.chosen_screen.area_list:
+            if not area_item.is_text_area:
+                continue
+            area_item.rec_only = screen_utils.is_rec_only_suitable(self.ctx, self.chosen_screen.screen_image, area_item)
+            if area_item.rec_only:
+                suitable_list.append(area_item.area_name)
+
+        self._area_table_update.signal.emit()
+        self.show_info_bar(
+            '分析完成',
+            f'可仅识别的区域: {", ".join(suitable_list)}' if suitable_list else '没有可仅识别的区域',
+            icon=InfoBarIcon.SUCCESS,
+            duration=5000,
+        )
+
     def _on_image_pasted(self, image_data) -> None:
         """通过拖放或粘贴加载图片后的回调，等同于“选择图片”。
 
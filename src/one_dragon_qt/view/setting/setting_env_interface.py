@@ -27,6 +27,7 @@ from one_dragon_qt.widgets.setting_card.key_setting_card import KeySettingCard
 from one_dragon_qt.widgets.setting_card.password_switch_setting_card import (
     PasswordSwitchSettingCard,
 )
+from one_dragon_qt.widgets.setting_card.spin_box_setting_card import SpinBoxSettingCard
 from one_dragon_qt.widgets.setting_card.switch_setting_card import SwitchSettingCard
 from one_dragon_qt.widgets.setting_card.text_setting_card import TextSettingCard
 from one_dragon_qt.widgets.vertical_scroll_interface import VerticalScrollInterface
@@ -68,6 +69,14 @@ class SettingEnvInterface(VerticalScrollInterface):
         self.screenshot_method_opt.value_changed.connect(lambda: self.ctx.init_controller())
         basic_group.addSettingCard(self.screenshot_method_opt)
 
+        self.capture_service_fps_opt = SpinBoxSettingCard(
+            icon=FluentIcon.CAMERA, title='后台截图帧率',
+            content='大于0时在后台持续截图，运行时直接使用最新的截图，0为不开启',
+            minimum=0, maximum=60,
+        )
+        self.capture_service_fps_opt.value_changed.connect(lambda: self.ctx.init_controller())
+        basic_group.addSettingCard(self.capture_service_fps_opt)
+
         self.debug_opt = SwitchSettingCard(
             icon=FluentIcon.SEARCH, title='调试模式', content='正常无需开启'
         )
@@ -196,6 +205,7 @@ class SettingEnvInterface(VerticalScrollInterface):
         VerticalScrollInterface.on_interface_shown(self)
 
         self.screenshot_method_opt.init_with_adapter(self.ctx.env_config.get_prop_adapter('screenshot_method'))
+        self.capture_service_fps_opt.init_with_adapter(self.ctx.env_config.get_prop_adapter('capture_service_fps'))
         self.debug_opt.init_with_adapter(self.ctx.env_config.get_prop_adapter('is_debug'))
         self.copy_screenshot_opt.init_with_adapter(self.ctx.env_config.get_prop_adapter('copy_screenshot'))
 
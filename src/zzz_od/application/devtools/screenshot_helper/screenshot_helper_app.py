@@ -1,6 +1,9 @@
 import time
+from collections import deque
 from typing import Optional
 
+from cv2.typing import MatLike
+
 from one_dragon.base.operation.application import application_const
 from one_dragon.base.operation.context_event_bus import ContextEventItem
 from one_dragon.base.operation.one_dragon_context import ContextKeyboardEventEnum
@@ -39,7 +42,7 @@ class ScreenshotHelperApp(ZApplication):
 
         self.to_save_screenshot: bool = False  # 去保存截图 由按键触发
         self.last_save_screenshot_time: float = 0  # 上次保存截图时间
-        self.screenshot_cache: list = []  # 缓存所有截图
+        self.screenshot_cache: deque[MatLike] = deque()  # 缓存最近的截图 有上限的环形队列
         self.cache_start_time: Optional[float] = None  # 缓存开始时间
         self.cache_max_count: int = 0  # 最大缓存数量
         self.is_saving_after_key: bool = False  # 是否正在保存按键后的截图
@@ -55,7 +58,7 @@ class ScreenshotHelperApp(ZApplication):
         self.ctx.controller.screenshot_alive_seconds = length_second + 1
         self.ctx.controller.max_screenshot_cnt = length_second // freq_second + 5
         self.cache_max_count = length_second // freq_second + 1
-        self.screenshot_cache = []
+        self.screenshot_cache = deque(maxlen=self.cache_max_count)
         self.cache_start_time = time.time()
         self.ctx.listen_event(ContextKeyboardEventEnum.PRESS.value, self._on_key_press)
 
@@ -77,7 +80,7 @@ class ScreenshotHelperApp(ZApplication):
         # 缓存截图
         if self.cache_start_time is None:
             self.cache_start_time = self.last_screenshot_time
-        self.screenshot_cache.append(self.last_screenshot)
+        self.screenshot_cache.append(self.last_screenshot)  # 超过数量时 自动移除最旧的
 
         if self.config.mini_map_angle_detect:
             mm = self.ctx.world_patrol_service.cut_mini_map(self.last_screenshot)
@@ -85,10 +88,6 @@ class ScreenshotHelperApp(ZApplication):
             log.info(f'当前角度 {angle}')
             if angle is None:
                 self.save_screenshot()
-        # 动态计算最大缓存数量
-        if len(self.screenshot_cache) > self.cache_max_count:
-            self.screenshot_cache.pop(0)
-
         if self.config.dodge_detect:
             if self.ctx.auto_battle_context.dodge_context.check_dodge_flash(self.last_screenshot, self.last_screenshot_time):
                 debug_utils.save_debug_image(self.last_screenshot, prefix='dodge')
@@ -129,13 +128,13 @@ class ScreenshotHelperApp(ZApplication):
             # 保存缓存中的截图
             for screen in self.screenshot_cache:
                 debug_utils.save_debug_image(screen, prefix='switch')
-            self.screenshot_cache = []
+            self.screenshot_cache.clear()
             self.cache_start_time = time.time()
             self.to_save_screenshot = False
             self.last_save_screenshot_time = time.time()
         else:
             # 清空缓存并开始保存按键后的截图
-            self.screenshot_cache = []
+            self.screenshot_cache.clear()
             self.cache_start_time = time.time()
             self.is_saving_after_key = True
             # 等待一个截图周期后再关闭保存标志，以确保能够捕获按键后的截图
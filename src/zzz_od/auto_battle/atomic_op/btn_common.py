@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING
 
 from one_dragon.base.conditional_operation.atomic_op import AtomicOp
 from one_dragon.base.conditional_operation.operation_def import OperationDef
+from one_dragon.thread.cancel_token import CancelToken
 from zzz_od.auto_battle.auto_battle_state import BattleStateEnum
 
 if TYPE_CHECKING:
@@ -56,6 +57,7 @@ class AtomicBtnCommon(AtomicOp):
 
         self._status = BtnRunStatus.WAIT
         self._update_lock = threading.Lock()
+        self._cancel_token = CancelToken()  # 用于中断前后延迟的等待
         self._method: Callable[[bool, float, bool], None] = None
         if op_name == BattleStateEnum.BTN_DODGE.value:
             self._method = self.ctx.dodge
@@ -95,19 +97,28 @@ class AtomicBtnCommon(AtomicOp):
             if self._status != BtnRunStatus.WAIT:
                 return
             self._status = BtnRunStatus.RUNNING
+            self._cancel_token.reset()
 
+        # 延迟按截止时间计算 重复时不会累积每次等待的误差
+        deadline = time.perf_counter()
         for _i in range(self.repeat_times):
             if self._status != BtnRunStatus.RUNNING:
                 break
 
-            if self._status == BtnRunStatus.RUNNING and self.pre_delay > 0:
-                time.sleep(self.pre_delay)
+            if self.pre_delay > 0:
+                deadline += self.pre_delay
+                if not self._cancel_token.sleep_until(deadline):
+                    break
 
             if self._status == BtnRunStatus.RUNNING:
                 self._method(press=self.is_press, press_time=self.press_time, release=self.is_release)
 
+            # 后延迟从按键完成后开始计算
+            deadline = time.perf_counter()
             if self._status == BtnRunStatus.RUNNING and self.post_delay > 0:
-                time.sleep(self.post_delay)
+                deadline += self.post_delay
+                if not self._cancel_token.sleep_until(deadline):
+                    break
 
         with self._update_lock:
             self._status = BtnRunStatus.WAIT
@@ -116,6 +127,7 @@ class AtomicBtnCommon(AtomicOp):
         with self._update_lock:
             if self._status == BtnRunStatus.RUNNING:
                 self._status = BtnRunStatus.STOP
+                self._cancel_token.cancel()
 
         if self.is_press:
             self._method(release=True)
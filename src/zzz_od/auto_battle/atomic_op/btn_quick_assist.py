@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 import threading
-import time
 from typing import TYPE_CHECKING, ClassVar
 
 from one_dragon.base.conditional_operation.atomic_op import AtomicOp
 from one_dragon.base.conditional_operation.operation_def import OperationDef
+from one_dragon.thread.cancel_token import CancelToken
 from zzz_od.auto_battle.atomic_op.btn_common import BtnRunStatus
 
 if TYPE_CHECKING:
@@ -26,21 +26,23 @@ class AtomicBtnQuickAssist(AtomicOp):
 
         self._status = BtnRunStatus.WAIT
         self._update_lock = threading.Lock()
+        self._cancel_token = CancelToken()  # 用于中断前后延迟的等待
 
     def execute(self):
         with self._update_lock:
             if self._status != BtnRunStatus.WAIT:
                 return
             self._status = BtnRunStatus.RUNNING
+            self._cancel_token.reset()
 
         if self._status == BtnRunStatus.RUNNING and self.pre_delay > 0:
-            time.sleep(self.pre_delay)
+            self._cancel_token.sleep(self.pre_delay)
 
         if self._status == BtnRunStatus.RUNNING:
             self.ctx.quick_assist()
 
         if self._status == BtnRunStatus.RUNNING and self.post_delay > 0:
-            time.sleep(self.post_delay)
+            self._cancel_token.sleep(self.post_delay)
 
         with self._update_lock:
             self._status = BtnRunStatus.WAIT
@@ -48,3 +50,4 @@ class AtomicBtnQuickAssist(AtomicOp):
     def stop(self) -> None:
         with self._update_lock:
             self._status = BtnRunStatus.STOP
+            self._cancel_token.cancel()
@@ -1,8 +1,8 @@
-import threading
 from typing import ClassVar
 
 from one_dragon.base.conditional_operation.atomic_op import AtomicOp
 from one_dragon.base.conditional_operation.operation_def import OperationDef
+from one_dragon.thread.cancel_token import CancelToken
 
 
 class AtomicWait(AtomicOp):
@@ -15,13 +15,13 @@ class AtomicWait(AtomicOp):
             wait_seconds = float(op_def.data[0])
         AtomicOp.__init__(self, op_name=f'{AtomicWait.OP_NAME} {wait_seconds:.2f}')
         self.wait_seconds: float = wait_seconds
-        self._stop_event = threading.Event()  # 用于中断的Event
+        self._cancel_token = CancelToken()  # 用于中断等待
 
     def execute(self):
-        self._stop_event.clear()
-        # 使用 wait() 而不是 sleep()，这样可以被 stop() 中断
-        self._stop_event.wait(timeout=self.wait_seconds)
+        self._cancel_token.reset()
+        # 可以被 stop() 中断 且按截止时间等待 精度不受系统定时器影响
+        self._cancel_token.sleep(self.wait_seconds)
 
     def stop(self):
         # 中断等待
-        self._stop_event.set()
+        self._cancel_token.cancel()
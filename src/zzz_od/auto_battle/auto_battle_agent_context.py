@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 import threading
-from concurrent.futures import ThreadPoolExecutor, Future
 from typing import Optional, List, Union, Tuple, Callable, TYPE_CHECKING
 
 from cv2.typing import MatLike
 
 from one_dragon.base.conditional_operation.state_recorder import StateRecord, StateRecorder
+from one_dragon.base.matcher.template_atlas import TemplateAtlas
 from one_dragon.base.screen.screen_area import ScreenArea
 from one_dragon.utils import cv2_utils, cal_utils
 from one_dragon.utils.log_utils import log
@@ -18,7 +18,7 @@ if TYPE_CHECKING:
     from zzz_od.context.zzz_context import ZContext
     from zzz_od.auto_battle.auto_battle_operator import AutoBattleOperator
 
-_battle_agent_context_executor = ThreadPoolExecutor(thread_name_prefix='od_battle_agent_context', max_workers=16)
+_AVATAR_PREFIX_LIST: list[str] = ['avatar_1_', 'avatar_2_', 'avatar_chain_', 'avatar_quick_']  # 战斗中使用的头像模板前缀
 _agent_state_check_method: dict[AgentStateCheckWay, Callable] = {
     AgentStateCheckWay.COLOR_RANGE_CONNECT: agent_state_checker.check_cnt_by_color_range,
     AgentStateCheckWay.COLOR_RANGE_EXIST: agent_state_checker.check_exist_by_color_range,
@@ -306,6 +306,10 @@ class AutoBattleAgentContext:
         self._last_switch_agent_time: float = 0
         self._last_ultimate_time: float = 0  # 上次释放终结技的时间
 
+        # 头像模板图集 key=模板前缀 所有代理人的头像一次完成粗略匹配
+        self._avatar_atlas_map: dict[str, TemplateAtlas] = {}
+        self._avatar_atlas_lock = threading.Lock()
+
     def init_screen_area(self) -> None:
         # 识别区域 先读取出来 不要每次用的时候再读取
         self.area_agent_3_1: ScreenArea = self.ctx.screen_loader.get_area('战斗画面', '头像-3-1')
@@ -333,6 +337,70 @@ class AutoBattleAgentContext:
         self._last_check_agent_time: float = 0
         self._last_switch_agent_time: float = 0
 
+        # 提前构建头像图集 避免第一次识别时耗时
+        for prefix in _AVATAR_PREFIX_LIST:
+            self.get_avatar_atlas(prefix)
+
+    def get_avatar_atlas(self, prefix: str) -> TemplateAtlas:
+        """
+        获取某种头像的模板图集 第一次获取时构建
+
+        Args:
+            prefix: 头像模板ID的前缀
+
+        Returns:
+            TemplateAtlas: 所有代理人该种头像的模板图集
+        """
+        atlas = self._avatar_atlas_map.get(prefix)
+        if atlas is not None:
+            return atlas
+
+        with self._avatar_atlas_lock:
+            atlas = self._avatar_atlas_map.get(prefix)
+            if atlas is None:
+                template_list = []
+                for agent_enum in AgentEnum:
+                    for template_id in agent_enum.value.template_id_list:
+                        template = self.ctx.template_loader.get_template('battle', prefix + template_id)
+                        if template is not None:
+                            template_list.append(template)
+                atlas = TemplateAtlas(template_list)
+                self._avatar_atlas_map[prefix] = atlas
+
+        return atlas
+
+    def match_avatar(
+        self,
+        img: MatLike,
+        prefix: str,
+        candidate_list: List[Tuple[Agent, str]],
+        threshold: float = 0.8,
+    ) -> Tuple[Optional[Agent], Optional[str]]:
+        """
+        在候选的头像模板中 找到匹配度最高的
+
+        Args:
+            img: 裁剪好的头像图片
+            prefix: 头像模板ID的前缀
+            candidate_list: 候选的代理人和皮肤模板
+            threshold: 匹配阈值
+
+        Returns:
+            匹配命中的代理人和对应的皮肤模板
+        """
+        if len(candidate_list) == 0:
+            return None, None
+
+        template_2_agent: dict[str, Tuple[Agent, str]] = {
+            prefix + template_id: (agent, template_id)
+            for agent, template_id in candidate_list
+        }
+        mr = self.get_avatar_atlas(prefix).match_best(img, list(template_2_agent.keys()), threshold=threshold)
+        if mr is None:
+            return None, None
+
+        return template_2_agent[mr.data]
+
     def get_possible_agent_list(self) -> Optional[List[Tuple[Agent, Optional[str]]]]:
         """
         获取用于匹配的候选角色列表
@@ -366,7 +434,7 @@ class AutoBattleAgentContext:
                 return
             self._last_check_agent_time = screenshot_time
 
-            screen_agent_list = self._check_agent_in_parallel(screen)
+            screen_agent_list = self._check_screen_agent(screen)
             if self._should_force_check_all_agents(screen_agent_list):
                 self.team_info.request_check_all_agents()
                 self._last_check_agent_time = 0
@@ -410,9 +478,9 @@ class AutoBattleAgentContext:
         log.debug('当前识别不到任何角色，下一次截图强制重新识别所有角色')
         return True
 
-    def _check_agent_in_parallel(self, screen: MatLike) -> List[Tuple[Agent, Optional[str]]]:
+    def _check_screen_agent(self, screen: MatLike) -> List[Tuple[Agent, Optional[str]]]:
         """
-        并发识别角色
+        识别画面上的角色
         :return:
         """
         area_rect = [
@@ -426,7 +494,6 @@ class AutoBattleAgentContext:
         possible_agents = self.get_possible_agent_list()
 
         result_agent_list: List[Tuple[Optional[Agent], Optional[str]]] = []
-        future_list: List[Optional[Future]] = []
         should_check: List[bool] = [True, False, False, False]
 
         if not self.team_info.should_check_all_agents:
@@ -439,18 +506,13 @@ class AutoBattleAgentContext:
             for i in range(4):
                 should_check[i] = True
 
+        # 图集匹配很快 在当前任务中依次识别 不占用战斗识别的其它线程
         for i in range(4):
-            if should_check[i]:
-                future_list.append(_battle_agent_context_executor.submit(self._match_agent_in, area_img[i], i == 0, possible_agents))
-            else:
-                future_list.append(None)
-
-        for future in future_list:
-            if future is None:
+            if not should_check[i]:
                 result_agent_list.append((None, None))
                 continue
             try:
-                result_agent, result_template_id = future.result()
+                result_agent, result_template_id = self._match_agent_in(area_img[i], i == 0, possible_agents)
                 result_agent_list.append((result_agent, result_template_id))
             except Exception:
                 log.error('识别角色头像失败', exc_info=True)
@@ -482,10 +544,6 @@ class AutoBattleAgentContext:
             匹配命中的代理人和对应的皮肤模板
         """
         # 代理人和皮肤多了之后 容易有头像相似度高 因此需要匹配度最高的 见 issue #1695
-        best_agent: Agent | None = None
-        best_template_id: str | None = None
-        best_confidence: float = 0
-
         prefix = "avatar_1_" if is_front else "avatar_2_"
         # 构造待匹配的模板列表
         # 1. 优先使用上次成功匹配的ID
@@ -498,41 +556,26 @@ class AutoBattleAgentContext:
                 else:
                     priority_list[1].append((agent, t_id))
 
-        # 按优先级进行匹配
+        # 按优先级进行匹配 同一优先级的模板通过图集一起匹配
         for agent_template_list in priority_list:
-            for agent, template_id in agent_template_list:
-                template_name = prefix + template_id
-                mrl = self.ctx.tm.match_template(img, "battle", template_name, threshold=0.8)
-                if mrl.max is None:
-                    continue
-                if mrl.max.confidence < best_confidence:
-                    continue
-
-                best_agent = agent
-                best_template_id = template_id
-                best_confidence = mrl.max.confidence
-
+            best_agent, best_template_id = self.match_avatar(img, prefix, agent_template_list)
             if best_agent is not None:
                 return best_agent, best_template_id
 
         return None, None
 
-    def _check_agent_state_in_parallel(self, screen: MatLike, screenshot_time: float, agent_state_list: List[CheckAgentState]) -> List[StateRecord]:
+    def _check_agent_state_list(self, screen: MatLike, screenshot_time: float, agent_state_list: List[CheckAgentState]) -> List[StateRecord]:
         """
-        并行识别多个角色状态
+        依次识别多个角色状态
         :param screen: 游戏画面
         :param screenshot_time: 截图时间
         :param agent_state_list: 需要识别的状态列表
         :return:
         """
-        future_list: List[Future] = []
+        result_list: List[StateRecord] = []
         for state in agent_state_list:
-            future_list.append(_battle_agent_context_executor.submit(self._check_agent_state, screen, screenshot_time, state))
-
-        result_list: List[Optional[StateRecord]] = []
-        for future in future_list:
             try:
-                record = future.result()
+                record = self._check_agent_state(screen, screenshot_time, state)
                 if record is not None:
                     result_list.append(record)
             except Exception:
@@ -649,7 +692,7 @@ class AutoBattleAgentContext:
             state = CommonAgentStateEnum.LIFE_DEDUCTION_21.value
         to_check_list.append(CheckAgentState(state))
 
-        all_state_result_list = self._check_agent_state_in_parallel(screen, screenshot_time, to_check_list)
+        all_state_result_list = self._check_agent_state_list(screen, screenshot_time, to_check_list)
         energy_len = len(energy_state_list)
         special_len = len(special_state_list)
         ultimate_len = len(ultimate_state_list)
@@ -918,10 +961,10 @@ class AutoBattleAgentContext:
         """
         App关闭后进行的操作 关闭一切可能资源操作
         """
-        _battle_agent_context_executor.shutdown(wait=False, cancel_futures=True)
+        pass
 
 
-def _debug_check_agent_in_parallel():
+def _debug_check_screen_agent():
     from one_dragon.utils import debug_utils
     screen = debug_utils.get_debug_image('517195536-d8b386c2-64bf-4261-8903-3a479af4661b')
 
@@ -931,14 +974,14 @@ def _debug_check_agent_in_parallel():
     agent_context = AutoBattleAgentContext(ctx)
     agent_context.init_screen_area()
     agent_context.init_battle_agent_context()
-    result_list = agent_context._check_agent_in_parallel(screen)
+    result_list = agent_context._check_screen_agent(screen)
     print(result_list)
     import time
     agent_context.team_info.update_agent_list(result_list, [], [], [], time.time())
     agent_context.team_info.should_check_all_agents = False
-    result_list = agent_context._check_agent_in_parallel(screen)
+    result_list = agent_context._check_screen_agent(screen)
     print(result_list)
 
 
 if __name__ == '__main__':
-    _debug_check_agent_in_parallel()
+    _debug_check_screen_agent()
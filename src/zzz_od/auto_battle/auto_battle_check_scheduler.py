@@ -0,0 +1,22 @@
+from enum import IntEnum
+
+from one_dragon.thread.priority_task_scheduler import PriorityTaskScheduler
+
+
+class BattleCheckPriority(IntEnum):
+    """
+    战斗画面识别任务的优先级 数值越小越先执行
+    """
+    DODGE = 0  # 闪避 晚了就没有意义
+    AGENT = 1  # 角色状态
+    TARGET = 2  # 目标状态
+    ASSIST = 3  # 连携 快速支援 切换后援
+    DISTANCE = 4  # 距离 战斗结束
+    INIT = 5  # 加载资源等不需要按帧处理的任务
+
+
+# 截图后超过这个时间仍未开始的识别任务会被丢弃 此时已经有更新的截图了
+CHECK_MAX_DELAY_SECONDS: float = 0.2
+
+# 所有战斗画面识别共用一个线程池 线程数按CPU核数限制
+battle_check_scheduler = PriorityTaskScheduler(thread_name_prefix='od_battle_check')
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import threading
 import time
-from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import Future
 from typing import TYPE_CHECKING
 
 import cv2
@@ -18,6 +18,11 @@ from one_dragon.utils import cal_utils, cv2_utils, gpu_executor, str_utils, thre
 from one_dragon.utils.log_utils import log
 from zzz_od.auto_battle.atomic_op.atomic_op_factory import AtomicOpFactory
 from zzz_od.auto_battle.auto_battle_agent_context import AutoBattleAgentContext
+from zzz_od.auto_battle.auto_battle_check_scheduler import (
+    CHECK_MAX_DELAY_SECONDS,
+    BattleCheckPriority,
+    battle_check_scheduler,
+)
 from zzz_od.auto_battle.auto_battle_custom_context import AutoBattleCustomContext
 from zzz_od.auto_battle.auto_battle_dodge_context import AutoBattleDodgeContext
 from zzz_od.auto_battle.auto_battle_operator import AutoBattleOperator
@@ -32,9 +37,6 @@ if TYPE_CHECKING:
     from zzz_od.context.zzz_context import ZContext
 
 
-_battle_state_check_executor = ThreadPoolExecutor(thread_name_prefix='od_battle_state_check', max_workers=16)
-
-
 class AutoBattleContext:
 
     def __init__(self, ctx: ZContext):
@@ -130,6 +132,10 @@ class AutoBattleContext:
         self.dodge_context.init_auto_op(auto_op=self.auto_op)
         self.target_context.init_auto_op(auto_op=self.auto_op)
 
+        # 预加载战斗中每帧都会用到的CV流水线 避免第一帧才读取文件
+        battle_pipelines = ['战斗-连携条'] + [task.pipeline_name for task in self.target_context.tasks]
+        self.ctx.cv_service.prewarm_pipelines(battle_pipelines)
+
     def start_auto_battle(self) -> None:
         """
         开始自动战斗
@@ -181,6 +187,15 @@ class AutoBattleContext:
             self.auto_op.stop_running()
         self.stop_context()
 
+        check_stats_text = battle_check_scheduler.get_display_text()
+        if check_stats_text:
+            log.info(f'战斗画面识别统计 {check_stats_text}')
+            battle_check_scheduler.clear_stats()
+
+        flash_stats_text = self.dodge_context.get_flash_display_text()
+        if flash_stats_text:
+            log.info(f'闪光识别统计 {flash_stats_text}')
+
     def init_battle_context(
             self,
     ) -> None:
@@ -228,7 +243,7 @@ class AutoBattleContext:
         App关闭后进行的操作 关闭一切可能资源操作
         """
         self.stop_auto_battle()
-        _battle_state_check_executor.shutdown(wait=False, cancel_futures=True)
+        battle_check_scheduler.shutdown()
 
         self.agent_context.after_app_shutdown()
         self.dodge_context.after_app_shutdown()
@@ -554,45 +569,56 @@ class AutoBattleContext:
         self.last_check_in_battle = in_battle
 
         future_list: list[Future] = []
+        deadline = time.perf_counter() + CHECK_MAX_DELAY_SECONDS
 
         # 统一提交检测任务
         if in_battle:
-            # 闪避相关
-            audio_future = _battle_state_check_executor.submit(self.dodge_context.check_dodge_audio, screenshot_time)
-            future_list.append(audio_future)
-            if self.ctx.model_config.flash_classifier_gpu:
-                future_list.append(gpu_executor.submit(self.dodge_context.check_dodge_flash, screen, screenshot_time, audio_future))
-            else:
-                future_list.append(_battle_state_check_executor.submit(self.dodge_context.check_dodge_flash, screen, screenshot_time, audio_future))
+            # 闪避相关 声音在画面识别的任务中一起识别
+            future_list.append(self._submit_check(
+                '闪避', BattleCheckPriority.DODGE, deadline, False,
+                self._check_dodge, screen, screenshot_time
+            ))
 
             # 角色状态
-            future_list.append(_battle_state_check_executor.submit(self.agent_context.check_agent_related, screen, screenshot_time))
+            future_list.append(self._submit_check(
+                '角色', BattleCheckPriority.AGENT, deadline, False,
+                self.agent_context.check_agent_related, screen, screenshot_time
+            ))
 
             # 目标状态
-            future_list.append(_battle_state_check_executor.submit(self.target_context.run_all_checks, screen, screenshot_time))
+            future_list.append(self._submit_check(
+                '目标', BattleCheckPriority.TARGET, deadline, False,
+                self.target_context.run_all_checks, screen, screenshot_time
+            ))
 
             # 快速支援
-            future_list.append(_battle_state_check_executor.submit(self.check_quick_assist, screen, screenshot_time))
-            future_list.append(_battle_state_check_executor.submit(self.check_switch_backup, screen, screenshot_time))
+            future_list.append(self._submit_check(
+                '快速支援', BattleCheckPriority.ASSIST, deadline, False,
+                self.check_quick_assist, screen, screenshot_time
+            ))
+            future_list.append(self._submit_check(
+                '切换后援', BattleCheckPriority.ASSIST, deadline, False,
+                self.check_switch_backup, screen, screenshot_time
+            ))
 
             # 距离
             if check_distance:
-                if self.ctx.model_config.ocr_use_gpu:
-                    future_list.append(gpu_executor.submit(self._check_distance_with_lock, screen, screenshot_time))
-                else:
-                    future_list.append(_battle_state_check_executor.submit(self._check_distance_with_lock, screen, screenshot_time))
+                future_list.append(self._submit_check(
+                    '距离', BattleCheckPriority.DISTANCE, deadline, self.ctx.model_config.ocr_use_gpu,
+                    self._check_distance_with_lock, screen, screenshot_time
+                ))
         else:
             # 连携
-            future_list.append(_battle_state_check_executor.submit(self.check_chain_attack, screen, screenshot_time))
+            future_list.append(self._submit_check(
+                '连携', BattleCheckPriority.ASSIST, deadline, False,
+                self.check_chain_attack, screen, screenshot_time
+            ))
 
             # 战斗结束
             check_battle_end = check_battle_end_normal_result or check_battle_end_hollow_result or check_battle_end_defense_result
             if check_battle_end:
-                if self.ctx.model_config.ocr_use_gpu:
-                    executor = gpu_executor
-                else:
-                    executor = _battle_state_check_executor
-                future_list.append(executor.submit(
+                future_list.append(self._submit_check(
+                    '战斗结束', BattleCheckPriority.DISTANCE, deadline, self.ctx.model_config.ocr_use_gpu,
                     self._check_battle_end,
                     screen, screenshot_time,
                     check_battle_end_normal_result, check_battle_end_hollow_result, check_battle_end_defense_result
@@ -608,6 +634,47 @@ class AutoBattleContext:
 
         return in_battle
 
+    def _submit_check(
+        self,
+        name: str,
+        priority: BattleCheckPriority,
+        deadline: float,
+        use_gpu: bool,
+        fn,
+        *args
+    ) -> Future:
+        """
+        提交一个识别任务到战斗识别线程池
+        同一种识别在排队中只保留最新的截图 超过截止时间仍未开始的会被丢弃
+
+        Args:
+            name: 识别名称 用于替换排队中的旧截图和统计
+            priority: 优先级
+            deadline: 截止时间 time.perf_counter()
+            use_gpu: 是否在GPU线程中执行
+            fn: 识别方法
+
+        Returns:
+            Future: 识别结果 被丢弃时为None
+        """
+        if use_gpu:
+            return battle_check_scheduler.submit(name, gpu_executor.run_sync, fn, *args,
+                                                 priority=priority, deadline=deadline)
+        else:
+            return battle_check_scheduler.submit(name, fn, *args,
+                                                 priority=priority, deadline=deadline)
+
+    def _check_dodge(self, screen: MatLike, screenshot_time: float) -> bool:
+        """
+        识别闪避 画面没有闪光时再使用声音的结果
+        声音识别很快 在同一个任务中先识别 避免占用另一个线程等待结果 只有画面识别放到GPU线程
+        """
+        audio_result = self.dodge_context.check_dodge_audio(screenshot_time)
+        if self.ctx.model_config.flash_classifier_gpu:
+            return gpu_executor.run_sync(self.dodge_context.check_dodge_flash, screen, screenshot_time, audio_result)
+        else:
+            return self.dodge_context.check_dodge_flash(screen, screenshot_time, audio_result)
+
     def check_chain_attack(self, screen: MatLike, screenshot_time: float) -> None:
         """
         识别连携技
@@ -621,15 +688,15 @@ class AutoBattleContext:
                 return
             self._last_check_chain_time = screenshot_time
 
-            self._check_chain_attack_in_parallel(screen, screenshot_time)
+            self._check_chain_attack_agent(screen, screenshot_time)
         except Exception:
             log.error('识别连携技出错', exc_info=True)
         finally:
             self._check_chain_lock.release()
 
-    def _check_chain_attack_in_parallel(self, screen: MatLike, screenshot_time: float):
+    def _check_chain_attack_agent(self, screen: MatLike, screenshot_time: float):
         """
-        并行识别连携技角色
+        识别连携技角色
         """
         c1 = cv2_utils.crop_image_only(screen, self.area_chain_1.rect)
         c2 = cv2_utils.crop_image_only(screen, self.area_chain_2.rect)
@@ -637,19 +704,17 @@ class AutoBattleContext:
         possible_agents = self.agent_context.get_possible_agent_list()
 
         # 连携技角色识别
-        result_agent_list: list[Agent | None] = []
-        future_list: list[Future] = []
-        future_list.append(_battle_state_check_executor.submit(self._match_chain_agent_in, c1, possible_agents))
-        future_list.append(_battle_state_check_executor.submit(self._match_chain_agent_in, c2, possible_agents))
-
         # 连携条检测（独立运行，结果在方法内部处理）
-        _battle_state_check_executor.submit(self._check_chain_bar, screen, screenshot_time)
+        future = battle_check_scheduler.submit('连携条', self._check_chain_bar, screen, screenshot_time,
+                                               priority=BattleCheckPriority.ASSIST,
+                                               deadline=time.perf_counter() + CHECK_MAX_DELAY_SECONDS)
+        future.add_done_callback(thread_utils.handle_future_result)
 
-        for future in future_list:
+        # 在当前任务中依次识别 不占用其它线程等待结果
+        result_agent_list: list[Agent | None] = []
+        for img in [c1, c2]:
             try:
-                future.add_done_callback(thread_utils.handle_future_result)
-                result = future.result()
-                result_agent_list.append(result)
+                result_agent_list.append(self._match_chain_agent_in(img, possible_agents))
             except Exception:
                 log.error('识别连携技角色头像失败', exc_info=True)
                 result_agent_list.append(None)
@@ -709,22 +774,16 @@ class AutoBattleContext:
         :return:
         """
         prefix = 'avatar_chain_'
+        # 上次识别过的模板 ID 只使用这个模板 否则匹配所有可能的模板 ID
+        candidate_list: list[tuple[Agent, str]] = []
         for agent, specific_template_id in possible_agents:
-            # 上次识别过的模板 ID，接着用
             if specific_template_id:
-                template_to_check = prefix + specific_template_id
-                mrl = self.ctx.tm.match_template(img, 'battle', template_to_check, threshold=0.8)
-                if mrl.max is not None:
-                    return agent
-            # 没有上次识别过的模板 ID，匹配所有可能的模板 ID
+                candidate_list.append((agent, specific_template_id))
             else:
-                for template_id in agent.template_id_list:
-                    template_to_check = prefix + template_id
-                    mrl = self.ctx.tm.match_template(img, 'battle', template_to_check, threshold=0.8)
-                    if mrl.max is not None:
-                        return agent
+                candidate_list.extend((agent, template_id) for template_id in agent.template_id_list)
 
-        return None
+        agent, _ = self.agent_context.match_avatar(img, prefix, candidate_list)
+        return agent
 
     def _check_chain_bar(self, screen: MatLike, screenshot_time: float) -> bool:
         """
@@ -862,22 +921,16 @@ class AutoBattleContext:
         :return:
         """
         prefix = 'avatar_quick_'
+        # 上次识别过的模板 ID 只使用这个模板 否则匹配所有可能的模板 ID
+        candidate_list: list[tuple[Agent, str]] = []
         for agent, specific_template_id in possible_agents:
-            # 上次识别过的模板 ID，接着用
             if specific_template_id:
-                template_to_check = prefix + specific_template_id
-                mrl = self.ctx.tm.match_template(img, 'battle', template_to_check, threshold=0.8)
-                if mrl.max is not None:
-                    return agent
-            # 没有上次识别过的模板 ID，匹配所有可能的模板 ID
+                candidate_list.append((agent, specific_template_id))
             else:
-                for template_id in agent.template_id_list:
-                    template_to_check = prefix + template_id
-                    mrl = self.ctx.tm.match_template(img, 'battle', template_to_check, threshold=0.8)
-                    if mrl.max is not None:
-                        return agent
+                candidate_list.extend((agent, template_id) for template_id in agent.template_id_list)
 
-        return None
+        agent, _ = self.agent_context.match_avatar(img, prefix, candidate_list)
+        return agent
 
     def _check_battle_end(self, screen: MatLike, screenshot_time: float,
                           check_battle_end_normal_result: bool,
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import threading
+import warnings
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy import fft as sp_fft
+from scipy import signal
+from scipy.io import wavfile
+
+from one_dragon.utils import thread_utils
+from one_dragon.utils.log_utils import log
+
+_audio_record_executor = ThreadPoolExecutor(thread_name_prefix='od_dodge_audio', max_workers=1)
+
+
+def get_highpass_sos(sample_rate: int, cut_off: float, filter_degree: int) -> np.ndarray:
+    """
+    Butterworth高通滤波器 使用二阶节形式 分块滤波时数值更稳定
+    级联两次 幅频响应与原来的 filtfilt 一致 相位偏移对模板和录音相同 不影响对齐
+
+    Args:
+        sample_rate: 采样率
+        cut_off: 截止频率
+        filter_degree: 阶数
+
+    Returns:
+        np.ndarray: 二阶节系数
+    """
+    sos = signal.butter(filter_degree, cut_off, btype='highpass', output='sos', fs=sample_rate)
+    return np.vstack([sos, sos])
+
+
+def load_audio_template(file_path: str, sample_rate: int) -> np.ndarray:
+    """
+    读取音频模板 转成单声道并重采样
+
+    Args:
+        file_path: wav文件路径
+        sample_rate: 目标采样率
+
+    Returns:
+        np.ndarray: 单声道音频
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', wavfile.WavFileWarning)
+        file_sample_rate, data = wavfile.read(file_path)
+
+    if np.issubdtype(data.dtype, np.integer):
+        data = data.astype(np.float64) / np.iinfo(data.dtype).max
+    else:
+        data = data.astype(np.float64)
+    if data.ndim > 1:
+        data = data.mean(axis=1)
+
+    if file_sample_rate != sample_rate:
+        gcd = np.gcd(file_sample_rate, sample_rate)
+        data = signal.resample_poly(data, sample_rate // gcd, file_sample_rate // gcd)
+
+    return data
+
+
+class AudioRecorder:
+    """
+    音频录制类，用于录制和处理音频数据。
+    录音滤波后写入环形缓冲区 只有录音线程写入 读取时不需要加锁
+    """
+
+    def __init__(self, error_callback: Callable[[RuntimeError], None] | None = None):
+        self.running: bool = False  # 标记录制是否正在运行
+        self._run_lock = threading.Lock()  # 用于线程安全的锁
+        self._error_callback: Callable[[RuntimeError], None] | None = error_callback
+
+        self.sample_rate = 32000  # 采样率
+        self._used_channel = 2  # 使用的音频通道数
+        self._sample_len = 0.01  # 每次采样的长度（秒）
+        self._chunk_size = int(self.sample_rate * self._sample_len)  # 每个音频块的大小
+
+        self.trigger_threshold = 0.1  # 触发阈值
+
+        self._filter_degree = 4  # 四阶bathworth多项式, 越大阻带区域滤波程度越大
+        self._cut_off = 1000  # Hz,截止频率,对该频率一下的声音进行滤波,若需要识别人声可适当降低
+
+        # Butterworth高通滤波 分块滤波时保留滤波器状态
+        self.filter_sos: np.ndarray = get_highpass_sos(self.sample_rate, self._cut_off, self._filter_degree)
+        self._filter_zi: np.ndarray = np.zeros((self.filter_sos.shape[0], 2), dtype=np.float64)
+
+        self.buffer_size: int = self.sample_rate  # 缓冲区长度为1秒 读取时最多使用一半 留出录音线程写入的余量
+        self._buffer: np.ndarray = np.zeros(self.buffer_size, dtype=np.float32)  # 滤波后的音频 环形缓冲区
+        self.write_idx: int = 0  # 累计写入的采样数 缓冲区的写入位置为 write_idx % buffer_size
+        self.clear_idx: int = 0  # 清除录音时的写入位置 之前的音频不再使用
+
+    def start_running_async(self) -> None:
+        """
+        异步启动音频录制。
+        """
+        with self._run_lock:
+            if self.running:
+                return
+
+            self.running = True
+
+        self._filter_zi[:] = 0
+        self.clear_audio()
+        future = _audio_record_executor.submit(self._record_loop)
+        future.add_done_callback(thread_utils.handle_future_result)
+
+    def _record_loop(self) -> None:
+        """
+        音频录制循环，持续录制音频数据。
+        """
+        # 这个在全局导入的话 会导致QT的选择文件无法使用
+        import soundcard as sc
+        from soundcard.mediafoundation import SoundcardRuntimeWarning
+
+        warnings.filterwarnings('ignore', category=SoundcardRuntimeWarning)
+
+        try:
+            _mic = sc.get_microphone(id=str(sc.default_speaker().name), include_loopback=True)
+            _recorder = _mic.recorder(samplerate=self.sample_rate, channels=self._used_channel)
+            with _recorder as audio_recorder:
+                while self.running:
+                    stream_data = audio_recorder.record(numframes=self._chunk_size)
+                    self.append_audio(stream_data)
+        except RuntimeError as e:
+            log.warning('音频录制异常，已停止声音闪避识别', exc_info=True)
+            if self._error_callback is not None:
+                self._error_callback(e)
+        finally:
+            self.running = False
+
+    def append_audio(self, stream_data: np.ndarray) -> None:
+        """
+        滤波后写入环形缓冲区 只应该在录音线程中调用
+
+        Args:
+            stream_data: 录音数据 (采样数, 声道数) 或单声道
+        """
+        if stream_data.ndim > 1:
+            stream_data = stream_data.mean(axis=1)
+        filtered, self._filter_zi = signal.sosfilt(self.filter_sos, stream_data, zi=self._filter_zi)
+
+        data_len = len(filtered)
+        if data_len >= self.buffer_size:
+            filtered = filtered[-self.buffer_size:]
+            start = (self.write_idx + data_len - self.buffer_size) % self.buffer_size
+        else:
+            start = self.write_idx % self.buffer_size
+        end = start + len(filtered)
+        if end <= self.buffer_size:
+            self._buffer[start:end] = filtered
+        else:
+            first_len = self.buffer_size - start
+            self._buffer[start:] = filtered[:first_len]
+            self._buffer[:end - self.buffer_size] = filtered[first_len:]
+
+        # 写入完成后再更新位置 读取方按位置读取就不会读到一半的数据
+        self.write_idx += data_len
+
+    def get_audio_since(self, start_idx: int) -> tuple[np.ndarray, int]:
+        """
+        获取某个位置之后的音频 最多为缓冲区长度
+
+        Args:
+            start_idx: 开始的写入位置
+
+        Returns:
+            tuple[np.ndarray, int]: 音频数据 和 数据开始的写入位置
+        """
+        end_idx = self.write_idx
+        start_idx = max(start_idx, self.clear_idx, end_idx - self.buffer_size)
+        if start_idx >= end_idx:
+            return np.empty(0, dtype=np.float32), end_idx
+
+        start = start_idx % self.buffer_size
+        end = start + end_idx - start_idx
+        if end <= self.buffer_size:
+            data = self._buffer[start:end].copy()
+        else:
+            data = np.concatenate([self._buffer[start:], self._buffer[:end - self.buffer_size]])
+
+        # 复制期间录音线程可能正在写入下一块 被覆盖的部分不能使用
+        overwritten = self.write_idx + self._chunk_size - self.buffer_size - start_idx
+        if overwritten > 0:
+            data = data[overwritten:]
+            start_idx += overwritten
+
+        return data, start_idx
+
+    def stop_running(self) -> None:
+        """
+        停止音频录制。
+        """
+        self.running = False
+
+    def clear_audio(self) -> None:
+        """
+        清楚当前录音
+        """
+        self.clear_idx = self.write_idx
+
+
+class AudioTemplateMatcher:
+
+    def __init__(self, template: np.ndarray, sample_rate: int, filter_sos: np.ndarray,
+                 match_seconds: float = 0.3, max_new_seconds: float = 0.2):
+        """
+        声音模板匹配 在录音中滑动计算与模板开头部分的归一化互相关
+        每次只计算以新录音结尾的位置 模板的频域结果在初始化时计算好
+
+        Args:
+            template: 未滤波的模板音频
+            sample_rate: 采样率
+            filter_sos: 与录音相同的滤波器
+            match_seconds: 使用模板开头多长的部分匹配 决定了声音出现后多久能识别到
+            max_new_seconds: 每次最多计算多长的新录音
+        """
+        template = signal.sosfilt(filter_sos, template)
+        self.template_len: int = min(len(template), int(sample_rate * match_seconds))
+        template = template[:self.template_len]
+        template = template / np.linalg.norm(template)
+
+        self.max_new_len: int = int(sample_rate * max_new_seconds)
+        self._template: np.ndarray = template
+        # 按FFT长度缓存模板的频域结果 每次新录音的长度基本固定 只会计算一两次
+        self._template_fft_map: dict[int, np.ndarray] = {}
+
+        # 音量过小的片段不计算 避免把静音放大成噪声
+        self.min_rms: float = 1e-4
+        self._min_energy: float = self.min_rms ** 2 * self.template_len
+
+        self.next_idx: int = 0  # 下一个需要计算的结尾位置
+
+    def match(self, recorder: AudioRecorder) -> float:
+        """
+        计算上次之后 以每个新录音结尾的片段与模板的最大相关性
+
+        Args:
+            recorder: 录音
+
+        Returns:
+            float: 最大的归一化互相关 没有足够的录音时返回0
+        """
+        # 需要的录音 = 第一个新结尾之前的模板长度 + 新录音
+        first_end_idx = max(self.next_idx, recorder.write_idx - self.max_new_len)
+        audio, start_idx = recorder.get_audio_since(first_end_idx - self.template_len + 1)
+        self.next_idx = start_idx + len(audio)
+        return self.match_audio(audio)
+
+    def match_audio(self, audio: np.ndarray) -> float:
+        """
+        计算音频中每个模板长度的片段与模板的归一化互相关
+
+        Args:
+            audio: 滤波后的音频
+
+        Returns:
+            float: 最大的归一化互相关 音频比模板短时返回0
+        """
+        window_cnt = len(audio) - self.template_len + 1
+        if window_cnt <= 0:
+            return 0
+        if window_cnt > self.max_new_len:
+            audio = audio[-(self.template_len + self.max_new_len - 1):]
+            window_cnt = self.max_new_len
+
+        audio = audio.astype(np.float64)
+        fft_len = sp_fft.next_fast_len(len(audio), real=True)
+        template_fft = self._template_fft_map.get(fft_len)
+        if template_fft is None:
+            template_fft = np.conj(sp_fft.rfft(self._template, n=fft_len))
+            self._template_fft_map[fft_len] = template_fft
+        corr = sp_fft.irfft(sp_fft.rfft(audio, n=fft_len) * template_fft, n=fft_len)[:window_cnt]
+
+        cum_energy = np.concatenate([[0], np.cumsum(audio * audio)])
+        energy = cum_energy[self.template_len:] - cum_energy[:window_cnt]
+        valid = energy > self._min_energy
+        if not np.any(valid):
+            return 0
+
+        return float(np.max(corr[valid] / np.sqrt(energy[valid])))
+
+    def reset(self, recorder: AudioRecorder) -> None:
+        """
+        识别到声音后重置 之前的录音不再计算
+
+        Args:
+            recorder: 录音
+        """
+        recorder.clear_audio()
+        self.next_idx = recorder.clear_idx
+
+
+def after_app_shutdown() -> None:
+    """
+    App关闭后进行的操作
+    """
+    _audio_record_executor.shutdown(wait=False, cancel_futures=True)
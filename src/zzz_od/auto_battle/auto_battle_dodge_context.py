@@ -2,124 +2,29 @@ from __future__ import annotations
 
 import os
 import threading
-from collections.abc import Callable
-from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
 from typing import TYPE_CHECKING
 
-import librosa
-import numpy as np
 from cv2.typing import MatLike
-from scipy.signal import butter, correlate, filtfilt
-from sklearn.preprocessing import scale
 
 from one_dragon.base.conditional_operation.state_recorder import StateRecord
+from one_dragon.base.geometry.rectangle import Rect
 from one_dragon.base.operation.context_notify_event import ContextNotifyEvent
 from one_dragon.utils import cal_utils, os_utils, thread_utils, yolo_config_utils
 from one_dragon.utils.log_utils import log
+from zzz_od.auto_battle.auto_battle_check_scheduler import (
+    BattleCheckPriority,
+    battle_check_scheduler,
+)
 from zzz_od.context.zzz_context import ZContext
-from zzz_od.yolo.flash_classifier import FlashClassifier
 
 if TYPE_CHECKING:
+    from zzz_od.auto_battle.auto_battle_dodge_audio import (
+        AudioRecorder,
+        AudioTemplateMatcher,
+    )
     from zzz_od.auto_battle.auto_battle_operator import AutoBattleOperator
-
-
-# 创建一个线程池执行器，用于异步执行任务
-_dodge_check_executor = ThreadPoolExecutor(thread_name_prefix='od_dodge_check', max_workers=16)
-
-
-class AudioRecorder:
-    """
-    音频录制类，用于录制和处理音频数据。
-    """
-
-    def __init__(self, error_callback: Callable[[RuntimeError], None] | None = None):
-        self.running: bool = False  # 标记录制是否正在运行
-        self._run_lock = threading.Lock()  # 用于线程安全的锁
-        self._error_callback: Callable[[RuntimeError], None] | None = error_callback
-
-        self._sample_rate = 32000  # 采样率
-        self._used_channel = 2  # 使用的音频通道数
-        self._sample_len = 0.01  # 每次采样的长度（秒）
-        self._chunk_size = int(self._sample_rate * self._sample_len)  # 每个音频块的大小
-
-        self.trigger_threshold = 0.1  # 触发阈值
-
-        self._filter_degree = 4  # 四阶bathworth多项式, 越大阻带区域滤波程度越大
-        self._cut_off = 1000  # Hz,截止频率,对该频率一下的声音进行滤波,若需要识别人声可适当降低
-
-        # Butterworth高通滤波
-        self.filter_b, self.filter_a = butter(
-            self._filter_degree,
-            self._cut_off,
-            btype='highpass',
-            output='ba',
-            fs=self._sample_rate
-        )
-
-        self.latest_audio = np.empty(shape=(0,), dtype=np.float64)  # 存储最新的音频数据
-        self._update_audio_lock = threading.Lock()
-
-    def start_running_async(self) -> None:
-        """
-        异步启动音频录制。
-        """
-        with self._run_lock:
-            if self.running:
-                return
-
-            self.running = True
-
-        self.latest_audio = np.zeros(int(self._sample_rate // 2))  # 初始化音频数据缓冲区，长度为0.5秒
-        future = _dodge_check_executor.submit(self._record_loop)
-        future.add_done_callback(thread_utils.handle_future_result)
-
-    def _record_loop(self) -> None:
-        """
-        音频录制循环，持续录制音频数据。
-        """
-        # 这个在全局导入的话 会导致QT的选择文件无法使用
-        import warnings
-
-        import soundcard as sc
-        from soundcard.mediafoundation import SoundcardRuntimeWarning
-
-        warnings.filterwarnings('ignore', category=SoundcardRuntimeWarning)
-
-        try:
-            _mic = sc.get_microphone(id=str(sc.default_speaker().name), include_loopback=True)
-            _recorder = _mic.recorder(samplerate=self._sample_rate, channels=self._used_channel)
-            with _recorder as audio_recorder:
-                while self.running:
-                    stream_data = audio_recorder.record(numframes=self._chunk_size)
-                    if self._used_channel > 1:
-                        stream_data = librosa.to_mono(stream_data.T)
-                    else:
-                        stream_data = stream_data.T
-
-                    with self._update_audio_lock:
-                        # 更新 latest_audio
-                        self.latest_audio[:-len(stream_data)] = self.latest_audio[len(stream_data):]
-                        self.latest_audio[-len(stream_data):] = stream_data
-        except RuntimeError as e:
-            log.warning('音频录制异常，已停止声音闪避识别', exc_info=True)
-            if self._error_callback is not None:
-                self._error_callback(e)
-        finally:
-            self.running = False
-
-    def stop_running(self) -> None:
-        """
-        停止音频录制。
-        """
-        self.running = False
-
-    def clear_audio(self) -> None:
-        """
-        清楚当前录音
-        """
-        with self._update_audio_lock:
-            self.latest_audio = np.zeros(int(self._sample_rate // 2))
+    from zzz_od.yolo.flash_classifier import FlashClassifier
 
 
 class YoloStateEventEnum(Enum):
@@ -140,8 +45,9 @@ class AutoBattleDodgeContext:
         self.ctx: ZContext = ctx  # 上下文对象
 
         self._flash_model: FlashClassifier | None = None  # 闪避分类器
-        self._audio_recorder: AudioRecorder = AudioRecorder(self._on_audio_record_error)  # 音频录制器
-        self._audio_template: np.ndarray | None = None  # 音频模板
+        self._audio_recorder: AudioRecorder | None = None  # 音频录制器 第一次使用时创建
+        self._audio_recorder_lock = threading.Lock()
+        self._audio_matcher: AudioTemplateMatcher | None = None  # 音频模板匹配
 
         # 识别锁，保证每种类型只有一个实例在进行识别
         self._check_dodge_flash_lock = threading.Lock()
@@ -149,6 +55,10 @@ class AutoBattleDodgeContext:
 
         # 识别间隔
         self._check_dodge_interval: float | list[float] = 0
+
+        # 闪光识别的区域 为空时使用整个画面
+        self._check_dodge_rect_list: list[Rect] = []
+        self._check_dodge_color_gate: bool = False
         self._check_audio_interval: float = 0.02
 
         # 上一次识别的时间
@@ -178,9 +88,12 @@ class AutoBattleDodgeContext:
         """
         self._check_dodge_interval = auto_op.check_dodge_interval
         self._check_audio_interval = 0.02
+        self._check_dodge_rect_list = self._get_check_dodge_rect_list(auto_op)
+        self._check_dodge_color_gate = auto_op.check_dodge_color_gate
 
         use_gpu = self.ctx.model_config.flash_classifier_gpu
         if self._flash_model is None or self._flash_model.gpu != use_gpu:
+            from zzz_od.yolo.flash_classifier import FlashClassifier
             self._flash_model = FlashClassifier(
                 model_name=self.ctx.model_config.flash_classifier,
                 backup_model_name=self.ctx.model_config.flash_classifier_backup,
@@ -191,6 +104,31 @@ class AutoBattleDodgeContext:
                 gpu=use_gpu
             )
 
+    def _get_check_dodge_rect_list(self, auto_op: AutoBattleOperator) -> list[Rect]:
+        """
+        根据配置获取闪光识别的区域
+
+        Args:
+            auto_op: 自动战斗操作器
+
+        Returns:
+            list[Rect]: 识别区域 为空时使用整个画面
+        """
+        rect_list: list[Rect] = []
+        for area_name in auto_op.check_dodge_area_list:
+            area = self.ctx.screen_loader.get_area('战斗画面', area_name)
+            if area is None:
+                log.warning('闪避识别区域不存在 战斗画面.%s', area_name)
+                continue
+            rect_list.append(area.rect)
+
+        if len(rect_list) == 0 and auto_op.check_dodge_center_crop < 1:
+            from zzz_od.yolo.flash_classifier import get_center_rect
+            width, height = self.ctx.project_config.screen_standard_width, self.ctx.project_config.screen_standard_height
+            rect_list.append(get_center_rect(width, height, auto_op.check_dodge_center_crop))
+
+        return rect_list
+
     def init_battle_dodge_context(
             self,
     ) -> None:
@@ -202,30 +140,56 @@ class AutoBattleDodgeContext:
         self._last_check_audio_time = 0
 
         # 异步加载音频模板
-        _dodge_check_executor.submit(self.init_audio_template)
+        future = battle_check_scheduler.submit('加载声音模板', self.init_audio_template,
+                                               priority=BattleCheckPriority.INIT)
+        future.add_done_callback(thread_utils.handle_future_result)
+
+    def _get_audio_recorder(self) -> AudioRecorder:
+        """
+        获取音频录制器 第一次使用时才导入音频相关的库
+
+        Returns:
+            AudioRecorder: 音频录制器
+        """
+        with self._audio_recorder_lock:
+            if self._audio_recorder is None:
+                from zzz_od.auto_battle.auto_battle_dodge_audio import AudioRecorder
+                self._audio_recorder = AudioRecorder(self._on_audio_record_error)
+            return self._audio_recorder
 
     def init_audio_template(self) -> None:
         """
         加载音频模板。
         """
-        if self._audio_template is not None:
+        if self._audio_matcher is not None:
             return
+        from zzz_od.auto_battle.auto_battle_dodge_audio import (
+            AudioTemplateMatcher,
+            load_audio_template,
+        )
         log.info('加载声音模板中')
-        self._audio_template, _ = librosa.load(os.path.join(
-            os_utils.get_path_under_work_dir('assets', 'template', 'dodge_audio'),
-            'template_1.wav'
-        ), sr=32000)
-
-        self._audio_template = self._get_filter_wave(self._audio_template)  # 滤波
+        audio_recorder = self._get_audio_recorder()
+        template = load_audio_template(
+            os.path.join(
+                os_utils.get_path_under_work_dir('assets', 'template', 'dodge_audio'),
+                'template_1.wav'
+            ),
+            sample_rate=audio_recorder.sample_rate,
+        )
+        self._audio_matcher = AudioTemplateMatcher(
+            template,
+            sample_rate=audio_recorder.sample_rate,
+            filter_sos=audio_recorder.filter_sos,
+        )
 
         log.info('加载声音模板完成')
 
-    def check_dodge_flash(self, screen: MatLike, screenshot_time: float, audio_future: Future[bool] | None = None) -> bool:
+    def check_dodge_flash(self, screen: MatLike, screenshot_time: float, audio_result: bool = False) -> bool:
         """
         识别画面是否有闪光。
         :param screen: 屏幕截图
         :param screenshot_time: 截图时间
-        :param audio_future: 音频识别结果的Future对象
+        :param audio_result: 音频识别结果 画面没有闪光时使用
         :return: 是否应该闪避 （识别到闪光或者声音）
         """
         if not self._check_dodge_flash_lock.acquire(blocking=False):
@@ -238,16 +202,19 @@ class AutoBattleDodgeContext:
 
             self._last_check_dodge_time = screenshot_time
 
-            result = self._flash_model.run(screen)
+            result = self._flash_model.run_roi(
+                screen,
+                rect_list=self._check_dodge_rect_list,
+                color_gate=self._check_dodge_color_gate,
+                run_time=screenshot_time,
+            )
             state_name: str | None = None
             if result.class_idx == 1:
                 state_name = YoloStateEventEnum.DODGE_RED.value
             elif result.class_idx == 2:
                 state_name = YoloStateEventEnum.DODGE_YELLOW.value
-            elif audio_future is not None:
-                audio_result = audio_future.result()
-                if audio_result:
-                    state_name = YoloStateEventEnum.DODGE_AUDIO.value
+            elif audio_result:
+                state_name = YoloStateEventEnum.DODGE_AUDIO.value
 
             should_dodge = state_name is not None
             if should_dodge:
@@ -273,20 +240,17 @@ class AutoBattleDodgeContext:
             if screenshot_time - self._last_check_audio_time < cal_utils.random_in_range(self._check_audio_interval):
                 # 还没有达到识别间隔
                 return False
-            if self._audio_template is None:
+            if self._audio_matcher is None or self._audio_recorder is None:
                 return False
             self._last_check_audio_time = screenshot_time
 
-            if self._audio_recorder.latest_audio.size == 0:
-                return False
-
-            corr = self.get_max_corr(self._audio_template, self._audio_recorder.latest_audio)
+            corr = self._audio_matcher.match(self._audio_recorder)
             # log.debug('声音相似度 %.2f' % corr)
 
             # 事件去重逻辑
             if corr > self._audio_recorder.trigger_threshold:
                 self._last_audio_event_time = screenshot_time
-                self._audio_recorder.clear_audio()
+                self._audio_matcher.reset(self._audio_recorder)
                 return True
 
             return False
@@ -296,54 +260,36 @@ class AutoBattleDodgeContext:
         finally:
             self._check_audio_lock.release()
 
-    def get_max_corr(self, x: np.ndarray, y: np.ndarray):
-        """
-        计算两个音频信号的最大相关性。
-        :param x: 音频信号x
-        :param y: 音频信号y
-        :return: 最大相关性系数
-        """
-        y = self._get_filter_wave(y)  # 滤波
-
-        # 标准化
-        wx = scale(x, with_mean=False)
-        wy = scale(y, with_mean=False)
-
-        # 计算NCC
-        if wx.shape[0] > wy.shape[0]:
-            correlation = correlate(wx, wy, mode='same', method='fft') / wx.shape[0]
-        else:
-            correlation = correlate(wy, wx, mode='same', method='fft') / wy.shape[0]
-
-        max_corr = np.max(correlation)
-
-        return max_corr
-
-    def _get_filter_wave(self, x: np.ndarray):
-        """
-        音频滤波。
-        :param x: 音频信号x
-        :return: 滤波后波形
-        """
-        wx = filtfilt(self._audio_recorder.filter_b,
-                      self._audio_recorder.filter_a,
-                      x)
-        return wx
-
     def start_context_async(self) -> None:
         """
         启动上下文，启动音频录制。
         """
-        self._audio_recorder.start_running_async()
+        self._get_audio_recorder().start_running_async()
 
     def stop_context(self) -> None:
         """
         停止上下文，停止音频录制。
         """
-        self._audio_recorder.stop_running()
+        if self._audio_recorder is not None:
+            self._audio_recorder.stop_running()
+
+    def get_flash_display_text(self) -> str:
+        """
+        获取闪光识别的统计文本 并清除统计
+
+        Returns:
+            str: 用于日志的统计文本 没有识别过时为空字符串
+        """
+        if self._flash_model is None:
+            return ''
+        text = self._flash_model.get_display_text()
+        self._flash_model.clear_stats()
+        return text
 
     def after_app_shutdown(self) -> None:
         """
         App关闭后进行的操作 关闭一切可能资源操作
         """
-        _dodge_check_executor.shutdown(wait=False, cancel_futures=True)
+        if self._audio_recorder is not None:
+            from zzz_od.auto_battle import auto_battle_dodge_audio
+            auto_battle_dodge_audio.after_app_shutdown()
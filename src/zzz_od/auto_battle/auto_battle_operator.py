@@ -62,6 +62,9 @@ class AutoBattleOperator(ConditionalOperator):
         self.team_list: list[list[str]] = []  # 配队信息
 
         self.check_dodge_interval: float = 0.02  # 检测闪避的间隔
+        self.check_dodge_area_list: list[str] = []  # 闪避识别使用的战斗画面区域 为空时使用整个画面
+        self.check_dodge_center_crop: float = 1  # 闪避识别使用画面中心的比例 设置了区域时不使用
+        self.check_dodge_color_gate: bool = False  # 闪避识别前先判断区域内是否有红光或黄光的颜色
         self.check_agent_interval: float = 0.5  # 检测代理人的间隔
         self.check_chain_interval: float = 1  # 检测连携技的间隔
         self.check_quick_interval: float = 0.5  # 检测快速支援的间隔
@@ -96,6 +99,9 @@ class AutoBattleOperator(ConditionalOperator):
         self.team_list = data.get('team_list', [])
 
         self.check_dodge_interval = data.get('check_dodge_interval', 0.02)
+        self.check_dodge_area_list = data.get('check_dodge_area_list', [])
+        self.check_dodge_center_crop = data.get('check_dodge_center_crop', 1)
+        self.check_dodge_color_gate = data.get('check_dodge_color_gate', False)
         self.check_agent_interval = data.get('check_agent_interval', 0.5)
         self.check_chain_interval = data.get('check_chain_interval', 1)
         self.check_quick_interval = data.get('check_quick_interval', 0.5)
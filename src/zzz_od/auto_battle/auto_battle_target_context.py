@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import threading
-from concurrent.futures import ThreadPoolExecutor, Future
+import time
 from typing import List, Any, Tuple, Dict, TYPE_CHECKING
 
 from cv2.typing import MatLike
 
 from one_dragon.base.conditional_operation.state_recorder import StateRecord
+from one_dragon.utils import thread_utils
 from one_dragon.utils.log_utils import log
+from zzz_od.auto_battle.auto_battle_check_scheduler import (
+    CHECK_MAX_DELAY_SECONDS,
+    BattleCheckPriority,
+    battle_check_scheduler,
+)
 from zzz_od.auto_battle.target_state.target_state_checker import TargetStateChecker
 from zzz_od.context.zzz_context import ZContext
 from zzz_od.game_data.target_state import DETECTION_TASKS, DetectionTask
@@ -16,10 +22,6 @@ if TYPE_CHECKING:
     from zzz_od.auto_battle.auto_battle_operator import AutoBattleOperator
 
 
-# 模块私有的独立线程池，用于并行处理状态检测任务
-_target_context_executor = ThreadPoolExecutor(thread_name_prefix='od_target_context', max_workers=8)
-
-
 class AutoBattleTargetContext:
     """
     一个由数据驱动的、通用的目标状态上下文。
@@ -84,7 +86,7 @@ class AutoBattleTargetContext:
         try:
             now = screenshot_time
             records_to_update: List[StateRecord] = []
-            futures: Dict[Future, DetectionTask] = {}
+            deadline = time.perf_counter() + CHECK_MAX_DELAY_SECONDS
 
             # 遍历并执行所有到期的任务
             for task in self.tasks:
@@ -95,20 +97,16 @@ class AutoBattleTargetContext:
                 if now - self._last_check_times[task.task_id] >= interval:
                     self._last_check_times[task.task_id] = now
                     if task.is_async:
-                        future = _target_context_executor.submit(self.checker.run_task, screen, task)
-                        futures[future] = task
+                        # 异步任务单独提交 不在当前线程等待结果
+                        future = battle_check_scheduler.submit(
+                            f'目标-{task.task_id}', self._run_async_task, screen, screenshot_time, task,
+                            priority=BattleCheckPriority.TARGET, deadline=deadline,
+                        )
+                        future.add_done_callback(thread_utils.handle_future_result)
                     else:
                         cv_ctx, sync_results = self.checker.run_task(screen, task)
                         self._handle_results(records_to_update, sync_results, screenshot_time, task)
 
-            # 处理异步任务结果
-            for future, task in futures.items():
-                try:
-                    _cv_ctx, async_results = future.result(timeout=1)
-                    self._handle_results(records_to_update, async_results, screenshot_time, task)
-                except Exception:
-                    log.error(f"异步检测任务失败 [task_id={task.task_id}]", exc_info=True)
-
             # 批量提交状态更新
             if records_to_update:
                 self.ctx.auto_battle_context.state_record_service.batch_update_states(records_to_update)
@@ -116,6 +114,20 @@ class AutoBattleTargetContext:
         finally:
             self._check_lock.release()
 
+    def _run_async_task(self, screen: MatLike, screenshot_time: float, task: DetectionTask) -> None:
+        """
+        执行一个异步检测任务 并提交状态更新
+        """
+        records_to_update: List[StateRecord] = []
+        try:
+            _cv_ctx, async_results = self.checker.run_task(screen, task)
+            self._handle_results(records_to_update, async_results, screenshot_time, task)
+        except Exception:
+            log.error(f"异步检测任务失败 [task_id={task.task_id}]", exc_info=True)
+
+        if records_to_update:
+            self.ctx.auto_battle_context.state_record_service.batch_update_states(records_to_update)
+
     def _handle_results(self, records_list: List[StateRecord],
                         results: List[Tuple[str, Any]],
                         screenshot_time: float,
@@ -162,4 +174,4 @@ class AutoBattleTargetContext:
         """
         App关闭后进行的操作 关闭一切可能资源操作
         """
-        _target_context_executor.shutdown(wait=False, cancel_futures=True)
+        pass
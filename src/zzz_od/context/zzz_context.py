@@ -11,14 +11,21 @@ class ZContext(OneDragonContext):
 
         OneDragonContext.__init__(self)
 
-        # 后续所有用到自动战斗的 都统一设置到这个里面
-        from zzz_od.auto_battle.auto_battle_context import AutoBattleContext
-        self.auto_battle_context: AutoBattleContext = AutoBattleContext(self)
-
     #------------------- 需要懒加载的都使用 @cached_property -------------------#
 
     #------------------- 以下是 游戏/脚本级别的 -------------------#
 
+    @cached_property
+    def auto_battle_context(self):
+        """
+        后续所有用到自动战斗的 都统一设置到这个里面
+        自动战斗会加载模型和音频相关的库 只有用到的应用才创建 不影响其它应用和界面的启动速度
+        """
+        from zzz_od.auto_battle.auto_battle_context import AutoBattleContext
+        auto_battle_context = AutoBattleContext(self)
+        auto_battle_context.init_screen_area()
+        return auto_battle_context
+
     @cached_property
     def model_config(self):
         from zzz_od.config.model_config import ModelConfig
@@ -124,11 +131,14 @@ class ZContext(OneDragonContext):
             )
             # 初始化窗口标题
             self.controller.set_window_title(self._get_win_title())
+            if self.env_config.capture_service_fps > 0:
+                self.controller.start_capture_service(self.env_config.capture_service_fps)
 
     def init_for_application(self) -> None:
         self.map_service.reload()  # 传送需要用的数据
         self.compendium_service.reload()  # 快捷手册
-        self.auto_battle_context.init_screen_area()  # 自动战斗相关的区域 依赖 ScreenLoader
+        if 'auto_battle_context' in self.__dict__:  # 未使用过自动战斗时 创建时再初始化
+            self.auto_battle_context.init_screen_area()  # 自动战斗相关的区域 依赖 ScreenLoader
 
     def init_others(self) -> None:
         self.telemetry.initialize()  # 遥测
@@ -141,10 +151,13 @@ class ZContext(OneDragonContext):
             self.telemetry.shutdown()
 
         # 上层清理依赖框架服务(如 StateRecordService)，必须先于框架清理
-        self.withered_domain.after_app_shutdown()
-        self.auto_battle_context.after_app_shutdown()
-
-        from zzz_od.auto_battle.auto_battle_operator import AutoBattleOperator
-        AutoBattleOperator.after_app_shutdown()
+        # 没有创建过的不需要清理 也避免关闭时才去导入
+        if 'withered_domain' in self.__dict__:
+            self.withered_domain.after_app_shutdown()
+        if 'auto_battle_context' in self.__dict__:
+            self.auto_battle_context.after_app_shutdown()
+
+            from zzz_od.auto_battle.auto_battle_operator import AutoBattleOperator
+            AutoBattleOperator.after_app_shutdown()
 
         OneDragonContext.after_app_shutdown(self)
@@ -0,0 +1,143 @@
+from one_dragon.base.controller.replay_controller import ReplayController
+
+
+class ZReplayController(ReplayController):
+    """
+    绝区零的离线回放控制器 游戏中的动作只记录 不会按键
+    可以代替 ZPcController 作为上下文的控制器 回放指令或者自动战斗
+    """
+
+    def __init__(self, *args, turn_dx: float = 1, **kwargs):
+        ReplayController.__init__(self, *args, **kwargs)
+        self.is_moving: bool = False  # 是否正在移动
+        self.turn_dx: float = turn_dx
+
+    def _action_btn(self, action: str, press: bool = False, press_time: float | None = None, release: bool = False) -> None:
+        """记录按键动作：按下/释放/点按 按下指定时间时回放时间同样前进"""
+        if press:
+            self.record_action(action, press=True, press_time=press_time)
+            if press_time is not None:
+                self.clock.sleep(press_time)
+        elif release:
+            self.record_action(action, release=True)
+        else:
+            self.record_action(action)
+
+    def dodge(self, press: bool = False, press_time: float | None = None, release: bool = False) -> None:
+        """闪避"""
+        self._action_btn('dodge', press, press_time, release)
+
+    def switch_next(self, press: bool = False, press_time: float | None = None, release: bool = False) -> None:
+        """切换角色-下一个"""
+        self._action_btn('switch_next', press, press_time, release)
+
+    def switch_prev(self, press: bool = False, press_time: float | None = None, release: bool = False) -> None:
+        """切换角色-上一个"""
+        self._action_btn('switch_prev', press, press_time, release)
+
+    def switch_backup(self, press: bool = False, press_time: float | None = None, release: bool = False) -> None:
+        """切换后援"""
+        self._action_btn('switch_backup', press, press_time, release)
+
+    def normal_attack(self, press: bool = False, press_time: float | None = None, release: bool = False) -> None:
+        """普通攻击"""
+        self._action_btn('normal_attack', press, press_time, release)
+
+    def special_attack(self, press: bool = False, press_time: float | None = None, release: bool = False) -> None:
+        """特殊攻击"""
+        self._action_btn('special_attack', press, press_time, release)
+
+    def ultimate(self, press: bool = False, press_time: float | None = None, release: bool = False) -> None:
+        """终结技"""
+        self._action_btn('ultimate', press, press_time, release)
+
+    def chain_left(self, press: bool = False, press_time: float | None = None, release: bool = False) -> None:
+        """连携技-左"""
+        self._action_btn('chain_left', press, press_time, release)
+
+    def chain_right(self, press: bool = False, press_time: float | None = None, release: bool = False) -> None:
+        """连携技-右"""
+        self._action_btn('chain_right', press, press_time, release)
+
+    def move_w(self, press: bool = False, press_time: float | None = None, release: bool = False) -> None:
+        """向前移动"""
+        self._action_btn('move_w', press, press_time, release)
+
+    def move_s(self, press: bool = False, press_time: float | None = None, release: bool = False) -> None:
+        """向后移动"""
+        self._action_btn('move_s', press, press_time, release)
+
+    def move_a(self, press: bool = False, press_time: float | None = None, release: bool = False) -> None:
+        """向左移动"""
+        self._action_btn('move_a', press, press_time, release)
+
+    def move_d(self, press: bool = False, press_time: float | None = None, release: bool = False) -> None:
+        """向右移动"""
+        self._action_btn('move_d', press, press_time, release)
+
+    def interact(self, press: bool = False, press_time: float | None = None, release: bool = False) -> None:
+        """交互"""
+        self._action_btn('interact', press, press_time, release)
+
+    def lock(self, press: bool = False, press_time: float | None = None, release: bool = False) -> None:
+        """锁定敌人"""
+        self._action_btn('lock', press, press_time, release)
+
+    def chain_cancel(self, press: bool = False, press_time: float | None = None, release: bool = False) -> None:
+        """取消连携"""
+        self._action_btn('chain_cancel', press, press_time, release)
+
+    def start_moving_forward(self) -> None:
+        """
+        开始向前移动
+        """
+        if self.is_moving:
+            return
+        self.is_moving = True
+        self.move_w(press=True)
+
+    def stop_moving_forward(self) -> None:
+        """
+        停止向前移动
+        """
+        self.is_moving = False
+        self.move_w(release=True)
+
+    def turn_by_distance(self, d: float):
+        """
+        横向转向 按距离转
+
+        Args:
+            d: 正数往右转 负数往左转
+        """
+        self.move_mouse_relative(d, 0)
+
+    def turn_by_angle_diff(self, angle_diff: float) -> None:
+        """
+        按照给定角度偏移进行转向
+
+        Args:
+            angle_diff: 角度偏移 逆时针为正
+        """
+        self.turn_by_distance(self.turn_dx * angle_diff)
+
+    def turn_vertical_by_distance(self, d: float):
+        """
+        纵向转向 按距离转
+
+        Args:
+            d: 正数往下转 负数往上转
+        """
+        self.move_mouse_relative(0, d)
+
+    def move_mouse_relative(self, dx: float, dy: float):
+        """
+        相对移动鼠标
+
+        Args:
+            dx: 横向移动距离，正数向右
+            dy: 纵向移动距离，正数向下
+        """
+        if dx == 0 and dy == 0:
+            return
+        self.record_action('move_mouse_relative', dx=dx, dy=dy)
@@ -25,6 +25,7 @@ class SettingOverlayInterface(VerticalScrollInterface):
     _PERF_CORE_METRICS = (
         ("OCR 耗时", "ocr_ms"),
         ("YOLO 耗时", "yolo_ms"),
+        ("YOLO 预处理耗时", "yolo_preprocess_ms"),
         ("CV Pipeline 耗时", "cv_pipeline_ms"),
         ("节点轮次耗时", "operation_round_ms"),
         ("Overlay 刷新耗时", "overlay_refresh_ms"),
@@ -50,7 +50,7 @@ class AreaPatrol(ZOperation):
 
         self.plan: ChargePlanItem = plan
 
-    @operation_node(name='等待入口加载', is_start_node=True, node_max_retry_times=60)
+    @operation_node(name='等待入口加载', is_start_node=True, node_max_retry_times=60, skip_if_screen_unchanged=True)
     def wait_entry_load(self) -> OperationRoundResult:
         return self.round_by_find_area(
             self.last_screenshot, '实战模拟室', '挑战等级',
@@ -153,7 +153,7 @@ class AreaPatrol(ZOperation):
         return self.round_success()
 
     @node_from(from_name='加载自动战斗指令')
-    @operation_node(name='等待战斗画面加载', node_max_retry_times=60)
+    @operation_node(name='等待战斗画面加载', node_max_retry_times=60, skip_if_screen_unchanged=True)
     def wait_battle_screen(self) -> OperationRoundResult:
         result = self.round_by_find_area(self.last_screenshot, '战斗画面', '按键-普通攻击', retry_wait_round=1)
         return result
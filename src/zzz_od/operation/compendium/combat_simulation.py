@@ -59,7 +59,7 @@ class CombatSimulation(ZOperation):
         self.plan: ChargePlanItem = plan
         self.scroll_count: int = 0  # 滑动次数计数器
 
-    @operation_node(name='等待入口加载', is_start_node=True, node_max_retry_times=60)
+    @operation_node(name='等待入口加载', is_start_node=True, node_max_retry_times=60, skip_if_screen_unchanged=True)
     def wait_entry_load(self) -> OperationRoundResult:
         result = self.round_by_find_area(self.last_screenshot, '实战模拟室', '挑战等级')
         if result.is_success:
@@ -267,7 +267,7 @@ class CombatSimulation(ZOperation):
         return self.round_success()
 
     @node_from(from_name='加载自动战斗指令')
-    @operation_node(name='等待战斗画面加载', node_max_retry_times=60)
+    @operation_node(name='等待战斗画面加载', node_max_retry_times=60, skip_if_screen_unchanged=True)
     def wait_battle_screen(self) -> OperationRoundResult:
         return self.round_by_find_area(self.last_screenshot, '战斗画面', '按键-普通攻击', retry_wait_round=1)
 
@@ -94,7 +94,7 @@ class NotoriousHunt(ZOperation):
                     break
         return any(str_utils.find_by_lcs(gt(n, 'game'), ocr_result, percent=0.5) for n in names)
 
-    @operation_node(name='等待入口加载', node_max_retry_times=60)
+    @operation_node(name='等待入口加载', node_max_retry_times=60, skip_if_screen_unchanged=True)
     def wait_entry_load(self) -> OperationRoundResult:
         r1 = self.round_by_find_area(self.last_screenshot, '恶名狩猎', '当期剩余奖励次数')
         if r1.is_success:
@@ -322,7 +322,7 @@ class NotoriousHunt(ZOperation):
         return self.round_success()
 
     @node_from(from_name='加载自动战斗指令')
-    @operation_node(name='等待战斗画面加载', node_max_retry_times=60, is_start_node=False)
+    @operation_node(name='等待战斗画面加载', node_max_retry_times=60, is_start_node=False, skip_if_screen_unchanged=True)
     def wait_battle_screen(self) -> OperationRoundResult:
         result = self.round_by_find_area(self.last_screenshot, '战斗画面', '按键-普通攻击')
         if result.is_success:
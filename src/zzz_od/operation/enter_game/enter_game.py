@@ -116,7 +116,7 @@ class EnterGame(ZOperation):
         if result.is_success:
             result2 = self.round_by_find_and_click_area(screen, '打开游戏', '按钮-退出登录-确定')
             if result2.is_success:
-                return self.round_wait(result2.status, wait=1)
+                return self.round_wait(result2.status, wait=1, wait_until_stable=True)
 
         # B服切换账号时会直接弹出这个框, 此时不需要点击切换账号
         result = self.round_by_find_area(screen, '打开游戏', 'B服新-登录记录')
@@ -130,15 +130,15 @@ class EnterGame(ZOperation):
 
         result = self.round_by_find_and_click_area(screen, '打开游戏', '国服-账号密码')
         if result.is_success:
-            return self.round_success(result.status, wait=1)
+            return self.round_success(result.status, wait=1, wait_until_stable=True)
 
         result = self.round_by_find_and_click_area(screen, '打开游戏', '国服-账号密码-新')
         if result.is_success:
-            return self.round_success(result.status, wait=1)
+            return self.round_success(result.status, wait=1, wait_until_stable=True)
 
         result = self.round_by_find_and_click_area(screen, '打开游戏', '按钮-登陆其他账号')
         if result.is_success:
-            return self.round_wait(result.status, wait=1)
+            return self.round_wait(result.status, wait=1, wait_until_stable=True)
 
         # region 当B服弹出这些提示的时候, 就代表需要重新输账号密码和验证码了, 脚本搞不定, 直接终止脚本运行最容易让用户发现问题
         result = self.round_by_find_area(screen, '打开游戏', 'B服新-手机号登录')
@@ -162,7 +162,7 @@ class EnterGame(ZOperation):
             time.sleep(2)  # 已登录的状态也可能出现几秒“点击登录”
             result = self.round_by_find_and_click_area(screen, '打开游戏', '国际服-点击登录')
             if result.is_success:
-                return self.round_wait(result.status, wait=1)
+                return self.round_wait(result.status, wait=1, wait_until_stable=True)
 
         # 未登录时会直接弹出登录窗口
         result = self.round_by_find_area(screen, '打开游戏', '国际服-密码输入区域')
@@ -344,7 +344,9 @@ class EnterGame(ZOperation):
     @node_from(from_name='国际服-输入账号密码', status='国际服-账号密码进入游戏')
     @operation_node(name='国际服-换服')
     def check_server(self) -> OperationRoundResult:
-        self.round_by_click_area('打开游戏', '国际服-换服', success_wait=1)
+        result = self.round_by_click_area('打开游戏', '国际服-换服')
+        if result.is_success:
+            self.wait_for_screen(1, until_stable=True)  # 等待服务器列表展开
 
         game_region = self.ctx.game_account_config.game_region
         if game_region == GameRegionEnum.EUROPE.value.value:
@@ -361,7 +363,7 @@ class EnterGame(ZOperation):
         start = area.center
         end = start + Point(0, 200)
         self.ctx.controller.drag_to(start=start, end=end)
-        time.sleep(1)
+        self.wait_for_screen(1, until_stable=True, require_change=False)  # 等待列表滑动停止
 
         screen = self.screenshot()
         return self.round_by_find_and_click_area(screen, '打开游戏', area_name, success_wait=1)
@@ -401,8 +403,8 @@ class EnterGame(ZOperation):
         self.after_second_enter_click = False
         self.resource_download_start_time = None
         if back_to_check_screen:
-            return self.round_success(EnterGame.STATUS_GAME_DATA_UPDATED, wait=3)
-        return self.round_wait(EnterGame.STATUS_GAME_DATA_UPDATED, wait=3)
+            return self.round_success(EnterGame.STATUS_GAME_DATA_UPDATED, wait=3, wait_until_stable=True)
+        return self.round_wait(EnterGame.STATUS_GAME_DATA_UPDATED, wait=3, wait_until_stable=True)
 
     def check_screen_to_interact(self, screen: MatLike) -> OperationRoundResult | None:
         """
@@ -467,14 +469,14 @@ class EnterGame(ZOperation):
             if match_word.find('领取') != -1:
                 self.interact_ignore_word_list.append(match_word)
 
-            time.sleep(0.5) # 等待画面稳定
+            self.wait_for_screen(0.5, until_stable=True, require_change=False)  # 等待画面稳定
             self.ctx.controller.click(match_word_mrl.max.center)
-            return self.round_wait(status=match_word, wait=1)
+            return self.round_wait(status=match_word, wait=1, wait_until_stable=True)
 
         if back_btn_result.is_success:
             # 左上角的返回
             self.round_by_click_area('菜单', '返回')
-            return self.round_wait(status=back_btn_result.status, wait=1)
+            return self.round_wait(status=back_btn_result.status, wait=1, wait_until_stable=True)
 
         return None
 
@@ -496,9 +498,9 @@ class EnterGame(ZOperation):
             target_word_list
         )
         if match_word is not None and match_word_mrl is not None and match_word_mrl.max is not None:
-            time.sleep(0.5) # 等待画面稳定
+            self.wait_for_screen(0.5, until_stable=True, require_change=False)  # 等待画面稳定
             self.ctx.controller.click(match_word_mrl.max.center)
-            return self.round_wait(status=match_word, wait=1)
+            return self.round_wait(status=match_word, wait=1, wait_until_stable=True)
 
         return None
 
@@ -1,8 +1,19 @@
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+from one_dragon.base.geometry.rectangle import Rect
 from one_dragon.utils import yolo_config_utils
 from one_dragon.yolo.yolo_utils import get_github_model_download_url
-from one_dragon.yolo.yolov8_onnx_cls import Yolov8Classifier
+from one_dragon.yolo.yolov8_onnx_cls import ClassificationResult, Yolov8Classifier
 from zzz_od.config.model_config import YOLO_RELEASE_TAG
 
+# 预筛选使用的颜色范围 RGB 闪光的亮红色和亮黄色
+_FLASH_RED_LOWER = np.array([200, 0, 0], dtype=np.uint8)
+_FLASH_RED_UPPER = np.array([255, 110, 110], dtype=np.uint8)
+_FLASH_YELLOW_LOWER = np.array([200, 160, 0], dtype=np.uint8)
+_FLASH_YELLOW_UPPER = np.array([255, 255, 130], dtype=np.uint8)
+
 
 class FlashClassifier(Yolov8Classifier):
 
@@ -36,6 +47,121 @@ class FlashClassifier(Yolov8Classifier):
             keep_result_seconds=keep_result_seconds
         )
 
+        self.color_gate_skip_cnt: int = 0  # 预筛选跳过推理的次数
+        self.run_cnt: int = 0  # 实际推理的次数
+
+    def run_roi(
+            self,
+            screen: MatLike,
+            rect_list: list[Rect] | None = None,
+            color_gate: bool = False,
+            run_time: float | None = None,
+    ) -> ClassificationResult:
+        """
+        只识别画面中的部分区域
+
+        Args:
+            screen: 游戏画面 RGB通道
+            rect_list: 识别的区域 多个区域会上下拼接后一次推理 为空时使用整个画面
+            color_gate: 是否先进行颜色预筛选 区域内没有亮红色或亮黄色时不进行推理
+            run_time: 识别时间
+
+        Returns:
+            ClassificationResult: 识别结果 预筛选跳过时 class_idx 为 -1
+        """
+        image = stack_crops(screen, rect_list) if rect_list else screen
+
+        if color_gate and not has_flash_color(image):
+            self.color_gate_skip_cnt += 1
+            return ClassificationResult(raw_image=image, class_idx=-1, run_time=run_time)
+
+        self.run_cnt += 1
+        return self.run(image, run_time=run_time)
+
+    def get_display_text(self) -> str:
+        """
+        Returns:
+            str: 用于日志的预筛选统计文本 没有识别过时为空字符串
+        """
+        total = self.color_gate_skip_cnt + self.run_cnt
+        if total == 0:
+            return ''
+        return f'识别{total}次 预筛选跳过{self.color_gate_skip_cnt}次 推理{self.run_cnt}次'
+
+    def clear_stats(self) -> None:
+        """
+        清除统计
+        """
+        self.color_gate_skip_cnt = 0
+        self.run_cnt = 0
+
+
+def get_center_rect(width: int, height: int, ratio: float) -> Rect:
+    """
+    获取画面中心的区域
+
+    Args:
+        width: 画面宽度
+        height: 画面高度
+        ratio: 区域宽高占画面的比例
+
+    Returns:
+        Rect: 中心区域
+    """
+    ratio = min(max(ratio, 0.01), 1)
+    crop_width = int(width * ratio)
+    crop_height = int(height * ratio)
+    x1 = (width - crop_width) // 2
+    y1 = (height - crop_height) // 2
+    return Rect(x1, y1, x1 + crop_width, y1 + crop_height)
+
+
+def stack_crops(image: MatLike, rect_list: list[Rect]) -> MatLike:
+    """
+    截取多个区域 上下拼接成一张图片 宽度不足的部分用黑色填充
+
+    Args:
+        image: 原图
+        rect_list: 区域列表
+
+    Returns:
+        MatLike: 拼接后的图片 只有一个区域时直接返回该区域
+    """
+    if len(rect_list) == 1:
+        rect = rect_list[0]
+        return image[rect.y1:rect.y2, rect.x1:rect.x2]
+
+    width = max(rect.width for rect in rect_list)
+    height = sum(rect.height for rect in rect_list)
+    result = np.zeros((height, width, image.shape[2]), dtype=image.dtype)
+    y = 0
+    for rect in rect_list:
+        result[y:y + rect.height, :rect.width] = image[rect.y1:rect.y2, rect.x1:rect.x2]
+        y += rect.height
+    return result
+
+
+def has_flash_color(image: MatLike, min_pixel_cnt: int = 20, step: int = 4) -> bool:
+    """
+    判断图片中是否有足够多的亮红色或亮黄色像素 用于跳过明显没有闪光的画面
+
+    Args:
+        image: 图片 RGB通道
+        min_pixel_cnt: 采样后最少需要的像素数量
+        step: 采样间隔 每隔多少个像素取一个
+
+    Returns:
+        bool: 是否可能有闪光
+    """
+    height, width = image.shape[:2]
+    # 最近邻缩放比切片采样快 而且得到连续内存
+    sample = cv2.resize(image, (max(width // step, 1), max(height // step, 1)), interpolation=cv2.INTER_NEAREST)
+    red_cnt = cv2.countNonZero(cv2.inRange(sample, _FLASH_RED_LOWER, _FLASH_RED_UPPER))
+    if red_cnt >= min_pixel_cnt:
+        return True
+    yellow_cnt = cv2.countNonZero(cv2.inRange(sample, _FLASH_YELLOW_LOWER, _FLASH_YELLOW_UPPER))
+    return red_cnt + yellow_cnt >= min_pixel_cnt
+
 
 def __debug():
     from one_dragon.utils import os_utils
@@ -0,0 +1,41 @@
+"""
+性能对比 - 声音闪避 每次滑动模板匹配的耗时
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / 'src'))
+
+from zzz_od.auto_battle import auto_battle_dodge_audio
+from zzz_od.auto_battle.auto_battle_dodge_audio import AudioRecorder, AudioTemplateMatcher
+
+_TEMPLATE_PATH = ROOT / 'assets' / 'template' / 'dodge_audio' / 'template_1.wav'
+
+
+def main():
+    recorder = AudioRecorder()
+    template = auto_battle_dodge_audio.load_audio_template(str(_TEMPLATE_PATH), recorder.sample_rate)
+    matcher = AudioTemplateMatcher(template, recorder.sample_rate, recorder.filter_sos)
+
+    # 先写入1秒的录音 按10ms一块写入
+    rng = np.random.default_rng(0)
+    for _ in range(recorder.sample_rate // 320):
+        recorder.append_audio(rng.normal(0, 0.02, (320, 2)).astype(np.float32))
+
+    cost_list: list[float] = []
+    for _ in range(50):
+        recorder.append_audio(rng.normal(0, 0.02, (320, 2)).astype(np.float32))
+        recorder.append_audio(rng.normal(0, 0.02, (320, 2)).astype(np.float32))
+        start = time.perf_counter()
+        matcher.match(recorder)
+        cost_list.append((time.perf_counter() - start) * 1000)
+
+    print(f'声音匹配 每次 {np.median(cost_list):.3f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""
+性能对比 - CancelToken 等待10毫秒时 超过截止时间的误差 对比 time.sleep 和 Event.wait
+Windows 上 Event.wait 按系统定时器(约15.6毫秒)取整 需要在 Windows 上运行对比
+"""
+import threading
+import time
+
+import numpy as np
+
+from one_dragon.thread.cancel_token import CancelToken
+
+
+def _overshoot_ms(sleep_func, seconds: float, times: int) -> list[float]:
+    result: list[float] = []
+    for _ in range(times):
+        deadline = time.perf_counter() + seconds
+        sleep_func(seconds)
+        result.append((time.perf_counter() - deadline) * 1000)
+    return result
+
+
+def main():
+    token = CancelToken()
+    event = threading.Event()
+    times = 50
+
+    for seconds in [0.001, 0.01, 0.03]:
+        for name, func in [
+            ('CancelToken.sleep', token.sleep),
+            ('time.sleep', time.sleep),
+            ('Event.wait', event.wait),
+        ]:
+            overshoot = _overshoot_ms(func, seconds, times)
+            print(f'等待 {seconds * 1000:.0f}ms {name:<18} 超出 中位数 {np.median(overshoot):.3f}ms'
+                  f' 最大 {max(overshoot):.3f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+性能对比 - cv2_utils.match_template 低阈值下 对比原来逐个位置创建结果的实现
+"""
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src'))
+
+from one_dragon.base.matcher.match_result import MatchResult, MatchResultList
+from one_dragon.utils import cv2_utils
+
+
+def _legacy_match_template(source, template, threshold, mask=None, only_best=True, ignore_inf=False):
+    """原来逐个位置创建结果的实现"""
+    tx, ty = template.shape[1], template.shape[0]
+    result = cv2.matchTemplate(source, template, cv2.TM_CCOEFF_NORMED, mask=mask)
+    match_result_list = MatchResultList(only_best=only_best)
+    filtered_locations = np.where(np.logical_and(
+        result >= threshold,
+        np.isfinite(result) if ignore_inf else np.ones_like(result))
+    )
+    for pt in zip(*filtered_locations[::-1]):
+        match_result_list.append(MatchResult(result[pt[1], pt[0]], pt[0], pt[1], tx, ty))
+    return match_result_list
+
+
+def main():
+    rng = np.random.default_rng(0)
+    # 平滑的图片在低阈值下 会有大量位置超过阈值 类似小地图匹配大地图
+    source = cv2.GaussianBlur(rng.integers(0, 256, (270, 480, 3), dtype=np.uint8), (31, 31), 0)
+    times = 3
+
+    for template_size in [(20, 20), (60, 120), (150, 150)]:
+        template = source[50:50 + template_size[0], 50:50 + template_size[1]].copy()
+
+        def _cost_ms(func, **kwargs) -> float:
+            start = time.perf_counter()
+            for _ in range(times):
+                func(source, template, 0.1, **kwargs)
+            return (time.perf_counter() - start) / times * 1000
+
+        legacy_best_ms = _cost_ms(_legacy_match_template)
+        best_ms = _cost_ms(cv2_utils.match_template)
+        multi_ms = _cost_ms(cv2_utils.match_template, only_best=False)
+
+        print(f'模板 {template_size} 最佳结果 原实现 {legacy_best_ms:.2f}ms 现实现 {best_ms:.2f}ms'
+              f' 多结果 {multi_ms:.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
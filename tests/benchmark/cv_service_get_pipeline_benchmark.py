@@ -0,0 +1,44 @@
+"""
+性能对比 - CvService.get_pipeline 缓存编译后的流水线 对比每次解析文件
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / 'src'))
+
+from one_dragon.base.cv_process.cv_service import CvService
+
+CHAIN_BAR_PIPELINE = ROOT / 'assets' / 'image_analysis_pipelines' / '战斗-连携条.yml'
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        CvService.PIPELINE_DIR = os.path.join(temp_dir, 'pipelines')
+        CvService.TEMPLATE_DIR = os.path.join(temp_dir, 'templates')
+        service = CvService(SimpleNamespace(ocr=None, template_loader=None))
+        shutil.copy(CHAIN_BAR_PIPELINE, os.path.join(service.PIPELINE_DIR, 'chain.yml'))
+        service.get_pipeline('chain')
+
+        times = 200
+
+        start = time.perf_counter()
+        for _ in range(times):
+            service.load_pipeline('chain')
+        load_us = (time.perf_counter() - start) / times * 1e6
+
+        start = time.perf_counter()
+        for _ in range(times):
+            service.get_pipeline('chain')
+        cached_us = (time.perf_counter() - start) / times * 1e6
+
+    print(f'获取流水线耗时 解析文件 {load_us:.1f}us/次 缓存 {cached_us:.1f}us/次')
+
+
+if __name__ == '__main__':
+    main()
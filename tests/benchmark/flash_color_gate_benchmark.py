@@ -0,0 +1,25 @@
+"""
+性能对比 - 闪光识别前的颜色预筛选耗时
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src'))
+
+from zzz_od.yolo import flash_classifier
+
+
+def main():
+    image = np.random.default_rng(0).integers(0, 180, size=(1080, 1920, 3), dtype=np.uint8)
+    times = 50
+    start = time.perf_counter()
+    for _ in range(times):
+        flash_classifier.has_flash_color(image)
+    print(f'颜色预筛选 1920x1080 {(time.perf_counter() - start) * 1000 / times:.3f}ms')
+
+
+if __name__ == '__main__':
+    main()
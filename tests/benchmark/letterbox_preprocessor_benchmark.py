@@ -0,0 +1,37 @@
+"""
+性能对比 - LetterboxPreprocessor 复用缓冲区的预处理 对比 scale_input_image_u
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src'))
+
+from one_dragon.yolo import onnx_utils
+from one_dragon.yolo.onnx_utils import LetterboxPreprocessor
+
+
+def main():
+    preprocessor = LetterboxPreprocessor(640, 640)
+    image = np.random.default_rng(1).integers(0, 256, size=(1080, 1920, 3), dtype=np.uint8)
+    times = 30
+
+    onnx_utils.scale_input_image_u(image, 640, 640)
+    start = time.perf_counter()
+    for _ in range(times):
+        onnx_utils.scale_input_image_u(image, 640, 640)
+    legacy_ms = (time.perf_counter() - start) * 1000 / times
+
+    preprocessor(image)
+    start = time.perf_counter()
+    for _ in range(times):
+        preprocessor(image)
+    reuse_ms = (time.perf_counter() - start) * 1000 / times
+
+    print(f'预处理 1920x1080 -> 640x640 原方式 {legacy_ms:.3f}ms 复用缓冲区 {reuse_ms:.3f}ms')
+
+
+if __name__ == '__main__':
+    main()
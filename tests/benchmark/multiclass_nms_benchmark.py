@@ -0,0 +1,53 @@
+"""
+性能对比 - multiclass_nms 所有类别一次处理 对比逐个类别NMS
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src'))
+
+from one_dragon.yolo import detect_utils
+
+
+def _per_class_nms(boxes, scores, class_ids, iou_threshold):
+    keep_boxes = []
+    for class_id in np.unique(class_ids):
+        class_indices = np.where(class_ids == class_id)[0]
+        class_keep_boxes = detect_utils.nms(boxes[class_indices, :], scores[class_indices], iou_threshold)
+        keep_boxes.extend(class_indices[class_keep_boxes])
+    return [int(i) for i in keep_boxes]
+
+
+def _random_boxes(rng: np.random.Generator, box_cnt: int, class_cnt: int):
+    # 围绕少量中心生成 保证有足够多重叠的框
+    centers = rng.uniform(0, 1920, size=(max(box_cnt // 20, 1), 2))
+    xy = centers[rng.integers(0, len(centers), size=box_cnt)] + rng.normal(0, 15, size=(box_cnt, 2))
+    wh = rng.uniform(20, 120, size=(box_cnt, 2))
+    boxes = detect_utils.xywh2xyxy(np.hstack([xy, wh]).astype(np.float32))
+    scores = rng.uniform(0.5, 1, size=box_cnt).astype(np.float32)
+    class_ids = rng.integers(0, class_cnt, size=box_cnt)
+    return boxes, scores, class_ids
+
+
+def main():
+    boxes, scores, class_ids = _random_boxes(np.random.default_rng(1), 500, 20)
+    times = 20
+
+    start = time.perf_counter()
+    for _ in range(times):
+        _per_class_nms(boxes, scores, class_ids, 0.5)
+    per_class_ms = (time.perf_counter() - start) * 1000 / times
+
+    start = time.perf_counter()
+    for _ in range(times):
+        detect_utils.multiclass_nms(boxes, scores, class_ids, 0.5)
+    batched_ms = (time.perf_counter() - start) * 1000 / times
+
+    print(f'500个框 20个类别 逐个类别 {per_class_ms:.3f}ms 一次处理 {batched_ms:.3f}ms')
+
+
+if __name__ == '__main__':
+    main()
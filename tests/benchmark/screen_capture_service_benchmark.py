@@ -0,0 +1,40 @@
+"""
+性能对比 - ScreenCaptureService 后台截图 对比每次同步截图 调用方的等待耗时
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src'))
+
+from one_dragon.base.controller.file_screencapper import FileScreencapper
+from one_dragon.base.controller.screen_capture_service import ScreenCaptureService
+
+
+def main():
+    # 模拟每次截图耗时 10ms 后台截图时调用方不需要等待截图
+    image_list = [np.full((720, 1280, 3), i * 10, dtype=np.uint8) for i in range(5)]
+    capturer = FileScreencapper(image_list, standard_width=1920, standard_height=1080, delay_seconds=0.01)
+    times = 20
+
+    start = time.perf_counter()
+    for _ in range(times):
+        capturer.capture()
+    sync_ms = (time.perf_counter() - start) * 1000 / times
+
+    service = ScreenCaptureService(capturer.capture, fps=60)
+    service.start()
+    service.get_latest()
+    start = time.perf_counter()
+    for _ in range(times):
+        service.get_latest()
+    service_ms = (time.perf_counter() - start) * 1000 / times
+    service.stop()
+
+    print(f'截图 同步 {sync_ms:.2f}ms 后台 {service_ms:.3f}ms 后台平均截图耗时 {service.get_avg_capture_ms():.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+"""
+性能对比 - ScreenContext 重新加载画面 和按需计算全部画面路径的耗时
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src'))
+
+from one_dragon.base.screen.screen_loader import ScreenContext
+
+
+def main():
+    ctx = ScreenContext()
+    start = time.perf_counter()
+    ctx.reload()
+    reload_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for from_screen in ctx.screen_info_list:
+        for to_screen in ctx.screen_info_list:
+            ctx.get_screen_route(from_screen.screen_name, to_screen.screen_name)
+    all_route_ms = (time.perf_counter() - start) * 1000
+
+    print(f'画面数量 {len(ctx.screen_info_list)} 重新加载 {reload_ms:.1f}ms 计算全部路径 {all_route_ms:.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+性能对比 - 状态判断树编译后的判断函数 对比逐个节点递归判断
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src'))
+
+from one_dragon.base.conditional_operation import state_cal_tree
+from one_dragon.base.conditional_operation.state_cal_tree import construct_state_cal_tree
+from one_dragon.base.conditional_operation.state_recorder import StateRecorder
+
+
+def _random_expr(rng: random.Random, state_list: list[str], depth: int) -> str:
+    if depth == 0 or rng.random() < 0.3:
+        state = rng.choice(state_list)
+        expr = f'[{state}, {rng.choice([0, 0.5])}, {rng.choice([1, 3])}]'
+        if rng.random() < 0.3:
+            expr += f'{{{rng.randint(0, 2)}, {rng.randint(2, 4)}}}'
+        return expr
+    choice = rng.random()
+    if choice < 0.2:
+        return '!' + _random_expr(rng, state_list, depth - 1)
+    op = '&' if choice < 0.6 else '|'
+    return f'({_random_expr(rng, state_list, depth - 1)} {op} {_random_expr(rng, state_list, depth - 1)})'
+
+
+def main():
+    recorders = {i: StateRecorder(i) for i in ['A', 'B', 'C', 'D']}
+    rng = random.Random(1)
+    state_list = list(recorders.keys())
+    tree_list = [construct_state_cal_tree(_random_expr(rng, state_list, 5), recorders.get) for _ in range(300)]
+    for recorder in recorders.values():
+        recorder.last_record_time = 999.5
+        recorder.last_value = 2
+
+    times = 20
+
+    start = time.perf_counter()
+    for _ in range(times):
+        for tree in tree_list:
+            state_cal_tree._in_time_range_by_walk(tree, 1000)
+    walk_ms = (time.perf_counter() - start) * 1000 / times
+
+    for tree in tree_list:
+        tree.in_time_range(1000)  # 首次调用时编译
+    start = time.perf_counter()
+    for _ in range(times):
+        for tree in tree_list:
+            tree.in_time_range(1000)
+    compiled_ms = (time.perf_counter() - start) * 1000 / times
+
+    print(f'{len(tree_list)}个判断树 递归判断 {walk_ms:.3f}ms 编译后 {compiled_ms:.3f}ms')
+
+
+if __name__ == '__main__':
+    main()
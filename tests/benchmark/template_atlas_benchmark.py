@@ -0,0 +1,65 @@
+"""
+性能对比 - TemplateAtlas 从大量头像模板中找到匹配度最高的一个 对比逐个模板匹配
+"""
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src'))
+
+from one_dragon.base.matcher.template_atlas import TemplateAtlas
+from one_dragon.base.screen.template_info import TemplateInfo
+from one_dragon.base.screen.template_loader import TemplateLoader
+from one_dragon.utils import cv2_utils
+
+
+def _make_source(rng: np.random.Generator, template: TemplateInfo) -> np.ndarray:
+    """
+    把模板放到随机背景中 模仿战斗画面中裁剪出来的头像区域
+    """
+    source = cv2.GaussianBlur(rng.integers(0, 255, (70, 170, 3), dtype=np.uint8), (9, 9), 0)
+    h, w = template.raw.shape[:2]
+    x = rng.integers(0, source.shape[1] - w + 1)
+    y = rng.integers(0, source.shape[0] - h + 1)
+    patch = source[y:y + h, x:x + w]
+    mask = template.mask > 0 if template.mask is not None else np.ones((h, w), dtype=bool)
+    noise = rng.integers(-8, 9, size=patch[mask].shape)
+    patch[mask] = np.clip(template.raw[mask].astype(np.int32) + noise, 0, 255)
+    return source
+
+
+def _match_one_by_one(source: np.ndarray, template_list: list[TemplateInfo]) -> None:
+    for template in template_list:
+        cv2_utils.match_template(source, template.raw, 0.8, mask=template.mask, ignore_inf=True)
+
+
+def main():
+    loader = TemplateLoader()
+    template_list = [i for i in loader.get_all_template_info_from_disk()
+                     if i.sub_dir == 'battle' and i.template_id.startswith('avatar_1_')]
+    if len(template_list) == 0:
+        print('没有头像模板')
+        return
+    atlas = TemplateAtlas(template_list)
+
+    rng = np.random.default_rng(2)
+    source_list = [_make_source(rng, template_list[i]) for i in range(0, len(template_list), 10)]
+
+    start = time.perf_counter()
+    for source in source_list:
+        _match_one_by_one(source, template_list)
+    one_by_one_ms = (time.perf_counter() - start) * 1000 / len(source_list)
+
+    start = time.perf_counter()
+    for source in source_list:
+        atlas.match_best(source, threshold=0.8)
+    atlas_ms = (time.perf_counter() - start) * 1000 / len(source_list)
+
+    print(f'{len(template_list)}个头像模板 逐个匹配 {one_by_one_ms:.3f}ms 图集匹配 {atlas_ms:.3f}ms')
+
+
+if __name__ == '__main__':
+    main()
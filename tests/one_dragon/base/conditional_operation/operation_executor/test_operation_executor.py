@@ -0,0 +1,77 @@
+"""
+测试 OperationExecutor 在执行器线程中直接执行指令
+"""
+import threading
+import time
+
+from one_dragon.base.conditional_operation.atomic_op import AtomicOp
+from one_dragon.base.conditional_operation.operation_executor import OperationExecutor
+from one_dragon.thread.cancel_token import CancelToken
+
+
+class RecordOp(AtomicOp):
+
+    def __init__(self, op_name: str, record: list[tuple[str, str]]):
+        AtomicOp.__init__(self, op_name=op_name)
+        self.record = record
+
+    def execute(self):
+        self.record.append((self.op_name, threading.current_thread().name))
+
+
+class WaitOp(AtomicOp):
+
+    def __init__(self, seconds: float):
+        AtomicOp.__init__(self, op_name='wait')
+        self.seconds = seconds
+        self.token = CancelToken()
+        self.started = threading.Event()
+
+    def execute(self):
+        self.token.reset()
+        self.started.set()
+        self.token.sleep(self.seconds)
+
+    def stop(self) -> None:
+        self.token.cancel()
+
+
+class ErrorOp(AtomicOp):
+
+    def execute(self):
+        raise ValueError('test')
+
+
+class TestOperationExecutor:
+
+    def test_run_inline(self):
+        record: list[tuple[str, str]] = []
+        executor = OperationExecutor([RecordOp(str(i), record) for i in range(20)], time.time())
+
+        assert executor.run_async().result(timeout=1)
+
+        assert [i[0] for i in record] == [str(i) for i in range(20)]
+        # 所有指令都在同一个线程中执行 指令之间没有线程池切换的等待
+        assert len({i[1] for i in record}) == 1
+        assert record[0][1] != threading.current_thread().name
+
+    def test_error_continue(self):
+        record: list[tuple[str, str]] = []
+        executor = OperationExecutor([ErrorOp('error'), RecordOp('after', record)], time.time())
+
+        assert executor.run_async().result(timeout=1)
+        assert [i[0] for i in record] == ['after']
+
+    def test_stop_interrupt(self):
+        record: list[tuple[str, str]] = []
+        wait_op = WaitOp(5)
+        executor = OperationExecutor([wait_op, RecordOp('after', record)], time.time())
+
+        future = executor.run_async()
+        assert wait_op.started.wait(1)
+        start = time.perf_counter()
+        assert not executor.stop()
+
+        assert not future.result(timeout=1)
+        assert time.perf_counter() - start < 0.1
+        assert record == []
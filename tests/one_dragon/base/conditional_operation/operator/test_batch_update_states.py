@@ -0,0 +1,125 @@
+"""
+测试 ConditionalOperator.batch_update_states 只在相关状态变化时重新判断打断条件
+"""
+import time
+
+import pytest
+
+from one_dragon.base.conditional_operation.atomic_op import AtomicOp
+from one_dragon.base.conditional_operation.execution_info import ExecutionInfo
+from one_dragon.base.conditional_operation.operation_def import OperationDef
+from one_dragon.base.conditional_operation.operator import ConditionalOperator
+from one_dragon.base.conditional_operation.state_cal_tree import (
+    construct_state_cal_tree,
+)
+from one_dragon.base.conditional_operation.state_record_service import (
+    StateRecordService,
+)
+from one_dragon.base.conditional_operation.state_recorder import (
+    StateRecord,
+    StateRecorder,
+)
+
+
+class FakeStateRecordService(StateRecordService):
+
+    def __init__(self):
+        StateRecordService.__init__(self)
+        self.recorders: dict[str, StateRecorder] = {
+            'A': StateRecorder('A'),
+            'B': StateRecorder('B', mutex_list=['C']),
+            'C': StateRecorder('C'),
+            'D': StateRecorder('D'),
+        }
+
+    def get_state_recorder(self, state_name: str) -> StateRecorder | None:
+        return self.recorders.get(state_name)
+
+
+class FakeOperator(ConditionalOperator):
+
+    def __init__(self, service: StateRecordService):
+        ConditionalOperator.__init__(
+            self,
+            sub_dir=[],
+            template_name='',
+            operation_template_sub_dir=[],
+            state_handler_template_sub_dir=[],
+            state_record_service=service,
+        )
+
+    def get_atomic_op(self, op_def: OperationDef) -> AtomicOp:
+        return AtomicOp(op_def.op_name)
+
+
+class FakeRunningExecutor:
+
+    def __init__(self):
+        self.running: bool = True
+        self.stop_cnt: int = 0
+
+    def stop(self) -> bool:
+        self.stop_cnt += 1
+        self.running = False
+        return False
+
+
+class CountingTree:
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.check_cnt: int = 0
+
+    def __getattr__(self, item):
+        return getattr(self.tree, item)
+
+    def in_time_range(self, now: float) -> bool:
+        self.check_cnt += 1
+        return self.tree.in_time_range(now)
+
+
+class TestBatchUpdateStates:
+
+    @pytest.fixture
+    def service(self) -> FakeStateRecordService:
+        return FakeStateRecordService()
+
+    @pytest.fixture
+    def operator(self, service: FakeStateRecordService) -> FakeOperator:
+        op = FakeOperator(service)
+        op.is_running = True
+        return op
+
+    def _set_running(self, operator: FakeOperator, service: FakeStateRecordService, expr: str) -> CountingTree:
+        tree = CountingTree(construct_state_cal_tree(expr, service.get_state_recorder))
+        operator.current_execution_info = ExecutionInfo([], interrupt_cal_tree=tree)
+        operator.running_executor = FakeRunningExecutor()
+        return tree
+
+    def test_skip_unrelated_update(self, operator: FakeOperator, service: FakeStateRecordService):
+        tree = self._set_running(operator, service, '[A, 0, 1]')
+
+        operator.batch_update_states([StateRecord('D', time.time())])  # 第一次总会判断
+        operator.batch_update_states([StateRecord('D', time.time())])
+        assert tree.check_cnt == 1
+
+        service.recorders['A'].last_record_time = time.time()
+        operator.batch_update_states([StateRecord('A', time.time())])
+        assert tree.check_cnt == 2
+        assert operator.running_executor is None  # 已被打断
+
+    def test_mutex_state_counts_as_changed(self, operator: FakeOperator, service: FakeStateRecordService):
+        tree = self._set_running(operator, service, '[C, 0, 1]')
+
+        operator.batch_update_states([StateRecord('D', time.time())])
+        operator.batch_update_states([StateRecord('B', time.time())])  # B 会清除互斥的 C
+        assert tree.check_cnt == 2
+
+    def test_not_monotone_always_check(self, operator: FakeOperator, service: FakeStateRecordService):
+        tree = self._set_running(operator, service, '![A]')
+        service.recorders['A'].last_record_time = time.time()
+
+        operator.batch_update_states([StateRecord('D', time.time())])
+        operator.batch_update_states([StateRecord('D', time.time())])
+        # 包含 NOT 的条件会随时间变为真 每次都需要判断
+        assert tree.check_cnt == 2
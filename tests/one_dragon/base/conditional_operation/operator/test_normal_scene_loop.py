@@ -0,0 +1,155 @@
+"""
+测试 ConditionalOperator 主循环由事件唤醒 而不是轮询
+"""
+import threading
+import time
+
+import pytest
+
+from one_dragon.base.conditional_operation.atomic_op import AtomicOp
+from one_dragon.base.conditional_operation.operation_def import OperationDef
+from one_dragon.base.conditional_operation.operator import ConditionalOperator
+from one_dragon.base.conditional_operation.scene import Scene
+from one_dragon.base.conditional_operation.state_record_service import (
+    StateRecordService,
+)
+from one_dragon.base.conditional_operation.state_recorder import (
+    StateRecord,
+    StateRecorder,
+)
+
+
+class FakeStateRecordService(StateRecordService):
+
+    def __init__(self, state_list: list[str]):
+        StateRecordService.__init__(self)
+        self.recorders: dict[str, StateRecorder] = {i: StateRecorder(i) for i in state_list}
+
+    def get_state_recorder(self, state_name: str) -> StateRecorder | None:
+        return self.recorders.get(state_name)
+
+
+class RecordOp(AtomicOp):
+
+    def __init__(self, op_name: str, executed: list[tuple[str, float]], event: threading.Event):
+        AtomicOp.__init__(self, op_name=op_name)
+        self.executed = executed
+        self.event = event
+
+    def execute(self):
+        self.executed.append((self.op_name, time.perf_counter()))
+        self.event.set()
+
+
+class FakeOperator(ConditionalOperator):
+
+    def __init__(self, service: StateRecordService, scene_data_list: list[dict]):
+        ConditionalOperator.__init__(
+            self,
+            sub_dir=[],
+            template_name='',
+            operation_template_sub_dir=[],
+            state_handler_template_sub_dir=[],
+            state_record_service=service,
+        )
+        self.scene_data_list = scene_data_list
+        self.executed: list[tuple[str, float]] = []
+        self.executed_event = threading.Event()
+        self.loop_exit_event = threading.Event()
+
+    def _normal_scene_loop(self) -> None:
+        ConditionalOperator._normal_scene_loop(self)
+        self.loop_exit_event.set()
+
+    def load(self) -> None:
+        self.scenes = [Scene(i) for i in self.scene_data_list]
+
+    def get_atomic_op(self, op_def: OperationDef) -> AtomicOp:
+        return RecordOp(op_def.op_name, self.executed, self.executed_event)
+
+
+def _handler(states: str, op_name: str) -> dict:
+    return {'states': states, 'operations': [{'op_name': op_name}]}
+
+
+class TestNormalSceneLoop:
+
+    @pytest.fixture
+    def service(self) -> FakeStateRecordService:
+        return FakeStateRecordService(['A', 'B'])
+
+    @pytest.fixture
+    def operator(self, service: FakeStateRecordService) -> FakeOperator:
+        op = FakeOperator(service, [
+            {'triggers': ['B'], 'priority': 9, 'interval': 0, 'handlers': [_handler('[B]', 'trigger_b')]},
+            {'interval': 0, 'handlers': [_handler('[A, 0, 1]', 'normal_a')]},
+        ])
+        op.init()
+        yield op
+        op.dispose()
+
+    def test_wake_on_state_update(self, operator: FakeOperator, service: FakeStateRecordService):
+        assert operator.start_running_async()
+        time.sleep(0.3)  # 让主循环进入等待
+        assert operator.executed == []
+
+        update_time = time.perf_counter()
+        service.update_state(StateRecord('A', trigger_time=time.time()))
+        assert operator.executed_event.wait(1)
+
+        name, execute_time = operator.executed[0]
+        assert name == 'normal_a'
+        # 主循环没有超时 只能是被状态更新唤醒的
+        assert execute_time >= update_time
+
+        stats = operator.reaction_latency.get_stats()
+        assert stats['主循环']['cnt'] >= 1
+
+    def test_trigger_latency(self, operator: FakeOperator, service: FakeStateRecordService):
+        assert operator.start_running_async()
+        service.update_state(StateRecord('B', trigger_time=time.time()))
+        assert operator.executed_event.wait(1)
+
+        assert operator.executed[0][0] == 'trigger_b'
+        assert operator.reaction_latency.get_stats()['触发']['cnt'] == 1
+
+    def test_stop_running_wakes_loop(self, operator: FakeOperator):
+        assert operator.start_running_async()
+        time.sleep(0.05)
+        start_time = time.perf_counter()
+        operator.stop_running()
+
+        # 等待中的主循环被马上唤醒并退出
+        assert operator.loop_exit_event.wait(1)
+        assert time.perf_counter() - start_time < 0.05
+
+    def test_no_polling_when_idle(self, operator: FakeOperator):
+        match_cnt: list[float] = []
+        match_execution = operator.normal_scene.match_execution
+
+        def _count_match(trigger_time: float):
+            match_cnt.append(trigger_time)
+            return match_execution(trigger_time)
+
+        operator.normal_scene.match_execution = _count_match
+        assert operator.start_running_async()
+        time.sleep(0.3)
+
+        # 没有状态更新 表达式也不会随时间变化 只在开始时判断一次
+        assert len(match_cnt) == 1
+
+    def test_wake_on_time_window(self, service: FakeStateRecordService):
+        op = FakeOperator(service, [
+            {'interval': 0, 'handlers': [_handler('[A, 0.2, 1]', 'normal_a')]},
+        ])
+        op.init()
+        try:
+            assert op.start_running_async()
+            update_time = time.perf_counter()
+            service.update_state(StateRecord('A', trigger_time=time.time()))
+
+            # 状态更新时还不在时间区间内 等到区间开始时再判断
+            assert op.executed_event.wait(1)
+            assert op.executed[0][1] - update_time >= 0.19
+        finally:
+            op.dispose()
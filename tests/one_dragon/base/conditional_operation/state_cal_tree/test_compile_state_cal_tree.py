@@ -0,0 +1,67 @@
+"""
+测试状态判断树编译后的判断函数 与逐个节点递归判断结果一致
+"""
+import random
+
+import pytest
+
+from one_dragon.base.conditional_operation import state_cal_tree
+from one_dragon.base.conditional_operation.state_cal_tree import (
+    construct_state_cal_tree,
+)
+from one_dragon.base.conditional_operation.state_recorder import StateRecorder
+
+
+def _random_expr(rng: random.Random, state_list: list[str], depth: int) -> str:
+    if depth == 0 or rng.random() < 0.3:
+        state = rng.choice(state_list)
+        expr = f'[{state}, {rng.choice([0, 0.5])}, {rng.choice([1, 3])}]'
+        if rng.random() < 0.3:
+            expr += f'{{{rng.randint(0, 2)}, {rng.randint(2, 4)}}}'
+        return expr
+    choice = rng.random()
+    if choice < 0.2:
+        return '!' + _random_expr(rng, state_list, depth - 1)
+    op = '&' if choice < 0.6 else '|'
+    return f'({_random_expr(rng, state_list, depth - 1)} {op} {_random_expr(rng, state_list, depth - 1)})'
+
+
+class TestCompileStateCalTree:
+
+    @pytest.fixture
+    def recorders(self) -> dict[str, StateRecorder]:
+        return {i: StateRecorder(i) for i in ['A', 'B', 'C', 'D']}
+
+    def test_same_as_walk(self, recorders: dict[str, StateRecorder]):
+        rng = random.Random(0)
+        state_list = list(recorders.keys())
+        now = 1000
+        for _ in range(300):
+            tree = construct_state_cal_tree(_random_expr(rng, state_list, 4), recorders.get)
+            for _ in range(5):
+                for recorder in recorders.values():
+                    recorder.last_record_time = rng.choice([-1, 0, now - 0.2, now - 0.7, now - 2])
+                    recorder.last_value = rng.choice([None, 0, 1, 3, 5])
+                assert tree.in_time_range(now) == state_cal_tree._in_time_range_by_walk(tree, now)
+
+    def test_empty_expr(self, recorders: dict[str, StateRecorder]):
+        tree = construct_state_cal_tree('', recorders.get)
+        assert tree.in_time_range(1000)
+
+    def test_long_chain(self, recorders: dict[str, StateRecorder]):
+        # 连续的相同运算符展开成一层 不会因为括号嵌套过深而编译失败
+        tree = construct_state_cal_tree(' | '.join(['[A, 0, 1]'] * 500 + ['[B, 0, 1]']), recorders.get)
+        recorders['B'].last_record_time = 999.5
+        assert tree.in_time_range(1000)
+        recorders['B'].last_record_time = 990
+        assert not tree.in_time_range(1000)
+
+    def test_deep_nested_fallback(self, recorders: dict[str, StateRecorder]):
+        tree = construct_state_cal_tree('!' * 300 + '[A, 0, 1]', recorders.get)
+        recorders['A'].last_record_time = 999.5
+        assert tree.in_time_range(1000)
+
+    def test_time_monotone(self, recorders: dict[str, StateRecorder]):
+        assert construct_state_cal_tree('[A, 0, 1] | ([B]{1, 2} & [C, 0, 3])', recorders.get).time_monotone
+        assert not construct_state_cal_tree('[A, 0, 1] & ![B]', recorders.get).time_monotone
+        assert not construct_state_cal_tree('[A, 0.1, 30]', recorders.get).time_monotone
@@ -0,0 +1,38 @@
+"""
+测试 状态判断树 判断结果下一次可能随时间变化的时间
+"""
+import pytest
+
+from one_dragon.base.conditional_operation.state_cal_tree import (
+    construct_state_cal_tree,
+)
+from one_dragon.base.conditional_operation.state_recorder import StateRecorder
+
+
+class TestGetNextChangeTime:
+
+    @pytest.fixture
+    def recorders(self) -> dict[str, StateRecorder]:
+        return {i: StateRecorder(i) for i in ['A', 'B']}
+
+    def test_never_recorded(self, recorders: dict[str, StateRecorder]):
+        tree = construct_state_cal_tree('[A, 0, 1] | ![B, 0.5, 3]', recorders.get)
+        assert tree.get_next_change_time(1000) is None
+
+    def test_window_start_and_end(self, recorders: dict[str, StateRecorder]):
+        tree = construct_state_cal_tree('[A, 0.5, 3] & ![B]', recorders.get)
+        recorders['A'].last_record_time = 1000
+        recorders['B'].last_record_time = 999.8
+
+        assert tree.get_next_change_time(1000) == pytest.approx(1000.5)  # A 开始生效
+        assert tree.get_next_change_time(1000.5) == pytest.approx(1000.8)  # B 过期
+        assert tree.get_next_change_time(1001) == pytest.approx(1003)  # A 过期
+        assert tree.get_next_change_time(1003.1) is None
+
+    def test_empty_expr(self, recorders: dict[str, StateRecorder]):
+        assert construct_state_cal_tree('', recorders.get).get_next_change_time(1000) is None
+
+    def test_long_chain(self, recorders: dict[str, StateRecorder]):
+        tree = construct_state_cal_tree(' | '.join(['[A, 0, 1]'] * 2000 + ['[B, 0, 2]']), recorders.get)
+        recorders['B'].last_record_time = 1000
+        assert tree.get_next_change_time(1001.5) == pytest.approx(1002)
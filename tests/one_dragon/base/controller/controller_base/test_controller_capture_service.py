@@ -0,0 +1,44 @@
+"""
+测试 ControllerBase 开启后台截图后 截图直接使用后台最新的一帧
+"""
+import numpy as np
+
+from one_dragon.base.controller.controller_base import ControllerBase
+from one_dragon.base.controller.file_screencapper import FileScreencapper
+
+
+class FileController(ControllerBase):
+
+    def __init__(self, capturer: FileScreencapper):
+        ControllerBase.__init__(self)
+        self.capturer: FileScreencapper = capturer
+        self.get_screenshot_cnt: int = 0
+
+    def get_screenshot(self, independent: bool = False, dst=None):
+        self.get_screenshot_cnt += 1
+        return self.capturer.capture(dst)
+
+
+class TestControllerCaptureService:
+
+    def test_screenshot_from_service(self):
+        capturer = FileScreencapper([np.zeros((1080, 1920, 3), dtype=np.uint8)])
+        controller = FileController(capturer)
+
+        controller.screenshot()
+        assert controller.get_screenshot_cnt == 1
+
+        controller.start_capture_service(fps=100)
+        try:
+            screenshot_time, screen = controller.screenshot()
+            assert screen is not None
+            assert controller.capture_service.get_cnt == 1
+
+            # 独立截图不使用后台截图
+            get_cnt = controller.capture_service.get_cnt
+            controller.screenshot(independent=True)
+            assert controller.capture_service.get_cnt == get_cnt
+        finally:
+            controller.stop_capture_service()
+
+        assert controller.capture_service is None
@@ -0,0 +1,104 @@
+"""
+测试 ControllerBase 截图后的处理 直接在截图上遮挡UID 历史截图使用有上限的环形队列
+"""
+import time
+import tracemalloc
+
+import numpy as np
+
+from one_dragon.base.controller.controller_base import ControllerBase
+from one_dragon.utils import cv2_utils
+
+
+class MaskController(ControllerBase):
+
+    def __init__(self, max_screenshot_cnt: int = 0):
+        ControllerBase.__init__(self, max_screenshot_cnt=max_screenshot_cnt)
+        self.next_screen: np.ndarray | None = None  # 为None时每次返回新的截图
+
+    def get_screenshot(self, independent: bool = False, dst=None):
+        if self.next_screen is not None:
+            return self.next_screen
+        return np.full((1080, 1920, 3), 255, dtype=np.uint8)
+
+    def fill_uid_black(self, screen):
+        return cv2_utils.mark_area_as_color(screen, pos=[1800, 1050, 100, 20], color=(0, 0, 0))
+
+
+class TestScreenshotPostProcess:
+
+    def test_mask_in_place(self):
+        controller = MaskController()
+        captured = np.full((1080, 1920, 3), 255, dtype=np.uint8)
+        controller.next_screen = captured
+
+        _, screen = controller.screenshot()
+        assert screen is captured
+        assert np.all(screen[1055, 1850] == 0)
+        assert np.all(screen[0, 0] == 255)
+
+    def test_copy_when_same_frame(self):
+        # 后台截图没有新的一帧时 会再次返回同一张截图
+        controller = MaskController()
+        controller.next_screen = np.full((1080, 1920, 3), 255, dtype=np.uint8)
+
+        _, screen_1 = controller.screenshot()
+        _, screen_2 = controller.screenshot()
+        assert screen_2 is not screen_1
+        assert np.array_equal(screen_1, screen_2)
+
+    def test_copy_when_same_frame_three_times(self):
+        # 连续多次拿到同一帧时 每次都要复制 不能和之前任何一次的返回共用
+        controller = MaskController(max_screenshot_cnt=3)
+        captured = np.full((1080, 1920, 3), 255, dtype=np.uint8)
+        controller.next_screen = captured
+
+        screen_list = [controller.screenshot()[1] for _ in range(3)]
+        assert screen_list[0] is captured
+        for i in range(3):
+            for j in range(i + 1, 3):
+                assert screen_list[i] is not screen_list[j]
+                assert not np.shares_memory(screen_list[i], screen_list[j])
+
+        # 调用方修改自己的截图 不影响其它调用方和历史截图
+        screen_list[2][0, 0] = 0
+        assert np.all(screen_list[0][0, 0] == 255)
+        assert np.all(screen_list[1][0, 0] == 255)
+        assert [i.image for i in controller.screenshot_history] == screen_list
+
+    def test_history_ring(self):
+        controller = MaskController(max_screenshot_cnt=3)
+        screen_list = [controller.screenshot()[1] for _ in range(5)]
+        assert [i.image for i in controller.screenshot_history] == screen_list[2:]
+
+        controller.max_screenshot_cnt = 2
+        assert [i.image for i in controller.screenshot_history] == screen_list[3:]
+
+        controller.max_screenshot_cnt = 0
+        controller.screenshot()
+        assert len(controller.screenshot_history) == 0
+
+    def test_history_alive_seconds(self):
+        controller = MaskController(max_screenshot_cnt=10)
+        controller.screenshot_alive_seconds = 0.05
+        controller.screenshot()
+        time.sleep(0.1)
+        controller.screenshot()
+        assert len(controller.screenshot_history) == 1
+
+    def test_no_allocation_after_capture(self):
+        controller = MaskController(max_screenshot_cnt=5)
+        # 每次截图使用新的图片 模拟截图方法的返回
+        frame_list = [np.full((1080, 1920, 3), 255, dtype=np.uint8) for _ in range(20)]
+        controller.get_screenshot = lambda independent=False, dst=None: frame_list.pop()
+        for _ in range(5):
+            controller.screenshot()
+
+        tracemalloc.start()
+        for _ in range(10):
+            controller.screenshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # 截图之外的处理不再复制整张截图 一张 1080p 截图约 6MB
+        assert peak < 64 * 1024
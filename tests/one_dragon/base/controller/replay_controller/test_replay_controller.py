@@ -0,0 +1,128 @@
+"""
+测试 ReplayController 离线回放录制的截图 记录操作 使用回放时钟
+"""
+import os
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from one_dragon.base.controller import replay_controller
+from one_dragon.base.controller.replay_clock import ReplayClock
+from one_dragon.base.controller.replay_controller import ReplayController, ReplayFrame
+from one_dragon.base.geometry.point import Point
+from one_dragon.base.matcher.vision_frame_memo import VisionFrameMemo
+from one_dragon.base.operation import operation
+from one_dragon.base.operation.context_event_bus import ContextEventBus
+from one_dragon.base.operation.operation import Operation
+from one_dragon.base.operation.operation_edge import node_from
+from one_dragon.base.operation.operation_node import operation_node
+from one_dragon.utils import cv2_utils
+
+
+def _frame_list() -> list[ReplayFrame]:
+    # 第 100 秒开始黑屏 第 103 秒出现白屏
+    return [
+        ReplayFrame(100, np.zeros((1080, 1920, 3), dtype=np.uint8)),
+        ReplayFrame(103, np.full((1080, 1920, 3), 255, dtype=np.uint8)),
+    ]
+
+
+class TestReplayController:
+
+    def test_frame_by_clock(self):
+        controller = ReplayController(_frame_list(), screenshot_seconds=0.5)
+        screenshot_time, screen = controller.screenshot()
+        assert screenshot_time == 100.5
+        assert screen[0, 0, 0] == 0
+
+        controller.clock.sleep(2.5)
+        screenshot_time, screen = controller.screenshot()
+        assert screenshot_time == 103.5
+        assert screen[0, 0, 0] == 255
+        assert controller.is_finished
+
+        # 返回副本 修改不影响录制的截图
+        screen[:] = 0
+        assert controller.screenshot()[1][0, 0, 0] == 255
+
+    def test_on_finished(self):
+        finished_list = []
+        controller = ReplayController(_frame_list(), screenshot_seconds=1, on_finished=lambda: finished_list.append(1))
+        for _ in range(6):
+            controller.screenshot()
+        assert finished_list == [1]
+
+    def test_record_action(self):
+        controller = ReplayController(_frame_list())
+        controller.click(Point(10, 20), press_time=0.2)
+        controller.drag_to(Point(0, 0), duration=0.5)
+        assert controller.get_action_name_list() == ['click', 'drag_to']
+        assert controller.action_list[0].action_time == 100
+        assert controller.action_list[1].action_time == pytest.approx(100.2)
+        assert controller.clock.time() == pytest.approx(100.7)
+
+    def test_from_dir(self, tmp_path):
+        for name, value in [('switch_1700000000000.png', 0), ('switch_1700000000500.png', 255)]:
+            cv2_utils.save_image(np.full((720, 1280, 3), value, dtype=np.uint8), os.path.join(tmp_path, name))
+
+        controller = ReplayController.from_dir(str(tmp_path), screenshot_seconds=0)
+        assert [i.screenshot_time for i in controller.frame_list] == [1700000000, 1700000000.5]
+        assert controller.frame_list[0].image.shape == (1080, 1920, 3)
+
+    def test_clock_patch(self):
+        clock = ReplayClock(10)
+        with clock.patch(replay_controller):
+            replay_controller.time.sleep(100)
+            assert replay_controller.time.time() == 110
+        assert replay_controller.time is time
+        assert clock.time() == 110
+
+
+class TestReplayOperation:
+
+    def _run(self) -> tuple[ReplayController, bool, float]:
+        class ClickWhenWhite(Operation):
+
+            @operation_node(name='等待白屏', is_start_node=True, node_max_retry_times=100)
+            def wait_white(self):
+                if self.last_screenshot[0, 0, 0] == 255:
+                    return self.round_success()
+                return self.round_wait(wait=1)
+
+            @node_from(from_name='等待白屏')
+            @operation_node(name='点击')
+            def click(self):
+                self.ctx.controller.click(Point(960, 540))
+                return self.round_success()
+
+        controller = ReplayController(_frame_list())
+        ctx = SimpleNamespace(
+            controller=controller,
+            vision_frame_memo=VisionFrameMemo(),
+            run_context=SimpleNamespace(event_bus=ContextEventBus(), is_context_stop=False, is_context_pause=False,
+                                        notify_pool=None),
+            notify_config=SimpleNamespace(enable_notify=False),
+            unlisten_all_event=lambda obj: None,
+        )
+        op = ClickWhenWhite(ctx, op_name='回放', need_check_game_win=False, timeout_seconds=60)
+
+        start = time.perf_counter()
+        with controller.clock.patch(operation):
+            result = op.execute()
+        return controller, result.success, time.perf_counter() - start
+
+    def test_replay_deterministic(self):
+        controller_1, success_1, real_seconds = self._run()
+        controller_2, success_2, _ = self._run()
+
+        assert success_1 and success_2
+        assert controller_1.get_action_name_list() == ['click']
+        # 回放时间在白屏出现后 并且两次运行完全一致
+        assert controller_1.action_list[0].action_time > 103
+        assert [(i.action_time, i.name) for i in controller_1.action_list] == \
+               [(i.action_time, i.name) for i in controller_2.action_list]
+        assert controller_1.screenshot_cnt == controller_2.screenshot_cnt
+        # 等待不会真的等待
+        assert real_seconds < 1
@@ -0,0 +1,92 @@
+"""
+测试 ScreenCaptureService 后台截图 使用 FileScreencapper 代替游戏窗口
+"""
+import time
+
+import numpy as np
+import pytest
+
+from one_dragon.base.controller.file_screencapper import FileScreencapper
+from one_dragon.base.controller.screen_capture_service import ScreenCaptureService
+
+
+def _image_list(cnt: int, width: int = 1280, height: int = 720) -> list[np.ndarray]:
+    # 每张图片使用不同的颜色 方便判断拿到的是哪一张
+    return [np.full((height, width, 3), i * 10, dtype=np.uint8) for i in range(cnt)]
+
+
+class TestScreenCaptureService:
+
+    @pytest.fixture
+    def capturer(self) -> FileScreencapper:
+        return FileScreencapper(_image_list(5), standard_width=1920, standard_height=1080)
+
+    @pytest.fixture
+    def service(self, capturer: FileScreencapper):
+        service = ScreenCaptureService(capturer.capture, fps=200, idle_seconds=0.2)
+        yield service
+        service.stop()
+
+    def test_get_latest(self, service: ScreenCaptureService):
+        service.start()
+        screenshot_time, screen = service.get_latest()
+        assert screen is not None
+        assert screen.shape == (1080, 1920, 3)
+        assert time.time() - screenshot_time < 1
+
+    def test_taken_frame_not_overwritten(self, service: ScreenCaptureService):
+        service.start()
+        frame_list = []
+        for _ in range(10):
+            _, screen = service.get_latest()
+            frame_list.append((screen, int(screen[0, 0, 0])))
+            time.sleep(0.01)
+
+        # 取走的截图不会再被后台写入
+        time.sleep(0.05)
+        for screen, value in frame_list:
+            assert np.all(screen == value)
+
+    def test_reuse_buffer(self, service: ScreenCaptureService):
+        service.start()
+        service.get_latest()
+        time.sleep(0.1)
+        ptr_set = set()
+        for _ in range(20):
+            with service._condition:
+                if service._front is not None:
+                    ptr_set.add(service._front.ctypes.data)
+            time.sleep(0.005)
+        # 没有取走的截图 只在两块图片之间轮流写入
+        assert len(ptr_set) <= 3
+
+    def test_pause_when_idle(self, service: ScreenCaptureService):
+        service.start()
+        service.get_latest()
+        time.sleep(0.4)  # 超过 idle_seconds 后暂停
+        paused_cnt = service.capture_cnt
+        time.sleep(0.2)
+        assert service.capture_cnt == paused_cnt
+
+        # 获取时恢复 并且等待新的一帧
+        screenshot_time, screen = service.get_latest()
+        assert screen is not None
+        assert time.time() - screenshot_time < 0.1
+        assert service.capture_cnt > paused_cnt
+
+    def test_fps(self, capturer: FileScreencapper):
+        service = ScreenCaptureService(capturer.capture, fps=20, idle_seconds=5)
+        service.start()
+        service.get_latest()
+        start_cnt = service.capture_cnt
+        time.sleep(0.5)
+        cnt = service.capture_cnt - start_cnt
+        service.stop()
+        assert 5 <= cnt <= 15
+
+    def test_stop(self, service: ScreenCaptureService):
+        service.start()
+        service.get_latest()
+        service.stop()
+        assert not service.is_running
+        assert service.get_latest() == (0, None)
@@ -0,0 +1,80 @@
+"""
+测试 CvPipeline.execute 在非调试模式下不复制图像
+"""
+import numpy as np
+import pytest
+
+from one_dragon.base.cv_process.cv_pipeline import CvPipeline
+from one_dragon.base.cv_process.cv_step import CvPipelineContext, CvStep
+from one_dragon.base.geometry.rectangle import Rect
+
+
+class CropStep(CvStep):
+
+    def __init__(self):
+        super().__init__('crop')
+
+    def _execute(self, context: CvPipelineContext, **kwargs):
+        self._crop_image_and_update_context(context, Rect(10, 10, 30, 20), 'crop')
+
+
+class DrawStep(CvStep):
+
+    def __init__(self):
+        super().__init__('draw')
+
+    def _execute(self, context: CvPipelineContext, **kwargs):
+        context.get_writable_display_image()[:] = 255
+
+
+class NewImageStep(CvStep):
+
+    def __init__(self):
+        super().__init__('new')
+
+    def _execute(self, context: CvPipelineContext, **kwargs):
+        context.display_image = context.display_image + 1
+
+
+class TestExecute:
+
+    @pytest.fixture
+    def image(self) -> np.ndarray:
+        return np.zeros((100, 100, 3), dtype=np.uint8)
+
+    def test_no_copy_in_production(self, image: np.ndarray):
+        pipeline = CvPipeline()
+        pipeline.steps = [CropStep()]
+
+        context = pipeline.execute(image, debug_mode=False)
+
+        assert np.shares_memory(context.display_image, image)
+        assert context.display_image.shape == (10, 20, 3)
+        assert context.crop_offset == (10, 10)
+        assert context.step_execution_times[0][2] == 0
+        assert context.total_allocated_bytes == 0
+
+    def test_copy_in_debug(self, image: np.ndarray):
+        context = CvPipeline().execute(image, debug_mode=True)
+
+        assert not np.shares_memory(context.display_image, image)
+
+    def test_materialize_on_write(self, image: np.ndarray):
+        pipeline = CvPipeline()
+        pipeline.steps = [CropStep(), DrawStep(), DrawStep()]
+
+        context = pipeline.execute(image, debug_mode=False)
+
+        assert not image.any()  # 原图不被修改
+        assert context.display_image.all()
+        # 只有第一次写入时复制
+        assert [i[2] for i in context.step_execution_times] == [0, 10 * 20 * 3, 0]
+
+    def test_new_image_not_shared(self, image: np.ndarray):
+        pipeline = CvPipeline()
+        pipeline.steps = [NewImageStep(), DrawStep()]
+
+        context = pipeline.execute(image, debug_mode=False)
+
+        assert not image.any()
+        assert [i[2] for i in context.step_execution_times] == [image.nbytes, 0]
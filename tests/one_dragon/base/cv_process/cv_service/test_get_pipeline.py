@@ -0,0 +1,97 @@
+"""
+测试 CvService.get_pipeline 的流水线缓存
+"""
+import os
+import shutil
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from one_dragon.base.cv_process.cv_pipeline import CvPipeline
+from one_dragon.base.cv_process.cv_service import CvService
+from one_dragon.base.cv_process.steps import CvStepGrayscale
+
+ROOT = Path(__file__).resolve().parents[5]
+CHAIN_BAR_PIPELINE = ROOT / 'assets' / 'image_analysis_pipelines' / '战斗-连携条.yml'
+
+
+class TestGetPipeline:
+
+    @pytest.fixture
+    def service(self, tmp_path, monkeypatch) -> CvService:
+        monkeypatch.setattr(CvService, 'PIPELINE_DIR', str(tmp_path / 'pipelines'))
+        monkeypatch.setattr(CvService, 'TEMPLATE_DIR', str(tmp_path / 'templates'))
+        od_ctx = SimpleNamespace(ocr=None, template_loader=None)
+        return CvService(od_ctx)
+
+    @staticmethod
+    def _save(service: CvService, name: str, step_cnt: int) -> None:
+        pipeline = CvPipeline()
+        pipeline.steps = [CvStepGrayscale() for _ in range(step_cnt)]
+        service.save_pipeline(name, pipeline)
+
+    def test_reuse_compiled_pipeline(self, service: CvService):
+        self._save(service, 'p', 1)
+
+        first = service.get_pipeline('p')
+        second = service.get_pipeline('p')
+
+        assert first is not None
+        assert first is second
+        # 编辑用的 load_pipeline 仍然返回独立实例
+        assert service.load_pipeline('p') is not first
+
+    def test_missing_pipeline(self, service: CvService):
+        assert service.get_pipeline('not_exist') is None
+
+    def test_reload_after_file_changed(self, service: CvService):
+        self._save(service, 'p', 1)
+        first = service.get_pipeline('p')
+
+        file_path = os.path.join(service.PIPELINE_DIR, 'p.yml')
+        service_2 = CvService(service.od_ctx)  # 用另一个服务改写文件 不会触发主动失效
+        self._save(service_2, 'p', 2)
+        mtime = os.stat(file_path).st_mtime_ns + 1_000_000
+        os.utime(file_path, ns=(mtime, mtime))
+
+        second = service.get_pipeline('p')
+        assert second is not first
+        assert len(second.steps) == 2
+
+    def test_invalidate_on_save(self, service: CvService):
+        self._save(service, 'p', 1)
+        first = service.get_pipeline('p')
+
+        self._save(service, 'p', 3)
+        second = service.get_pipeline('p')
+
+        assert second is not first
+        assert len(second.steps) == 3
+
+    def test_invalidate_on_delete_and_rename(self, service: CvService):
+        self._save(service, 'p', 1)
+        assert service.get_pipeline('p') is not None
+
+        service.rename_pipeline('p', 'q')
+        assert service.get_pipeline('p') is None
+        assert service.get_pipeline('q') is not None
+
+        service.delete_pipeline('q')
+        assert service.get_pipeline('q') is None
+
+    def test_prewarm(self, service: CvService):
+        self._save(service, 'p', 1)
+
+        service.prewarm_pipelines(['p', 'not_exist'])
+
+        assert 'p' in service._pipeline_cache
+        assert 'not_exist' not in service._pipeline_cache
+
+    def test_reuse_real_pipeline(self, service: CvService):
+        shutil.copy(CHAIN_BAR_PIPELINE, os.path.join(service.PIPELINE_DIR, 'chain.yml'))
+
+        first = service.get_pipeline('chain')
+        assert first is not None
+        assert service.get_pipeline('chain') is first
+        assert len(first.steps) == len(service.load_pipeline('chain').steps)
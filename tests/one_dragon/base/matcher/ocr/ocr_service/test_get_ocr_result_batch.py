@@ -0,0 +1,116 @@
+"""
+测试 OcrService.get_ocr_result_batch 的多区域批量识别
+"""
+import numpy as np
+import pytest
+
+from one_dragon.base.geometry.rectangle import Rect
+from one_dragon.base.matcher.ocr import ocr_utils
+from one_dragon.base.matcher.ocr.ocr_match_result import OcrMatchResult
+from one_dragon.base.matcher.ocr.ocr_matcher import OcrMatcher
+from one_dragon.base.matcher.ocr.ocr_service import OcrService
+
+
+class FakeCanvasOcrMatcher(OcrMatcher):
+    """
+    在整张画布上 对每个非零色块返回一个识别结果
+    """
+
+    def __init__(self):
+        OcrMatcher.__init__(self)
+        self.call_count: int = 0
+
+    def ocr(self, image, threshold: float = 0, merge_line_distance: float = -1) -> list[OcrMatchResult]:
+        self.call_count += 1
+        result_list: list[OcrMatchResult] = []
+        gray = image if image.ndim == 2 else image.max(axis=2)
+        visited = np.zeros(gray.shape, dtype=bool)
+        for y, x in zip(*np.nonzero(gray), strict=True):
+            if visited[y, x]:
+                continue
+            value = int(gray[y, x])
+            block = gray == value
+            ys, xs = np.nonzero(block)
+            visited |= block
+            result_list.append(OcrMatchResult(
+                1, int(xs.min()), int(ys.min()),
+                int(xs.max() - xs.min() + 1), int(ys.max() - ys.min() + 1),
+                data=f'text_{value}',
+            ))
+        return result_list
+
+
+class TestGetOcrResultBatch:
+
+    @pytest.fixture
+    def matcher(self) -> FakeCanvasOcrMatcher:
+        return FakeCanvasOcrMatcher()
+
+    @pytest.fixture
+    def service(self, matcher: FakeCanvasOcrMatcher) -> OcrService:
+        return OcrService(ocr_matcher=matcher)
+
+    @staticmethod
+    def _screen() -> np.ndarray:
+        screen = np.zeros((200, 300, 3), dtype=np.uint8)
+        screen[20:30, 20:50] = 10
+        screen[120:130, 200:260] = 20
+        return screen
+
+    def test_single_ocr_call(self, service: OcrService, matcher: FakeCanvasOcrMatcher):
+        screen = self._screen()
+        result_list = service.get_ocr_result_batch(screen, [
+            (Rect(10, 10, 60, 40), None),
+            (Rect(190, 110, 280, 140), None),
+            (Rect(100, 60, 150, 90), None),
+        ])
+
+        assert matcher.call_count == 1
+        assert [[i.data for i in r] for r in result_list] == [['text_10'], ['text_20'], []]
+        # 坐标换算回原图
+        assert (result_list[0][0].x, result_list[0][0].y) == (20, 20)
+        assert (result_list[1][0].x, result_list[1][0].y) == (200, 120)
+
+    def test_same_as_single_region(self, service: OcrService, matcher: FakeCanvasOcrMatcher):
+        screen = self._screen()
+        rect = Rect(190, 110, 280, 140)
+        batch_result = service.get_ocr_result_batch(screen, [(rect, None), (Rect(10, 10, 60, 40), None)])[0]
+
+        # 单独识别时命中批量识别写入的缓存
+        single_result = service.get_ocr_result_list(screen, rect=rect)
+        assert matcher.call_count == 1
+        assert [i.rect for i in single_result] == [i.rect for i in batch_result]
+
+    def test_partial_cache_hit(self, service: OcrService, matcher: FakeCanvasOcrMatcher):
+        screen = self._screen()
+        service.get_ocr_result_list(screen, rect=Rect(10, 10, 60, 40))
+
+        result_list = service.get_ocr_result_batch(screen, [
+            (Rect(10, 10, 60, 40), None),
+            (Rect(190, 110, 280, 140), None),
+        ])
+
+        assert matcher.call_count == 2
+        assert [[i.data for i in r] for r in result_list] == [['text_10'], ['text_20']]
+
+
+class TestPackImagesToCanvas:
+
+    def test_no_overlap(self):
+        image_list = [np.ones((h, w, 3), dtype=np.uint8) for h, w in [(30, 100), (50, 80), (20, 300)]]
+        layout_list = ocr_utils.pack_images_to_canvas(image_list, 400, 400, gap=16)
+
+        assert len(layout_list) == 1
+        canvas, placement = layout_list[0]
+        assert sorted(i for i, _ in placement) == [0, 1, 2]
+        rect_list = [r for _, r in placement]
+        for i in range(len(rect_list)):
+            for j in range(i + 1, len(rect_list)):
+                a, b = rect_list[i], rect_list[j]
+                assert a.x2 + 16 <= b.x1 or b.x2 + 16 <= a.x1 or a.y2 + 16 <= b.y1 or b.y2 + 16 <= a.y1
+
+    def test_split_when_full(self):
+        image_list = [np.ones((150, 150, 3), dtype=np.uint8) for _ in range(3)]
+        layout_list = ocr_utils.pack_images_to_canvas(image_list, 200, 200, gap=16)
+
+        assert len(layout_list) == 3
@@ -0,0 +1,93 @@
+"""
+测试 OcrService.get_ocr_result_list 的内容哈希缓存
+"""
+import numpy as np
+import pytest
+
+from one_dragon.base.geometry.rectangle import Rect
+from one_dragon.base.matcher.ocr.ocr_match_result import OcrMatchResult
+from one_dragon.base.matcher.ocr.ocr_matcher import OcrMatcher
+from one_dragon.base.matcher.ocr.ocr_service import OcrService
+
+
+class FakeOcrMatcher(OcrMatcher):
+
+    def __init__(self):
+        OcrMatcher.__init__(self)
+        self.call_count: int = 0
+
+    def ocr(self, image, threshold: float = 0, merge_line_distance: float = -1) -> list[OcrMatchResult]:
+        self.call_count += 1
+        return [OcrMatchResult(1, 0, 0, 10, 10, data=f'text_{int(image.mean())}')]
+
+
+class TestGetOcrResultList:
+
+    @pytest.fixture
+    def matcher(self) -> FakeOcrMatcher:
+        return FakeOcrMatcher()
+
+    @pytest.fixture
+    def service(self, matcher: FakeOcrMatcher) -> OcrService:
+        return OcrService(ocr_matcher=matcher)
+
+    @staticmethod
+    def _screen(value: int = 0) -> np.ndarray:
+        return np.full((100, 200, 3), value, dtype=np.uint8)
+
+    def test_same_pixels_different_array(self, service: OcrService, matcher: FakeOcrMatcher):
+        rect = Rect(10, 10, 60, 40)
+        screen_1 = self._screen()
+        screen_2 = self._screen()
+        screen_2[80:, 150:] = 255  # 区域外的变化不影响
+
+        result_1 = service.get_ocr_result_list(screen_1, rect=rect)
+        result_2 = service.get_ocr_result_list(screen_2, rect=rect)
+
+        assert matcher.call_count == 1
+        assert [i.data for i in result_1] == [i.data for i in result_2]
+        assert result_1[0].x == 10 and result_1[0].y == 10
+        assert service.get_cache_stats()['hit'] == 1
+        assert service.get_cache_stats()['miss'] == 1
+
+    def test_changed_pixels_in_area(self, service: OcrService, matcher: FakeOcrMatcher):
+        rect = Rect(10, 10, 60, 40)
+        service.get_ocr_result_list(self._screen(0), rect=rect)
+        service.get_ocr_result_list(self._screen(100), rect=rect)
+
+        assert matcher.call_count == 2
+
+    def test_reused_memory_not_stale(self, service: OcrService, matcher: FakeOcrMatcher):
+        screen = self._screen(0)
+        service.get_ocr_result_list(screen)
+        screen[:] = 100  # 同一个数组对象 内容变化
+        result = service.get_ocr_result_list(screen)
+
+        assert matcher.call_count == 2
+        assert result[0].data == 'text_100'
+
+    def test_threshold_and_color_range_in_key(self, service: OcrService, matcher: FakeOcrMatcher):
+        screen = self._screen(50)
+        service.get_ocr_result_list(screen, threshold=0.5)
+        service.get_ocr_result_list(screen, threshold=0.6)
+        assert matcher.call_count == 2
+
+        service.get_ocr_result_list(screen, color_range=[[0, 0, 0], [100, 100, 100]])
+        service.get_ocr_result_list(screen, color_range=[[0, 0, 0], [100, 100, 100]])
+        assert matcher.call_count == 3
+
+    def test_lru_eviction(self, matcher: FakeOcrMatcher):
+        service = OcrService(ocr_matcher=matcher, max_cache_size=2)
+        for value in [0, 1, 0, 2, 1]:
+            service.get_ocr_result_list(self._screen(value))
+
+        # 0 1 命中0 2淘汰1 1重新识别
+        assert matcher.call_count == 4
+        assert service.get_cache_stats()['size'] == 2
+
+    def test_byte_budget(self, matcher: FakeOcrMatcher):
+        service = OcrService(ocr_matcher=matcher, max_cache_bytes=1)
+        service.get_ocr_result_list(self._screen(0))
+
+        assert service.get_cache_stats()['size'] == 0
+        assert service.get_cache_stats()['bytes'] == 0
@@ -0,0 +1,70 @@
+"""
+测试 OcrService.get_rec_result_batch 跳过文本检测的批量识别
+"""
+import numpy as np
+import pytest
+
+from one_dragon.base.geometry.rectangle import Rect
+from one_dragon.base.matcher.ocr.ocr_match_result import OcrMatchResult
+from one_dragon.base.matcher.ocr.ocr_matcher import OcrMatcher
+from one_dragon.base.matcher.ocr.ocr_service import OcrService
+
+
+class FakeRecOcrMatcher(OcrMatcher):
+
+    def __init__(self):
+        OcrMatcher.__init__(self)
+        self.ocr_count: int = 0
+        self.rec_batch_size_list: list[int] = []
+
+    def ocr(self, image, threshold: float = 0, merge_line_distance: float = -1) -> list[OcrMatchResult]:
+        self.ocr_count += 1
+        return [OcrMatchResult(1, 0, 0, 10, 10, data=f'text_{int(image.mean())}')]
+
+    def recognize_batch(self, image_list, threshold: float = 0) -> list[tuple[str, float]]:
+        self.rec_batch_size_list.append(len(image_list))
+        return [
+            ('', 0) if int(image.mean()) == 0 else (f'text_{int(image.mean())}', 0.9)
+            for image in image_list
+        ]
+
+
+class TestGetRecResultBatch:
+
+    @pytest.fixture
+    def matcher(self) -> FakeRecOcrMatcher:
+        return FakeRecOcrMatcher()
+
+    @pytest.fixture
+    def service(self, matcher: FakeRecOcrMatcher) -> OcrService:
+        return OcrService(ocr_matcher=matcher)
+
+    @staticmethod
+    def _screen() -> np.ndarray:
+        screen = np.zeros((200, 300, 3), dtype=np.uint8)
+        screen[10:40, 10:60] = 10
+        screen[110:140, 190:280] = 20
+        return screen
+
+    def test_one_rec_batch(self, service: OcrService, matcher: FakeRecOcrMatcher):
+        result_list = service.get_rec_result_batch(self._screen(), [
+            (Rect(10, 10, 60, 40), None),
+            (Rect(190, 110, 280, 140), None),
+            (Rect(100, 60, 150, 90), None),
+        ])
+
+        assert matcher.ocr_count == 0
+        assert matcher.rec_batch_size_list == [3]
+        assert [[i.data for i in r] for r in result_list] == [['text_10'], ['text_20'], []]
+        # 结果覆盖整个区域
+        assert result_list[1][0].rect == Rect(190, 110, 280, 140)
+
+    def test_cache_separated_from_det(self, service: OcrService, matcher: FakeRecOcrMatcher):
+        screen = self._screen()
+        rect = Rect(10, 10, 60, 40)
+        service.get_ocr_result_list(screen, rect=rect)
+        service.get_rec_result_batch(screen, [(rect, None)])
+        service.get_rec_result_batch(screen, [(rect, None)])
+
+        assert matcher.ocr_count == 1
+        assert matcher.rec_batch_size_list == [1]
@@ -0,0 +1,75 @@
+"""
+测试 TemplateAtlas 从大量头像模板中找到匹配度最高的一个 结果与逐个模板匹配一致
+"""
+import cv2
+import numpy as np
+import pytest
+
+from one_dragon.base.matcher.template_atlas import TemplateAtlas
+from one_dragon.base.screen.template_info import TemplateInfo
+from one_dragon.base.screen.template_loader import TemplateLoader
+from one_dragon.utils import cv2_utils
+
+
+@pytest.fixture(scope='module')
+def template_list() -> list[TemplateInfo]:
+    loader = TemplateLoader()
+    template_list = [i for i in loader.get_all_template_info_from_disk()
+                     if i.sub_dir == 'battle' and i.template_id.startswith('avatar_1_')]
+    if len(template_list) == 0:
+        pytest.skip('没有头像模板')
+    return template_list
+
+
+@pytest.fixture(scope='module')
+def atlas(template_list: list[TemplateInfo]) -> TemplateAtlas:
+    return TemplateAtlas(template_list)
+
+
+def _make_source(rng: np.random.Generator, template: TemplateInfo) -> np.ndarray:
+    """
+    把模板放到随机背景中 模仿战斗画面中裁剪出来的头像区域
+    """
+    source = cv2.GaussianBlur(rng.integers(0, 255, (70, 170, 3), dtype=np.uint8), (9, 9), 0)
+    h, w = template.raw.shape[:2]
+    x = rng.integers(0, source.shape[1] - w + 1)
+    y = rng.integers(0, source.shape[0] - h + 1)
+    patch = source[y:y + h, x:x + w]
+    mask = template.mask > 0 if template.mask is not None else np.ones((h, w), dtype=bool)
+    noise = rng.integers(-8, 9, size=patch[mask].shape)
+    patch[mask] = np.clip(template.raw[mask].astype(np.int32) + noise, 0, 255)
+    return source
+
+
+def _match_one_by_one(source: np.ndarray, template_list: list[TemplateInfo]) -> tuple[str | None, float]:
+    best_id, best_confidence = None, 0
+    for template in template_list:
+        mrl = cv2_utils.match_template(source, template.raw, 0.8, mask=template.mask, ignore_inf=True)
+        if mrl.max is not None and mrl.max.confidence > best_confidence:
+            best_id, best_confidence = template.template_id, mrl.max.confidence
+    return best_id, best_confidence
+
+
+def test_same_as_one_by_one(atlas: TemplateAtlas, template_list: list[TemplateInfo]):
+    rng = np.random.default_rng(0)
+    for template in template_list[::3]:
+        source = _make_source(rng, template)
+        expected_id, expected_confidence = _match_one_by_one(source, template_list)
+        result = atlas.match_best(source, threshold=0.8)
+        assert result is not None
+        assert result.data == expected_id
+        assert result.confidence == pytest.approx(expected_confidence, abs=1e-3)
+
+
+def test_candidate_list(atlas: TemplateAtlas, template_list: list[TemplateInfo]):
+    rng = np.random.default_rng(1)
+    source = _make_source(rng, template_list[0])
+    # 候选中没有正确的模板时 不会匹配到
+    assert atlas.match_best(source, [i.template_id for i in template_list[1:3]], threshold=0.8) is None
+    assert atlas.match_best(source, [template_list[0].template_id], threshold=0.8).data == template_list[0].template_id
+    assert atlas.match_best(source, ['not_existed'], threshold=0.8) is None
+
+
+def test_no_match(atlas: TemplateAtlas):
+    source = np.full((70, 170, 3), 50, dtype=np.uint8)
+    assert atlas.match_best(source, threshold=0.8) is None
@@ -0,0 +1,46 @@
+"""
+测试 TemplateMatcher.match_template_binary 使用缓存的二值化模板
+"""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from one_dragon.base.geometry.rectangle import Rect
+from one_dragon.base.matcher.template_matcher import TemplateMatcher
+from one_dragon.base.screen.template_info import TemplateInfo
+from one_dragon.utils import cv2_utils
+
+
+class TestMatchTemplateBinary:
+
+    @pytest.fixture
+    def template(self) -> TemplateInfo:
+        template = TemplateInfo('__test__', 'binary')
+        rng = np.random.default_rng(0)
+        template.raw = rng.integers(0, 256, (20, 30, 3), dtype=np.uint8)
+        return template
+
+    @pytest.fixture
+    def matcher(self, template: TemplateInfo) -> TemplateMatcher:
+        loader = SimpleNamespace(get_template=lambda sub_dir, template_id: template)
+        return TemplateMatcher(loader)
+
+    def test_binary_cached_per_threshold(self, template: TemplateInfo):
+        binary_127 = template.get_binary()
+        assert template.get_binary(127) is binary_127
+        assert template.get_binary(100) is not binary_127
+        assert np.array_equal(binary_127, cv2_utils.to_binary(template.raw, threshold=127))
+        assert template.get_image('binary') is binary_127
+        assert template.get_image('hsv') is template.hsv
+
+    def test_crop_and_match(self, template: TemplateInfo, matcher: TemplateMatcher):
+        screen = np.zeros((200, 300, 3), dtype=np.uint8)
+        screen[50:70, 100:130] = template.raw
+
+        mrl = matcher.crop_and_match_template_binary(screen, Rect(80, 40, 160, 90), '__test__', 'binary',
+                                                     threshold=0.9)
+
+        assert mrl.max is not None
+        assert (mrl.max.x, mrl.max.y) == (20, 10)
+        assert 127 in template._binary_map
@@ -0,0 +1,97 @@
+"""
+测试 VisionFrameMemo 在同一帧内复用识别结果
+"""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from one_dragon.base.geometry.rectangle import Rect
+from one_dragon.base.matcher.template_matcher import TemplateMatcher
+from one_dragon.base.matcher.vision_frame_memo import VisionFrameMemo
+from one_dragon.base.screen import screen_utils
+from one_dragon.base.screen.screen_area import ScreenArea
+from one_dragon.base.screen.template_info import TemplateInfo
+
+
+class CountingTemplateMatcher(TemplateMatcher):
+
+    def __init__(self, template_loader):
+        TemplateMatcher.__init__(self, template_loader)
+        self.match_count: int = 0
+
+    def match_template(self, source, template_sub_dir, template_id, **kwargs):
+        self.match_count += 1
+        return TemplateMatcher.match_template(self, source, template_sub_dir, template_id, **kwargs)
+
+
+class TestVisionFrameMemo:
+
+    @pytest.fixture
+    def template(self) -> TemplateInfo:
+        template = TemplateInfo('__test__', 'memo')
+        template.raw = np.random.default_rng(0).integers(0, 256, (20, 30, 3), dtype=np.uint8)
+        return template
+
+    @pytest.fixture
+    def ctx(self, template: TemplateInfo) -> SimpleNamespace:
+        memo = VisionFrameMemo()
+        tm = CountingTemplateMatcher(SimpleNamespace(get_template=lambda sub_dir, template_id: template))
+        tm.frame_memo = memo
+        return SimpleNamespace(tm=tm, vision_frame_memo=memo)
+
+    @pytest.fixture
+    def area(self) -> ScreenArea:
+        return ScreenArea(area_name='图标', pc_rect=Rect(90, 40, 150, 80),
+                          template_sub_dir='__test__', template_id='memo')
+
+    def _screen(self, template: TemplateInfo) -> np.ndarray:
+        screen = np.zeros((200, 300, 3), dtype=np.uint8)
+        screen[50:70, 100:130] = template.raw
+        return screen
+
+    def test_reuse_in_same_frame(self, ctx: SimpleNamespace, area: ScreenArea, template: TemplateInfo):
+        screen = self._screen(template)
+        ctx.vision_frame_memo.new_frame(screen)
+
+        for _ in range(3):
+            result = screen_utils.find_area_in_screen(ctx, screen, area)
+            assert result == screen_utils.FindAreaResultEnum.TRUE
+
+        assert ctx.tm.match_count == 1
+        stats = ctx.vision_frame_memo.get_stats()
+        assert stats['area_hit'] == 2
+        assert stats['area_miss'] == 1
+
+    def test_template_result_copied(self, ctx: SimpleNamespace, area: ScreenArea, template: TemplateInfo):
+        screen = self._screen(template)
+        ctx.vision_frame_memo.new_frame(screen)
+
+        mrl_1 = ctx.tm.crop_and_match_template(screen, area.rect, '__test__', 'memo', threshold=0.9)
+        mrl_1.max.x += 100  # 调用方修改结果 不影响记录
+        mrl_2 = ctx.tm.crop_and_match_template(screen, area.rect, '__test__', 'memo', threshold=0.9)
+
+        assert ctx.tm.match_count == 1
+        assert (mrl_2.max.x, mrl_2.max.y) == (10, 10)
+        assert ctx.vision_frame_memo.get_stats()['template_hit'] == 1
+
+    def test_new_frame_clears(self, ctx: SimpleNamespace, area: ScreenArea, template: TemplateInfo):
+        screen = self._screen(template)
+        ctx.vision_frame_memo.new_frame(screen)
+        screen_utils.find_area_in_screen(ctx, screen, area)
+
+        screen[:] = 0  # 截图对象被复用
+        ctx.vision_frame_memo.new_frame(screen)
+        result = screen_utils.find_area_in_screen(ctx, screen, area)
+
+        assert result == screen_utils.FindAreaResultEnum.FALSE
+        assert ctx.tm.match_count == 2
+
+    def test_other_screen_not_memo(self, ctx: SimpleNamespace, area: ScreenArea, template: TemplateInfo):
+        ctx.vision_frame_memo.new_frame(self._screen(template))
+
+        other = self._screen(template)
+        screen_utils.find_area_in_screen(ctx, other, area)
+        screen_utils.find_area_in_screen(ctx, other, area)
+
+        assert ctx.tm.match_count == 2
@@ -0,0 +1,112 @@
+"""
+测试 画面没有变化时 节点沿用上一轮的结果 跳过识别
+"""
+from types import SimpleNamespace
+
+import numpy as np
+
+from one_dragon.base.matcher.vision_frame_memo import VisionFrameMemo
+from one_dragon.base.operation.operation import Operation
+from one_dragon.base.operation.operation_node import operation_node
+from one_dragon.base.operation.operation_round_result import (
+    OperationRoundResult,
+    OperationRoundResultEnum,
+)
+
+
+class ListController:
+
+    def __init__(self, image_list: list[np.ndarray]):
+        self.image_list: list[np.ndarray] = image_list
+        self.capture_idx: int = 0
+
+    def screenshot(self):
+        image = self.image_list[min(self.capture_idx, len(self.image_list) - 1)]
+        self.capture_idx += 1
+        return 0, image.copy()
+
+
+class WaitOperation(Operation):
+
+    def __init__(self, ctx):
+        Operation.__init__(self, ctx, op_name='测试', need_check_game_win=False)
+        self.check_cnt: int = 0
+        self.click_in_round: bool = False
+
+    @operation_node(name='等待画面', is_start_node=True, skip_if_screen_unchanged=True)
+    def wait_screen(self) -> OperationRoundResult:
+        self.check_cnt += 1
+        if self.click_in_round:
+            self.node_clicked = True
+        return self.round_wait(status='加载中')
+
+    @operation_node(name='每轮运行')
+    def always_run(self) -> OperationRoundResult:
+        self.check_cnt += 1
+        return self.round_wait()
+
+
+def _new_op(image_list: list[np.ndarray]) -> tuple[WaitOperation, VisionFrameMemo]:
+    memo = VisionFrameMemo()
+    ctx = SimpleNamespace(controller=ListController(image_list), vision_frame_memo=memo)
+    op = WaitOperation(ctx)
+    return op, memo
+
+
+def _screen(value: int) -> np.ndarray:
+    return np.full((1080, 1920, 3), value, dtype=np.uint8)
+
+
+class TestSkipUnchangedRound:
+
+    def test_skip_when_unchanged(self):
+        op, memo = _new_op([_screen(0)])
+        op._current_node = op.wait_screen.operation_node_annotation
+
+        for _ in range(5):
+            round_result = op._execute_one_round()
+            assert round_result.result == OperationRoundResultEnum.WAIT
+            assert round_result.status == '加载中'
+
+        assert op.check_cnt == 1
+        stats = memo.get_stats()
+        assert stats['round_run'] == 1
+        assert stats['round_skip'] == 4
+
+    def test_run_when_changed(self):
+        changed = _screen(0)
+        changed[500:520, 900:960] = 255  # 局部出现的小按钮
+        op, memo = _new_op([_screen(0), _screen(0), changed, changed])
+        op._current_node = op.wait_screen.operation_node_annotation
+
+        for _ in range(4):
+            op._execute_one_round()
+
+        assert op.check_cnt == 2
+        assert memo.get_stats()['round_skip'] == 2
+
+    def test_not_reuse_after_click(self):
+        op, memo = _new_op([_screen(0)])
+        op._current_node = op.wait_screen.operation_node_annotation
+        op.click_in_round = True
+
+        # 点击的一轮 画面可能还没来得及变化 下一轮需要重新判断
+        op._execute_one_round()
+        op._execute_one_round()
+        assert op.check_cnt == 2
+
+    def test_not_reuse_across_node(self):
+        op, memo = _new_op([_screen(0)])
+        op._current_node = op.wait_screen.operation_node_annotation
+        op._execute_one_round()
+
+        op._current_node = op.always_run.operation_node_annotation
+        op._reset_status_for_new_node()
+        op._execute_one_round()
+        op._execute_one_round()
+        assert op.check_cnt == 3
+
+        op._current_node = op.wait_screen.operation_node_annotation
+        op._reset_status_for_new_node()
+        op._execute_one_round()
+        assert op.check_cnt == 4
@@ -0,0 +1,76 @@
+"""
+测试 轮次等待 画面稳定或者出现指定区域时提前结束
+使用回放控制器和回放时钟 不会真的等待
+"""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from one_dragon.base.controller.replay_controller import ReplayController, ReplayFrame
+from one_dragon.base.matcher.vision_frame_memo import VisionFrameMemo
+from one_dragon.base.operation import operation
+from one_dragon.base.operation.operation import Operation
+from one_dragon.base.screen.screen_utils import FindAreaResultEnum
+
+
+def _screen(value: int) -> np.ndarray:
+    return np.full((1080, 1920, 3), value, dtype=np.uint8)
+
+
+def _new_op(frame_list: list[ReplayFrame]) -> tuple[Operation, ReplayController]:
+    controller = ReplayController(frame_list, screenshot_seconds=0)
+    ctx = SimpleNamespace(controller=controller, vision_frame_memo=VisionFrameMemo())
+    op = Operation(ctx, op_name='测试', need_check_game_win=False)
+    return op, controller
+
+
+class TestWaitForScreen:
+
+    def test_until_stable(self):
+        # 点击后 0.3秒开始切换画面 0.5秒后画面稳定
+        op, controller = _new_op([
+            ReplayFrame(0, _screen(0)),
+            ReplayFrame(0.3, _screen(100)),
+            ReplayFrame(0.5, _screen(200)),
+        ])
+        with controller.clock.patch(operation):
+            op.screenshot()
+            op.round_start_time = controller.clock.time()
+            round_result = op.round_wait(wait=3, wait_until_stable=True)
+
+        assert round_result.status is None
+        # 稳定后连续 3 次截图没有变化 即 0.5 + 0.3
+        assert controller.clock.time() == pytest.approx(0.8)
+        assert op.last_screenshot[0, 0, 0] == 200
+
+    def test_wait_full_when_unchanged(self):
+        # 画面一直没有变化 可能点击还没生效 等待完整的时间
+        op, controller = _new_op([ReplayFrame(0, _screen(0))])
+        with controller.clock.patch(operation):
+            op.screenshot()
+            assert not op.wait_for_screen(2, until_stable=True)
+        assert controller.clock.time() == pytest.approx(2)
+
+    def test_stable_without_change(self):
+        op, controller = _new_op([ReplayFrame(0, _screen(0))])
+        with controller.clock.patch(operation):
+            op.screenshot()
+            assert op.wait_for_screen(2, until_stable=True, require_change=False)
+        assert controller.clock.time() == pytest.approx(0.4)
+
+    def test_until_area(self, monkeypatch):
+        op, controller = _new_op([
+            ReplayFrame(0, _screen(0)),
+            ReplayFrame(1, _screen(255)),
+        ])
+        monkeypatch.setattr(
+            operation.screen_utils, 'find_area',
+            lambda ctx, screen, screen_name, area_name:
+                FindAreaResultEnum.TRUE if screen[0, 0, 0] == 255 else FindAreaResultEnum.FALSE,
+        )
+        with controller.clock.patch(operation):
+            op.screenshot()
+            op.round_start_time = controller.clock.time()
+            op.round_retry(wait_round_time=5, wait_until_area=('画面', '区域'))
+        assert controller.clock.time() < 1.2  # 下一次截图就结束等待 不需要等待 5秒
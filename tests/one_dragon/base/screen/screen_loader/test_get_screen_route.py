@@ -0,0 +1,91 @@
+"""
+测试 ScreenContext.get_screen_route 按需计算画面路径
+"""
+import pytest
+
+from one_dragon.base.screen.screen_info import ScreenInfo
+from one_dragon.base.screen.screen_loader import ScreenContext
+
+
+def _legacy_route_len_map(ctx: ScreenContext) -> dict[tuple[str, str], int]:
+    """原来 Floyd 算法得到的路径长度 只有一条直接跳转时与现在的结果一致"""
+    inf = 10 ** 9
+    name_list = [i.screen_name for i in ctx.screen_info_list]
+    dist = {(i, j): inf for i in name_list for j in name_list}
+    for screen_info in ctx.screen_info_list:
+        for area in screen_info.area_list:
+            for goto in area.goto_list or []:
+                if goto in ctx.screen_info_map and goto != screen_info.screen_name:
+                    dist[(screen_info.screen_name, goto)] = 1
+    for k in name_list:
+        for i in name_list:
+            for j in name_list:
+                if i == j or dist[(i, k)] == inf or dist[(k, j)] == inf:
+                    continue
+                dist[(i, j)] = min(dist[(i, j)], dist[(i, k)] + dist[(k, j)])
+    return {key: value for key, value in dist.items() if value < inf}
+
+
+def _make_screen(name: str, goto_list_by_area: list[list[str]]) -> ScreenInfo:
+    return ScreenInfo({
+        'screen_name': name,
+        'area_list': [
+            {'area_name': f'按钮{idx}', 'pc_rect': [0, 0, 10, 10], 'goto_list': goto_list}
+            for idx, goto_list in enumerate(goto_list_by_area)
+        ],
+    })
+
+
+class TestGetScreenRoute:
+
+    @pytest.fixture
+    def ctx(self) -> ScreenContext:
+        ctx = ScreenContext()
+        for screen_info in [
+            _make_screen('A', [['B'], ['C']]),
+            _make_screen('B', [['D']]),
+            _make_screen('C', [['D'], ['A']]),
+            _make_screen('D', [['E']]),
+            _make_screen('E', []),
+            _make_screen('F', [['A']]),
+        ]:
+            ctx.screen_info_list.append(screen_info)
+            ctx.screen_info_map[screen_info.screen_name] = screen_info
+        ctx.init_screen_route()
+        return ctx
+
+    def test_shortest_route(self, ctx: ScreenContext):
+        route = ctx.get_screen_route('A', 'E')
+
+        assert route.can_go
+        assert [(i.from_screen, i.from_area, i.to_screen) for i in route.node_list] == [
+            ('A', '按钮0', 'B'), ('B', '按钮0', 'D'), ('D', '按钮0', 'E'),
+        ]
+
+    def test_unreachable(self, ctx: ScreenContext):
+        assert not ctx.get_screen_route('E', 'A').can_go
+        assert not ctx.get_screen_route('A', 'F').can_go
+        assert ctx.get_screen_route('A', '不存在') is None
+        assert ctx.get_screen_route('不存在', 'A') is None
+
+    def test_cache_per_source(self, ctx: ScreenContext):
+        assert ctx.get_screen_route('A', 'E') is ctx.get_screen_route('A', 'E')
+        assert list(ctx.screen_route_map.keys()) == ['A']
+
+        ctx.init_screen_route()
+        assert len(ctx.screen_route_map) == 0
+
+    def test_same_length_as_floyd(self):
+        ctx = ScreenContext()
+        ctx.reload()
+
+        legacy = _legacy_route_len_map(ctx)
+        for from_screen in ctx.screen_info_list:
+            for to_screen in ctx.screen_info_list:
+                if from_screen is to_screen:
+                    continue
+                key = (from_screen.screen_name, to_screen.screen_name)
+                route = ctx.get_screen_route(*key)
+                assert route.can_go == (key in legacy)
+                if route.can_go:
+                    assert len(route.node_list) == legacy[key]
@@ -0,0 +1,141 @@
+"""
+测试 screen_utils.get_match_screen_name 使用画面识别索引
+"""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from one_dragon.base.matcher.match_result import MatchResultList
+from one_dragon.base.matcher.ocr.ocr_match_result import OcrMatchResult
+from one_dragon.base.matcher.ocr.ocr_matcher import OcrMatcher
+from one_dragon.base.matcher.ocr.ocr_service import OcrService
+from one_dragon.base.matcher.vision_frame_memo import VisionFrameMemo
+from one_dragon.base.screen import screen_utils
+from one_dragon.base.screen.screen_info import ScreenInfo
+from one_dragon.base.screen.screen_loader import ScreenContext
+
+
+class FakeOcrMatcher(OcrMatcher):
+    """每个亮度不为0的区域 识别出 text_{亮度}"""
+
+    def __init__(self):
+        OcrMatcher.__init__(self)
+        self.call_count: int = 0
+
+    def ocr(self, image, threshold: float = 0, merge_line_distance: float = -1) -> list[OcrMatchResult]:
+        self.call_count += 1
+        result_list = []
+        gray = image.max(axis=2)
+        for value in np.unique(gray):
+            if value == 0:
+                continue
+            ys, xs = np.nonzero(gray == value)
+            result_list.append(OcrMatchResult(1, xs.min(), ys.min(), xs.max() - xs.min() + 1,
+                                              ys.max() - ys.min() + 1, data=f'text_{value}'))
+        return result_list
+
+
+class FakeTemplateMatcher:
+    """模板ID 为 ok 开头时匹配成功"""
+
+    def __init__(self):
+        self.call_list: list[str] = []
+
+    def crop_and_match_template(self, screen, rect, template_sub_dir, template_id, **kwargs) -> MatchResultList:
+        self.call_list.append(template_id)
+        mrl = MatchResultList()
+        if template_id.startswith('ok'):
+            mrl.append(SimpleNamespace(confidence=1))
+        return mrl
+
+
+def _text_area(name: str, x: int, text: str) -> dict:
+    return {'area_name': name, 'id_mark': True, 'pc_rect': [x, 10, x + 40, 30], 'text': text,
+            'lcs_percent': 0.5}
+
+
+def _template_area(name: str, template_id: str) -> dict:
+    return {'area_name': name, 'id_mark': True, 'pc_rect': [0, 100, 40, 140],
+            'template_sub_dir': 'test', 'template_id': template_id, 'template_match_threshold': 0.7}
+
+
+class TestGetMatchScreenName:
+
+    @pytest.fixture
+    def ctx(self) -> SimpleNamespace:
+        screen_loader = ScreenContext()
+        screen_data_list = [
+            {'screen_name': '画面A', 'area_list': [_template_area('返回', 'back'), _text_area('标题', 0, 'text_1')]},
+            {'screen_name': '画面B', 'area_list': [_template_area('返回', 'back'), _text_area('标题', 50, 'text_2')]},
+            {'screen_name': '画面C', 'area_list': [_text_area('标题', 100, 'text_9')]},
+            {'screen_name': '画面D', 'area_list': [_template_area('图标', 'ok_icon'), _text_area('标题', 150, 'text_4')]},
+            {'screen_name': '画面E', 'area_list': [_template_area('图标', 'ok_icon'), _text_area('标题', 200, 'text_5')]},
+        ]
+        for data in screen_data_list:
+            screen_info = ScreenInfo(data)
+            screen_loader.screen_info_list.append(screen_info)
+            screen_loader.screen_info_map[screen_info.screen_name] = screen_info
+
+        return SimpleNamespace(
+            screen_loader=screen_loader,
+            ocr_service=OcrService(FakeOcrMatcher()),
+            tm=FakeTemplateMatcher(),
+            vision_frame_memo=VisionFrameMemo(),
+        )
+
+    @staticmethod
+    def _screen() -> np.ndarray:
+        screen = np.zeros((200, 300, 3), dtype=np.uint8)
+        screen[15:25, 205:230] = 5  # 画面E 的标题
+        return screen
+
+    def test_match_when_lost(self, ctx: SimpleNamespace):
+        screen = self._screen()
+
+        assert screen_utils.get_match_screen_name(ctx, screen) == '画面E'
+        # 共用的模板区域只判断一次 排除 画面A 画面B 后 剩余文本区域只识别一次
+        assert sorted(ctx.tm.call_list) == ['back', 'ok_icon']
+        assert ctx.ocr_service.ocr_matcher.call_count == 1
+
+    def test_memo_in_same_frame(self, ctx: SimpleNamespace):
+        screen = self._screen()
+        ctx.vision_frame_memo.new_frame(screen)
+        screen_utils.get_match_screen_name(ctx, screen)
+        tm_cnt = len(ctx.tm.call_list)
+        ocr_cnt = ctx.ocr_service.ocr_matcher.call_count
+
+        assert screen_utils.get_match_screen_name(ctx, screen, screen_name_list=['画面D', '画面E']) == '画面E'
+        assert len(ctx.tm.call_list) == tm_cnt
+        assert ctx.ocr_service.ocr_matcher.call_count == ocr_cnt
+
+        # 新的一帧重新识别 之前一帧的结果不再保留
+        new_screen = self._screen()
+        ctx.vision_frame_memo.new_frame(new_screen)
+        screen_utils.get_match_screen_name(ctx, new_screen, screen_name_list=['画面D', '画面E'])
+        assert len(ctx.tm.call_list) > tm_cnt
+
+    def test_not_current_frame(self, ctx: SimpleNamespace):
+        # 不是当前帧的截图 不记录结果 每次重新识别
+        screen = self._screen()
+        screen_utils.get_match_screen_name(ctx, screen)
+        tm_cnt = len(ctx.tm.call_list)
+
+        assert screen_utils.get_match_screen_name(ctx, screen, screen_name_list=['画面D', '画面E']) == '画面E'
+        assert len(ctx.tm.call_list) > tm_cnt
+
+    def test_match_from_last(self, ctx: SimpleNamespace):
+        ctx.screen_loader.current_screen_name = '画面E'
+
+        assert screen_utils.get_match_screen_name(ctx, self._screen()) == '画面E'
+        assert ctx.tm.call_list == ['ok_icon']
+
+    def test_same_as_is_target_screen(self, ctx: SimpleNamespace):
+        screen = self._screen()
+        expected = None
+        for screen_info in ctx.screen_loader.screen_info_list:
+            if screen_utils.is_target_screen(ctx, screen, screen_info=screen_info):
+                expected = screen_info.screen_name
+                break
+
+        assert screen_utils.get_match_screen_name(ctx, screen) == expected
@@ -0,0 +1,30 @@
+"""
+测试 CancelToken 按截止时间等待和取消
+"""
+import threading
+import time
+
+from one_dragon.thread.cancel_token import CancelToken
+
+
+class TestCancelToken:
+
+    def test_sleep_until_deadline(self):
+        # 不会在截止时间前返回 睡过头的多少和机器有关 见 tests/benchmark/cancel_token_benchmark.py
+        token = CancelToken()
+        for _ in range(10):
+            deadline = time.perf_counter() + 0.01
+            assert token.sleep_until(deadline)
+            assert time.perf_counter() >= deadline
+
+    def test_cancel(self):
+        token = CancelToken()
+        threading.Timer(0.02, token.cancel).start()
+
+        start = time.perf_counter()
+        assert not token.sleep(1)
+        assert time.perf_counter() - start < 0.2
+        assert token.cancelled
+
+        token.reset()
+        assert token.sleep(0.001)
@@ -0,0 +1,117 @@
+"""
+测试 PriorityTaskScheduler 的优先级 同名替换 截止时间丢弃和统计
+"""
+import threading
+import time
+
+import pytest
+
+from one_dragon.thread.priority_task_scheduler import PriorityTaskScheduler
+
+
+class TestPriorityTaskScheduler:
+
+    @pytest.fixture
+    def scheduler(self):
+        scheduler = PriorityTaskScheduler('test_scheduler', max_workers=1)
+        yield scheduler
+        scheduler.shutdown()
+
+    def _block(self, scheduler: PriorityTaskScheduler) -> threading.Event:
+        """
+        让唯一的线程卡住 后续提交的任务都会排队
+        """
+        started = threading.Event()
+        release = threading.Event()
+
+        def _wait():
+            started.set()
+            release.wait(5)
+
+        scheduler.submit('block', _wait)
+        assert started.wait(5)
+        return release
+
+    def test_priority(self, scheduler: PriorityTaskScheduler):
+        release = self._block(scheduler)
+        order: list[str] = []
+        future_list = [
+            scheduler.submit('distance', order.append, 'distance', priority=3),
+            scheduler.submit('target', order.append, 'target', priority=2),
+            scheduler.submit('dodge', order.append, 'dodge', priority=0),
+            scheduler.submit('agent', order.append, 'agent', priority=1),
+        ]
+        release.set()
+        for future in future_list:
+            future.result(timeout=5)
+
+        assert order == ['dodge', 'agent', 'target', 'distance']
+
+    def test_replace_same_name(self, scheduler: PriorityTaskScheduler):
+        release = self._block(scheduler)
+        old = scheduler.submit('dodge', lambda x: x, 1)
+        new = scheduler.submit('dodge', lambda x: x, 2)
+        assert old.result(timeout=1) is None  # 被替换后马上返回
+        release.set()
+        assert new.result(timeout=5) == 2
+
+        stats = scheduler.get_stats()['dodge']
+        assert stats['submit'] == 2
+        assert stats['run'] == 1
+        assert stats['replaced'] == 1
+
+    def test_deadline(self, scheduler: PriorityTaskScheduler):
+        release = self._block(scheduler)
+        called: list[int] = []
+        expired = scheduler.submit('target', called.append, 1, deadline=time.perf_counter() + 0.01)
+        kept = scheduler.submit('agent', called.append, 2, deadline=time.perf_counter() + 5)
+        time.sleep(0.05)
+        release.set()
+
+        assert expired.result(timeout=5) is None
+        kept.result(timeout=5)
+        assert called == [2]
+        assert scheduler.get_stats()['target']['expired'] == 1
+
+    def test_exception(self, scheduler: PriorityTaskScheduler):
+        def _raise():
+            raise ValueError('test')
+
+        with pytest.raises(ValueError):
+            scheduler.submit('error', _raise).result(timeout=5)
+        assert scheduler.submit('after_error', lambda: 1).result(timeout=5) == 1  # 线程不会因为异常退出
+
+    def test_bounded_workers(self):
+        scheduler = PriorityTaskScheduler('test_scheduler', max_workers=2)
+        running = 0
+        max_running = 0
+        lock = threading.Lock()
+
+        def _run():
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+
+        future_list = [scheduler.submit(f'task_{i}', _run) for i in range(10)]
+        for future in future_list:
+            future.result(timeout=5)
+        scheduler.shutdown()
+
+        assert max_running <= 2
+        stats = scheduler.get_stats()
+        assert all(stats[f'task_{i}']['run'] == 1 for i in range(10))
+        assert 'task_0[' in scheduler.get_display_text()
+
+    def test_shutdown_cancel_pending(self, scheduler: PriorityTaskScheduler):
+        release = self._block(scheduler)
+        pending = scheduler.submit('pending', lambda: 1)
+        scheduler.shutdown()
+        release.set()
+
+        assert pending.cancelled()
+        with pytest.raises(RuntimeError):
+            scheduler.submit('after_shutdown', lambda: 1)
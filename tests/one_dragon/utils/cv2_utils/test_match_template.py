@@ -0,0 +1,110 @@
+"""
+测试 cv2_utils.match_template 的最佳结果和多结果路径
+"""
+import cv2
+import numpy as np
+import pytest
+
+from one_dragon.base.matcher.match_result import MatchResult, MatchResultList
+from one_dragon.utils import cv2_utils
+
+
+def _legacy_match_template(source, template, threshold, mask=None, only_best=True, ignore_inf=False):
+    """原来逐个位置创建结果的实现 用于对比"""
+    tx, ty = template.shape[1], template.shape[0]
+    result = cv2.matchTemplate(source, template, cv2.TM_CCOEFF_NORMED, mask=mask)
+    match_result_list = MatchResultList(only_best=only_best)
+    filtered_locations = np.where(np.logical_and(
+        result >= threshold,
+        np.isfinite(result) if ignore_inf else np.ones_like(result))
+    )
+    for pt in zip(*filtered_locations[::-1], strict=True):
+        match_result_list.append(MatchResult(result[pt[1], pt[0]], pt[0], pt[1], tx, ty))
+    return match_result_list
+
+
+class TestMatchTemplate:
+
+    @pytest.fixture
+    def rng(self) -> np.random.Generator:
+        return np.random.default_rng(0)
+
+    @staticmethod
+    def _source_with_templates(rng: np.random.Generator, size: tuple[int, int], template: np.ndarray,
+                               pos_list: list[tuple[int, int]]) -> np.ndarray:
+        source = rng.integers(0, 256, (size[0], size[1], 3), dtype=np.uint8)
+        th, tw = template.shape[:2]
+        for x, y in pos_list:
+            source[y:y + th, x:x + tw] = template
+        return source
+
+    def test_only_best_same_as_legacy(self, rng: np.random.Generator):
+        template = rng.integers(0, 256, (20, 30, 3), dtype=np.uint8)
+        source = self._source_with_templates(rng, (200, 300), template, [(40, 50)])
+
+        for threshold in [0.1, 0.5, 0.99]:
+            new = cv2_utils.match_template(source, template, threshold).max
+            old = _legacy_match_template(source, template, threshold).max
+            assert (new.x, new.y) == (old.x, old.y) == (40, 50)
+            assert new.confidence == pytest.approx(old.confidence)
+
+    def test_only_best_below_threshold(self, rng: np.random.Generator):
+        template = rng.integers(0, 256, (20, 30, 3), dtype=np.uint8)
+        source = rng.integers(0, 256, (100, 100, 3), dtype=np.uint8)
+
+        mrl = cv2_utils.match_template(source, template, 0.99)
+        assert mrl.max is None
+        assert len(mrl) == 0
+
+    def test_ignore_inf(self):
+        source = np.zeros((50, 50, 3), dtype=np.uint8)
+        template = np.zeros((10, 10, 3), dtype=np.uint8)
+        mask = np.full((10, 10), 255, dtype=np.uint8)
+
+        # 纯色图片使用掩码时结果不是有限值
+        mrl = cv2_utils.match_template(source, template, 0.1, mask=mask, ignore_inf=True)
+        assert mrl.max is None
+
+    def test_multiple_results(self, rng: np.random.Generator):
+        template = rng.integers(0, 256, (20, 30, 3), dtype=np.uint8)
+        pos_list = [(10, 10), (100, 20), (40, 120), (200, 150)]
+        source = self._source_with_templates(rng, (200, 300), template, pos_list)
+
+        mrl = cv2_utils.match_template(source, template, 0.8, only_best=False)
+
+        assert sorted((i.x, i.y) for i in mrl) == sorted(pos_list)
+        # 按原图扫描顺序返回
+        assert [(i.y, i.x) for i in mrl] == sorted((i.y, i.x) for i in mrl)
+        assert mrl.max.confidence == pytest.approx(1)
+
+    def test_max_result_cnt(self, rng: np.random.Generator):
+        template = rng.integers(0, 256, (20, 30, 3), dtype=np.uint8)
+        source = self._source_with_templates(rng, (200, 300), template, [(10, 10), (100, 20), (40, 120)])
+        source[120:140, 40:70] //= 2  # 降低其中一个的置信度
+
+        mrl = cv2_utils.match_template(source, template, 0.5, only_best=False, max_result_cnt=2)
+
+        assert sorted((i.x, i.y) for i in mrl) == [(10, 10), (100, 20)]
+
+    def test_low_threshold_merged(self, rng: np.random.Generator):
+        template = cv2.GaussianBlur(rng.integers(0, 256, (30, 30, 3), dtype=np.uint8), (9, 9), 0)
+        source = cv2.GaussianBlur(rng.integers(0, 256, (200, 200, 3), dtype=np.uint8), (9, 9), 0)
+
+        mrl = cv2_utils.match_template(source, template, 0.1, only_best=False)
+
+        # 任意两个结果之间的距离都超过合并距离
+        pos = np.array([(i.x, i.y) for i in mrl])
+        if len(pos) > 1:
+            dist = np.sqrt(((pos[:, None, :] - pos[None, :, :]) ** 2).sum(axis=2))
+            assert dist[np.triu_indices(len(pos), 1)].min() > 10
+
+    @pytest.mark.parametrize('template_size', [(20, 20), (60, 120), (150, 150)])
+    def test_smooth_source_low_threshold(self, rng: np.random.Generator, template_size: tuple[int, int]):
+        # 平滑的图片在低阈值下 会有大量位置超过阈值 类似小地图匹配大地图
+        source = cv2.GaussianBlur(rng.integers(0, 256, (270, 480, 3), dtype=np.uint8), (31, 31), 0)
+        template = source[50:50 + template_size[0], 50:50 + template_size[1]].copy()
+
+        best = cv2_utils.match_template(source, template, 0.1).max
+        old = _legacy_match_template(source, template, 0.1).max
+        assert (best.x, best.y) == (old.x, old.y) == (50, 50)
+        assert best.confidence == pytest.approx(old.confidence)
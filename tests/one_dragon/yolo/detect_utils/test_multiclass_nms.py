@@ -0,0 +1,47 @@
+"""
+测试 multiclass_nms 所有类别一次处理 结果与逐个类别NMS一致
+"""
+import numpy as np
+import pytest
+
+from one_dragon.yolo import detect_utils
+
+
+def _per_class_nms(boxes, scores, class_ids, iou_threshold):
+    keep_boxes = []
+    for class_id in np.unique(class_ids):
+        class_indices = np.where(class_ids == class_id)[0]
+        class_keep_boxes = detect_utils.nms(boxes[class_indices, :], scores[class_indices], iou_threshold)
+        keep_boxes.extend(class_indices[class_keep_boxes])
+    return [int(i) for i in keep_boxes]
+
+
+def _random_boxes(rng: np.random.Generator, box_cnt: int, class_cnt: int):
+    # 围绕少量中心生成 保证有足够多重叠的框
+    centers = rng.uniform(0, 1920, size=(max(box_cnt // 20, 1), 2))
+    xy = centers[rng.integers(0, len(centers), size=box_cnt)] + rng.normal(0, 15, size=(box_cnt, 2))
+    wh = rng.uniform(20, 120, size=(box_cnt, 2))
+    boxes = detect_utils.xywh2xyxy(np.hstack([xy, wh]).astype(np.float32))
+    scores = rng.uniform(0.5, 1, size=box_cnt).astype(np.float32)
+    class_ids = rng.integers(0, class_cnt, size=box_cnt)
+    return boxes, scores, class_ids
+
+
+class TestMulticlassNms:
+
+    @pytest.mark.parametrize('box_cnt', [0, 1, 5, 300, 3000])
+    def test_same_as_per_class(self, box_cnt: int):
+        rng = np.random.default_rng(box_cnt)
+        boxes, scores, class_ids = _random_boxes(rng, box_cnt, 8)
+        for iou in [0.3, 0.5, 0.7]:
+            assert detect_utils.multiclass_nms(boxes, scores, class_ids, iou) == _per_class_nms(boxes, scores, class_ids, iou)
+
+    def test_no_cross_class_suppress(self):
+        boxes = np.array([[0, 0, 10, 10], [0, 0, 10, 10], [1, 1, 10, 10]], dtype=np.float32)
+        scores = np.array([0.9, 0.8, 0.7], dtype=np.float32)
+        class_ids = np.array([1, 0, 1])
+        assert detect_utils.multiclass_nms(boxes, scores, class_ids, 0.5) == [1, 0]
+
+    def test_many_classes(self):
+        boxes, scores, class_ids = _random_boxes(np.random.default_rng(1), 500, 20)
+        assert detect_utils.multiclass_nms(boxes, scores, class_ids, 0.5) == _per_class_nms(boxes, scores, class_ids, 0.5)
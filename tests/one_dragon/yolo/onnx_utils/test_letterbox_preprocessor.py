@@ -0,0 +1,43 @@
+"""
+测试 LetterboxPreprocessor 复用缓冲区的预处理 与 scale_input_image_u 结果一致
+"""
+import numpy as np
+import pytest
+
+from one_dragon.yolo import onnx_utils
+from one_dragon.yolo.onnx_utils import LetterboxPreprocessor
+
+
+class TestLetterboxPreprocessor:
+
+    @pytest.fixture
+    def preprocessor(self) -> LetterboxPreprocessor:
+        return LetterboxPreprocessor(640, 640)
+
+    @pytest.mark.parametrize('shape', [(1080, 1920), (1920, 1080), (640, 640), (300, 200), (720, 1280)])
+    def test_same_as_legacy(self, preprocessor: LetterboxPreprocessor, shape: tuple[int, int]):
+        rng = np.random.default_rng(0)
+        image = rng.integers(0, 256, size=(*shape, 3), dtype=np.uint8)
+
+        expected, expected_h, expected_w = onnx_utils.scale_input_image_u(image, 640, 640)
+        tensor, scale_h, scale_w = preprocessor(image)
+
+        assert (scale_h, scale_w) == (expected_h, expected_w)
+        assert tensor.dtype == np.float32
+        assert tensor.shape == expected.shape
+        np.testing.assert_allclose(tensor, expected, rtol=0, atol=1e-6)
+
+    def test_padding_refill_on_shape_change(self, preprocessor: LetterboxPreprocessor):
+        # 先横图再竖图 上一次的图片内容不能残留在padding区域
+        preprocessor(np.full((1080, 1920, 3), 255, dtype=np.uint8))
+        image = np.zeros((1920, 1080, 3), dtype=np.uint8)
+        tensor, _, _ = preprocessor(image)
+        expected, _, _ = onnx_utils.scale_input_image_u(image, 640, 640)
+        np.testing.assert_allclose(tensor, expected, rtol=0, atol=1e-6)
+
+    def test_reuse_buffer(self, preprocessor: LetterboxPreprocessor):
+        # 同一线程下 每次返回同一个输入张量 不重新分配
+        image = np.random.default_rng(1).integers(0, 256, size=(1080, 1920, 3), dtype=np.uint8)
+        first, _, _ = preprocessor(image)
+        second, _, _ = preprocessor(image)
+        assert second is first
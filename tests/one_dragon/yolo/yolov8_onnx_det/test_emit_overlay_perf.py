@@ -0,0 +1,20 @@
+"""
+测试 Yolov8Detector 推送到 overlay 的耗时指标包含各阶段耗时
+"""
+from one_dragon.base.operation.overlay_debug_bus import OverlayDebugBus
+from one_dragon.yolo.yolov8_onnx_det import Yolov8Detector
+
+
+def test_emit_stage_metrics():
+    detector = Yolov8Detector.__new__(Yolov8Detector)  # 不加载模型 只测试指标推送
+    detector.overlay_debug_bus = OverlayDebugBus()
+
+    detector._emit_overlay_perf_and_timeline(preprocess_ms=1.5, infer_ms=6, postprocess_ms=0.5, result_count=3)
+
+    snapshot = detector.overlay_debug_bus.snapshot()
+    metric_map = {i.metric: i for i in snapshot.performance_items}
+    assert metric_map['yolo_ms'].value == 8
+    assert metric_map['yolo_ms'].meta['preprocess_ms'] == 1.5
+    assert metric_map['yolo_ms'].meta['infer_ms'] == 6
+    assert metric_map['yolo_preprocess_ms'].value == 1.5
+    assert 'pre 1.5' in snapshot.timeline_items[0].detail
@@ -0,0 +1,91 @@
+"""
+测试 Yolov8Detector.process_output 先按置信度过滤再限定类别 结果与原来先屏蔽类别再过滤一致
+"""
+import numpy as np
+import pytest
+
+from one_dragon.yolo.detect_utils import (
+    DetectClass,
+    DetectContext,
+    multiclass_nms,
+    xywh2xyxy,
+)
+from one_dragon.yolo.yolov8_onnx_det import Yolov8Detector
+
+
+def _legacy_process_output(detector: Yolov8Detector, output, context: DetectContext) -> list[tuple]:
+    predictions = np.squeeze(output[0]).T.copy()
+    keep = np.ones(shape=(predictions.shape[1]), dtype=bool)
+    if context.label_list is not None or context.category_list is not None:
+        keep[4:] = False
+        if context.label_list is not None:
+            for label in context.label_list:
+                idx = detector.class_2_idx.get(label)
+                if idx is not None:
+                    keep[idx + 4] = True
+        if context.category_list is not None:
+            for category in context.category_list:
+                for idx in detector.category_2_idx.get(category, []):
+                    keep[idx + 4] = True
+    predictions[:, ~keep] = 0
+
+    scores = np.max(predictions[:, 4:], axis=1)
+    predictions = predictions[scores > context.conf, :]
+    scores = scores[scores > context.conf]
+    if len(scores) == 0:
+        return []
+    class_ids = np.argmax(predictions[:, 4:], axis=1)
+    boxes = predictions[:, :4]
+    scale_shape = np.array([context.scale_width, context.scale_height, context.scale_width, context.scale_height])
+    boxes = np.divide(boxes, scale_shape, dtype=np.float32)
+    boxes *= np.array([context.img_width, context.img_height, context.img_width, context.img_height])
+    boxes = xywh2xyxy(boxes)
+    indices = multiclass_nms(boxes, scores, class_ids, context.iou)
+    return [(int(class_ids[i]), float(scores[i]), boxes[i].astype(int).tolist()) for i in indices]
+
+
+@pytest.fixture
+def detector() -> Yolov8Detector:
+    detector = Yolov8Detector.__new__(Yolov8Detector)  # 不加载模型
+    detector.idx_2_class = {}
+    detector.class_2_idx = {}
+    detector.category_2_idx = {}
+    for i in range(10):
+        c = DetectClass(i, f'label_{i}', category=f'category_{i % 3}')
+        detector.idx_2_class[i] = c
+        detector.class_2_idx[c.class_name] = i
+        detector.category_2_idx.setdefault(c.class_category, []).append(i)
+    return detector
+
+
+def _random_output(rng: np.random.Generator) -> list[np.ndarray]:
+    box_cnt = 8400
+    xy = rng.uniform(0, 640, size=(2, box_cnt))
+    wh = rng.uniform(10, 80, size=(2, box_cnt))
+    class_scores = rng.uniform(0, 1, size=(10, box_cnt)) ** 8  # 大部分得分都很低
+    return [np.vstack([xy, wh, class_scores]).astype(np.float32)[np.newaxis, :, :]]
+
+
+@pytest.mark.parametrize('label_list, category_list', [
+    (None, None),
+    (['label_1', 'label_5'], None),
+    (None, ['category_2']),
+    (['label_0'], ['category_1']),
+    (['not_existed'], None),
+])
+def test_same_as_legacy(detector: Yolov8Detector, label_list, category_list):
+    rng = np.random.default_rng(0)
+    for _ in range(3):
+        output = _random_output(rng)
+        context = DetectContext(np.zeros((1080, 1920, 3), dtype=np.uint8))
+        context.conf = 0.6
+        context.iou = 0.5
+        context.scale_width = 640
+        context.scale_height = 360
+        context.label_list = label_list
+        context.category_list = category_list
+
+        expected = _legacy_process_output(detector, output, context)
+        results = detector.process_output(output, context)
+        actual = [(r.detect_class.class_id, r.score, [r.x1, r.y1, r.x2, r.y2]) for r in results]
+        assert actual == expected
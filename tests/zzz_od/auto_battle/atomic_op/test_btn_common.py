@@ -0,0 +1,60 @@
+"""
+测试 AtomicBtnCommon 的前后延迟按截止时间计算 并且可以被中断
+"""
+import threading
+import time
+
+from one_dragon.base.conditional_operation.operation_def import OperationDef
+from zzz_od.auto_battle.atomic_op.btn_common import AtomicBtnCommon
+from zzz_od.auto_battle.auto_battle_state import BattleStateEnum
+
+
+class FakeAutoBattleContext:
+
+    def __init__(self):
+        self.dodge_time_list: list[float] = []
+
+    def dodge(self, press: bool = False, press_time: float | None = None, release: bool = False):
+        if not release:
+            self.dodge_time_list.append(time.perf_counter())
+
+
+def _new_op(ctx: FakeAutoBattleContext, **kwargs) -> AtomicBtnCommon:
+    return AtomicBtnCommon(ctx, OperationDef({'op_name': BattleStateEnum.BTN_DODGE.value, 'way': '点按', **kwargs}))
+
+
+class TestAtomicBtnCommon:
+
+    def test_repeat_timing(self):
+        ctx = FakeAutoBattleContext()
+        op = _new_op(ctx, pre_delay=0.01, post_delay=0.02, repeat=5)
+
+        start = time.perf_counter()
+        op.execute()
+
+        assert len(ctx.dodge_time_list) == 5
+        assert ctx.dodge_time_list[0] - start >= 0.01
+        # 按截止时间计算 每次间隔不少于前后延迟之和
+        interval_list = [b - a for a, b in zip(ctx.dodge_time_list, ctx.dodge_time_list[1:], strict=False)]
+        for interval in interval_list:
+            assert interval >= 0.03
+
+    def test_stop_during_delay(self):
+        ctx = FakeAutoBattleContext()
+        op = _new_op(ctx, pre_delay=2)
+
+        t = threading.Thread(target=op.execute)
+        t.start()
+        time.sleep(0.02)
+        start = time.perf_counter()
+        op.stop()
+        t.join(1)
+
+        assert not t.is_alive()
+        assert time.perf_counter() - start < 0.1
+        assert ctx.dodge_time_list == []
+
+        # 停止后可以重新执行
+        op.pre_delay = 0
+        op.execute()
+        assert len(ctx.dodge_time_list) == 1
@@ -0,0 +1,87 @@
+"""
+测试声音闪避的环形缓冲区和滑动模板匹配
+"""
+import os
+
+import numpy as np
+import pytest
+
+from zzz_od.auto_battle import auto_battle_dodge_audio
+from zzz_od.auto_battle.auto_battle_dodge_audio import (
+    AudioRecorder,
+    AudioTemplateMatcher,
+)
+
+_TEMPLATE_PATH = os.path.join(
+    os.path.dirname(__file__), '..', '..', '..', '..', 'assets', 'template', 'dodge_audio', 'template_1.wav'
+)
+
+
+class TestAudioTemplateMatcher:
+
+    @pytest.fixture
+    def recorder(self) -> AudioRecorder:
+        return AudioRecorder()
+
+    @pytest.fixture
+    def template(self, recorder: AudioRecorder) -> np.ndarray:
+        return auto_battle_dodge_audio.load_audio_template(_TEMPLATE_PATH, recorder.sample_rate)
+
+    @pytest.fixture
+    def matcher(self, recorder: AudioRecorder, template: np.ndarray) -> AudioTemplateMatcher:
+        return AudioTemplateMatcher(template, recorder.sample_rate, recorder.filter_sos)
+
+    @staticmethod
+    def _stream(recorder: AudioRecorder, matcher: AudioTemplateMatcher, audio: np.ndarray,
+                check_every: int = 2) -> list[float]:
+        """按10ms一块写入录音 每隔几块匹配一次"""
+        corr_list: list[float] = []
+        chunk = 320
+        for i in range(0, len(audio) - chunk + 1, chunk):
+            recorder.append_audio(np.stack([audio[i:i + chunk]] * 2, axis=1).astype(np.float32))
+            if (i // chunk) % check_every == check_every - 1:
+                corr_list.append(matcher.match(recorder))
+        return corr_list
+
+    def test_ring_buffer(self, recorder: AudioRecorder):
+        recorder.filter_sos = np.array([[1, 0, 0, 1, 0, 0]], dtype=np.float64)  # 不滤波 方便对比
+        recorder._filter_zi = np.zeros((1, 2))
+        audio = np.arange(recorder.buffer_size * 2, dtype=np.float32)
+        for i in range(0, len(audio), 320):
+            recorder.append_audio(audio[i:i + 320])
+
+        data, start_idx = recorder.get_audio_since(len(audio) - 1000)
+        assert start_idx == len(audio) - 1000
+        np.testing.assert_array_equal(data, audio[-1000:])
+
+        recorder.clear_audio()
+        data, _ = recorder.get_audio_since(0)
+        assert len(data) == 0
+
+    def test_detect_template(self, recorder: AudioRecorder, matcher: AudioTemplateMatcher, template: np.ndarray):
+        rng = np.random.default_rng(0)
+        sample_rate = recorder.sample_rate
+        noise = rng.normal(0, 0.02, sample_rate * 2)
+        audio = noise.copy()
+        sound_start = sample_rate
+        audio[sound_start:sound_start + len(template)] += template
+
+        corr_list = self._stream(recorder, matcher, audio)
+        check_time_list = [(i + 1) * 640 for i in range(len(corr_list))]
+
+        hit_time_list = [t for t, c in zip(check_time_list, corr_list, strict=True) if c > recorder.trigger_threshold]
+        assert len(hit_time_list) > 0
+        # 模板的匹配部分出现后 下一次检查就能识别到
+        latency = hit_time_list[0] - sound_start
+        assert latency <= matcher.template_len + 640
+        # 声音出现前没有误识别
+        assert max(c for t, c in zip(check_time_list, corr_list, strict=True) if t < sound_start) < recorder.trigger_threshold
+
+    def test_reset_after_hit(self, recorder: AudioRecorder, matcher: AudioTemplateMatcher, template: np.ndarray):
+        audio = np.zeros(recorder.sample_rate)
+        audio[1000:1000 + len(template)] = template
+        corr_list = self._stream(recorder, matcher, audio[:1000 + matcher.template_len + 640])
+        assert max(corr_list) > recorder.trigger_threshold
+
+        matcher.reset(recorder)
+        assert matcher.match(recorder) == 0
@@ -0,0 +1,78 @@
+"""
+测试 创建 ZContext 时不会导入自动战斗和较重的库 只有用到时才导入
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+_ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..'))
+
+# 只有用到自动战斗等功能时才需要导入的模块
+_LAZY_MODULE_LIST: list[str] = [
+    'zzz_od.auto_battle.auto_battle_context',
+    'scipy',
+]
+
+
+def _get_loaded_modules(statement: str, module_list: list[str]) -> list[str]:
+    """
+    在新的进程中运行语句 返回已经导入的模块
+
+    Args:
+        statement: 需要运行的语句
+        module_list: 需要检查的模块
+
+    Returns:
+        list[str]: module_list 中已经导入的模块
+    """
+    src_dir = os.path.join(_ROOT_DIR, 'src')
+    env = dict(os.environ)
+    env['PYTHONPATH'] = src_dir + os.pathsep + env.get('PYTHONPATH', '')
+    script = '\n'.join([
+        'import json, sys',
+        statement,
+        f'print(json.dumps([i for i in {module_list!r} if i in sys.modules]))',
+    ])
+    result = subprocess.run(
+        [sys.executable, '-c', script],
+        env=env, capture_output=True, text=True, timeout=120,
+    )
+    if result.returncode != 0:
+        pytest.skip(f'当前环境无法运行: {result.stderr.strip().splitlines()[-1]}')
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.fixture
+def clean_config_dir():
+    """
+    创建 ZContext 时会在项目的配置文件夹中生成默认配置 测试后删除新生成的文件
+    """
+    config_dir = os.path.join(_ROOT_DIR, 'config')
+    before = set(os.listdir(config_dir)) if os.path.isdir(config_dir) else set()
+    yield
+    if not os.path.isdir(config_dir):
+        return
+    for file_name in set(os.listdir(config_dir)) - before:
+        file_path = os.path.join(config_dir, file_name)
+        if os.path.isfile(file_path):
+            os.remove(file_path)
+
+
+class TestLazyImport:
+
+    def test_zzz_context(self, clean_config_dir):
+        loaded = _get_loaded_modules(
+            'from zzz_od.context.zzz_context import ZContext\nctx = ZContext()',
+            _LAZY_MODULE_LIST,
+        )
+        assert loaded == []
+
+    def test_scipy_lazy(self):
+        loaded = _get_loaded_modules(
+            'import one_dragon.utils.mini_map_angle_utils, one_dragon.base.cv_process.steps',
+            ['scipy'],
+        )
+        assert loaded == []
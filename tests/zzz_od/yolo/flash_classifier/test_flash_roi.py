@@ -0,0 +1,77 @@
+"""
+测试闪光识别的区域截取 和 颜色预筛选
+"""
+import numpy as np
+
+from one_dragon.base.geometry.rectangle import Rect
+from zzz_od.yolo import flash_classifier
+from zzz_od.yolo.flash_classifier import FlashClassifier
+
+
+class FakeFlashClassifier(FlashClassifier):
+
+    def __init__(self):
+        # 不加载模型 只记录推理时的输入
+        self.color_gate_skip_cnt = 0
+        self.run_cnt = 0
+        self.run_image_list = []
+
+    def run(self, image, conf: float = 0.9, run_time=None):
+        self.run_image_list.append(image)
+        return flash_classifier.ClassificationResult(raw_image=image, class_idx=1, run_time=run_time)
+
+
+def test_center_rect():
+    assert flash_classifier.get_center_rect(1920, 1080, 0.5) == Rect(480, 270, 1440, 810)
+    assert flash_classifier.get_center_rect(1920, 1080, 1) == Rect(0, 0, 1920, 1080)
+
+
+def test_stack_crops():
+    image = np.arange(100 * 200 * 3, dtype=np.uint32).reshape((100, 200, 3)).astype(np.uint8)
+    stacked = flash_classifier.stack_crops(image, [Rect(0, 0, 50, 20), Rect(100, 50, 130, 60)])
+    assert stacked.shape == (30, 50, 3)
+    assert np.array_equal(stacked[:20], image[0:20, 0:50])
+    assert np.array_equal(stacked[20:, :30], image[50:60, 100:130])
+    assert not stacked[20:, 30:].any()
+
+
+def test_color_gate():
+    image = np.full((1080, 1920, 3), 60, dtype=np.uint8)
+    assert not flash_classifier.has_flash_color(image)
+
+    image[500:540, 900:960] = (240, 40, 30)  # 红光
+    assert flash_classifier.has_flash_color(image)
+
+    image[:] = 60
+    image[500:540, 900:960] = (250, 220, 60)  # 黄光
+    assert flash_classifier.has_flash_color(image)
+
+
+def test_run_roi():
+    model = FakeFlashClassifier()
+    image = np.full((1080, 1920, 3), 60, dtype=np.uint8)
+    rect = Rect(480, 270, 1440, 810)
+
+    result = model.run_roi(image, rect_list=[rect], color_gate=True)
+    assert result.class_idx == -1
+    assert model.color_gate_skip_cnt == 1
+    assert len(model.run_image_list) == 0
+
+    image[500:540, 900:960] = (240, 40, 30)
+    result = model.run_roi(image, rect_list=[rect], color_gate=True)
+    assert result.class_idx == 1
+    assert model.run_image_list[0].shape == (540, 960, 3)
+
+    image[:] = 60
+    image[0:40, 0:60] = (240, 40, 30)  # 区域外的红色不算
+    assert model.run_roi(image, rect_list=[rect], color_gate=True).class_idx == -1
+
+    assert model.get_display_text() == '识别3次 预筛选跳过2次 推理1次'
+    model.clear_stats()
+    assert model.get_display_text() == ''
+
+
+def test_color_gate_dark_noise():
+    # 普通的暗色画面 不会被当成闪光
+    image = np.random.default_rng(0).integers(0, 180, size=(1080, 1920, 3), dtype=np.uint8)
+    assert not flash_classifier.has_flash_color(image)